@@ -1,21 +1,25 @@
+import importlib as _importlib
 import logging
 import sys as _sys
 from pathlib import Path as _Path
+from typing import TYPE_CHECKING as _TYPE_CHECKING, Any as _Any
 
-from rich.logging import RichHandler as _RichHandler
-from . import (
-    analyse,
-    dataobjects,
-    objectstore,
-    datapack,
-    retrieve,
-    plotting,
-    standardise,
-    store,
-    types,
-    tutorial,
-    util,
-)
+# Subpackages are imported on first access (PEP 562) as importing them pulls in
+# xarray, dask, zarr, pint and plotly, which makes `import openghg` slow.
+if _TYPE_CHECKING:
+    from . import (
+        analyse,
+        dataobjects,
+        objectstore,
+        datapack,
+        retrieve,
+        plotting,
+        standardise,
+        store,
+        types,
+        tutorial,
+        util,
+    )
 
 __all__ = [
     "analyse",
@@ -31,6 +35,37 @@ __all__ = [
     "util",
 ]
 
+
+def __getattr__(name: str) -> _Any:
+    if name in __all__:
+        module = _importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+class _LazyRichHandler(logging.Handler):
+    """Console handler that only imports rich when the first record is emitted."""
+
+    def __init__(self, level: int = logging.NOTSET) -> None:
+        super().__init__(level=level)
+        self._handler: logging.Handler | None = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._handler is None:
+            from rich.logging import RichHandler
+
+            self._handler = RichHandler()
+
+        self._handler.setFormatter(self.formatter)
+        self._handler.emit(record)
+
+
 if _sys.version_info < (3, 10):
     raise ImportError("openghg requires Python >= 3.10")
 
@@ -57,7 +92,8 @@ logging.captureWarnings(capture=True)
 logfile_path = str(_Path.home().joinpath("openghg.log"))
 
 # Create file handler for log file - set to DEBUG (maximum detail)
-fileHandler = logging.FileHandler(logfile_path)  # May want to update this to user area
+# The log file is only opened when the first record is written
+fileHandler = logging.FileHandler(logfile_path, delay=True)  # May want to update this to user area
 fileFormatter = logging.Formatter(
     "%(asctime)s:%(levelname)s:%(name)s:%(message)s", datefmt="%Y-%m-%dT%H:%M:%S%z"
 )
@@ -66,7 +102,7 @@ fileHandler.setLevel(logging.DEBUG)
 logger.addHandler(fileHandler)
 
 # Create console handler - set to WARNING (lower level)
-consoleHandler = _RichHandler()
+consoleHandler = _LazyRichHandler()
 consoleFormatter = logging.Formatter("%(levelname)s:%(name)s:%(message)s", datefmt="%Y-%m-%dT%H:%M:%S%z")
 consoleHandler.setFormatter(consoleFormatter)
 consoleHandler.setLevel(logging.INFO)
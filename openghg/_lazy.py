@@ -0,0 +1,58 @@
+"""Lazy loading of the attributes exported by a package (PEP 562).
+
+The public subpackages of OpenGHG re-export functions and classes from their submodules,
+and importing these submodules pulls in xarray, dask, pint and plotly. Instead of importing
+them in the package `__init__`, each attribute is imported from its submodule when it is
+first accessed:
+
+    __getattr__, __dir__ = lazy_exports(__name__, {"._search": ["search", "search_surface"]})
+
+The same names should be imported within an `if TYPE_CHECKING:` block so type checkers
+and IDEs can see them.
+
+This module must not import anything from openghg, as it is used by the package `__init__`s.
+"""
+
+import importlib
+import sys
+from collections.abc import Callable
+from typing import Any
+
+
+def lazy_exports(
+    package: str, submodules: dict[str, list[str]]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Create the module level `__getattr__` and `__dir__` for a package whose attributes
+    are imported from its submodules on first access.
+
+    Subpackages and submodules of the package can also be accessed as attributes, as they
+    could be when these were imported by the package `__init__`.
+
+    Args:
+        package: Name of the package, i.e. `__name__`
+        submodules: Names of submodules, relative to the package (e.g. "._search"),
+            mapped to the names of the attributes exported from each submodule
+    Returns:
+        tuple: `__getattr__` and `__dir__` functions for the package
+    """
+    attribute_modules = {name: module for module, names in submodules.items() for name in names}
+
+    def __getattr__(name: str) -> Any:
+        if name in attribute_modules:
+            value = getattr(importlib.import_module(attribute_modules[name], package), name)
+        else:
+            try:
+                value = importlib.import_module(f".{name}", package)
+            except ModuleNotFoundError as e:
+                if e.name != f"{package}.{name}":
+                    raise
+                raise AttributeError(f"module {package!r} has no attribute {name!r}") from None
+
+        # Cache the attribute so __getattr__ is only called once for each name
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(sys.modules[package])) | set(attribute_modules))
+
+    return __getattr__, __dir__
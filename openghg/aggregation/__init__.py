@@ -0,0 +1,33 @@
+"""Aggregates of stored timeseries, such as monthly and annual means.
+
+Aggregates are computed as data is added to the object store and stored alongside the data,
+so they can be reused without retrieving the full record, see `openghg.aggregation._store`.
+"""
+
+from ._statistics import FREQUENCIES, affected_windows, climatology, growth_rate, window_statistics
+from ._store import (
+    delete_aggregates,
+    get_aggregate,
+    get_aggregate_variables,
+    get_aggregates,
+    list_aggregates,
+    rebuild_aggregates,
+    set_aggregates,
+    update_aggregates,
+)
+
+__all__ = [
+    "FREQUENCIES",
+    "affected_windows",
+    "climatology",
+    "delete_aggregates",
+    "get_aggregate",
+    "get_aggregate_variables",
+    "get_aggregates",
+    "growth_rate",
+    "list_aggregates",
+    "rebuild_aggregates",
+    "set_aggregates",
+    "update_aggregates",
+    "window_statistics",
+]
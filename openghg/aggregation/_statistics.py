@@ -0,0 +1,127 @@
+"""Statistics of the data in regular time windows, and quantities derived from them."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+__all__ = ["FREQUENCIES", "affected_windows", "climatology", "growth_rate", "window_statistics"]
+
+# Standard aggregates and the pandas frequency of their windows
+FREQUENCIES = {"daily": "D", "monthly": "MS", "annual": "YS"}
+
+
+def _aggregated_names(
+    data: xr.Dataset, time_dim: str = "time", variables: Iterable[str] | None = None
+) -> list[str]:
+    """Names of the numeric timeseries variables, i.e. those whose only dimension is time."""
+    selected = None if variables is None else set(variables)
+    return [
+        str(name)
+        for name, variable in data.data_vars.items()
+        if variable.dims == (time_dim,)
+        and (selected is None or name in selected)
+        and np.issubdtype(variable.dtype, np.number)
+        and not np.issubdtype(variable.dtype, np.timedelta64)
+    ]
+
+
+def window_statistics(
+    data: xr.Dataset, freq: str, time_dim: str = "time", variables: Iterable[str] | None = None
+) -> xr.Dataset:
+    """Compute the mean, standard deviation and number of valid values of each numeric
+    timeseries variable in windows of time.
+
+    For a variable "ch4" the result has variables "ch4" (mean), "ch4_std" and "ch4_count",
+    with the time of each window being its start. Windows without data are not included.
+
+    Args:
+        data: Dataset with a time dimension
+        freq: Length of windows, as a pandas frequency, e.g. "MS" for calendar months
+        time_dim: Name of time dimension
+        variables: Names of the variables to aggregate, defaults to all numeric timeseries variables
+    Returns:
+        xr.Dataset: Statistics of each window
+    """
+    names = _aggregated_names(data, time_dim=time_dim, variables=variables)
+    if not names:
+        return xr.Dataset(attrs=data.attrs).assign_attrs(aggregate_frequency=freq)
+    numeric = data[names]
+
+    resampled = numeric.resample({time_dim: freq})
+    mean = resampled.mean(keep_attrs=True)
+    std = resampled.std()
+    count = resampled.count()
+
+    result = mean
+    for name in names:
+        result[f"{name}_std"] = std[name]
+        result[f"{name}_count"] = count[name]
+
+    # Drop the windows in gaps in the data
+    total = sum(count[name] for name in names)
+    result = result.isel({time_dim: np.asarray(total > 0)})
+
+    return result.assign_attrs(data.attrs).assign_attrs(aggregate_frequency=freq)
+
+
+def affected_windows(
+    start_date: pd.Timestamp | str, end_date: pd.Timestamp | str, freq: str
+) -> tuple[pd.Timestamp, pd.Timestamp]:
+    """Find the windows containing a range of times.
+
+    Args:
+        start_date: First time
+        end_date: Last time (inclusive)
+        freq: Length of windows, as a pandas frequency
+    Returns:
+        tuple: Start of the first window and end (exclusive) of the last window
+    """
+    offset = pd.tseries.frequencies.to_offset(freq)
+    start = offset.rollback(pd.Timestamp(start_date).normalize())
+    end = offset.rollback(pd.Timestamp(end_date).normalize()) + offset
+    return pd.Timestamp(start), pd.Timestamp(end)
+
+
+def _means(aggregate: xr.Dataset) -> list[str]:
+    return [str(name) for name in aggregate.data_vars if f"{name}_count" in aggregate]
+
+
+def climatology(aggregate: xr.Dataset, time_dim: str = "time") -> xr.Dataset:
+    """Compute the mean seasonal cycle from daily or monthly statistics.
+
+    Each window is weighted by its number of values.
+
+    Args:
+        aggregate: Statistics from `window_statistics`, e.g. the "monthly" aggregate
+        time_dim: Name of time dimension
+    Returns:
+        xr.Dataset: Mean of each variable for each calendar month, with dimension "month"
+    """
+    result = {}
+    month = aggregate[time_dim].dt.month.rename("month")
+
+    for name in _means(aggregate):
+        count = aggregate[f"{name}_count"]
+        weighted = (aggregate[name] * count).fillna(0.0)
+        result[name] = weighted.groupby(month).sum() / count.groupby(month).sum()
+        result[f"{name}_count"] = count.groupby(month).sum()
+
+    return xr.Dataset(result, attrs=aggregate.attrs)
+
+
+def growth_rate(aggregate: xr.Dataset, time_dim: str = "time") -> xr.Dataset:
+    """Compute the change in mean value from each window to the next, e.g. the annual growth
+    rate from the "annual" aggregate.
+
+    Args:
+        aggregate: Statistics from `window_statistics`
+        time_dim: Name of time dimension
+    Returns:
+        xr.Dataset: Difference of each mean from the previous window, labelled by the later window
+    """
+    names = _means(aggregate)
+    return aggregate[names].diff(dim=time_dim, label="upper").assign_attrs(aggregate.attrs)
@@ -0,0 +1,333 @@
+"""Storage of aggregates of the data in Datasources.
+
+Aggregates are statistics of the data in a Datasource in regular time windows, see
+`window_statistics`. Each aggregate of a Datasource is stored in its own zarr store, with its
+own UUID, and a version for each version of the source data. A record of the aggregates of
+each Datasource is kept in the object store at "aggregates/<source UUID>":
+
+    {
+        "source_uuid": ...,
+        "aggregates": {
+            "monthly": {
+                "uuid": UUID of the aggregate,
+                "freq": "MS",
+                "versions": {"v1": {"updated": timestamp, "start_date": ..., "end_date": ...}},
+            },
+        },
+    }
+
+The aggregates computed for each timeseries data type, and optionally the variables aggregated,
+are set with `set_aggregates`. They are then updated when a Datasource of that data type is saved
+after data has been added, recomputing only the windows containing the new data. A new version
+combining new data with the previous version starts from a copy of the aggregates of the previous
+version. Use `rebuild_aggregates` to compute the aggregates of data stored before they were set.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import logging
+from pathlib import Path
+import shutil
+from typing import cast
+from uuid import uuid4
+
+import pandas as pd
+import xarray as xr
+
+from openghg.objectstore import delete_object, get_object_from_json, set_object_from_json
+from openghg.storage import get_zarr_directory_store
+from openghg.types import ObjectStoreError
+from openghg.util import timestamp_now
+
+from ._statistics import FREQUENCIES, affected_windows, window_statistics
+
+logger = logging.getLogger("openghg.aggregation")
+logger.setLevel(logging.DEBUG)  # Have to set level for logger as well as handler
+
+__all__ = [
+    "delete_aggregates",
+    "get_aggregate",
+    "get_aggregate_variables",
+    "get_aggregates",
+    "list_aggregates",
+    "rebuild_aggregates",
+    "set_aggregates",
+    "update_aggregates",
+]
+
+AGGREGATES_CONFIG_KEY = "config/aggregates"
+
+
+def _record_key(source_uuid: str) -> str:
+    return f"aggregates/{source_uuid}"
+
+
+def _aggregate_path(bucket: str, aggregate_uuid: str) -> Path:
+    return Path(bucket, "aggregates", "data", aggregate_uuid)
+
+
+def _zarr_path(bucket: str, aggregate_uuid: str, version: str) -> Path:
+    return _aggregate_path(bucket, aggregate_uuid) / version
+
+
+def _get_config(bucket: str) -> dict:
+    try:
+        return get_object_from_json(bucket=bucket, key=AGGREGATES_CONFIG_KEY)
+    except ObjectStoreError:
+        return {}
+
+
+def _get_settings(bucket: str, data_type: str) -> dict:
+    settings = _get_config(bucket=bucket).get(data_type.lower(), {})
+    # Only the names of the aggregates were stored by earlier versions
+    if isinstance(settings, list):
+        return {"aggregates": settings}
+    return dict(settings)
+
+
+def get_aggregates(bucket: str, data_type: str) -> list[str]:
+    """Get the aggregates computed for a data type in an object store.
+
+    Args:
+        bucket: Object store path
+        data_type: Data type, e.g. "surface"
+    Returns:
+        list: Names of aggregates, e.g. ["monthly", "annual"]
+    """
+    return list(_get_settings(bucket=bucket, data_type=data_type).get("aggregates", []))
+
+
+def get_aggregate_variables(bucket: str, data_type: str) -> list[str] | None:
+    """Get the variables aggregated for a data type in an object store.
+
+    Args:
+        bucket: Object store path
+        data_type: Data type, e.g. "surface"
+    Returns:
+        list or None: Names of variables, or None if all numeric timeseries variables are aggregated
+    """
+    variables = _get_settings(bucket=bucket, data_type=data_type).get("variables")
+    return None if variables is None else list(variables)
+
+
+def set_aggregates(
+    bucket: str, data_type: str, aggregates: Iterable[str], variables: Iterable[str] | None = None
+) -> None:
+    """Set the aggregates computed when data of a data type is added to an object store.
+
+    Args:
+        bucket: Object store path
+        data_type: Timeseries data type, e.g. "surface"
+        aggregates: Names of aggregates, from "daily", "monthly" and "annual".
+            Pass an empty list to stop computing aggregates for the data type.
+        variables: Names of the variables to aggregate, e.g. ["mf"]. By default all numeric
+            variables whose only dimension is time are aggregated.
+    Returns:
+        None
+    """
+    from openghg.store.spec import define_timeseries_data_types
+
+    data_type = data_type.lower()
+    timeseries_data_types = define_timeseries_data_types()
+    if data_type not in timeseries_data_types:
+        raise ValueError(
+            f"Aggregates can only be computed for timeseries data types, select from {timeseries_data_types}"
+        )
+
+    aggregates = list(aggregates)
+    invalid = [name for name in aggregates if name not in FREQUENCIES]
+    if invalid:
+        raise ValueError(f"Invalid aggregates {invalid}, select from {tuple(FREQUENCIES)}")
+
+    config = _get_config(bucket=bucket)
+    if aggregates:
+        config[data_type] = {"aggregates": aggregates}
+        if variables is not None:
+            config[data_type]["variables"] = list(variables)
+    else:
+        config.pop(data_type, None)
+
+    set_object_from_json(bucket=bucket, key=AGGREGATES_CONFIG_KEY, data=config)
+
+
+def list_aggregates(bucket: str, source_uuid: str) -> dict:
+    """Get the record of the aggregates of a Datasource, see module documentation.
+
+    Args:
+        bucket: Object store path
+        source_uuid: UUID of Datasource
+    Returns:
+        dict: Aggregates keyed by name, empty if the Datasource has no aggregates
+    """
+    try:
+        record = get_object_from_json(bucket=bucket, key=_record_key(source_uuid))
+    except ObjectStoreError:
+        return {}
+    return dict(cast(dict, record["aggregates"]))
+
+
+def update_aggregates(
+    bucket: str,
+    source_uuid: str,
+    version: str,
+    data: xr.Dataset,
+    start_date: pd.Timestamp | str,
+    end_date: pd.Timestamp | str,
+    aggregates: Iterable[str],
+    variables: Iterable[str] | None = None,
+    copy_from: str | None = None,
+    replace: bool = False,
+) -> None:
+    """Update the aggregates of a version of a Datasource for a range of times.
+
+    Only the windows containing times between `start_date` and `end_date` are recomputed,
+    using the data in those windows. If the aggregate has no data for this version yet,
+    it is copied from version `copy_from`, if given, and otherwise computed from all of the data.
+    If `replace` is True the aggregate of this version is computed again from all of the data.
+
+    Args:
+        bucket: Object store path
+        source_uuid: UUID of Datasource
+        version: Version of the Datasource data
+        data: All the data stored for this version; only the windows needed are read
+        start_date: Start of the times changed
+        end_date: End of the times changed (inclusive)
+        aggregates: Names of aggregates to update
+        variables: Names of variables to aggregate, defaults to all numeric timeseries variables
+        copy_from: Version the data of this version was copied from, before the new data was added
+        replace: The stored data of this version was replaced, rather than added to
+    Returns:
+        None
+    """
+    record = list_aggregates(bucket=bucket, source_uuid=source_uuid)
+
+    for name in aggregates:
+        freq = FREQUENCIES[name]
+        entry = record.setdefault(name, {"uuid": str(uuid4()), "freq": freq, "versions": {}})
+
+        if replace and entry["versions"].pop(version, None) is not None:
+            shutil.rmtree(_zarr_path(bucket, entry["uuid"], version), ignore_errors=True)
+
+        # Start from the aggregate of the data this version was copied from
+        if version not in entry["versions"] and copy_from in entry["versions"]:
+            target = _zarr_path(bucket, entry["uuid"], version)
+            shutil.rmtree(target, ignore_errors=True)
+            shutil.copytree(_zarr_path(bucket, entry["uuid"], cast(str, copy_from)), target)
+            entry["versions"][version] = dict(entry["versions"][cast(str, copy_from)])
+
+        if version in entry["versions"]:
+            window_start, window_end = affected_windows(start_date, end_date, freq)
+            windows = data.sel(time=slice(window_start, window_end - pd.Timedelta(1, "ns")))
+        else:
+            # A new version of the data, which may include data copied from the previous version
+            windows = data
+
+        if not windows.sizes.get("time"):
+            continue
+
+        statistics = window_statistics(windows, freq=freq, variables=variables)
+        if not statistics.data_vars:
+            continue
+        statistics = statistics.chunk({"time": -1})
+
+        store = get_zarr_directory_store(path=_zarr_path(bucket, entry["uuid"], version))
+        if store:
+            store.upsert(statistics)
+        else:
+            store.insert(statistics)
+
+        times = store.index
+        entry["versions"][version] = {
+            "updated": str(timestamp_now()),
+            "start_date": str(times.min()),
+            "end_date": str(times.max()),
+        }
+        logger.debug(f"Updated {name} aggregate of {source_uuid} for {statistics.time.size} windows.")
+
+    if record:
+        set_object_from_json(
+            bucket=bucket,
+            key=_record_key(source_uuid),
+            data={"source_uuid": source_uuid, "aggregates": record},
+        )
+
+
+def get_aggregate(bucket: str, source_uuid: str, name: str, version: str = "latest") -> xr.Dataset:
+    """Get an aggregate of the data of a Datasource.
+
+    Args:
+        bucket: Object store path
+        source_uuid: UUID of Datasource
+        name: Name of aggregate, e.g. "monthly"
+        version: Version of the Datasource data, or "latest" for the latest version aggregated
+    Returns:
+        xr.Dataset: Aggregate, see `window_statistics`
+    """
+    record = list_aggregates(bucket=bucket, source_uuid=source_uuid)
+    if name not in record:
+        raise ObjectStoreError(f"No {name} aggregate found for Datasource {source_uuid}.")
+
+    entry = record[name]
+    if version == "latest":
+        version = max(entry["versions"], key=lambda v: int(v.lstrip("v")))
+    elif version not in entry["versions"]:
+        raise ValueError(f"Invalid version {version}, {name} aggregate versions: {list(entry['versions'])}")
+
+    store = get_zarr_directory_store(path=_zarr_path(bucket, entry["uuid"], version))
+    return store.get()
+
+
+def delete_aggregates(bucket: str, source_uuid: str) -> None:
+    """Delete the aggregates of a Datasource.
+
+    Args:
+        bucket: Object store path
+        source_uuid: UUID of Datasource
+    Returns:
+        None
+    """
+    record = list_aggregates(bucket=bucket, source_uuid=source_uuid)
+    for entry in record.values():
+        shutil.rmtree(_aggregate_path(bucket, entry["uuid"]), ignore_errors=True)
+
+    if record:
+        delete_object(bucket=bucket, key=_record_key(source_uuid))
+
+
+def rebuild_aggregates(bucket: str, source_uuid: str, aggregates: Iterable[str] | None = None) -> None:
+    """Compute the aggregates of the latest version of a Datasource from all of its data.
+
+    Args:
+        bucket: Object store path
+        source_uuid: UUID of Datasource
+        aggregates: Names of aggregates, defaults to those set for its data type, see `set_aggregates`
+    Returns:
+        None
+    """
+    from openghg.objectstore import get_datasource
+
+    datasource = get_datasource(bucket=bucket, uuid=source_uuid)
+
+    if aggregates is None:
+        aggregates = get_aggregates(bucket=bucket, data_type=datasource.data_type)
+    variables = get_aggregate_variables(bucket=bucket, data_type=datasource.data_type)
+
+    version = datasource.latest_version
+    data = datasource.get_data(version=version)
+
+    record = list_aggregates(bucket=bucket, source_uuid=source_uuid)
+    for name in aggregates:
+        if name in record and version in record[name]["versions"]:
+            shutil.rmtree(_zarr_path(bucket, record[name]["uuid"], version), ignore_errors=True)
+
+    update_aggregates(
+        bucket=bucket,
+        source_uuid=source_uuid,
+        version=version,
+        data=data,
+        start_date=data.time.values.min(),
+        end_date=data.time.values.max(),
+        aggregates=aggregates,
+        variables=variables,
+    )
@@ -1,7 +1,22 @@
-from ._alignment import combine_datasets
-from ._scenario import ModelScenario
-from ._utils import (
-    calc_dim_resolution,
-    match_dataset_dims,
-    stack_datasets,
+from typing import TYPE_CHECKING
+
+from openghg._lazy import lazy_exports
+
+# Attributes are imported from their submodules on first access, see openghg._lazy
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "._alignment": ["combine_datasets"],
+        "._scenario": ["ModelScenario"],
+        "._utils": ["calc_dim_resolution", "match_dataset_dims", "stack_datasets"],
+    },
 )
+
+if TYPE_CHECKING:
+    from ._alignment import combine_datasets
+    from ._scenario import ModelScenario
+    from ._utils import (
+        calc_dim_resolution,
+        match_dataset_dims,
+        stack_datasets,
+    )
@@ -3,7 +3,24 @@ from typing import cast
 import numpy as np
 import xarray as xr
 
-from openghg.util import check_lifetime_monthly, species_lifetime, time_offset
+from openghg.analyse._utils import align_time_ffill
+from openghg.util import (
+    check_lifetime_monthly,
+    conversion_factor,
+    multiply_with_units,
+    species_lifetime,
+    time_offset,
+)
+
+
+def _loss(mean_age: xr.DataArray, lifetime_hrs: float | np.ndarray) -> xr.DataArray:
+    """Loss term exp(-mean age / lifetime), with the mean age in hours (stored without units)."""
+    factor = conversion_factor(mean_age.attrs.get("units", "dimensionless"), "dimensionless")
+    age = mean_age.copy(deep=False)
+    age.attrs = {k: v for k, v in mean_age.attrs.items() if k != "units"}
+
+    # Ignoring type below - problem with xarray patching np.exp to return DataArray rather than ndarray
+    return np.exp(-1 * factor * age / lifetime_hrs)  # type: ignore
 
 
 def baseline_sensitivities(bc: xr.Dataset, fp: xr.Dataset, species: str | None = None) -> xr.Dataset:
@@ -29,15 +46,13 @@ def baseline_sensitivities(bc: xr.Dataset, fp: xr.Dataset, species: str | None =
         if dim in fp.dims and "units" not in bc[dim].attrs:
             bc[dim].attrs["units"] = fp[dim].attrs.get("units")
 
-    fp = fp.pint.quantify()
-    bc = bc.pint.quantify()
-    bc = bc.pint.reindex_like(fp, "ffill")
+    # the units of the coordinates are assumed to match, so only the units of the data variables
+    # are used, see `multiply_with_units`
+    other_dims = [dim for dim in bc.dims if dim != "time" and dim in fp.indexes]
+    bc = bc.reindex({dim: fp[dim] for dim in other_dims}, method="ffill")
 
-    # align chunks for time after filling
-    fp_time_chunks = fp.particle_locations_n.chunksizes.get("time")
-    if fp_time_chunks is not None:
-        fp_time_chunk = fp_time_chunks[0]
-        bc = bc.chunk({"time": fp_time_chunk})
+    # align separately on time, gathering the boundary conditions for each chunk of footprint times
+    bc = align_time_ffill(bc, fp, chunks=fp.particle_locations_n.chunksizes.get("time"))
 
     # check if loss term is needed
     lifetime_value = species_lifetime(species)
@@ -83,19 +98,10 @@ def baseline_sensitivities(bc: xr.Dataset, fp: xr.Dataset, species: str | None =
                     f"Unable to calculate baseline for short-lived species {species} without species specific footprint."
                 )
 
-        # Ignoring type below -  - problem with xarray patching np.exp to return DataArray rather than ndarray
-        loss_n: xr.DataArray | float = np.exp(-1 * fp["mean_age_particles_n"] / lifetime_hrs).rename(  # type: ignore
-            "loss_n"
-        )
-        loss_e: xr.DataArray | float = np.exp(-1 * fp["mean_age_particles_e"] / lifetime_hrs).rename(  # type: ignore
-            "loss_e"
-        )
-        loss_s: xr.DataArray | float = np.exp(-1 * fp["mean_age_particles_s"] / lifetime_hrs).rename(  # type: ignore
-            "loss_s"
-        )
-        loss_w: xr.DataArray | float = np.exp(-1 * fp["mean_age_particles_w"] / lifetime_hrs).rename(  # type: ignore
-            "loss_w"
-        )
+        loss_n: xr.DataArray | float = _loss(fp["mean_age_particles_n"], lifetime_hrs).rename("loss_n")
+        loss_e: xr.DataArray | float = _loss(fp["mean_age_particles_e"], lifetime_hrs).rename("loss_e")
+        loss_s: xr.DataArray | float = _loss(fp["mean_age_particles_s"], lifetime_hrs).rename("loss_s")
+        loss_w: xr.DataArray | float = _loss(fp["mean_age_particles_w"], lifetime_hrs).rename("loss_w")
 
     else:
         loss_n = 1.0
@@ -104,15 +110,13 @@ def baseline_sensitivities(bc: xr.Dataset, fp: xr.Dataset, species: str | None =
         loss_w = 1.0
 
     sensitivities = {
-        "bc_n": fp["particle_locations_n"] * bc["vmr_n"] * loss_n,
-        "bc_e": fp["particle_locations_e"] * bc["vmr_e"] * loss_e,
-        "bc_s": fp["particle_locations_s"] * bc["vmr_s"] * loss_s,
-        "bc_w": fp["particle_locations_w"] * bc["vmr_w"] * loss_w,
+        "bc_n": multiply_with_units(fp["particle_locations_n"], bc["vmr_n"], loss_n),
+        "bc_e": multiply_with_units(fp["particle_locations_e"], bc["vmr_e"], loss_e),
+        "bc_s": multiply_with_units(fp["particle_locations_s"], bc["vmr_s"], loss_s),
+        "bc_w": multiply_with_units(fp["particle_locations_w"], bc["vmr_w"], loss_w),
     }
 
-    # convert units then dequantify so output has correct units, but is not quantified, which
-    # might cause issues with dask in subsequent computations
-    result = cast(xr.Dataset, xr.Dataset(sensitivities).pint.dequantify())
+    result = xr.Dataset(sensitivities)
 
     # keep float32
     result = result.astype({f"bc_{d}": "float32" for d in "nesw"})
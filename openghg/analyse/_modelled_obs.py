@@ -6,7 +6,8 @@ import pandas as pd
 import xarray as xr
 
 from openghg.analyse._alignment import time_of_day_offset
-from openghg.analyse._utils import reindex_on_dims
+from openghg.analyse._utils import align_time_ffill, reindex_on_dims
+from openghg.util import add_with_units, multiply_with_units
 
 
 def fp_x_flux_integrated(footprint: xr.Dataset, flux: xr.Dataset) -> xr.DataArray:
@@ -22,18 +23,10 @@ def fp_x_flux_integrated(footprint: xr.Dataset, flux: xr.Dataset) -> xr.DataArra
     """
     flux = reindex_on_dims(flux, footprint, ["lat", "lon"])
 
-    # align separately on time
-    # TODO: if method="nearest" was acceptable, then we could align all coordinates at once with reindex_like
-    flux = flux.reindex_like(footprint, method="ffill")
+    # align separately on time, gathering the flux for each chunk of footprint times
+    flux = align_time_ffill(flux, footprint, chunks=footprint.fp.chunksizes.get("time"))
 
-    # align chunks for time after filling
-    fp_time_chunks = footprint.fp.chunksizes.get("time")
-    if fp_time_chunks is not None:
-        fp_time_chunk = fp_time_chunks[0]
-        flux = flux.chunk({"time": fp_time_chunk})
-
-    result = footprint.fp.pint.quantify() * flux.flux.pint.quantify()
-    return cast(xr.DataArray, result.pint.dequantify())
+    return multiply_with_units(footprint.fp, flux.flux)
 
 
 # helper functions for time-resolved calculation
@@ -122,12 +115,10 @@ def _make_low_freq_flux(flux: xr.DataArray, fp: xr.DataArray | xr.Dataset) -> xr
     start, end = _padded_flux_slice_start_and_end(fp)
 
     flux_low_freq = (
-        flux.resample({"time": "1MS"})
-        .mean()
-        .sel(time=slice(start, end))
-        .transpose("lat", "lon", "time")
-        .reindex_like(fp, method="ffill")
+        flux.resample({"time": "1MS"}).mean().sel(time=slice(start, end)).transpose("lat", "lon", "time")
     )
+    fp_residual = fp.fp_residual if isinstance(fp, xr.Dataset) else fp
+    flux_low_freq = align_time_ffill(flux_low_freq, fp, chunks=fp_residual.chunksizes.get("time"))
 
     return flux_low_freq
 
@@ -219,24 +210,23 @@ def fp_x_flux_time_resolved(
 
     # create low res. (monthly) flux and calculate low res. fp x flux
     flux_low_freq = _make_low_freq_flux(flux, fp)
-    fp_x_flux_residual = fp_residual.pint.quantify() * flux_low_freq.pint.quantify()
+    fp_x_flux_residual = multiply_with_units(fp_residual, flux_low_freq)
 
     # Calculate time resolution for flux
     flux_res_hours = calc_hourly_freq(flux.time, input_nanoseconds=True)
 
     # if resolution coarser than "H_back" dimension, just sum over "H_back" and use low freq. flux
     if flux_res_hours > _max_h_back(fp):
-        result = (
-            fp_time_resolved.sum("H_back").pint.quantify() * flux_low_freq.pint.quantify()
-            + fp_x_flux_residual
-        )
-        return cast(xr.DataArray, result.pint.dequantify())
+        fp_x_flux_low_freq = multiply_with_units(fp_time_resolved.sum("H_back"), flux_low_freq)
+        return add_with_units(fp_x_flux_low_freq, fp_x_flux_residual)
 
     # create high frequency flux (resampled to gcd of footprint time and H_back frequencies) with H_back dim
     flux_high_freq = _make_high_freq_flux(flux, fp)
 
-    fp_x_flux = (flux_high_freq.pint.quantify() * fp_time_resolved.pint.quantify()).sum(
-        "H_back"
-    ) + fp_x_flux_residual
+    fp_x_flux = multiply_with_units(flux_high_freq, fp_time_resolved)
+    # summing drops the units attribute, so keep it
+    fp_x_flux_summed = fp_x_flux.sum("H_back")
+    if "units" in fp_x_flux.attrs:
+        fp_x_flux_summed.attrs["units"] = fp_x_flux.attrs["units"]
 
-    return cast(xr.DataArray, fp_x_flux.pint.dequantify())
+    return add_with_units(fp_x_flux_summed, fp_x_flux_residual)
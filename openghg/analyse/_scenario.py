@@ -66,7 +66,14 @@ from openghg.retrieve import (
     search_footprints,
     search_column,
 )
-from openghg.util import synonyms, clean_string, format_inlet, verify_site_with_satellite, define_platform
+from openghg.util import (
+    synonyms,
+    clean_string,
+    format_inlet,
+    verify_site_with_satellite,
+    define_platform,
+    uses_execution_options,
+)
 from openghg.types import SearchError, ReindexMethod
 from ._alignment import combine_datasets, resample_obs_and_other
 from ._modelled_baseline import baseline_sensitivities
@@ -1060,6 +1067,7 @@ class ModelScenario:
 
         return True
 
+    @uses_execution_options
     def calc_modelled_obs(
         self,
         sources: str | list | None = None,
@@ -1283,6 +1291,7 @@ class ModelScenario:
 
         return Dataset(data)
 
+    @uses_execution_options
     def calc_modelled_baseline(
         self,
         resample_to: str | None = "coarsest",
@@ -1368,6 +1377,7 @@ class ModelScenario:
     # def _calc_modelled_baseline_short_lived():
     #     pass
 
+    @uses_execution_options
     def footprints_data_merge(
         self,
         resample_to: str | None = "coarsest",
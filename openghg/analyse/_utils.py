@@ -2,11 +2,15 @@ from collections.abc import Iterable, Sequence
 from typing import Any, cast
 
 import numpy as np
+import pandas as pd
 import xarray as xr
 from xarray import AlignmentError
 
 from openghg.types import ReindexMethod, XrDataLikeMatch
 
+# name for a DataArray while it is aligned as a Dataset
+_TEMP_NAME = "__to_align__"
+
 
 def _indexes_match(dataset_A: xr.Dataset, dataset_B: xr.Dataset) -> bool:
     """Check if two datasets need to be reindexed_like for combine_datasets
@@ -126,6 +130,115 @@ def reindex_on_dims(
     return result  # type: ignore
 
 
+def time_index_map(
+    source: pd.DatetimeIndex | np.ndarray, target: pd.DatetimeIndex | np.ndarray
+) -> np.ndarray:
+    """Map each target time to the position of the last source time at or before it.
+
+    This is the mapping used by forward filling, e.g. `reindex(method="ffill")`.
+
+    Args:
+        source: times to map to; must be increasing
+        target: times to map from
+
+    Returns:
+        np.ndarray of integer positions in `source`, with -1 for target times before the first source time.
+
+    """
+    source = pd.DatetimeIndex(source)
+    if not source.is_monotonic_increasing:
+        raise ValueError("Source times must be increasing to map target times to them.")
+
+    positions: np.ndarray = np.searchsorted(source.values, pd.DatetimeIndex(target).values, side="right")
+    return positions.astype(np.int64) - 1
+
+
+def _take_blocks(variable: xr.Variable, dim: str, indices: np.ndarray, chunks: Sequence[int]) -> xr.Variable:
+    """Take values along a dimension, creating a lazy dask block for each chunk of `indices`."""
+    import dask.array as da
+
+    data = variable.data
+    if not isinstance(data, da.Array):
+        data = da.from_array(data, chunks=-1)
+
+    axis = variable.get_axis_num(dim)
+    bounds = np.cumsum((0, *chunks))
+
+    blocks = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        block_indices = indices[start:end]
+        first, last = block_indices.min(), block_indices.max()
+
+        # only the source values between the first and last index are read for this block
+        source = data[(slice(None),) * axis + (slice(first, last + 1),)].rechunk({axis: -1})
+        block_chunks = source.chunks[:axis] + ((end - start,),) + source.chunks[axis + 1 :]
+        blocks.append(
+            source.map_blocks(
+                np.take, block_indices - first, axis=axis, chunks=block_chunks, dtype=source.dtype
+            )
+        )
+
+    return xr.Variable(variable.dims, da.concatenate(blocks, axis=axis), attrs=variable.attrs)
+
+
+def align_time_ffill(
+    to_align: XrDataLikeMatch,
+    align_like: xr.DataArray | xr.Dataset,
+    dim: str = "time",
+    chunks: Sequence[int] | None = None,
+) -> XrDataLikeMatch:
+    """Forward fill values along the time dimension of `to_align` onto the times of `align_like`.
+
+    This gives the same result as `to_align.reindex({dim: align_like[dim]}, method="ffill")`, but the
+    values are selected using an integer map from the times of `align_like` to the times of `to_align`
+    (see `time_index_map`). If `chunks` is given, the result is a dask array with these chunks along
+    `dim` and each chunk is only gathered when computed, so (for instance) monthly flux aligned to hourly
+    footprints is not expanded to hourly values in memory.
+
+    Only `dim` is aligned; use `reindex_on_dims` for other dimensions.
+
+    Args:
+        to_align: DataArray or Dataset to align. Variables without `dim` are unchanged.
+        align_like: DataArray or Dataset with the times to align to.
+        dim: time dimension
+        chunks: chunk sizes along `dim` for the result, e.g. the chunks of the footprint
+
+    Returns:
+        `to_align` with the times of `align_like`; NaN before the first time of `to_align`.
+
+    """
+    if dim not in to_align.dims:
+        return to_align
+
+    if isinstance(to_align, xr.DataArray):
+        name = to_align.name
+        aligned = align_time_ffill(to_align.to_dataset(name=_TEMP_NAME), align_like, dim=dim, chunks=chunks)
+        return aligned[_TEMP_NAME].rename(name)
+
+    target = align_like.get_index(dim)
+    indices = time_index_map(to_align.get_index(dim), target)
+
+    # times before the start of `to_align` take values from a padded NaN value at the end
+    missing = indices < 0
+    if missing.any():
+        to_align = to_align.pad({dim: (0, 1)})
+        indices = np.where(missing, to_align.sizes[dim] - 1, indices)
+
+    def align_variable(variable: xr.Variable) -> xr.Variable:
+        if dim not in variable.dims:
+            return variable
+        if chunks is None:
+            return variable.isel({dim: indices})
+        return _take_blocks(variable, dim, indices, chunks)
+
+    coords = {name: align_variable(to_align.variables[name]) for name in to_align.coords if name != dim}
+    coords[dim] = xr.Variable(dim, target.values, attrs=to_align[dim].attrs)
+
+    data_vars = {name: align_variable(to_align.variables[name]) for name in to_align.data_vars}
+
+    return xr.Dataset(data_vars, coords=coords, attrs=to_align.attrs)
+
+
 def match_dataset_dims(
     datasets: Sequence[xr.Dataset],
     dims: str | Sequence = [],
@@ -1,8 +1,28 @@
-from ._bc_data import BoundaryConditionsData
-from ._flux_data import FluxData
-from ._footprint_data import FootprintData
-from ._metdata import METData
-from ._obsdata import ObsData
-from ._obscolumn_data import ObsColumnData
-from ._searchresults import SearchResults
-from ._datamanager import DataManager, data_manager
+from typing import TYPE_CHECKING
+
+from openghg._lazy import lazy_exports
+
+# Attributes are imported from their submodules on first access, see openghg._lazy
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "._bc_data": ["BoundaryConditionsData"],
+        "._flux_data": ["FluxData"],
+        "._footprint_data": ["FootprintData"],
+        "._metdata": ["METData"],
+        "._obsdata": ["ObsData"],
+        "._obscolumn_data": ["ObsColumnData"],
+        "._searchresults": ["SearchResults"],
+        "._datamanager": ["DataManager", "data_manager"],
+    },
+)
+
+if TYPE_CHECKING:
+    from ._bc_data import BoundaryConditionsData
+    from ._flux_data import FluxData
+    from ._footprint_data import FootprintData
+    from ._metdata import METData
+    from ._obsdata import ObsData
+    from ._obscolumn_data import ObsColumnData
+    from ._searchresults import SearchResults
+    from ._datamanager import DataManager, data_manager
@@ -8,7 +8,7 @@ import logging
 from pandas import Timestamp, Timedelta
 import xarray as xr
 
-from openghg.objectstore import get_datasource
+from openghg.objectstore import Datasource, get_datasource
 
 logger = logging.getLogger("openghg.dataobjects")
 logger.setLevel(logging.DEBUG)  # Have to set level for logger as well as handler
@@ -39,6 +39,9 @@ class _BaseData:
         sort: bool = True,
         elevate_inlet: bool = False,
         attrs_to_check: dict | None = None,
+        datasource: Datasource | None = None,
+        lazy: bool = False,
+        spatial_bounds: dict[str, tuple[float, float]] | None = None,
     ) -> None:
         """
         This handles data for each of the data type classes. It accepts either a Dataset
@@ -58,9 +61,14 @@ class _BaseData:
                 a new data variable will be created containing the values from each dataset
                 If a dictionary is passed, the attribute(s) will be retained and the new value assigned.
                 If a list/string is passed, the attribute(s) will be removed.
+            datasource: Datasource with the given UUID, if already loaded
+            lazy: If True, the Datasource is only opened (and the data sliced and sorted)
+                when the data is first accessed
+            spatial_bounds: Minimum and maximum values of the "lat" and / or "lon" coordinates
+                to select, see `openghg.util.get_spatial_bounds`. When opening data from a zarr store
+                these are converted to index slices using the stored coordinates, so only the
+                chunks covering the region are read.
         """
-        from openghg.util import timestamp_epoch, timestamp_now
-
         if data is None and uuid is None and version is None:
             raise ValueError("Must supply either data or uuid and version")
 
@@ -71,6 +79,10 @@ class _BaseData:
 
         self._start_date = start_date
         self._end_date = end_date
+        self._sort = sort
+        self._datasource = datasource
+        self._spatial_bounds = spatial_bounds or {}
+        self._data: xr.Dataset | None = None
 
         if elevate_inlet:
             raise NotImplementedError("elevate_inlet not implemented yet")
@@ -78,58 +90,127 @@ class _BaseData:
         if attrs_to_check is not None:
             raise NotImplementedError("attrs_to_check not implemented yet")
 
-        sorted = False  # Check so we don't sort more than once
-
         if data is not None:
-            self.data = data
+            if self._spatial_bounds:
+                data = self._select_region(data, coords={str(k): v.values for k, v in data.coords.items()})
+            if sort:
+                try:
+                    data = data.sortby("time")
+                except KeyError:
+                    logger.debug("Cannot sort data by time as no time dimension present")
+            self._data = data
         elif uuid is not None and version is not None:
-            slice_time = False
-            if start_date is not None or end_date is not None:
-                slice_time = True
-                if start_date is None:
-                    start_date = timestamp_epoch()
-                if end_date is None:
-                    end_date = timestamp_now()
-
             self._version = version
             self._bucket = metadata["object_store"]
 
-            datasource = get_datasource(bucket=self._bucket, uuid=uuid, data_type=self._data_type)
+            if not lazy:
+                self._data = self._open_data()
+        else:
+            raise ValueError(
+                "Must supply either data or uuid and version, cannot create an empty data object."
+            )
 
-            version = version or "latest"  # can't pass version=None to Datasource.get_data
-            self.data = datasource.get_data(version=version)
+    @property
+    def data(self) -> xr.Dataset:
+        """The data, opened from the object store when first accessed if retrieved lazily."""
+        if self._data is None:
+            self._data = self._open_data()
+        return self._data
 
-            if slice_time:
-                # If slicing by time, this must be sorted along the time dimension
-                if sort is False:
-                    logger.warning(
-                        f"Ignoring sort={sort} input as it is necessary to sort the data when extracting a start and end date range."
-                    )
+    @data.setter
+    def data(self, data: xr.Dataset) -> None:
+        self._data = data
 
-                self.data = self.data.sortby("time")
-                sorted = True
+    def _open_data(self) -> xr.Dataset:
+        """Open the requested version of the data in the Datasource, slicing it to the requested
+        dates and sorting it by time.
 
-                if self.data.time.size > 1:
-                    start_date = start_date - Timedelta("1s")
-                    # TODO: May want to consider this extra 1s subtraction as end_date on data has already has -1s applied.
-                    end_date = end_date - Timedelta("1s")
+        Returns:
+            xarray.Dataset: Data
+        """
+        from openghg.util import timestamp_epoch, timestamp_now
 
-                    # TODO - I feel we should do this in a tider way
-                    start_date = start_date.tz_localize(None)
-                    end_date = end_date.tz_localize(None)
+        if self._uuid is None:
+            raise ValueError("Unable to open data without a UUID.")
 
-                    self.data = self.data.sel(time=slice(start_date, end_date))
-        else:
-            raise ValueError(
-                "Must supply either data or uuid and version, cannot create an empty data object."
-            )
+        start_date = self._start_date
+        end_date = self._end_date
+        sort = self._sort
+
+        slice_time = False
+        if start_date is not None or end_date is not None:
+            slice_time = True
+            if start_date is None:
+                start_date = timestamp_epoch()
+            if end_date is None:
+                end_date = timestamp_now()
+
+        datasource = self._datasource
+        if datasource is None:
+            datasource = get_datasource(bucket=self._bucket, uuid=self._uuid, data_type=self._data_type)
+
+        version = self._version or "latest"  # can't pass version=None to Datasource.get_data
+        data = datasource.get_data(version=version)
+        dim_sizes = {str(k): v for k, v in data.sizes.items()}
+
+        if self._spatial_bounds:
+            # Only the coordinate values are read to find the region
+            names = [name for name in self._spatial_bounds if name in data.coords]
+            data = self._select_region(data, coords=datasource.get_coords(names=names, version=version))
+
+        sorted = False  # Check so we don't sort more than once
+
+        if slice_time:
+            # If slicing by time, this must be sorted along the time dimension
+            if sort is False:
+                logger.warning(
+                    f"Ignoring sort={sort} input as it is necessary to sort the data when extracting a start and end date range."
+                )
+
+            data = data.sortby("time")
+            sorted = True
+
+            if data.time.size > 1:
+                start_date = Timestamp(start_date) - Timedelta("1s")
+                # TODO: May want to consider this extra 1s subtraction as end_date on data has already has -1s applied.
+                end_date = Timestamp(end_date) - Timedelta("1s")
+
+                # TODO - I feel we should do this in a tider way
+                start_date = start_date.tz_localize(None)
+                end_date = end_date.tz_localize(None)
+
+                data = data.sel(time=slice(start_date, end_date))
+
+        datasource.record_access(
+            read_sizes={str(k): v for k, v in data.sizes.items()},
+            dim_sizes=dim_sizes,
+        )
 
         if sort and not sorted:
             try:
-                self.data = self.data.sortby("time")
+                data = data.sortby("time")
             except KeyError:
                 logger.debug("Cannot sort data by time as no time dimension present")
 
+        # The Datasource is no longer needed once the data is open
+        self._datasource = None
+
+        return data
+
+    def _select_region(self, data: xr.Dataset, coords: dict) -> xr.Dataset:
+        """Select the region within the spatial bounds from the data.
+
+        Args:
+            data: Data to select from
+            coords: Values of the coordinates to select along
+        Returns:
+            xarray.Dataset: Data within the spatial bounds
+        """
+        from openghg.util import spatial_index_slices
+
+        slices = spatial_index_slices(coords=coords, bounds=self._spatial_bounds)
+        return data.isel(slices) if slices else data
+
     def __bool__(self) -> bool:
         return bool(self.data)
 
@@ -147,6 +228,7 @@ class _BaseData:
             "ukghg sectors",
             "min_latitude",
             "versions",
+            "summary",
             "processed by",
             "time_resolved",
             "max_longitude",
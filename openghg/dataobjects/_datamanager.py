@@ -1,8 +1,11 @@
 from collections import defaultdict
-from collections.abc import MutableMapping
+from collections.abc import Mapping, MutableMapping
+from concurrent.futures import as_completed, ThreadPoolExecutor
 import copy
 import logging
 
+import pandas as pd
+from rich.progress import Progress
 import zarr
 
 from openghg.objectstore import get_datasource, locking_object_store, LockingObjectStoreType
@@ -12,6 +15,49 @@ from openghg.types import ObjectStoreError
 logger = logging.getLogger("openghg.dataobjects")
 logger.setLevel(logging.DEBUG)  # Have to set level for logger as well as handler
 
+# Columns of the reports returned by the bulk methods of DataManager
+REPORT_COLUMNS = ["uuid", "version", "variable", "key", "action", "current", "new"]
+
+
+def _find_changes(
+    current: Mapping, to_update: dict | None = None, to_delete: list | None = None
+) -> list[dict]:
+    """Find the changes to make to metadata or attributes.
+
+    Keys to delete which aren't present and updates which don't change a value are skipped.
+
+    Args:
+        current: Current metadata or attributes
+        to_update: Dictionary of key/value pairs to add/update
+        to_delete: Keys to delete
+    Returns:
+        list: A dictionary for each change, with the key, action ("add", "update" or "delete"),
+            current value and new value
+    """
+    changes = []
+    for key in to_delete or []:
+        if key in current:
+            changes.append({"key": key, "action": "delete", "current": current[key], "new": None})
+
+    for key, value in (to_update or {}).items():
+        if key not in current or key in (to_delete or []):
+            changes.append({"key": key, "action": "add", "current": None, "new": value})
+        elif current[key] != value:
+            changes.append({"key": key, "action": "update", "current": current[key], "new": value})
+
+    return changes
+
+
+def _apply_changes(current: Mapping, changes: list[dict]) -> dict:
+    """Return a copy of metadata or attributes with the changes from `_find_changes` applied."""
+    updated = dict(current)
+    for change in changes:
+        if change["action"] == "delete":
+            updated.pop(change["key"], None)
+        else:
+            updated[change["key"]] = change["new"]
+    return updated
+
 
 class DataManager:
     def __init__(self, metadata: dict[str, dict], store: str):
@@ -311,6 +357,216 @@ class DataManager:
                 zarr.consolidate_metadata(zs)
                 logger.info(f"Modified attributes for {u}.")
 
+    def bulk_update_metadata(
+        self,
+        uuid: list | str,
+        to_update: dict | None = None,
+        to_delete: str | list | None = None,
+        dry_run: bool = False,
+    ) -> pd.DataFrame:
+        """Update the metadata of many Datasources at once.
+
+        This makes the same changes as `update_metadata`, but updates the metastore records of all
+        the Datasources together, which is much quicker for large numbers of Datasources.
+        Keys to delete are only deleted from the Datasources which have them.
+
+        Args:
+            uuid: UUID(s) of Datasources to be updated.
+            to_update: Dictionary of metadata to add/update. New key/value pairs will be added.
+            If the key already exists in the metadata the value will be updated.
+            to_delete: Key(s) to delete from the metadata
+            dry_run: If True, only report the changes that would be made
+        Returns:
+            pandas.DataFrame: The changes made (or to be made), one row per key of each Datasource
+        """
+        if not isinstance(uuid, list):
+            uuid = [uuid]
+
+        if to_delete is not None and not isinstance(to_delete, list):
+            to_delete = [to_delete]
+
+        dtype = self._check_datatypes(uuid=uuid)
+
+        rows: list[dict] = []
+        with self.objectstore(data_type=dtype) as objstore:
+            to_modify = set(uuid)
+            records = {r["uuid"]: r for r in objstore.metastore.search() if r.get("uuid") in to_modify}
+
+            changes = {}
+            for u in uuid:
+                # The metadata from the search includes values from the Datasource
+                current = {**self.metadata[u], **records[u]}
+                changes[u] = _find_changes(current, to_update, to_delete)
+                rows.extend({"uuid": u, "version": None, "variable": None, **c} for c in changes[u])
+
+            if not dry_run:
+                objstore.update_many(uuids=uuid, metadata=to_update, keys_to_delete=to_delete)
+
+                for u in uuid:
+                    current = {**self.metadata[u], **records[u]}
+
+                    # back up metadata
+                    version = str(len(self._backup[u].keys()) + 1)
+                    self._latest = version
+                    self._backup[u][version] = copy.deepcopy(current)
+
+                    # update DataManager's copy of metadata
+                    self.metadata[u] = copy.deepcopy(_apply_changes(current, changes[u]))
+
+                logger.info(f"Modified metadata for {len(uuid)} Datasources.")
+
+        return pd.DataFrame(rows, columns=REPORT_COLUMNS)
+
+    def bulk_update_attributes(
+        self,
+        uuid: list | str,
+        version: str | list[str] = "latest",
+        data_vars: str | list[str] | None = None,
+        update_global: bool = True,
+        to_update: dict | None = None,
+        to_delete: str | list | None = None,
+        dry_run: bool = False,
+        max_workers: int | None = None,
+        progress: bool = True,
+    ) -> pd.DataFrame:
+        """Update the attributes of the stored Datasets of many Datasources at once.
+
+        This makes the same changes as `update_attributes`, but the zarr stores of the Datasources
+        are updated using a pool of threads. Attributes to delete are only deleted where present.
+
+        Args:
+            uuid: UUID(s) of Datasources to be updated.
+            version: optional version string, or a version for each UUID
+            data_vars: optional list of data vars to update; if None, then only global attributes
+                will be updated.
+            update_global: if True, update global attributes.
+            to_update: Dictionary of attributes to add/update.
+            to_delete: Key(s) to delete from the attributes
+            dry_run: If True, only report the changes that would be made
+            max_workers: Maximum number of threads used to update the zarr stores. Defaults to
+                the concurrent.futures.ThreadPoolExecutor default.
+            progress: If True show a progress bar
+        Returns:
+            pandas.DataFrame: The changes made (or to be made), one row per attribute of each
+                variable (None for global attributes) of each Datasource
+        """
+        if not isinstance(uuid, list):
+            uuid = [uuid]
+
+        if not isinstance(version, list):
+            version = [version] * len(uuid)
+
+        if len(uuid) != len(version):
+            raise ValueError("List passed for 'version' must have same length as 'uuid'.")
+
+        keys_to_delete = [to_delete] if isinstance(to_delete, str) else to_delete
+
+        if data_vars is not None and not isinstance(data_vars, list):
+            data_vars = [data_vars]
+
+        if (to_update is None and to_delete is None) or (update_global is False and data_vars is None):
+            return pd.DataFrame([], columns=REPORT_COLUMNS)
+
+        dtype = self._check_datatypes(uuid=uuid)
+
+        def _update(objstore: LockingObjectStoreType, u: str, v: str) -> list[dict]:
+            d = objstore.get_datasource(u)
+
+            if v == "latest":
+                v = d._latest_version
+
+            d._store._vzds.checkout_version(v)
+            zs = d._store._vzds.store  # zarr store for specified version
+            group = zarr.open_group(zs, mode="r" if dry_run else "r+")
+
+            targets: list[tuple[str | None, MutableMapping]] = []
+            if update_global:
+                targets.append((None, group.attrs))
+            for dv in data_vars or []:
+                if dv in group:
+                    targets.append((dv, group[dv].attrs))
+                else:
+                    logger.warning(f"Data variable {dv} not present in zarr store for {u}. Skipping.")
+
+            rows: list[dict] = []
+            for variable, attrs in targets:
+                changes = _find_changes(attrs, to_update, keys_to_delete)
+                rows.extend({"uuid": u, "version": v, "variable": variable, **c} for c in changes)
+
+                if changes and not dry_run:
+                    # write all the changes to the attributes at once
+                    attrs.put(_apply_changes(attrs.asdict(), changes))  # type: ignore
+
+            if rows and not dry_run:
+                zarr.consolidate_metadata(zs)
+                logger.debug(f"Modified attributes for {u}.")
+
+            return rows
+
+        rows: list[dict] = []
+        with self.objectstore(data_type=dtype) as objstore:
+            with (
+                Progress(disable=not progress) as bar,
+                ThreadPoolExecutor(max_workers=max_workers) as executor,
+            ):
+                description = "Checking attributes" if dry_run else "Updating attributes"
+                task = bar.add_task(description, total=len(uuid))
+
+                futures = [executor.submit(_update, objstore, u, v) for u, v in zip(uuid, version)]
+                for future in as_completed(futures):
+                    rows.extend(future.result())
+                    bar.advance(task)
+
+        if not dry_run:
+            logger.info(f"Modified attributes for {len({r['uuid'] for r in rows})} Datasources.")
+
+        return pd.DataFrame(rows, columns=REPORT_COLUMNS)
+
+    def rechunk(
+        self,
+        uuid: list | str,
+        chunks: dict[str, int] | None = None,
+        max_mem: int = 500,
+        max_chunk_size: int = 300,
+    ) -> None:
+        """Rewrite the latest version of the data of Datasource(s) into a new chunk layout.
+
+        The rechunked data is stored as a new version, and only becomes the latest version once
+        it has been written in full, so the data can still be read while it is being rechunked.
+        The previous version is kept.
+
+        Args:
+            uuid: UUID(s) of Datasources to be rechunked.
+            chunks: Dictionary of dimension name and chunk size, for example {"time": 24}.
+                If None the chunks are suggested from the access statistics recorded for each Datasource
+                (see openghg.store.storage.configure_access_stats).
+            max_mem: Maximum amount of data to hold in memory, in megabytes
+            max_chunk_size: Maximum chunk size in megabytes when suggesting chunks
+        Returns:
+            None
+        """
+        if not isinstance(uuid, list):
+            uuid = [uuid]
+
+        dtype = self._check_datatypes(uuid=uuid)
+
+        with self.objectstore(data_type=dtype) as objstore:
+            for u in uuid:
+                datasource = objstore.get_datasource(u)
+                version = datasource.rechunk(chunks=chunks, max_mem=max_mem, max_chunk_size=max_chunk_size)
+                datasource.save()
+
+                to_update = {
+                    "latest_version": version,
+                    "timestamp": datasource.metadata["timestamp"],
+                    "versions": datasource.metadata["versions"],
+                }
+                if "summary" in datasource.metadata:
+                    to_update["summary"] = datasource.metadata["summary"]
+                objstore.update(uuid=u, metadata=copy.deepcopy(to_update))
+                self.metadata[u].update(copy.deepcopy(to_update))
+                logger.info(f"Rechunked {u}, new version {version}.")
+
     def delete_datasource(self, uuid: list | str) -> None:
         """Delete Datasource(s) in the object store.
         At the moment we only support deleting the complete Datasource.
@@ -332,6 +588,51 @@ class DataManager:
                 objstore.delete(uid)
                 logger.info(f"Deleted Datasource with UUID {uid}.")
 
+    def bulk_delete_datasource(
+        self,
+        uuid: list | str,
+        dry_run: bool = False,
+        max_workers: int | None = None,
+        progress: bool = True,
+    ) -> pd.DataFrame:
+        """Delete many Datasources in the object store.
+
+        The data of the Datasources is deleted using a pool of threads, and their metastore
+        records are deleted together.
+
+        NOTE: Make sure you really want to delete the Datasource(s)
+
+        Args:
+            uuid: UUID(s) of objects to delete
+            dry_run: If True, only report the Datasources that would be deleted
+            max_workers: Maximum number of threads used to delete data. Defaults to
+                the concurrent.futures.ThreadPoolExecutor default.
+            progress: If True show a progress bar
+        Returns:
+            pandas.DataFrame: The Datasources deleted (or to be deleted)
+        """
+        if not isinstance(uuid, list):
+            uuid = [uuid]
+
+        dtype = self._check_datatypes(uuid=uuid)
+
+        rows = [{"uuid": u, "version": None, "variable": None, "key": None, "action": "delete"} for u in uuid]
+        report = pd.DataFrame(rows, columns=REPORT_COLUMNS)
+
+        if dry_run:
+            return report
+
+        with self.objectstore(data_type=dtype) as objstore:
+            with Progress(disable=not progress) as bar:
+                task = bar.add_task("Deleting Datasources", total=len(uuid))
+                objstore.delete_many(uuid, max_workers=max_workers, callback=lambda _: bar.advance(task))
+
+        for u in uuid:
+            self.metadata.pop(u, None)
+        logger.info(f"Deleted {len(uuid)} Datasources.")
+
+        return report
+
 
 def data_manager(data_type: str, store: str, **kwargs: dict) -> DataManager:
     """Lookup the data / metadata you'd like to modify.
@@ -0,0 +1,94 @@
+"""Column-oriented index of the metadata of search results, used to refine them.
+
+Each metadata key is stored as a categorical column of case-folded values, with a row
+per Datasource, so a search term can be matched against all the results using integer
+codes rather than comparing strings record by record. Columns are built the first time
+a key is searched and then kept.
+"""
+
+from collections.abc import Mapping
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["MetadataIndex"]
+
+
+def fold_value(value: Any) -> str | None:
+    """Case-fold a metadata value for comparison.
+
+    Only scalar values can be matched; other values (lists, dictionaries etc) are returned as None.
+
+    Args:
+        value: Metadata value
+    Returns:
+        str or None: Lowercase string of value
+    """
+    if isinstance(value, (str, int, float, bool, np.number)):
+        return str(value).lower()
+    return None
+
+
+class MetadataIndex:
+    """Categorical columns of the case-folded metadata of search results.
+
+    Args:
+        metadata: Dictionary of metadata keyed by Datasource UUID
+    """
+
+    def __init__(self, metadata: Mapping[str, Mapping]) -> None:
+        self.uuids = np.array(list(metadata), dtype=object)
+        self._records = [{str(k).lower(): v for k, v in m.items()} for m in metadata.values()]
+        self._columns: dict[str, pd.Categorical] = {}
+
+    def __len__(self) -> int:
+        return len(self.uuids)
+
+    def column(self, key: str) -> pd.Categorical:
+        """Case-folded values of a metadata key, with NaN where a record doesn't have the key.
+
+        Args:
+            key: Metadata key
+        Returns:
+            pandas.Categorical: Column of values
+        """
+        key = key.lower()
+        if key not in self._columns:
+            self._columns[key] = pd.Categorical([fold_value(r.get(key)) for r in self._records])
+        return self._columns[key]
+
+    def mask(self, **terms: Any) -> np.ndarray:
+        """Find the results matching all the given terms.
+
+        A value may be a list or tuple, in which case results matching any of its items match.
+        Terms with value None are ignored.
+
+        Args:
+            terms: Metadata keys and values to match, case insensitively
+        Returns:
+            numpy.ndarray: Boolean array, True for each matching result
+        """
+        mask = np.ones(len(self), dtype=bool)
+
+        for key, value in terms.items():
+            if value is None:
+                continue
+
+            values = value if isinstance(value, (list, tuple)) else [value]
+            column = self.column(key)
+
+            codes = column.categories.get_indexer([str(v).lower() for v in values])
+            mask &= np.isin(column.codes, codes[codes >= 0])
+
+        return mask
+
+    def select(self, **terms: Any) -> list[str]:
+        """UUIDs of the results matching all the given terms, see `mask`.
+
+        Args:
+            terms: Metadata keys and values to match, case insensitively
+        Returns:
+            list: UUIDs, in the order of the results
+        """
+        return list(self.uuids[self.mask(**terms)])
@@ -1,6 +1,8 @@
 from ._basedata import _BaseData
-from openghg.plotting import plot_timeseries as general_plot_timeseries
-import plotly.graph_objects as go
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 __all__ = ["ObsColumnData"]
 
@@ -23,8 +25,9 @@ class ObsColumnData(_BaseData):
         ylabel: str | None = None,
         units: str | None = None,
         logo: bool | None = True,
-    ) -> go.Figure:
+    ) -> "go.Figure":
         """Plot a timeseries"""
+        from openghg.plotting import plot_timeseries as general_plot_timeseries
 
         return general_plot_timeseries(
             data=self,
@@ -1,9 +1,10 @@
 from ._basedata import _BaseData
-from openghg.plotting import plot_timeseries as general_plot_timeseries
-import plotly.graph_objects as go
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from collections.abc import Iterator
 
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
 
 class ObsData(_BaseData):
     """This class is used to return observations data. It be created with a preloaded xarray Dataset or
@@ -61,8 +62,9 @@ class ObsData(_BaseData):
         ylabel: str | None = None,
         units: str | None = None,
         logo: bool | None = True,
-    ) -> go.Figure:
+    ) -> "go.Figure":
         """Plot a timeseries"""
+        from openghg.plotting import plot_timeseries as general_plot_timeseries
 
         return general_plot_timeseries(
             data=self,
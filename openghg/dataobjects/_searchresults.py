@@ -1,9 +1,13 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from typing import Any, TypeVar
-from collections.abc import Iterable
 
 from openghg.dataobjects import ObsData
-from pandas import DataFrame
+from openghg.dataobjects._metadata_index import MetadataIndex
+from openghg.objectstore import Datasource
+from pandas import DataFrame, Timestamp
 
 __all__ = ["SearchResults"]
 
@@ -23,7 +27,6 @@ class SearchResults:
         start_result: ?
     """
 
-    # TODO - WIP move to tinydb metadata lookup to simplify code
     def __init__(
         self,
         metadata: dict | None = None,
@@ -31,33 +34,48 @@ class SearchResults:
         start_date: str | None = None,
         end_date: str | None = None,
     ):
-        # db = tinydb.TinyDB(tinydb.storages.MemoryStorage)
-        if metadata is not None:
-            self.metadata = metadata
-            # db.insert_multiple([m for m in metadata.values()])
-            self.results = (
-                DataFrame.from_dict(data=metadata, orient="index").reset_index().drop(columns="index")
-            )
+        self.metadata = metadata if metadata is not None else {}
 
-            if start_result is not None:
-                for uuid_key, uuid_metadata in metadata.items():
-                    if start_result in uuid_metadata:
-                        other_keys = list(uuid_metadata.keys())
-                        other_keys.remove(start_result)
-                        reorder = [start_result] + other_keys
-                        metadata[uuid_key] = {key: uuid_metadata[key] for key in reorder}
+        if start_result is not None:
+            for uuid_key, uuid_metadata in self.metadata.items():
+                if start_result in uuid_metadata:
+                    other_keys = list(uuid_metadata.keys())
+                    other_keys.remove(start_result)
+                    reorder = [start_result] + other_keys
+                    self.metadata[uuid_key] = {key: uuid_metadata[key] for key in reorder}
 
-        else:
-            self.results = {}  # type: ignore
-            self.metadata = {}
+        # The index used to refine results and the results DataFrame are created when first needed
+        self._index: MetadataIndex | None = None
+        self._results: DataFrame | None = None
 
         self._start_date = start_date
         self._end_date = end_date
 
+    @property
+    def results(self) -> DataFrame:
+        """DataFrame of the metadata of each result."""
+        if self._results is None:
+            if self.metadata:
+                self._results = (
+                    DataFrame.from_dict(data=self.metadata, orient="index")
+                    .reset_index()
+                    .drop(columns="index")
+                )
+            else:
+                self._results = DataFrame()
+        return self._results
+
+    @property
+    def metadata_index(self) -> MetadataIndex:
+        """Index of the metadata of the results, used by `filter`."""
+        if self._index is None:
+            self._index = MetadataIndex(self.metadata)
+        return self._index
+
     def __str__(self) -> str:
         SearchResults.df_to_table_console_output(df=DataFrame.from_dict(data=self.metadata))
 
-        return f"Found {len(self.results)} results.\nView the results DataFrame using the results property."
+        return f"Found {len(self)} results.\nView the results DataFrame using the results property."
 
     def __repr__(self) -> str:
         return self.__str__()
@@ -76,6 +94,9 @@ class SearchResults:
         dataframe: DataFrame | None = None,
         version: str = "latest",
         sort: bool = True,
+        lazy: bool = False,
+        max_workers: int | None = None,
+        spatial_bounds: dict[str, tuple[float, float]] | None = None,
         **kwargs: Any,
     ) -> ObsData | list[ObsData]:
         """Retrieve data from object store using a filtered pandas DataFrame
@@ -84,30 +105,66 @@ class SearchResults:
             dataframe: pandas DataFrame
             version: Version of data requested from Datasource. Default = "latest".
             sort: Sort data by time in retrieved Dataset
+            lazy: If True, the data is only opened (and sorted) when the `data` attribute
+                of each ObsData object is first accessed
+            max_workers: Maximum number of threads used to open Datasources. Defaults to
+                the concurrent.futures.ThreadPoolExecutor default.
+            spatial_bounds: Minimum and maximum values of the "lat" and / or "lon" coordinates to
+                select, only the data within these is read. See `openghg.util.get_spatial_bounds`.
             **kwargs: Metadata values to search for
         Returns:
             ObsData / List[ObsData]: ObsData object(s)
         """
         if dataframe is not None:
             uuids = dataframe["uuid"].to_list()
-            return self._retrieve_by_uuid(uuids=uuids, version=version, sort=sort)
+            return self._retrieve_by_uuid(
+                uuids=uuids,
+                version=version,
+                sort=sort,
+                lazy=lazy,
+                max_workers=max_workers,
+                spatial_bounds=spatial_bounds,
+            )
         else:
-            return self._retrieve_by_term(version=version, sort=sort, **kwargs)
+            return self._retrieve_by_term(
+                version=version,
+                sort=sort,
+                lazy=lazy,
+                max_workers=max_workers,
+                spatial_bounds=spatial_bounds,
+                **kwargs,
+            )
 
     def retrieve_all(
         self,
         version: str = "latest",
         sort: bool = True,
+        lazy: bool = False,
+        max_workers: int | None = None,
+        spatial_bounds: dict[str, tuple[float, float]] | None = None,
     ) -> ObsData | list[ObsData]:
         """Retrieves all data found during the search
 
         Args:
             version: Version of data requested from Datasource. Default = "latest".
             sort: Sort by time. Note that this may be very memory hungry for large Datasets.
+            lazy: If True, the data is only opened (and sorted) when the `data` attribute
+                of each ObsData object is first accessed
+            max_workers: Maximum number of threads used to open Datasources. Defaults to
+                the concurrent.futures.ThreadPoolExecutor default.
+            spatial_bounds: Minimum and maximum values of the "lat" and / or "lon" coordinates to
+                select, only the data within these is read. See `openghg.util.get_spatial_bounds`.
         Returns:
             ObsData / List[ObsData]: ObsData object(s)
         """
-        return self._retrieve_by_uuid(uuids=self.metadata.keys(), version=version, sort=sort)
+        return self._retrieve_by_uuid(
+            uuids=self.metadata.keys(),
+            version=version,
+            sort=sort,
+            lazy=lazy,
+            max_workers=max_workers,
+            spatial_bounds=spatial_bounds,
+        )
 
     def uuids(self) -> list:
         """Return the UUIDs of the found data
@@ -117,7 +174,121 @@ class SearchResults:
         """
         return list(self.metadata.keys())
 
-    def _retrieve_by_term(self, version: str, sort: bool = True, **kwargs: Any) -> ObsData | list[ObsData]:
+    def filter(self, **kwargs: Any) -> "SearchResults":
+        """Narrow the results to those whose metadata matches all of the given values.
+        The object store isn't searched again.
+
+        Values are matched case insensitively, and a list of values matches any of them, e.g.
+
+            >>> results.filter(site="tac", inlet=["100m", "185m"])
+
+        Args:
+            **kwargs: Metadata keys and values to match; values of None are ignored
+        Returns:
+            SearchResults: Matching results
+        """
+        uuids = self.metadata_index.select(**kwargs)
+        metadata = {uuid: self.metadata[uuid] for uuid in uuids}
+        return SearchResults(metadata=metadata, start_date=self._start_date, end_date=self._end_date)
+
+    def summaries(self, variable: str | None = None) -> DataFrame:
+        """Summary statistics of the data found, as recorded when the data was stored.
+        No stored data is read.
+
+        Args:
+            variable: Only include this data variable, e.g. "ch4"
+        Returns:
+            pandas.DataFrame: Number of valid and NaN values, minimum, maximum and mean of each
+            variable, with a row per UUID and variable
+        """
+        columns = ["uuid", "variable", "count", "nan_count", "min", "max", "mean"]
+
+        rows = []
+        for uuid, metadata in self.metadata.items():
+            for name, stats in metadata.get("summary", {}).items():
+                if variable is not None and name != variable:
+                    continue
+                rows.append([uuid, name] + [stats[key] for key in columns[2:]])
+
+        return DataFrame(rows, columns=columns)
+
+    def filter_summary(
+        self,
+        variable: str,
+        above: float | None = None,
+        below: float | None = None,
+        min_count: int = 1,
+        start_date: str | Timestamp | None = None,
+        end_date: str | Timestamp | None = None,
+    ) -> "SearchResults":
+        """Narrow the results using the summary statistics recorded when the data was stored.
+        The statistics for each month are read from the summary stored with the data, no stored
+        data is read.
+
+        The statistics are recorded for each month, so values and dates are matched to whole
+        months: a month is counted if any part of it is between `start_date` and `end_date` and
+        it has any value above `above` and any value below `below`. For example, to find data
+        with CH4 above 2100 ppb in 2023
+
+            >>> results.filter_summary(variable="ch4", above=2100, start_date="2023-01-01", end_date="2024-01-01")
+
+        Data stored before summaries were recorded has no summary and is not included.
+
+        Args:
+            variable: Name of data variable, e.g. "ch4"
+            above: Only count months with values greater than this
+            below: Only count months with values less than this
+            min_count: Minimum number of valid values in the months counted
+            start_date: Start of date range
+            end_date: End of date range (exclusive)
+        Returns:
+            SearchResults: Results with at least `min_count` valid values in the months counted
+        """
+        from openghg.objectstore._summary import summary_matches
+
+        metadata = {}
+        for uuid, uuid_metadata in self.metadata.items():
+            stats = uuid_metadata.get("summary", {}).get(variable)
+            if stats is None:
+                continue
+
+            if "months" not in stats:
+                stats = self._stored_summary(uuid).get(variable, stats)
+
+            if summary_matches(
+                stats, above=above, below=below, min_count=min_count, start_date=start_date, end_date=end_date
+            ):
+                metadata[uuid] = uuid_metadata
+
+        return SearchResults(metadata=metadata, start_date=self._start_date, end_date=self._end_date)
+
+    def _stored_summary(self, uuid: str) -> dict[str, dict]:
+        """Read the summary stored with the latest version of the data for a UUID.
+
+        Args:
+            uuid: UUID of Datasource
+        Returns:
+            dict: Summary of the data, empty if no summary is stored
+        """
+        from openghg.store.storage import LocalZarrStore
+
+        bucket = self.metadata[uuid].get("object_store")
+        version = self.metadata[uuid].get("latest_version")
+        if not bucket or not version:
+            return {}
+
+        summary = LocalZarrStore(bucket=bucket, datasource_uuid=uuid, mode="r").get_summary(version=version)
+        return summary or {}
+
+    def _retrieve_by_term(
+        self,
+        version: str,
+        sort: bool = True,
+        lazy: bool = False,
+        max_workers: int | None = None,
+        spatial_bounds: dict[str, tuple[float, float]] | None = None,
+        **kwargs: Any,
+    ) -> ObsData | list[ObsData]:
         """Retrieve data from the object store by search term. This function scans the
         metadata of the retrieved results, retrieves the UUID associated with that data,
         pulls it from the object store, recombines it into an xarray Dataset and returns
@@ -126,50 +297,51 @@ class SearchResults:
         Args:
             version: Version of data requested from Datasource. Default = "latest".
             sort: Sort by time. Note that this may be very memory hungry for large Datasets.
+            lazy: If True, the data is only opened when first accessed
+            max_workers: Maximum number of threads used to open Datasources
+            spatial_bounds: Minimum and maximum values of the "lat" and / or "lon" coordinates to select
             **kwargs: Metadata values to search for
         """
-        uuids = set()
-        # Make sure we don't have any Nones
-        clean_kwargs = {k: v for k, v in kwargs.items() if v is not None}
-
-        for uid, metadata in self.metadata.items():
-            n_required = len(clean_kwargs)
-            n_matched = 0
-            for key, value in clean_kwargs.items():
-                try:
-                    # Here we want to check if it's a list and if so iterate over it
-                    if isinstance(value, (list, tuple)):
-                        for val in value:
-                            val = str(val).lower()
-                            if metadata[key.lower()] == val:
-                                n_matched += 1
-                                break
-                    else:
-                        value = str(value).lower()
-                        if metadata[key.lower()] == value:
-                            n_matched += 1
-                except KeyError:
-                    pass
-
-            if n_matched == n_required:
-                uuids.add(uid)
+        uuids = self.metadata_index.select(**kwargs)
 
         # Now we can retrieve the data using the UUIDs
-        return self._retrieve_by_uuid(uuids=list(uuids), version=version, sort=sort)
-
-    def _retrieve_by_uuid(self, uuids: Iterable, version: str, sort: bool = True) -> ObsData | list[ObsData]:
+        return self._retrieve_by_uuid(
+            uuids=uuids,
+            version=version,
+            sort=sort,
+            lazy=lazy,
+            max_workers=max_workers,
+            spatial_bounds=spatial_bounds,
+        )
+
+    def _retrieve_by_uuid(
+        self,
+        uuids: Iterable,
+        version: str,
+        sort: bool = True,
+        lazy: bool = False,
+        max_workers: int | None = None,
+        spatial_bounds: dict[str, tuple[float, float]] | None = None,
+    ) -> ObsData | list[ObsData]:
         """Internal retrieval function that uses the passed in UUIDs to retrieve
         the keys from the key_data dictionary, pull the data from the object store,
         create ObsData object(s) and return the result.
 
+        The Datasources are loaded concurrently, opening each object store once. Unless
+        `lazy` is True the data is then opened concurrently too.
+
         Args:
             uuids: UUIDs of Datasources in the object store
             version: Version of data requested from Datasource. Default = "latest".
             sort: Sort by time. Note that this may be very memory hungry for large Datasets.
+            lazy: If True, the data is only opened when first accessed
+            max_workers: Maximum number of threads used to open Datasources
+            spatial_bounds: Minimum and maximum values of the "lat" and / or "lon" coordinates to select
         Returns:
             ObsData / List[ObsData]: ObsData object(s)
         """
-        results = []
+        uuids = list(uuids)
+        versions = {}
         for uuid in uuids:
             metadata = self.metadata[uuid]
             if version == "latest":
@@ -181,22 +353,60 @@ class SearchResults:
                         f"Invalid version {version} for UUID {uuid} possible versions: {possible_versions}"
                     )
                 version_to_use = version
-            results.append(
-                ObsData(
+            versions[uuid] = version_to_use
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            datasources = self._load_datasources(uuids=uuids, executor=executor)
+
+            def to_obsdata(uuid: str) -> ObsData:
+                return ObsData(
                     uuid=uuid,
-                    version=version_to_use,
-                    metadata=metadata,
+                    version=versions[uuid],
+                    metadata=self.metadata[uuid],
                     start_date=self._start_date,
                     end_date=self._end_date,
                     sort=sort,
+                    datasource=datasources.get(uuid),
+                    lazy=lazy,
+                    spatial_bounds=spatial_bounds,
                 )
-            )
+
+            if lazy:
+                results = [to_obsdata(uuid) for uuid in uuids]
+            else:
+                results = list(executor.map(to_obsdata, uuids))
 
         if len(results) == 1:
             return results[0]
         else:
             return results
 
+    def _load_datasources(self, uuids: list[str], executor: ThreadPoolExecutor) -> dict[str, Datasource]:
+        """Load the Datasources for the given UUIDs, opening the object store for each
+        bucket and data type once and reading the Datasources concurrently.
+
+        Args:
+            uuids: UUIDs of Datasources
+            executor: Thread pool to read the Datasources with
+        Returns:
+            dict: Datasources keyed by UUID. UUIDs without a known bucket and data type are left
+            out and their Datasources will be found when the data is opened.
+        """
+        from openghg.objectstore import open_object_store
+
+        groups = defaultdict(list)
+        for uuid in uuids:
+            metadata = self.metadata[uuid]
+            if "object_store" in metadata and "data_type" in metadata:
+                groups[(metadata["object_store"], metadata["data_type"])].append(uuid)
+
+        datasources: dict[str, Datasource] = {}
+        for (bucket, data_type), group in groups.items():
+            with open_object_store(bucket=bucket, data_type=data_type, mode="r") as objstore:
+                datasources.update(zip(group, executor.map(objstore.get_datasource, group)))
+
+        return datasources
+
     @staticmethod
     def df_to_table_console_output(df: DataFrame) -> None:
         """
@@ -1,14 +1,33 @@
-from ._file_structure import (
-    define_stored_data_filename,
-    define_full_obspack_filename,
-    define_obspack_name,
-)
-from ._obspack import (
-    StoredData,
-    ObsPack,
-    retrieve_data,
-    create_obspack,
-)
-from ._specification import (
-    define_obs_types,
+from typing import TYPE_CHECKING
+
+from openghg._lazy import lazy_exports
+
+# Attributes are imported from their submodules on first access, see openghg._lazy
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "._file_structure": [
+            "define_stored_data_filename",
+            "define_full_obspack_filename",
+            "define_obspack_name",
+        ],
+        "._obspack": ["StoredData", "ObsPack", "retrieve_data", "create_obspack"],
+        "._specification": ["define_obs_types"],
+    },
 )
+
+if TYPE_CHECKING:
+    from ._file_structure import (
+        define_stored_data_filename,
+        define_full_obspack_filename,
+        define_obspack_name,
+    )
+    from ._obspack import (
+        StoredData,
+        ObsPack,
+        retrieve_data,
+        create_obspack,
+    )
+    from ._specification import (
+        define_obs_types,
+    )
@@ -13,6 +13,7 @@ The default obspack will also contain:
 Default overall obspack structure:
 {obspack_name}/
     obspack_README.md
+    obspack_manifest.json
     site_index_details*.txt
     surface-insitu/
         {species}_{site}_{inlet}_surface-insitu_{data_version}.nc
@@ -22,12 +23,20 @@ Key functions:
  - define_full_obspack_filename() - defines the full output filename for each file based on naming convention
  - retrieve_data() - retrieve data from an object store search terms (currently from a config file)
  - create_obspack() - this is the summary function for creating an obspack
+
+The manifest (obspack_manifest.json) records the source UUID, data version and a hash of the
+source details (metadata and a digest of the stored data) for each file. When a new obspack is
+created, the most recent manifest within the output folder is found and files whose source details
+have not changed are copied across rather than being written again.
 """
 
+import hashlib
+import json
 import numpy as np
 import pandas as pd
 import shutil
 import pathlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from typing import Sequence, cast
@@ -35,7 +44,15 @@ import logging
 
 from openghg.dataobjects import ObsData, ObsColumnData
 from openghg.types import pathType
-from openghg.util import check_unique, find_repeats, collate_strings, openghg_data_path
+from openghg.util import (
+    check_unique,
+    find_repeats,
+    collate_strings,
+    hash_file,
+    hash_string,
+    openghg_data_path,
+    timestamp_now,
+)
 
 from ._file_structure import (
     find_current_obspacks,
@@ -56,6 +73,8 @@ logger = logging.getLogger("openghg.obspack")
 # TODO: Perhaps move away from the overall type definitions being in classes? (openghg.types._enum.py)
 ObsOutputType = ObsData | ObsColumnData
 
+MANIFEST_FILENAME = "obspack_manifest.json"
+
 
 class StoredData:
     """
@@ -299,6 +318,75 @@ class StoredData:
 
         return params
 
+    def content_digest(self) -> str:
+        """
+        Digest of the data content. For data retrieved from an object store this is
+        based on the stored zarr store for the data version: the consolidated metadata and the
+        name, size and modification time of each stored file, so data changed in place is detected
+        without reading it. Otherwise the values of the data are hashed.
+
+        Returns:
+            str: SHA-1 digest
+        """
+        from openghg.store.storage import LocalZarrStore
+        from openghg.types import ZarrStoreError
+
+        bucket = self.metadata.get("object_store")
+        uuid = self.metadata.get("uuid")
+
+        if bucket and uuid and self.data_version:
+            try:
+                store_path = LocalZarrStore(bucket=bucket, datasource_uuid=uuid, mode="r").store_path(
+                    self.data_version
+                )
+            except ZarrStoreError:
+                store_path = None
+
+            if store_path is not None and (store_path / ".zmetadata").exists():
+                digest = hashlib.sha1((store_path / ".zmetadata").read_bytes())
+                for filepath in sorted(store_path.rglob("*")):
+                    if filepath.is_file():
+                        stat = filepath.stat()
+                        relative = filepath.relative_to(store_path).as_posix()
+                        digest.update(f"{relative}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+                return digest.hexdigest()
+
+        digest = hashlib.sha1()
+        for name in sorted(map(str, self.data.variables)):
+            values = np.ascontiguousarray(self.data[name].values)
+            digest.update(name.encode())
+            if values.dtype.hasobject:
+                digest.update(json.dumps(values.tolist(), default=str).encode())
+            else:
+                digest.update(values.tobytes())
+        return digest.hexdigest()
+
+    def source_details(self) -> dict:
+        """
+        Details of the source data to record within the obspack manifest. This includes
+        a hash of the metadata, data attributes, data version and data content (see content_digest())
+        which is used to decide whether a file written for a previous obspack can be reused.
+
+        Returns:
+            dict: Source details containing "uuid", "data_version" and "source_hash" keys
+        """
+        metadata = {key: value for key, value in self.metadata.items() if key != "file_created"}
+        attrs = {key: value for key, value in self.data.attrs.items() if key != "file_created"}
+
+        to_hash = {
+            "metadata": metadata,
+            "attrs": attrs,
+            "data_version": self.data_version,
+            "content": self.content_digest(),
+        }
+        source_hash = hash_string(json.dumps(to_hash, sort_keys=True, default=str))
+
+        return {
+            "uuid": self.metadata.get("uuid"),
+            "data_version": self.data_version,
+            "source_hash": source_hash,
+        }
+
     def write(
         self,
         obspack_name: str | None = None,
@@ -486,6 +574,7 @@ class ObsPack:
         search_df: pd.DataFrame | None = None,
         store: str | None = None,
         subfolders: MultiSubFolder | None = None,
+        max_workers: int = 1,
     ) -> list:
         """
         Use search parameters to get data from object store. This expects either a filename for an input
@@ -501,11 +590,14 @@ class ObsPack:
              - no subfolder(s) - pass empty string
              - one subfolder for all files - pass a string
              - dictionary of subfolders per obs_type.
+            max_workers: Number of worker threads to use to retrieve the data. Default = 1.
         Returns:
             list [StoredData]: List of extracted data from the object store based on search parameters
         """
 
-        retrieved_data = retrieve_data(filename=filename, search_df=search_df, store=store)
+        retrieved_data = retrieve_data(
+            filename=filename, search_df=search_df, store=store, max_workers=max_workers
+        )
 
         self.retrieved_data = retrieved_data
 
@@ -802,25 +894,205 @@ class ObsPack:
 
         output_file.close()
 
+    def define_manifest_path(self, obspack_path: pathType | None = None) -> Path:
+        """
+        Define the path to the manifest file for an obspack.
+
+        Args:
+            obspack_path: Path to the obspack folder. If not specified, the path for this
+                ObsPack will be used (see define_obspack_path()).
+        Returns:
+            Path: Path to the manifest file
+        """
+        if obspack_path is None:
+            obspack_path = self.define_obspack_path()
+        return Path(obspack_path) / MANIFEST_FILENAME
+
+    def read_manifest(self, obspack_path: pathType | None = None) -> dict:
+        """
+        Read the manifest file for an obspack. See write_manifest() for the structure of this file.
+
+        Args:
+            obspack_path: Path to the obspack folder. If not specified, the path for this
+                ObsPack will be used (see define_obspack_path()).
+        Returns:
+            dict: Contents of the manifest or an empty dictionary if this is not present.
+        """
+        manifest_path = self.define_manifest_path(obspack_path)
+
+        if not manifest_path.exists():
+            return {}
+
+        manifest: dict = json.loads(manifest_path.read_text())
+        return manifest
+
+    def find_previous_obspack(self) -> Path | None:
+        """
+        Find the obspack to reuse unchanged files from when no previous obspack is given.
+        This is this obspack if it already contains a manifest, otherwise the obspack within the
+        output folder with the most recently created manifest.
+
+        Files are only reused if their source details match those in the manifest, so any
+        previous obspack can be used safely.
+
+        Returns:
+            Path | None: Path to the previous obspack folder or None if no manifest was found.
+        """
+        obspack_path = self.define_obspack_path()
+        if self.define_manifest_path(obspack_path).exists():
+            return obspack_path
+
+        candidates = []
+        for manifest_path in self.output_folder.glob(f"*/{MANIFEST_FILENAME}"):
+            try:
+                created = json.loads(manifest_path.read_text()).get("created", "")
+            except (OSError, ValueError):
+                continue
+            candidates.append((str(created), manifest_path.parent))
+
+        if not candidates:
+            return None
+
+        previous_path = max(candidates)[1]
+        logger.info(f"Using manifest of previous obspack {previous_path}")
+        return previous_path
+
+    def write_manifest(self, files: dict[str, dict]) -> Path:
+        """
+        Write the manifest file for the obspack. This contains:
+            - "obspack_name", "version" and "created" details for the obspack
+            - "files" - for each file path (relative to the obspack folder), the source "uuid",
+              "data_version", "source_hash" and the "file_hash" of the written file.
+
+        Args:
+            files: Manifest entries for each file within the obspack
+        Returns:
+            Path: Path to the manifest file
+        """
+        manifest = {
+            "obspack_name": self.obspack_name,
+            "version": self.version,
+            "created": str(timestamp_now()),
+            "files": dict(sorted(files.items())),
+        }
+
+        manifest_path = self.define_manifest_path()
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps(manifest, indent=4, default=str))
+
+        return manifest_path
+
+    def write_stored_data(
+        self, max_workers: int = 1, previous_obspack: pathType | None = None
+    ) -> dict[str, dict]:
+        """
+        Write the retrieved data to the obspack folder.
+
+        Files are only written if the source details (see StoredData.source_details()) differ from those
+        recorded in the manifest of the previous obspack. Unchanged files are copied from the previous
+        obspack or, if the previous obspack is this obspack, left in place.
+
+        Args:
+            max_workers: Number of worker threads to use to write files. Each worker loads one
+                dataset at a time so this also limits how many datasets are held in memory.
+                Default = 1.
+            previous_obspack: Path to a previous obspack to reuse unchanged files from. If not specified,
+                this is found within the output folder, see find_previous_obspack().
+        Returns:
+            dict: Manifest entries for each file, keyed by the file path relative to the obspack folder.
+        """
+        retrieved_data = self.check_retrieved_data()
+
+        obspack_path = self.define_obspack_path()
+        if previous_obspack is not None:
+            previous_path = Path(previous_obspack)
+        else:
+            previous_path = self.find_previous_obspack() or obspack_path
+        previous_files: dict[str, dict] = self.read_manifest(previous_path).get("files", {})
+
+        in_place = previous_path.resolve() == obspack_path.resolve()
+
+        files = {}
+        to_write = []
+        for data in retrieved_data:
+            output_filename = data.define_full_path(
+                obspack_name=self.obspack_name, output_folder=self.output_folder
+            )
+            key = output_filename.relative_to(obspack_path).as_posix()
+            entry = data.source_details()
+
+            previous_entry = previous_files.get(key)
+            previous_filename = previous_path / key
+
+            if (
+                previous_entry is not None
+                and previous_entry.get("source_hash") == entry["source_hash"]
+                and previous_filename.exists()
+            ):
+                if not in_place:
+                    output_filename.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copy2(previous_filename, output_filename)
+                entry["file_hash"] = previous_entry.get("file_hash")
+                files[key] = entry
+            else:
+                to_write.append((key, output_filename, data, entry))
+
+        def _write(key: str, output_filename: Path, data: StoredData, entry: dict) -> tuple[str, dict]:
+            data.write(obspack_name=self.obspack_name, output_folder=self.output_folder)
+            entry["file_hash"] = hash_file(output_filename)
+            return key, entry
+
+        logger.info(
+            f"Writing {len(to_write)} file(s) to obspack, reusing {len(files)} unchanged file(s) from {previous_path}"
+        )
+
+        if max_workers > 1 and len(to_write) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                written = list(executor.map(lambda args: _write(*args), to_write))
+        else:
+            written = [_write(*args) for args in to_write]
+
+        files.update(dict(written))
+
+        # Remove any files from a previous write of this obspack which are no longer included
+        if in_place:
+            for key in set(previous_files) - set(files):
+                stale_filename = obspack_path / key
+                if stale_filename.exists():
+                    logger.info(f"Removing file no longer included in obspack: {stale_filename}")
+                    stale_filename.unlink()
+
+        return files
+
     def write(
         self,
         include_release_files: bool = True,
         release_files: Sequence | None = None,
         include_site_index: bool = True,
         site_index_filename: pathType | None = None,
+        max_workers: int = 1,
+        previous_obspack: pathType | None = None,
     ) -> None:
         """
         Write constructed ObsPack to disc.
         Currently this will write:
-            - retrieved_data
+            - retrieved_data (see write_stored_data())
             - release files
             - site index file
+            - manifest file
 
+        Args:
+            include_release_files: Whether to include release files. Default = True.
+            release_files: Release files to include. See default_release_files() for defaults.
+            include_site_index: Whether to include the site index file. Default = True.
+            site_index_filename: Filename for the site index file.
+            max_workers: Number of worker threads to use to write files. Default = 1.
+            previous_obspack: Path to a previous obspack to reuse unchanged files from.
+                If not specified, this is found within the output folder, see find_previous_obspack().
+        Returns:
+            None
         """
-        retrieved_data = self.check_retrieved_data()
-
-        for data in retrieved_data:
-            data.write(obspack_name=self.obspack_name, output_folder=self.output_folder)
+        files = self.write_stored_data(max_workers=max_workers, previous_obspack=previous_obspack)
 
         if include_release_files:
             if release_files is not None:
@@ -839,6 +1111,8 @@ class ObsPack:
                 site_index_filename = f"site_index_details_{self.version}.txt"
             self.write_site_index_file(site_index_filename)
 
+        self.write_manifest(files)
+
 
 def read_input_file(filename: pathType) -> pd.DataFrame:
     """
@@ -864,8 +1138,49 @@ def read_input_file(filename: pathType) -> pd.DataFrame:
     return search_df
 
 
+def _retrieve_stored_data(
+    kwargs: dict, obs_type: str, get_functions: dict, get_fn_arguments: dict, store: str | None = None
+) -> StoredData:
+    """
+    Retrieve data from the object store for one set of search parameters.
+
+    Args:
+        kwargs: Search parameters for this data
+        obs_type: Observation type associated with this data (see define_obs_types())
+        get_functions, get_fn_arguments: Outputs from define_get_functions()
+        store: Name of specific object store to use to search for data
+    Returns:
+        StoredData: Data extracted from the object store
+    """
+    get_fn = get_functions[obs_type]
+    additional_fn_arguments = get_fn_arguments[get_fn]
+
+    if store:
+        kwargs["store"] = store
+
+    # TODO: Update to a more robust check (may be code to already do this?)
+    if "-" in kwargs["inlet"]:
+        start, end = kwargs["inlet"].split("-")
+        kwargs["inlet"] = slice(start, end)
+
+    # Remove any NaN entries
+    # TODO: Decide how this could work with negative lookup?
+    kwargs = {key: value for key, value in kwargs.items() if not pd.isnull(value)}
+
+    # Pass any additional arguments needed for the get/search function
+    kwargs = kwargs | additional_fn_arguments
+
+    # TODO: Decide details around catching errors for no files/multi files found.
+    data_retrieved = get_fn(**kwargs)
+
+    return StoredData(data_retrieved, obs_type=obs_type)
+
+
 def retrieve_data(
-    filename: pathType | None = None, search_df: pd.DataFrame | None = None, store: str | None = None
+    filename: pathType | None = None,
+    search_df: pd.DataFrame | None = None,
+    store: str | None = None,
+    max_workers: int = 1,
 ) -> list:
     """
     Use search parameters to get data from object store. This expects either a filename for an input
@@ -876,8 +1191,10 @@ def retrieve_data(
         filename: Filename containing search parameters.
         search_df: pandas DataFrame containing search parameters
         store: Name of specific object store to use to search for data
+        max_workers: Number of worker threads to use to retrieve the data. Default = 1.
     Returns:
-        list [StoredData]: List of extracted data from the object store based on search parameters
+        list [StoredData]: List of extracted data from the object store based on search parameters.
+            This is in the same order as the search parameters.
     """
 
     if filename:
@@ -898,36 +1215,20 @@ def retrieve_data(
 
     get_functions, get_fn_arguments = define_get_functions()
 
-    data_object_all = []
+    search_rows = []
     for i, row in search_df.iterrows():
-        obs_type = row[obs_type_name]
-        get_fn = get_functions[obs_type]
-        additional_fn_arguments = get_fn_arguments[get_fn]
-
         kwargs = row.to_dict()
-        kwargs.pop(obs_type_name)
-
-        if store:
-            kwargs["store"] = store
-
-        # TODO: Update to a more robust check (may be code to already do this?)
-        if "-" in kwargs["inlet"]:
-            start, end = kwargs["inlet"].split("-")
-            kwargs["inlet"] = slice(start, end)
-
-        # Remove any NaN entries
-        # TODO: Decide how this could work with negative lookup?
-        kwargs = {key: value for key, value in kwargs.items() if not pd.isnull(value)}
-
-        # Pass any additional arguments needed for the get/search function
-        kwargs = kwargs | additional_fn_arguments
-
-        # TODO: Decide details around catching errors for no files/multi files found.
-        data_retrieved = get_fn(**kwargs)
+        obs_type = kwargs.pop(obs_type_name)
+        search_rows.append((kwargs, obs_type))
 
-        stored_data = StoredData(data_retrieved, obs_type=obs_type)
+    def _retrieve(kwargs: dict, obs_type: str) -> StoredData:
+        return _retrieve_stored_data(kwargs, obs_type, get_functions, get_fn_arguments, store=store)
 
-        data_object_all.append(stored_data)
+    if max_workers > 1 and len(search_rows) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            data_object_all = list(executor.map(lambda args: _retrieve(*args), search_rows))
+    else:
+        data_object_all = [_retrieve(*args) for args in search_rows]
 
     return data_object_all
 
@@ -951,6 +1252,8 @@ def create_obspack(
     include_data_versions: bool = True,
     name_components: MultiNameComponents | None = None,
     store: str | None = None,
+    max_workers: int = 1,
+    previous_obspack: pathType | None = None,
 ) -> Path:
     """
     Create ObsPack from observation stored within an object store based on input search parameters.
@@ -982,6 +1285,11 @@ def create_obspack(
             within the filename. This can be specified per obs_type using a dictionary.
             Default will depend on obs_type - see define_name_components().
         store: Name of the object store to use to extract the data.
+        max_workers: Number of worker threads to use when retrieving and writing data. Default = 1.
+        previous_obspack: Path to a previous obspack. Files whose source data and metadata are unchanged
+            (based on the manifest of the previous obspack) are copied rather than written again.
+            If not specified, the manifest within this obspack folder or else the most recently created
+            manifest within the output folder is used.
     Returns:
         Path : Path to created obspack
     """
@@ -996,7 +1304,11 @@ def create_obspack(
 
     obspack = ObsPack(output_folder, obspack_name)
     obspack.find_and_retrieve_data(
-        filename=search_filename, search_df=search_df, store=store, subfolders=subfolders
+        filename=search_filename,
+        search_df=search_df,
+        store=store,
+        subfolders=subfolders,
+        max_workers=max_workers,
     )
 
     if obspack_name is None:
@@ -1026,6 +1338,8 @@ def create_obspack(
         release_files=release_files,
         include_site_index=include_site_index,
         site_index_filename=site_index_filename,
+        max_workers=max_workers,
+        previous_obspack=previous_obspack,
     )
 
     obspack_path = obspack.define_obspack_path()
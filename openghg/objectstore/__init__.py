@@ -24,6 +24,7 @@ from ._local_store import (
     get_folder_size,
 )
 
+from ._catalog import Catalog, load_catalog, rebuild_catalog
 from ._encoding import bytes_to_string, datetime_to_datetime, get_datetime_now, string_to_bytes
 from ._integrity import integrity_check
 from ._legacy_datasource import Datasource
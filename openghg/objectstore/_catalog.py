@@ -0,0 +1,347 @@
+"""Catalog of the Datasources in an object store, across all data types.
+
+Each data type has its own metastore, so finding a Datasource without knowing its
+data type (e.g. `search(uuid=...)`) means opening every metastore in turn. The catalog
+is a single object per bucket holding a compact row for each Datasource:
+
+    {
+        "uuid": ...,
+        "data_type": "surface",
+        "metadata": {...},  # the scalar values of its metastore record
+        "start_date": ...,
+        "end_date": ...,
+        "latest_version": "v1",
+        "size": number of bytes stored,
+    }
+
+The catalog is updated by `ObjectStore.create`, `update` and `delete` and written when
+the metastore of the data type is written, while its lock is held.
+
+Along with the rows, the catalog records the size and modification time of the metastore
+of each data type when the rows were written. When reading, the rows of a data type are only
+used if its metastore is unchanged since then; otherwise (for instance if the metastore was
+written by an older version of OpenGHG) that data type must be searched using its metastore.
+The rows of a data type are rebuilt from its metastore the next time it is written, or for all
+data types with `rebuild_catalog`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+import logging
+from pathlib import Path
+from typing import Any
+
+from openghg.objectstore._local_store import get_object_from_json, set_object_from_json
+from openghg.types import ObjectStoreError
+
+logger = logging.getLogger("openghg.objectstore")
+logger.setLevel(logging.DEBUG)
+
+__all__ = ["Catalog", "CatalogWriter", "load_catalog", "rebuild_catalog"]
+
+CATALOG_KEY = "catalog/datasources"
+CATALOG_FORMAT = 1
+
+# Parameters of `MetaStore.search` which are not search terms
+_SEARCH_PARAMS = ("search_functions", "negative_lookup_keys", "search_list_keys", "daterange")
+
+Signature = list[int] | None
+
+
+def _metastore_signature(bucket: str, data_type: str) -> Signature:
+    """Size and modification time of the metastore of a data type, or None if it doesn't exist."""
+    from openghg.objectstore.metastore._classic_metastore import get_metakey
+
+    try:
+        stat = Path(f"{bucket}/{get_metakey(data_type)}._data").stat()
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _scalar_metadata(record: dict) -> dict:
+    return {k: v for k, v in record.items() if k != "uuid" and isinstance(v, (str, int, float, bool))}
+
+
+def _make_row(data_type: str, record: dict, datasource: Any = None) -> dict:
+    """Create a catalog row from a metastore record and (if available) its Datasource."""
+    row: dict[str, Any] = {
+        "uuid": record["uuid"],
+        "data_type": data_type,
+        "metadata": _scalar_metadata(record),
+        "start_date": record.get("start_date"),
+        "end_date": record.get("end_date"),
+        "latest_version": record.get("latest_version"),
+        "size": None,
+    }
+
+    metadata = getattr(datasource, "metadata", None)
+    if isinstance(metadata, dict):
+        for key in ("start_date", "end_date", "latest_version"):
+            if metadata.get(key) is not None:
+                row[key] = metadata[key]
+
+    if hasattr(datasource, "nbytes"):
+        try:
+            row["size"] = int(datasource.nbytes)
+        except (OSError, ObjectStoreError) as e:
+            logger.debug(f"Unable to get size of Datasource {record['uuid']}: {e}")
+
+    return row
+
+
+def _search_terms(search: dict) -> dict:
+    """Get the search terms from the arguments of a metastore search, see `ObjectStore._search`."""
+    terms = {k: v for k, v in search.items() if k not in _SEARCH_PARAMS and k != "search_terms"}
+    terms.update(search.get("search_terms") or {})
+    return terms
+
+
+def _terms_match(metadata: dict, terms: dict) -> bool:
+    """Check if catalog metadata could match metastore search terms.
+
+    Only scalar search terms are checked; these must match exactly, as in the metastore.
+    Other terms are assumed to match.
+    """
+    for key, value in terms.items():
+        if key == "uuid" or not isinstance(value, (str, int, float, bool)):
+            continue
+        key = key.lower()
+        if key not in metadata or metadata[key] != value:
+            return False
+    return True
+
+
+class Catalog:
+    """Rows describing each Datasource in an object store, see module documentation."""
+
+    def __init__(self, bucket: str, data: dict | None = None) -> None:
+        data = data or {}
+        self.bucket = bucket
+        self.rows: dict[str, dict] = data.get("rows", {})
+        self.signatures: dict[str, Signature] = data.get("metastores", {})
+
+    def to_dict(self) -> dict:
+        return {"format": CATALOG_FORMAT, "metastores": self.signatures, "rows": self.rows}
+
+    def is_current(self, data_type: str) -> bool:
+        """Check if the rows for a data type are up to date with its metastore.
+
+        Args:
+            data_type: Data type
+        Returns:
+            bool: True if the rows for the data type can be used instead of its metastore
+        """
+        current = _metastore_signature(self.bucket, data_type)
+        if data_type not in self.signatures:
+            # The metastore has never been written
+            return current is None
+        return self.signatures[data_type] == current
+
+    def data_type_of(self, uuid: str, data_types: Iterable[str]) -> str | None:
+        """Find the data type of a Datasource.
+
+        Args:
+            uuid: UUID of Datasource
+            data_types: Data types to check
+        Returns:
+            str or None: Data type, if the Datasource is in the catalog
+        """
+        row = self.rows.get(uuid)
+        if row is not None and row["data_type"] in data_types and self.is_current(row["data_type"]):
+            return str(row["data_type"])
+        return None
+
+    def data_types_to_search(self, data_types: Iterable[str], searches: list[dict]) -> list[str]:
+        """Select the data types which may contain results for a search.
+
+        Data types whose rows are out of date are always selected.
+
+        Args:
+            data_types: Data types to search
+            searches: Metastore searches, results matching any of these are wanted
+        Returns:
+            list: Data types, in the order given
+        """
+        data_types = list(data_types)
+        current = {dt for dt in data_types if self.is_current(dt)}
+
+        matched = set()
+        for search in searches:
+            terms = _search_terms(search)
+            uuid = terms.get("uuid")
+
+            # Searches by UUID only need to look at one row
+            if isinstance(uuid, str):
+                rows: Iterable[dict] = [self.rows[uuid]] if uuid in self.rows else []
+            else:
+                rows = self.rows.values()
+
+            for row in rows:
+                if row["data_type"] in current and _terms_match(row["metadata"], terms):
+                    matched.add(row["data_type"])
+
+        return [dt for dt in data_types if dt not in current or dt in matched]
+
+    def rows_for(self, data_type: str) -> list[dict]:
+        return [row for row in self.rows.values() if row["data_type"] == data_type]
+
+
+def load_catalog(bucket: str) -> Catalog | None:
+    """Load the catalog of an object store.
+
+    Args:
+        bucket: Object store path
+    Returns:
+        Catalog or None: Catalog, or None if the object store has no catalog
+    """
+    try:
+        data = get_object_from_json(bucket=bucket, key=CATALOG_KEY)
+    except (ObjectStoreError, ValueError):
+        return None
+
+    if data.get("format") != CATALOG_FORMAT:
+        return None
+
+    return Catalog(bucket=bucket, data=data)
+
+
+def _save_catalog(catalog: Catalog) -> None:
+    set_object_from_json(bucket=catalog.bucket, key=CATALOG_KEY, data=catalog.to_dict())
+
+
+def _catalog_lock(bucket: str) -> Any:
+    from openghg.objectstore.metastore._classic_metastore import FileLock
+
+    return FileLock(bucket, CATALOG_KEY).lock
+
+
+class CatalogWriter:
+    """Changes to the catalog rows of one data type, written by `flush`.
+
+    Used by `ObjectStore`, which passes it the Datasources created, updated and deleted.
+    """
+
+    def __init__(self, bucket: str, data_type: str) -> None:
+        self.bucket = bucket
+        self.data_type = data_type
+        self._pending: dict[str, tuple[dict, Any] | None] = {}
+        # State of the metastore when it was opened, so we know if the catalog rows were up to date
+        self._opened_signature = _metastore_signature(bucket, data_type)
+
+    def upsert(self, record: dict, datasource: Any = None) -> None:
+        """Add or update the row of a Datasource.
+
+        Args:
+            record: Metastore record of Datasource, including its UUID
+            datasource: Datasource, used for dates, version and size
+        Returns:
+            None
+        """
+        uuid = record["uuid"]
+        previous = self._pending.get(uuid)
+        if datasource is None and previous is not None:
+            datasource = previous[1]
+        self._pending[uuid] = (dict(record), datasource)
+
+    def delete(self, uuid: str) -> None:
+        """Delete the row of a Datasource.
+
+        Args:
+            uuid: UUID of Datasource
+        Returns:
+            None
+        """
+        self._pending[uuid] = None
+
+    def discard(self) -> None:
+        """Drop the pending changes without writing them.
+
+        Returns:
+            None
+        """
+        self._pending.clear()
+
+    def flush(self, get_records: Callable[[], Iterable[dict]]) -> None:
+        """Write the pending changes to the catalog.
+
+        This should be called after the metastore has been written. If the catalog rows
+        for this data type weren't up to date with the metastore when it was opened, the rows
+        are rebuilt from the records in the metastore.
+
+        Args:
+            get_records: Function returning all records in the metastore
+        Returns:
+            None
+        """
+        signature = _metastore_signature(self.bucket, self.data_type)
+        if not self._pending and signature == self._opened_signature:
+            return
+
+        with _catalog_lock(self.bucket):
+            catalog = load_catalog(self.bucket) or Catalog(bucket=self.bucket)
+
+            # If the data type isn't in the catalog, the rows are only up to date if the metastore was empty
+            up_to_date = catalog.signatures.get(self.data_type) == self._opened_signature
+
+            if not up_to_date:
+                logger.debug(f"Rebuilding catalog rows for {self.data_type} in {self.bucket}.")
+                existing = {row["uuid"]: row for row in catalog.rows_for(self.data_type)}
+                for uuid in existing:
+                    del catalog.rows[uuid]
+                for record in get_records():
+                    row = _make_row(self.data_type, dict(record))
+                    # Keep the size of Datasources we know about
+                    if record["uuid"] in existing:
+                        row["size"] = existing[record["uuid"]].get("size")
+                    catalog.rows[record["uuid"]] = row
+
+            for uuid, change in self._pending.items():
+                if change is None:
+                    catalog.rows.pop(uuid, None)
+                else:
+                    record, datasource = change
+                    row = _make_row(self.data_type, record, datasource)
+                    # Keep the values from the Datasource if only the metadata was updated
+                    if datasource is None and uuid in catalog.rows:
+                        previous = catalog.rows[uuid]
+                        for key in ("start_date", "end_date", "latest_version", "size"):
+                            if row[key] is None:
+                                row[key] = previous.get(key)
+                    catalog.rows[uuid] = row
+
+            catalog.signatures[self.data_type] = signature
+
+            _save_catalog(catalog)
+
+        self._pending.clear()
+        self._opened_signature = signature
+
+
+def rebuild_catalog(bucket: str) -> Catalog:
+    """Rebuild the catalog of an object store from the metastores of all data types.
+
+    The sizes of Datasources are not recorded; they are added as Datasources are updated.
+
+    Args:
+        bucket: Object store path
+    Returns:
+        Catalog: The new catalog
+    """
+    from openghg.objectstore.metastore import open_metastore
+    from openghg.store.spec import define_data_types
+
+    with _catalog_lock(bucket):
+        catalog = Catalog(bucket=bucket)
+        for data_type in define_data_types():
+            signature = _metastore_signature(bucket, data_type)
+            if signature is not None:
+                with open_metastore(bucket=bucket, data_type=data_type, mode="r") as metastore:
+                    for record in metastore.search():
+                        catalog.rows[record["uuid"]] = _make_row(data_type, dict(record))
+                catalog.signatures[data_type] = signature
+
+        _save_catalog(catalog)
+
+    return catalog
@@ -99,3 +99,10 @@ class AbstractDatasource(ABC, Generic[T]):
     def save(self) -> None:
         """Save changes to datasource made by `add` method."""
         pass
+
+    def discard_unsaved(self) -> None:
+        """Undo changes to the stored data made since the datasource was last saved.
+
+        Override this method if `add` writes data before `save` is called.
+        """
+        pass
@@ -4,6 +4,7 @@ from collections import defaultdict
 import logging
 
 from openghg.objectstore import get_readable_buckets
+from openghg.objectstore._catalog import load_catalog
 from openghg.objectstore._objectstore import open_object_store
 from openghg.types import ObjectStoreError
 
@@ -30,7 +31,14 @@ def integrity_check(raise_error: bool = True) -> dict[str, dict[str, str]] | Non
 
     failed_datasources = defaultdict(dict)
     for bucket in readable_buckets.values():
-        for data_type in data_types:
+        # Skip data types the catalog shows have no Datasources
+        catalog = load_catalog(bucket)
+        if catalog is None:
+            bucket_types = data_types
+        else:
+            bucket_types = [dt for dt in data_types if not catalog.is_current(dt) or catalog.rows_for(dt)]
+
+        for data_type in bucket_types:
             # Now load the object
             with open_object_store(bucket=bucket, data_type=data_type) as objstore:
                 # Get all the Datasources
@@ -1,6 +1,11 @@
 from __future__ import annotations
 from collections import defaultdict
-from typing import Any, cast, Literal
+from collections.abc import Iterable
+import json
+from pathlib import Path
+from typing import Any, cast, Literal, TYPE_CHECKING
+import numpy as np
+from numpy import ndarray
 from typing_extensions import Self
 from types import TracebackType
 import logging
@@ -8,7 +13,7 @@ from pandas import Timestamp, Timedelta
 import xarray as xr
 
 from openghg.objectstore import exists, get_object_from_json
-from openghg.objectstore._local_store import delete_object
+from openghg.objectstore._local_store import delete_object, get_object
 from openghg.util import (
     create_daterange_str,
     get_representative_daterange_str,
@@ -19,6 +24,10 @@ from openghg.util import (
 from openghg.types import DataOverlapError, ObjectStoreError
 
 from ._datasource import AbstractDatasource, DatasourceFactory
+from ._summary import compute_summary, merge_summaries, replace_months, summary_totals
+
+if TYPE_CHECKING:
+    from openghg.store.storage import ReadCache
 
 logger = logging.getLogger("openghg.objectstore")
 logger.setLevel(logging.DEBUG)
@@ -26,6 +35,27 @@ logger.setLevel(logging.DEBUG)
 __all___ = ["Datasource"]
 
 
+def _load_cached_json(cache: ReadCache, bucket: str, key: str, uuid: str) -> dict:
+    """Load the JSON of a Datasource, keeping it in the read cache.
+
+    The JSON text is cached rather than the parsed dictionary, as loading modifies the dictionary
+    and parsing is quicker than copying it.
+    """
+    filepath = Path(f"{bucket}/{key}._data")
+    try:
+        stat = filepath.stat()
+    except FileNotFoundError:
+        raise ObjectStoreError(f"No Datasource with uuid {uuid} found in bucket {bucket}")
+
+    cache_key = (uuid, "datasource", (stat.st_size, stat.st_mtime_ns))
+    data = cache.get(cache_key)
+    if data is None:
+        data = get_object(bucket=bucket, key=key)
+        cache.put(cache_key, data)
+
+    return cast(dict, json.loads(bytes(data)))
+
+
 class Datasource(AbstractDatasource[xr.Dataset]):
     """A Datasource holds data relating to a single source.
 
@@ -49,6 +79,11 @@ class Datasource(AbstractDatasource[xr.Dataset]):
         # Hold information regarding the versions of the data
         self._latest_version: str = ""
         self._timestamps: dict[str, str] = {}
+        # Summary statistics of the data variables in each version, see openghg.objectstore._summary.
+        # These are stored next to the zarr store, this holds those already read or computed.
+        self._summaries: dict[str, dict] = {}
+        # Times of the data added to each version since the aggregates were last updated, see `save`
+        self._pending_aggregates: dict[str, dict] = {}
 
         if mode not in ("r", "rw"):
             raise ValueError("Invalid mode. Please select r or rw.")
@@ -64,8 +99,14 @@ class Datasource(AbstractDatasource[xr.Dataset]):
     # Methods to satisfy AbstractDatasource ABC
     @classmethod
     def load(cls, uuid: str, bucket: str, mode: Literal["r", "rw"] = "rw", data_type: str = "") -> Self:
+        from openghg.store.storage import get_read_cache
+
         key = f"{Datasource._datasource_root}/uuid/{uuid}"
-        if exists(bucket=bucket, key=key):
+
+        cache = get_read_cache()
+        if cache is not None:
+            stored_data = _load_cached_json(cache=cache, bucket=bucket, key=key, uuid=uuid)
+        elif exists(bucket=bucket, key=key):
             stored_data = get_object_from_json(bucket=bucket, key=key)
         else:
             raise ObjectStoreError(f"No Datasource with uuid {uuid} found in bucket {bucket}")
@@ -73,11 +114,14 @@ class Datasource(AbstractDatasource[xr.Dataset]):
         ds = cls(bucket, uuid, mode, data_type)
         ds.__dict__.update(stored_data)
         ds._data_keys = defaultdict(list, ds._data_keys)
+        ds._summaries = {}
+        ds._pending_aggregates = {}
 
         return ds
 
     def save(self) -> None:
-        """Save this Datasource object as JSON to the object store
+        """Save this Datasource object as JSON to the object store, and update the aggregates
+        of the data added since it was last saved, see `openghg.aggregation`.
 
         Args:
             bucket: Bucket to hold data
@@ -93,12 +137,48 @@ class Datasource(AbstractDatasource[xr.Dataset]):
             "_status",
             "_start_date",
             "_end_date",
+            "_summaries",
+            "_pending_aggregates",
         }
 
+        # Aggregates are updated once for all the data added, e.g. in several slabs of a file
+        self._update_aggregates()
+
+        from openghg.store.storage import invalidate_read_cache
+
         internal_metadata = {k: v for k, v in self.__dict__.items() if k not in DO_NOT_STORE}
         set_object_from_json(bucket=self._bucket, key=self.key, data=internal_metadata)
         self._store.close()
 
+        invalidate_read_cache(self._uuid)
+
+    def discard_unsaved(self) -> None:
+        """Delete data added to the zarr store since this Datasource was last saved.
+
+        Versions created since the last save are deleted, and if the Datasource was never
+        saved all of its data is deleted. Data added to a version which had already been
+        saved can't be removed, a warning is logged if there is any.
+
+        Returns:
+            None
+        """
+        self._pending_aggregates.clear()
+
+        if not exists(bucket=self._bucket, key=self.key):
+            self._store.delete_all()
+            return
+
+        saved_keys = get_object_from_json(bucket=self._bucket, key=self.key).get("_data_keys", {})
+        for version, date_keys in self._data_keys.items():
+            if version not in saved_keys:
+                if self._store.version_exists(version):
+                    self._store.delete_version(version)
+            elif sorted(date_keys) != sorted(saved_keys[version]):
+                logger.warning(
+                    f"Unable to remove data added to version {version} of Datasource {self._uuid}, "
+                    "which had already been saved."
+                )
+
     def add(self, data: xr.Dataset, **kwargs) -> None:
         if (period := kwargs.pop("period", None)) is not None:
             self._metadata["period"] = period
@@ -118,8 +198,26 @@ class Datasource(AbstractDatasource[xr.Dataset]):
 
         return self._store.get(version=version)
 
+    def get_coords(self, names: Iterable[str], version: str = "latest") -> dict[str, ndarray]:
+        """Get the values of coordinates (e.g. lat, lon) stored for a version
+        without opening the data variables.
+
+        Args:
+            names: Names of coordinates
+            version: Version string, e.g. v1, v2
+        Returns:
+            dict: Coordinate names mapped to their values
+        """
+        if version == "latest":
+            version = self._latest_version
+
+        return self._store.get_coords(version=version, names=names)
+
     def delete(self) -> None:
+        from openghg.aggregation import delete_aggregates
+
         self.delete_all_data()
+        delete_aggregates(bucket=self._bucket, source_uuid=self._uuid)
         delete_object(bucket=self._bucket, key=self.key)
 
     # Context manager
@@ -205,6 +303,7 @@ class Datasource(AbstractDatasource[xr.Dataset]):
         if_exists: str = "auto",
         compressor: Any | None = None,
         filters: Any | None = None,
+        append_only: bool = False,
     ) -> None:
         """Add data to this Datasource and segment the data by size.
         The data is stored as a tuple of the data and the daterange it covers.
@@ -226,6 +325,7 @@ class Datasource(AbstractDatasource[xr.Dataset]):
                 - "combine" - replace and insert new data into current timeseries
             compressor: Compression for zarr encoding
             filters: Filters for zarr encoding
+            append_only: Data is expected to come after the data already stored, see `add_timed_data`
         Returns:
             None
         """
@@ -241,6 +341,7 @@ class Datasource(AbstractDatasource[xr.Dataset]):
                 if_exists=if_exists,
                 compressor=compressor,
                 filters=filters,
+                append_only=append_only,
             )
         else:
             raise NotImplementedError()
@@ -255,6 +356,7 @@ class Datasource(AbstractDatasource[xr.Dataset]):
         if_exists: str = "auto",
         compressor: Any | None = None,
         filters: Any | None = None,
+        append_only: bool = False,
     ) -> None:
         """Add data to this Datasource
 
@@ -273,9 +375,20 @@ class Datasource(AbstractDatasource[xr.Dataset]):
                 - "combine" - replace and insert new data into current timeseries
             compressor: Compression for zarr encoding
             filters: Filters for zarr encoding
+            append_only: Data is expected to come after the data already stored in the latest version.
+                If it starts after the stored end date it is appended without scanning the stored
+                data for overlaps, otherwise it is added as determined by `if_exists`.
         Returns:
             None
         """
+        from openghg.store.spec import define_timeseries_data_types
+        from openghg.store.storage import get_codec_policies
+
+        codec_policies = get_codec_policies(bucket=self._bucket, data_type=data_type)
+
+        # Summaries are only kept for timeseries, summarising gridded data would read it all again
+        summarise = data_type in define_timeseries_data_types()
+
         # Ensure data is in time order
         time_coord = "time"
         new_daterange_str = get_representative_daterange_str(dataset=data, period=self.period)
@@ -288,6 +401,10 @@ class Datasource(AbstractDatasource[xr.Dataset]):
         # Save details of current Datasource status
         self._status = {}
 
+        # Version whose data a new version starts from, if any, and whether the stored data is replaced
+        copied_from = None
+        replaced = False
+
         # We'll use this to store the dates covered by this version of the data
         date_keys = self._data_keys[self._latest_version] if self._data_keys else []
 
@@ -298,8 +415,21 @@ class Datasource(AbstractDatasource[xr.Dataset]):
         elif drop_duplicates:
             data = data.drop_duplicates(time_coord, keep="first")
 
-        overlapping = self._store and self._store._vzds._overlap_determiner.has_overlaps(
-            data.get_index(self._store._vzds.append_dim)
+        new_summary = compute_summary(data) if summarise else None
+
+        appending = (
+            append_only
+            and version_str == self._latest_version
+            and bool(self._store)
+            and self._appends_to_latest(data)
+        )
+
+        overlapping = (
+            not appending
+            and self._store
+            and self._store._vzds._overlap_determiner.has_overlaps(
+                data.get_index(self._store._vzds.append_dim)
+            )
         )
 
         # TODO: what does the following comment mean? (BM Jan 2026)
@@ -307,7 +437,19 @@ class Datasource(AbstractDatasource[xr.Dataset]):
 
         # If we don't have any data in this Datasource or we have no overlap we'll just add the new data
         if not self._store or not overlapping:
-            self._store.add(version=version_str, dataset=data, compressor=compressor, filters=filters)
+            # New versions start empty, otherwise the data is appended to the stored data
+            summary = new_summary
+            if new_summary is not None and version_str == self._latest_version:
+                current_summary = self._known_summary(version_str)
+                summary = None if current_summary is None else merge_summaries(current_summary, new_summary)
+            self._store.add(
+                version=version_str,
+                dataset=data,
+                compressor=compressor,
+                filters=filters,
+                codec_policies=codec_policies,
+                check_overlaps=not appending,
+            )
             date_keys.append(new_daterange_str)
         # Otherwise if we have data already stored in the Datasource
         elif if_exists == "new":
@@ -317,17 +459,43 @@ class Datasource(AbstractDatasource[xr.Dataset]):
             logger.info("Updating store to include new added data only.")
 
             if new_version:
-                self._store.add(version=version_str, dataset=data, compressor=compressor, filters=filters)
+                self._store.add(
+                    version=version_str,
+                    dataset=data,
+                    compressor=compressor,
+                    filters=filters,
+                    codec_policies=codec_policies,
+                )
             else:
                 self._store.overwrite(
-                    version=version_str, dataset=data, compressor=compressor, filters=filters
+                    version=version_str,
+                    dataset=data,
+                    compressor=compressor,
+                    filters=filters,
+                    codec_policies=codec_policies,
                 )
+                replaced = True
             # Only save the current daterange string for this version
             date_keys = [new_daterange_str]
+            summary = new_summary
         elif if_exists == "combine":
             logger.info("Updating store by combining new data with existing.")
-            self._store.update(version=version_str, dataset=data, compressor=compressor, filters=filters)
+            if version_str != self._latest_version:
+                copied_from = self._latest_version
+            # A new version starts from a copy of the latest version
+            current_summary = self._known_summary(copied_from or version_str) if summarise else None
+            self._store.update(
+                version=version_str,
+                dataset=data,
+                compressor=compressor,
+                filters=filters,
+                codec_policies=codec_policies,
+            )
             date_keys = [get_representative_daterange_str(self.get_data())]
+            # Only the months covered by the new data have changed, so only these are summarised again
+            summary = None
+            if current_summary is not None:
+                summary = self._updated_summary(version=version_str, current=current_summary, data=data)
         # If we don't know what (i.e. we've got "auto") to do we'll raise an error
         else:
             # if_exists == "auto" (or at least... not "new" or "combine"), but we already have data
@@ -360,8 +528,262 @@ class Datasource(AbstractDatasource[xr.Dataset]):
         # present version data to the users
         self._metadata["versions"] = self._data_keys
 
+        if summary is not None:
+            self._set_summary(version_str, summary)
+        else:
+            # The summary of the stored data isn't known, it's computed when first requested
+            self._summaries.pop(version_str, None)
+            self._store.delete_summary(version=version_str)
+            if summarise or "summary" in self._metadata:
+                self._metadata["summary"] = {}
+
         self._last_updated = timestamp_str_now
 
+        # Record the times added so the aggregates of the windows containing them are updated on save
+        if data[time_coord].size:
+            times = data[time_coord].values
+            pending = self._pending_aggregates.setdefault(
+                version_str,
+                {"start_date": str(times.min()), "end_date": str(times.max()), "copy_from": copied_from},
+            )
+            if replaced:
+                pending.update(start_date=str(times.min()), end_date=str(times.max()), replace=True)
+            pending["start_date"] = str(min(np.datetime64(pending["start_date"]), times.min()))
+            pending["end_date"] = str(max(np.datetime64(pending["end_date"]), times.max()))
+
+    def _update_aggregates(self) -> None:
+        """Update the aggregates of the windows containing the data added since the last update."""
+        from openghg.aggregation import get_aggregate_variables, get_aggregates, update_aggregates
+
+        if not self._pending_aggregates:
+            return
+
+        aggregates = get_aggregates(bucket=self._bucket, data_type=self._data_type)
+        if aggregates:
+            variables = get_aggregate_variables(bucket=self._bucket, data_type=self._data_type)
+            for version, pending in self._pending_aggregates.items():
+                if not self._store.version_exists(version):
+                    continue
+                update_aggregates(
+                    bucket=self._bucket,
+                    source_uuid=self._uuid,
+                    version=version,
+                    data=self._store.get(version=version),
+                    aggregates=aggregates,
+                    variables=variables,
+                    **pending,
+                )
+
+        self._pending_aggregates.clear()
+
+    def _set_summary(self, version: str, summary: dict[str, dict]) -> None:
+        """Store the summary of a version of the data next to the stored data, and add
+        its totals to the metadata if this is the latest version."""
+        self._summaries[version] = summary
+        self._store.set_summary(version=version, summary=summary)
+
+        if version == self._latest_version:
+            self._metadata["summary"] = summary_totals(summary)
+
+    def _known_summary(self, version: str) -> dict[str, dict] | None:
+        """Get the summary of a version of the stored data, without reading the stored data.
+
+        Args:
+            version: Version of the data
+        Returns:
+            dict or None: Summary of the data, empty if there is no data stored for this version,
+            or None if no summary is stored for this version
+        """
+        if not version or not self._store or not self._store.version_exists(version):
+            return {}
+
+        if version not in self._summaries:
+            summary = self._store.get_summary(version=version)
+            if summary is None:
+                return None
+
+            self._summaries[version] = summary
+
+        return self._summaries[version]
+
+    def _stored_summary(self, version: str) -> dict[str, dict]:
+        """Get the summary of a version of the stored data, computing it from the stored
+        data if no summary is stored for the version, e.g. if the version was added before
+        summaries were recorded.
+
+        Args:
+            version: Version of the data
+        Returns:
+            dict: Summary of the data, empty if there is no data stored for this version
+        """
+        summary = self._known_summary(version)
+
+        if summary is None:
+            logger.debug(f"No summary found for {self._uuid} {version}, computing from stored data.")
+            summary = compute_summary(self._store.get(version=version))
+
+            if self._mode == "rw":
+                self._set_summary(version, summary)
+            else:
+                self._summaries[version] = summary
+
+        return summary
+
+    def _updated_summary(self, version: str, current: dict[str, dict], data: xr.Dataset) -> dict[str, dict]:
+        """Update the summary of a version after data has been combined with the stored data,
+        summarising the stored data again only for the months covered by the new data.
+
+        Args:
+            version: Version of the data
+            current: Summary of the version before the update
+            data: Data combined with the stored data
+        Returns:
+            dict: Summary of the updated version
+        """
+        times = data["time"].values
+        first_month = times.min().astype("datetime64[M]")
+        end_month = times.max().astype("datetime64[M]") + np.timedelta64(1, "M")
+        months = {str(month) for month in np.arange(first_month, end_month)}
+
+        stored = self._store.get(version=version)
+        stored_times = stored["time"].values
+        in_months = stored.isel(time=(stored_times >= first_month) & (stored_times < end_month))
+
+        return replace_months(current=current, new=compute_summary(in_months), months=months)
+
+    def summary(self, version: str = "latest") -> dict[str, dict]:
+        """Summary statistics of the data variables stored in a version of the data.
+
+        For each numeric variable with a time dimension this gives the number of valid
+        and NaN values, the minimum, maximum and mean values and the number of valid values,
+        minimum, maximum, sum and number of NaN values in each month. See
+        `openghg.objectstore._summary` for the layout.
+
+        Args:
+            version: Version of the data
+        Returns:
+            dict: Summary keyed by variable name
+        """
+        if version == "latest":
+            version = self._latest_version
+
+        if version not in self._data_keys:
+            raise KeyError(f"Invalid version, valid versions {list(self._data_keys.keys())}")
+
+        return self._stored_summary(version)
+
+    def _appends_to_latest(self, data: xr.Dataset) -> bool:
+        """Check if data starts after the end of the latest version of the stored data,
+        using the stored date ranges rather than reading the stored data.
+
+        Args:
+            data: Data sorted by time
+        Returns:
+            bool: True if data can be appended to the latest version
+        """
+        if not self._latest_version or not self._data_keys.get(self._latest_version) or not data.time.size:
+            return False
+
+        _, end = split_daterange_str(daterange_str=sorted(self._data_keys[self._latest_version])[-1])
+
+        if timestamp_tzaware(data.time[0].values) > timestamp_tzaware(end):
+            return True
+
+        logger.debug("Data to append starts before the end of the stored data, checking for overlaps.")
+        return False
+
+    def record_access(self, read_sizes: dict[str, int], dim_sizes: dict[str, int]) -> None:
+        """Record a read of the data in this Datasource, used to suggest chunk layouts.
+        This is only recorded if enabled, see `openghg.store.storage.configure_access_stats`.
+
+        Args:
+            read_sizes: Number of elements read along each dimension
+            dim_sizes: Total size of each dimension of the stored data
+        Returns:
+            None
+        """
+        self._store.record_access(read_sizes=read_sizes, dim_sizes=dim_sizes)
+
+    def suggest_chunks(self, version: str = "latest", max_chunk_size: int = 300) -> dict[str, int]:
+        """Suggest a chunk layout for the data from the recorded access statistics.
+
+        The layout is based on the largest data variable stored.
+
+        Args:
+            version: Version of the data
+            max_chunk_size: Maximum chunk size in megabytes, defaults to 300 MB
+        Returns:
+            dict: Dictionary of chunk sizes
+        """
+        from openghg.store.storage import suggest_chunks
+
+        if version == "latest":
+            version = self._latest_version
+
+        stored = self._store.get(version=version)
+        variable = max(stored.data_vars.values(), key=lambda v: v.nbytes)
+
+        return suggest_chunks(
+            dim_sizes={str(k): v for k, v in variable.sizes.items()},
+            dtype_bytes=variable.dtype.itemsize,
+            access_stats=self._store.access_stats(),
+            max_chunk_size=max_chunk_size,
+        )
+
+    def rechunk(
+        self,
+        chunks: dict[str, int] | None = None,
+        version: str = "latest",
+        max_mem: int = 500,
+        max_chunk_size: int = 300,
+    ) -> str:
+        """Rewrite a version of the data into a new chunk layout, stored as a new version.
+
+        The data is copied out of core and the new version only becomes the latest
+        version once it has been written in full, so the data can be read throughout.
+        Call `save` to commit the new version.
+
+        Args:
+            chunks: Dictionary of dimension name and chunk size, for example {"time": 24}.
+                If None the chunks are suggested from the recorded access statistics.
+            version: Version of the data to rechunk
+            max_mem: Maximum amount of data to hold in memory, in megabytes
+            max_chunk_size: Maximum chunk size in megabytes when suggesting chunks
+        Returns:
+            str: The new version
+        """
+        if version == "latest":
+            version = self._latest_version
+
+        if version not in self._data_keys:
+            raise KeyError(f"Invalid version, valid versions {list(self._data_keys.keys())}")
+
+        if chunks is None:
+            chunks = self.suggest_chunks(version=version, max_chunk_size=max_chunk_size)
+
+        version_str = f"v{len(self._data_keys) + 1!s}"
+
+        logger.info(f"Rechunking {self._uuid} {version} to {version_str} with chunks {chunks}.")
+        self._store.rechunk(version=version, new_version=version_str, chunks=chunks, max_mem=max_mem)
+
+        self._latest_version = version_str
+
+        timestamp_str_now = str(timestamp_now())
+        self._data_keys[version_str] = list(self._data_keys[version])
+        self._timestamps[version_str] = timestamp_str_now
+        self.add_metadata_key(key="latest_version", value=version_str)
+        self.add_metadata_key(key="timestamp", value=timestamp_str_now)
+        self._metadata["versions"] = self._data_keys
+
+        # The data is unchanged, so the new version has the same summary
+        summary = self._known_summary(version)
+        if summary is not None:
+            self._set_summary(version_str, summary)
+
+        self._last_updated = timestamp_str_now
+
+        return version_str
+
     def delete_all_data(self) -> None:
         """Delete datasource entirely.
 
@@ -378,6 +800,7 @@ class Datasource(AbstractDatasource[xr.Dataset]):
         self._data_keys.clear()
         self._metadata.clear()
         self._timestamps.clear()
+        self._summaries.clear()
 
     def delete_version(self, version: str) -> None:
         """Delete a specific version of data.
@@ -397,6 +820,7 @@ class Datasource(AbstractDatasource[xr.Dataset]):
         self._store.delete_version(version=version)
         del self._data_keys[version]
         del self._timestamps[version]
+        self._summaries.pop(version, None)
 
     # Metadata methods
     def add_metadata_key(self, key: str, value: str) -> None:
@@ -16,6 +16,7 @@ both metadata and data.
 from __future__ import annotations
 
 from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import as_completed, ThreadPoolExecutor
 from contextlib import contextmanager
 from types import TracebackType
 from typing import Any, Generic, Literal, TypeAlias, TypeVar
@@ -25,12 +26,13 @@ from uuid import uuid4
 
 import xarray as xr
 
+from openghg.objectstore._catalog import CatalogWriter, load_catalog
 from openghg.objectstore._datasource import DatasourceFactory, DatasourceT
 from openghg.objectstore._legacy_datasource import Datasource, get_legacy_datasource_factory
 from openghg.objectstore.metastore import MetaStore, open_metastore
 from openghg.objectstore.metastore._classic_metastore import DataClassMetaStore, FileLock, LockingError
-from openghg.types import ObjectStoreError
-from openghg.util import split_function_inputs
+from openghg.types import MetastoreError, ObjectStoreError
+from openghg.util import dates_overlap, split_function_inputs
 
 MetaData = dict[str, Any]
 QueryResults = list[MetaData]
@@ -55,13 +57,20 @@ class ObjectStore(Generic[DatasourceT, T]):
         metastore: MetaStore,
         datasource_factory: DatasourceFactory[DatasourceT],
         metadata_updater: MetadataUpdaterT | None = None,
+        catalog: CatalogWriter | None = None,
     ) -> None:
         self.metastore = metastore
         self.datasource_factory = datasource_factory
+        # Catalog of the Datasources of all data types in the bucket, updated along with the metastore
+        self.catalog = catalog
 
         # use default metadata updater if None is passed
         self.metadata_updater = metadata_updater or _default_metadata_updater
 
+        # Datasources loaded while saving is deferred, and those not yet saved, see `defer_saves`
+        self._deferred: dict[UUID, DatasourceT] | None = None
+        self._unsaved: set[UUID] = set()
+
     def __enter__(self) -> Self:
         return self
 
@@ -74,8 +83,48 @@ class ObjectStore(Generic[DatasourceT, T]):
         self.close()
 
     def close(self) -> None:
+        # The catalog is written once the metastore has been written, and before closing
+        # the metastore releases its lock
+        self.metastore.flush()
+        self._flush_catalog()
         self.metastore.close()
 
+    def _flush_catalog(self) -> None:
+        """Write changes to the catalog, once the metastore has been written."""
+        if self.catalog is not None:
+            self.catalog.flush(get_records=lambda: self.metastore.search())
+
+    def _update_catalog(self, uuid: UUID, datasource: DatasourceT | None = None) -> None:
+        """Record the current metadata (and Datasource, if given) of a UUID in the catalog."""
+        if self.catalog is not None:
+            self.catalog.upsert(record=self.metastore.search({"uuid": uuid})[0], datasource=datasource)
+
+    def _record_daterange(self, uuid: UUID, datasource: DatasourceT) -> None:
+        """Record the dates of the data in a Datasource in the metastore, for searching by date."""
+        metadata = getattr(datasource, "metadata", None)
+        if isinstance(metadata, dict) and metadata.get("start_date") and metadata.get("end_date"):
+            self.metastore.set_daterange(uuid, metadata["start_date"], metadata["end_date"])
+
+    def _undated_in_daterange(self, search_results: QueryResults, daterange: Any) -> list[bool]:
+        """Check which search results are in a date range.
+
+        Results whose dates are in the metastore have already been checked by the metastore
+        search; for the others (e.g. those stored by older versions of OpenGHG), the dates
+        from their Datasource metadata are used, if present.
+        """
+        index = self.metastore.daterange_index()
+        start, end = daterange
+
+        keep = []
+        for r in search_results:
+            if r.get("uuid") in index or r.get("start_date") is None or r.get("end_date") is None:
+                keep.append(True)
+            else:
+                keep.append(
+                    dates_overlap(start_a=start, end_a=end, start_b=r["start_date"], end_b=r["end_date"])
+                )
+        return keep
+
     def _search(self, metadata: MetaData | None = None, **kwargs: Any) -> QueryResults:
         """Internal metastore search.
 
@@ -105,7 +154,67 @@ class ObjectStore(Generic[DatasourceT, T]):
 
     def get_datasource(self, uuid: UUID) -> DatasourceT:
         """Get data stored at given uuid."""
-        return self.datasource_factory.load(uuid)
+        if self._deferred is None:
+            return self.datasource_factory.load(uuid)
+
+        if uuid not in self._deferred:
+            self._deferred[uuid] = self.datasource_factory.load(uuid)
+
+        return self._deferred[uuid]
+
+    def _save_datasource(self, uuid: UUID, datasource: DatasourceT) -> None:
+        """Save a Datasource, or keep it in memory until `commit` if saving is deferred."""
+        if self._deferred is None:
+            datasource.save()
+        else:
+            self._deferred[uuid] = datasource
+            self._unsaved.add(uuid)
+
+    def defer_saves(self) -> None:
+        """Keep Datasources in memory once loaded, and only save them on `commit`.
+
+        This avoids reloading and saving the metadata of each Datasource every time
+        it is updated, for instance when adding many files one at a time.
+
+        Returns:
+            None
+        """
+        if self._deferred is None:
+            self._deferred = {}
+
+    def commit(self) -> None:
+        """Save any Datasources held in memory and write changes to the metastore.
+
+        Returns:
+            None
+        """
+        if self._deferred is not None:
+            for uuid in sorted(self._unsaved):
+                self._deferred[uuid].save()
+        self._unsaved.clear()
+
+        self.metastore.flush()
+        self._flush_catalog()
+
+    def rollback(self) -> None:
+        """Discard changes made since the last `commit`, instead of writing them.
+
+        Datasources held in memory are not saved, and the data they added to their stores
+        since they were last saved is deleted (see `discard_unsaved`). Pending changes to the
+        metastore and catalog are dropped.
+
+        Returns:
+            None
+        """
+        if self._deferred is not None:
+            for uuid in sorted(self._unsaved):
+                self._deferred[uuid].discard_unsaved()
+            self._deferred = {}
+        self._unsaved.clear()
+
+        self.metastore.discard()
+        if self.catalog is not None:
+            self.catalog.discard()
 
     def _retrieve(
         self, metadata: MetaData | None = None, **kwargs: Any
@@ -128,7 +237,15 @@ class ObjectStore(Generic[DatasourceT, T]):
         """
         search_results = self._search(metadata, **kwargs)
         datasources = (self.get_datasource(r["uuid"]) for r in search_results)
-        return self.metadata_updater(search_results, datasources)
+        search_results, datasources = self.metadata_updater(search_results, datasources)
+
+        if kwargs.get("daterange") is not None and search_results:
+            pairs = list(zip(search_results, datasources))
+            keep = self._undated_in_daterange(search_results, kwargs["daterange"])
+            search_results = [r for (r, _), k in zip(pairs, keep) if k]
+            datasources = [d for (_, d), k in zip(pairs, keep) if k]
+
+        return search_results, datasources
 
     def search(self, metadata: MetaData | None = None, **kwargs: Any) -> QueryResults:
         """Search the metastore.
@@ -136,6 +253,9 @@ class ObjectStore(Generic[DatasourceT, T]):
         Adds metadata from Datasources via `self.metadata_updater`, if Datasource
         metadata is available.
 
+        Passing `daterange=(start, end)` only returns Datasources with data overlapping
+        this date range.
+
         Args:
             metadata: metadata to narrow search by
             **kwargs: keyword arg version of search metadata
@@ -149,6 +269,9 @@ class ObjectStore(Generic[DatasourceT, T]):
             # Datasource not found? just warn...
             warnings.warn(f"Metadata found without corresponding Datasource {e}.")
             search_results = self._search(metadata, **kwargs)
+            if kwargs.get("daterange") is not None:
+                keep = self._undated_in_daterange(search_results, kwargs["daterange"])
+                search_results = [r for r, k in zip(search_results, keep) if k]
 
         return list(search_results)
 
@@ -204,7 +327,9 @@ class ObjectStore(Generic[DatasourceT, T]):
 
         self.metastore.insert(metadata)
         del metadata["uuid"]  # don't mutate the metadata
-        datasource.save()
+        self._record_daterange(uuid, datasource)
+        self._save_datasource(uuid, datasource)
+        self._update_catalog(uuid, datasource)
 
         return uuid
 
@@ -260,7 +385,11 @@ class ObjectStore(Generic[DatasourceT, T]):
         if data:
             datasource = self.get_datasource(uuid)
             datasource.add(data, **kwargs)
-            datasource.save()
+            self._record_daterange(uuid, datasource)
+            self._save_datasource(uuid, datasource)
+            self._update_catalog(uuid, datasource)
+        elif metadata or keys_to_delete:
+            self._update_catalog(uuid)
 
     def delete(self, uuid: UUID) -> None:
         """Delete data and metadata with given UUID."""
@@ -268,6 +397,109 @@ class ObjectStore(Generic[DatasourceT, T]):
         data.delete()
         self.metastore.delete({"uuid": uuid})
 
+        if self.catalog is not None:
+            self.catalog.delete(uuid)
+
+        if self._deferred is not None:
+            self._deferred.pop(uuid, None)
+            self._unsaved.discard(uuid)
+
+    def update_many(
+        self,
+        uuids: Iterable[UUID],
+        metadata: MetaData | None = None,
+        keys_to_delete: str | list[str] | None = None,
+    ) -> None:
+        """Update the metadata of several UUIDs with the same changes.
+
+        The metastore records are updated together, rather than searched for and updated
+        one at a time as by `update`. Keys in `keys_to_delete` which are not in a record are ignored.
+
+        Args:
+            uuids: UUIDs of datasources to update
+            metadata: metadata to add/overwrite in the metastore records
+            keys_to_delete: metadata keys to delete
+
+        Returns:
+            None
+
+        Raises:
+            ObjectStoreError if any of the given UUIDs is not found.
+        """
+        if isinstance(keys_to_delete, str):
+            keys_to_delete = [keys_to_delete]
+        if keys_to_delete is not None and "uuid" in keys_to_delete:
+            raise ValueError("Cannot delete UUID.")
+        if metadata is not None and "uuid" in metadata:
+            raise ValueError("Cannot update UUID.")
+
+        uuids = list(uuids)
+        if not uuids or not (metadata or keys_to_delete):
+            return
+
+        try:
+            self.metastore.update_many(uuids, to_update=metadata, to_delete=keys_to_delete)
+        except MetastoreError as e:
+            raise ObjectStoreError(f"Cannot update: {e}") from e
+
+        if self.catalog is not None:
+            to_record = set(uuids)
+            for record in self.metastore.search():
+                if record.get("uuid") in to_record:
+                    self.catalog.upsert(record=record)
+
+    def delete_many(
+        self,
+        uuids: Iterable[UUID],
+        max_workers: int | None = None,
+        callback: Callable[[UUID], None] | None = None,
+    ) -> None:
+        """Delete the data and metadata of several UUIDs.
+
+        The data of each datasource is deleted using a pool of threads, then the metastore
+        records of the deleted datasources are removed together.
+
+        Args:
+            uuids: UUIDs of datasources to delete
+            max_workers: maximum number of threads used to delete data. Defaults to
+                the concurrent.futures.ThreadPoolExecutor default.
+            callback: function called with each UUID once its data is deleted, e.g. to show progress
+
+        Returns:
+            None
+        """
+
+        def _delete_data(uuid: UUID) -> UUID:
+            self.get_datasource(uuid).delete()
+            return uuid
+
+        deleted = []
+        error: Exception | None = None
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_delete_data, uuid) for uuid in uuids]
+            for future in as_completed(futures):
+                try:
+                    uuid = future.result()
+                except Exception as e:
+                    error = error or e
+                    continue
+                deleted.append(uuid)
+                if callback is not None:
+                    callback(uuid)
+
+        # Only remove the records of datasources whose data was deleted
+        self.metastore.delete_many(deleted)
+
+        for uuid in deleted:
+            if self.catalog is not None:
+                self.catalog.delete(uuid)
+            if self._deferred is not None:
+                self._deferred.pop(uuid, None)
+                self._unsaved.discard(uuid)
+
+        if error is not None:
+            raise error
+
 
 # Helper functions for creating object stores
 def _update_one(
@@ -359,8 +591,10 @@ def open_object_store(
             list_keys = None
         metadata_updater = make_metadata_updater_fn(extend_keys=list_keys)
 
+        catalog = CatalogWriter(bucket=bucket, data_type=data_type) if mode == "rw" else None
+
         object_store = ObjectStore[Datasource, xr.Dataset](
-            metastore=ms, datasource_factory=ds_factory, metadata_updater=metadata_updater
+            metastore=ms, datasource_factory=ds_factory, metadata_updater=metadata_updater, catalog=catalog
         )
         yield object_store
 
@@ -390,7 +624,14 @@ def get_datasource(bucket: str, uuid: str, data_type: str | None = None) -> Data
         # try iterating over all data types
         from openghg.store.spec import define_data_types
 
-        for dtype in define_data_types():
+        data_types = define_data_types()
+
+        # Look up the data type in the catalog, if it's there
+        catalog = load_catalog(bucket)
+        if catalog is not None and (catalog_type := catalog.data_type_of(uuid, data_types)) is not None:
+            data_types = [catalog_type]
+
+        for dtype in data_types:
             try:
                 with open_object_store(bucket=bucket, data_type=dtype, mode="r") as objstore:
                     result = objstore.retrieve(uuid=uuid)[0]
@@ -416,14 +657,20 @@ class LockingObjectStore(ObjectStore[DatasourceT, T]):
         datasource_factory: DatasourceFactory,
         metadata_updater: MetadataUpdaterT,
         lock: FileLock,
+        catalog: CatalogWriter | None = None,
     ) -> None:
         super().__init__(
-            metastore=metastore, datasource_factory=datasource_factory, metadata_updater=metadata_updater
+            metastore=metastore,
+            datasource_factory=datasource_factory,
+            metadata_updater=metadata_updater,
+            catalog=catalog,
         )
         self.lock = lock
+        self._held = False
 
     def __enter__(self) -> Self:
-        self.lock.acquire()
+        if not self._held:
+            self.lock.acquire()
         return self
 
     def __exit__(
@@ -432,7 +679,49 @@ class LockingObjectStore(ObjectStore[DatasourceT, T]):
         exc_value: BaseException | None,
         traceback: TracebackType | None,
     ) -> bool | None:
-        self.close()
+        # If the lock is held by a session, changes are written on `commit`
+        if not self._held:
+            self.close()
+
+    def hold(self) -> None:
+        """Acquire the lock and keep it, along with the loaded metastore and Datasources,
+        until `release` is called.
+
+        While held, using the object store as a context manager doesn't release the
+        lock or write to the metastore, and Datasources are only saved on `commit`.
+
+        Returns:
+            None
+        """
+        self.lock.acquire()
+        self._held = True
+        self.defer_saves()
+
+    def release(self) -> None:
+        """Commit any changes and release a lock acquired with `hold`.
+
+        Returns:
+            None
+        """
+        try:
+            self.commit()
+        finally:
+            self._held = False
+            self._deferred = None
+            self.close()
+
+    def abort(self) -> None:
+        """Discard any changes, see `rollback`, and release a lock acquired with `hold`.
+
+        Returns:
+            None
+        """
+        try:
+            self.rollback()
+        finally:
+            self._held = False
+            self._deferred = None
+            self.close()
 
     def close(self) -> None:
         super().close()
@@ -463,6 +752,28 @@ class LockingObjectStore(ObjectStore[DatasourceT, T]):
 
         return super().delete(uuid)
 
+    def update_many(
+        self,
+        uuids: Iterable[UUID],
+        metadata: MetaData | None = None,
+        keys_to_delete: str | list[str] | None = None,
+    ) -> None:
+        if not self.lock.is_locked:
+            raise LockingError("Object store must be locked to update data.")
+
+        return super().update_many(uuids, metadata, keys_to_delete)
+
+    def delete_many(
+        self,
+        uuids: Iterable[UUID],
+        max_workers: int | None = None,
+        callback: Callable[[UUID], None] | None = None,
+    ) -> None:
+        if not self.lock.is_locked:
+            raise LockingError("Object store must be locked to delete data.")
+
+        return super().delete_many(uuids, max_workers, callback)
+
 
 LockingObjectStoreType: TypeAlias = LockingObjectStore[Datasource, xr.Dataset]
 
@@ -478,7 +789,11 @@ def locking_object_store(
     ds_factory = get_legacy_datasource_factory(bucket=bucket, data_type=data_type, mode=mode)
     metadata_updater = make_metadata_updater_fn(skip_keys=skip_keys, extend_keys=extend_keys)
     object_store = LockingObjectStore[Datasource, xr.Dataset](
-        metastore=ms, datasource_factory=ds_factory, metadata_updater=metadata_updater, lock=ms.lock
+        metastore=ms,
+        datasource_factory=ds_factory,
+        metadata_updater=metadata_updater,
+        lock=ms.lock,
+        catalog=CatalogWriter(bucket=bucket, data_type=data_type),
     )
 
     return object_store
@@ -0,0 +1,247 @@
+"""Summary statistics for the data stored in a Datasource.
+
+Summaries are computed as data is added to a Datasource, so questions such as
+"which inlets have CH4 data above 2100 ppb in 2023" can be answered without
+opening any stored data.
+
+A summary maps the name of each numeric data variable with a time dimension to
+
+    {
+        "count": number of valid (non-NaN) values,
+        "nan_count": number of NaN values,
+        "min": minimum value,
+        "max": maximum value,
+        "mean": mean value,
+        "months": {"2023-01": [count, min, max, sum, nan_count], ...},
+    }
+
+where "min", "max" and "mean" (and the minimum and maximum for a month) are None if
+there are no valid values. The totals are calculated from the values for each month,
+so when data is added only the months it covers need to be summarised again.
+
+The full summary of each version is stored next to the stored data (see
+`LocalZarrStore.set_summary`) and only the totals (see `summary_totals`) are
+added to the metadata of the Datasource.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+import dask
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from openghg.util._execution import dask_scheduler
+
+__all__ = ["compute_summary", "merge_summaries", "replace_months", "summary_matches", "summary_totals"]
+
+
+def _to_float(value: Any) -> float | None:
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def compute_summary(data: xr.Dataset, time_dim: str = "time") -> dict[str, dict]:
+    """Compute summary statistics of the numeric variables in a Dataset.
+
+    Args:
+        data: Dataset with a time dimension
+        time_dim: Name of time dimension
+    Returns:
+        dict: Summary of each variable, see module documentation
+    """
+    names = [
+        str(name)
+        for name, variable in data.data_vars.items()
+        if time_dim in variable.dims
+        and np.issubdtype(variable.dtype, np.number)
+        and not np.issubdtype(variable.dtype, np.timedelta64)
+    ]
+
+    if not names or not data.sizes.get(time_dim):
+        return {}
+
+    numeric = data[names]
+    other_dims = [dim for dim in numeric.dims if dim != time_dim]
+
+    # Reduce to a value per time, computing all reductions in a single pass over the data
+    with dask_scheduler():
+        count, minimum, maximum, total = dask.compute(
+            numeric.count(dim=other_dims),
+            numeric.min(dim=other_dims),
+            numeric.max(dim=other_dims),
+            numeric.sum(dim=other_dims),
+        )
+
+    months = pd.Index(data[time_dim].values.astype("datetime64[M]").astype(str), name="month")
+
+    summary = {}
+    for name in names:
+        variable = numeric[name]
+        values_per_time = int(variable.size // variable.sizes[time_dim])
+        per_time = pd.DataFrame(
+            {
+                "count": count[name].values,
+                "min": minimum[name].values,
+                "max": maximum[name].values,
+                "sum": total[name].values,
+            },
+            index=months,
+        )
+        per_time.loc[per_time["count"] == 0, ["min", "max", "sum"]] = np.nan
+        per_time["nan_count"] = values_per_time - per_time["count"]
+
+        per_month = per_time.groupby(level="month").agg(
+            {"count": "sum", "min": "min", "max": "max", "sum": "sum", "nan_count": "sum"}
+        )
+
+        summary[name] = _with_totals(
+            {
+                str(month): [int(n), _to_float(low), _to_float(high), float(n_sum), int(n_nan)]
+                for month, n, low, high, n_sum, n_nan in zip(
+                    per_month.index,
+                    per_month["count"],
+                    per_month["min"],
+                    per_month["max"],
+                    per_month["sum"],
+                    per_month["nan_count"],
+                )
+            }
+        )
+
+    return summary
+
+
+def _merge_extreme(a: float | None, b: float | None, func: Any) -> float | None:
+    values = [v for v in (a, b) if v is not None]
+    return func(values) if values else None
+
+
+def _with_totals(months: dict[str, list]) -> dict:
+    """Create the summary of a variable from the statistics for each month."""
+    months = dict(sorted(months.items()))
+
+    count = sum(entry[0] for entry in months.values())
+    minimum = None
+    maximum = None
+    for _, low, high, _, _ in months.values():
+        minimum = _merge_extreme(minimum, low, min)
+        maximum = _merge_extreme(maximum, high, max)
+
+    return {
+        "count": count,
+        "nan_count": sum(entry[4] for entry in months.values()),
+        "min": minimum,
+        "max": maximum,
+        "mean": sum(entry[3] for entry in months.values()) / count if count else None,
+        "months": months,
+    }
+
+
+def merge_summaries(current: dict[str, dict], new: dict[str, dict]) -> dict[str, dict]:
+    """Combine the summaries of two Datasets which don't overlap in time.
+
+    Args:
+        current: Summary of the data currently stored
+        new: Summary of the data added
+    Returns:
+        dict: Summary of the combined data
+    """
+    merged = {}
+    for name in {**current, **new}:
+        months = dict(current.get(name, {}).get("months", {}))
+
+        for month, (n, low, high, n_sum, n_nan) in new.get(name, {}).get("months", {}).items():
+            if month in months:
+                m_n, m_low, m_high, m_sum, m_nan = months[month]
+                months[month] = [
+                    m_n + n,
+                    _merge_extreme(m_low, low, min),
+                    _merge_extreme(m_high, high, max),
+                    m_sum + n_sum,
+                    m_nan + n_nan,
+                ]
+            else:
+                months[month] = [n, low, high, n_sum, n_nan]
+
+        merged[name] = _with_totals(months)
+
+    return merged
+
+
+def replace_months(current: dict[str, dict], new: dict[str, dict], months: set[str]) -> dict[str, dict]:
+    """Replace the statistics for some months of a summary, e.g. after data within these
+    months has been updated.
+
+    Args:
+        current: Summary of the data before the update
+        new: Summary of all of the data now stored within the months
+        months: Months summarised in new, as "YYYY-MM" strings
+    Returns:
+        dict: Updated summary
+    """
+    kept = {
+        name: {"months": {month: entry for month, entry in stats["months"].items() if month not in months}}
+        for name, stats in current.items()
+    }
+    return merge_summaries(kept, new)
+
+
+def summary_totals(summary: dict[str, dict]) -> dict[str, dict]:
+    """The totals of a summary without the statistics for each month, as added
+    to the metadata of a Datasource.
+
+    Args:
+        summary: Summary of the data
+    Returns:
+        dict: Summary without "months"
+    """
+    return {name: {k: v for k, v in stats.items() if k != "months"} for name, stats in summary.items()}
+
+
+def summary_matches(
+    stats: dict,
+    above: float | None = None,
+    below: float | None = None,
+    min_count: int = 1,
+    start_date: str | pd.Timestamp | None = None,
+    end_date: str | pd.Timestamp | None = None,
+) -> bool:
+    """Check if the summary of a variable has enough values in a range of values and dates.
+
+    Dates and values are matched to whole months: a month is counted if any part of it is
+    between `start_date` and `end_date` and it has any value above `above` and any value below
+    `below`, in which case all of the valid values in the month are counted.
+
+    Args:
+        stats: Summary of a variable, see `compute_summary`
+        above: Only count months with values greater than this
+        below: Only count months with values less than this
+        min_count: Minimum number of valid values in the months counted
+        start_date: Start of date range
+        end_date: End of date range (exclusive)
+    Returns:
+        bool: True if the variable has at least `min_count` valid values in the months counted
+    """
+    first = None if start_date is None else str(pd.Timestamp(start_date).strftime("%Y-%m"))
+    last = None if end_date is None else str((pd.Timestamp(end_date) - pd.Timedelta(1)).strftime("%Y-%m"))
+
+    count = 0
+    for month, (n, low, high, *_) in stats.get("months", {}).items():
+        if not n:
+            continue
+        if first is not None and month < first:
+            continue
+        if last is not None and month > last:
+            continue
+        if above is not None and high <= above:
+            continue
+        if below is not None and low >= below:
+            continue
+
+        count += n
+
+    return count >= min_count
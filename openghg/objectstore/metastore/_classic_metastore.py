@@ -173,6 +173,11 @@ class SafetyCachingMiddleware(Middleware):
         self.cache = data
         self.writes_made = True
 
+    def discard(self) -> None:
+        """Drop the cached changes to the database without writing them."""
+        self.cache = None
+        self.writes_made = False
+
     def close(self):
         """Close the database. If writes have been made, and the underlying
         file has not changed, writes will be saved to disk at this point.
@@ -286,6 +291,9 @@ class DataClassMetaStore(TinyDBMetaStore):
         self.lock.release()
 
     def close(self) -> None:
-        """Close the underlying TinyDB database."""
-        self.lock.release()
-        self._db.close()
+        """Close the underlying TinyDB database, writing any changes, and release the lock."""
+        self._daterange_index = None
+        try:
+            self._db.close()
+        finally:
+            self.lock.release()
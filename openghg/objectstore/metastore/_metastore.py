@@ -20,17 +20,83 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from functools import reduce
 from typing import Any
-from collections.abc import Callable, MutableMapping
+from collections.abc import Callable, Iterable, MutableMapping
 
+import numpy as np
+from pandas import Timestamp
 import tinydb
 from tinydb.operations import delete as tinydb_delete
 
-from openghg.util import merge_and_extend_dict
+from openghg.util import merge_and_extend_dict, timestamp_tzaware
 from openghg.types import MetastoreError
 
 MetaData = dict[str, Any]
 QueryResults = list[dict[str, Any]]  # ...to avoid clashes with `SearchResults` object
 Bucket = str
+DateRange = tuple[Timestamp | str | int, Timestamp | str | int]
+
+DATERANGE_TABLE = "dateranges"
+
+
+def to_epoch_ns(date: Timestamp | str | int) -> int:
+    """Convert a date to an integer number of nanoseconds since the epoch (UTC).
+
+    Integers are assumed to already be nanoseconds since the epoch.
+
+    Args:
+        date: date to convert
+    Returns:
+        int: nanoseconds since 1970-01-01 00:00:00 UTC
+    """
+    if isinstance(date, (int, np.integer)):
+        return int(date)
+    return int(timestamp_tzaware(date).value)
+
+
+class DateRangeIndex:
+    """Index of the start and end dates of Datasources, for finding those overlapping a date range.
+
+    The intervals are sorted by start date, so only those starting before the end of the
+    date range need their end dates checked.
+    """
+
+    def __init__(self, rows: Iterable[dict]) -> None:
+        """Create DateRangeIndex object.
+
+        Args:
+            rows: dictionaries with keys "uuid", "start" and "end"; the dates are in
+                nanoseconds since the epoch.
+
+        Returns:
+            None
+        """
+        rows = list(rows)
+        starts = np.array([row["start"] for row in rows], dtype=np.int64)
+        order = np.argsort(starts, kind="stable")
+
+        self.starts = starts[order]
+        self.ends = np.array([row["end"] for row in rows], dtype=np.int64)[order]
+        self.uuids = np.array([row["uuid"] for row in rows], dtype=object)[order]
+        self._uuid_set = set(self.uuids)
+
+    def __contains__(self, uuid: object) -> bool:
+        return uuid in self._uuid_set
+
+    def __len__(self) -> int:
+        return len(self._uuid_set)
+
+    def overlapping(self, start: Timestamp | str | int, end: Timestamp | str | int) -> set[str]:
+        """Find the UUIDs whose dates overlap a date range, including its end points.
+
+        Args:
+            start: start of date range
+            end: end of date range
+        Returns:
+            set: UUIDs of Datasources with data between start and end
+        """
+        n_started = np.searchsorted(self.starts, to_epoch_ns(end), side="right")
+        in_range = self.ends[:n_started] >= to_epoch_ns(start)
+        return set(self.uuids[:n_started][in_range])
 
 
 class MetaStore(ABC):
@@ -122,6 +188,50 @@ class MetaStore(ABC):
                 "Multiple records found matching metadata. `where` must identify a single record."
             )
 
+    def update_many(
+        self,
+        uuids: Iterable[str],
+        to_update: MetaData | None = None,
+        to_delete: str | list[str] | None = None,
+    ) -> None:
+        """Update the records of several UUIDs with the same changes.
+
+        Unlike `update`, keys in `to_delete` which are not in a record are ignored.
+
+        Args:
+            uuids: UUIDs of the records to update; each must identify a single record.
+            to_update: metadata to overwrite or add to the records.
+            to_delete: key or list of keys to delete from the records.
+
+        Returns:
+            None
+
+        Raises:
+            MetastoreError if a UUID doesn't identify a single record.
+        """
+        if isinstance(to_delete, str):
+            to_delete = [to_delete]
+
+        for uuid in uuids:
+            records = self.search({"uuid": uuid})
+            if len(records) != 1:
+                raise MetastoreError(f"UUID {uuid} must identify a single record, found {len(records)}.")
+            keys = [key for key in to_delete or [] if key in records[0]]
+            if to_update or keys:
+                self.update(where={"uuid": uuid}, to_update=to_update, to_delete=keys)
+
+    def delete_many(self, uuids: Iterable[str]) -> None:
+        """Delete the records of several UUIDs.
+
+        Args:
+            uuids: UUIDs of the records to delete
+
+        Returns:
+            None
+        """
+        for uuid in uuids:
+            self.delete({"uuid": uuid})
+
     def select(self, key: str) -> list[Any]:
         """Select the values stored in all records for given key.
 
@@ -133,6 +243,29 @@ class MetaStore(ABC):
         """
         return [result[key] for result in self.search()]
 
+    def set_daterange(self, uuid: str, start_date: Timestamp | str, end_date: Timestamp | str) -> None:
+        """Record the start and end dates of the data stored for a UUID.
+
+        Metastores which don't index dates ignore this.
+
+        Args:
+            uuid: UUID of Datasource
+            start_date: start date of data
+            end_date: end date of data
+
+        Returns:
+            None
+        """
+        pass
+
+    def daterange_index(self) -> DateRangeIndex:
+        """Return the index of the dates recorded by `set_daterange`.
+
+        Returns:
+            DateRangeIndex: index of recorded dates (empty if dates aren't indexed)
+        """
+        return DateRangeIndex([])
+
     def _uniquely_identifies(self, metadata: MetaData) -> bool:
         """Return true if the given metadata identifies a single record in the metastore.
 
@@ -145,6 +278,14 @@ class MetaStore(ABC):
         result = self.search(search_terms=metadata)
         return len(result) == 1
 
+    def flush(self) -> None:
+        """Write any pending changes to the Metastore."""
+        pass
+
+    def discard(self) -> None:
+        """Discard any pending changes that haven't been written to the Metastore."""
+        pass
+
     def close(self) -> None:
         """Clean up any resources used by the Metastore."""
         pass
@@ -163,6 +304,8 @@ class TinyDBMetaStore(MetaStore):
             None
         """
         self._db = database
+        self._dateranges = database.table(DATERANGE_TABLE)
+        self._daterange_index: DateRangeIndex | None = None
 
     @staticmethod
     def _format_key(key: str) -> str:
@@ -246,6 +389,7 @@ class TinyDBMetaStore(MetaStore):
         search_functions: dict[str, Callable] | None = None,
         negative_lookup_keys: list[str] | None = None,
         search_list_keys: dict | None = None,
+        daterange: DateRange | None = None,
     ) -> QueryResults:
         """Search metastore using a dictionary of search terms.
 
@@ -260,6 +404,9 @@ class TinyDBMetaStore(MetaStore):
             search_list_keys: dictionary of keys which we expect to be store lists
                 in the database and the values to search. This allows a
                 search for values in those lists rather than exact matches.
+            daterange: start and end dates; records whose dates (see `set_daterange`) don't
+                overlap this range are excluded. Records without recorded dates are not excluded,
+                since these can't be checked here.
 
         Returns:
             list: list of records in the metastore matching the given search terms.
@@ -280,7 +427,14 @@ class TinyDBMetaStore(MetaStore):
             _list_query = self._get_list_items_query(search_list_keys)
             _query &= _list_query
 
-        return list(self._db.search(_query))
+        results = list(self._db.search(_query))
+
+        if daterange is not None and results:
+            index = self.daterange_index()
+            in_range = index.overlapping(*daterange)
+            results = [r for r in results if r.get("uuid") in in_range or r.get("uuid") not in index]
+
+        return results
 
     def insert(self, metadata: MetaData) -> None:
         """Add new metadata to the metastore.
@@ -361,11 +515,131 @@ class TinyDBMetaStore(MetaStore):
         """
         super().delete(metadata, delete_one)  # Error handling
         _query = self._get_query(metadata)
+        uuids = [r["uuid"] for r in self._db.search(_query) if "uuid" in r]
         self._db.remove(_query)
 
+        if uuids:
+            self._dateranges.remove(tinydb.Query().uuid.one_of(uuids))
+            self._daterange_index = None
+
+    def update_many(
+        self,
+        uuids: Iterable[str],
+        to_update: MetaData | None = None,
+        to_delete: str | list[str] | None = None,
+    ) -> None:
+        """Update the records of several UUIDs with the same changes.
+
+        The records are found and updated in a single pass over the database.
+        Unlike `update`, keys in `to_delete` which are not in a record are ignored.
+
+        Args:
+            uuids: UUIDs of the records to update; each must identify a single record.
+            to_update: metadata to overwrite or add to the records.
+            to_delete: key or list of keys to delete from the records.
+
+        Returns:
+            None
+
+        Raises:
+            MetastoreError if a UUID doesn't identify a single record.
+        """
+        uuids = set(uuids)
+        docs = self._db.search(tinydb.Query().uuid.one_of(list(uuids)))
+
+        found = [doc["uuid"] for doc in docs]
+        missing = uuids - set(found)
+        if missing:
+            raise MetastoreError(f"No records found for UUIDs {sorted(missing)}.")
+        if len(found) != len(uuids):
+            raise MetastoreError("Multiple records found for some UUIDs, each must identify a single record.")
+
+        if isinstance(to_delete, str):
+            to_delete = [to_delete]
+        keys = list(to_delete or [])
+
+        def updater(doc: MutableMapping) -> None:
+            for key in keys:
+                doc.pop(key, None)
+            if to_update:
+                doc.update(to_update)
+
+        # NOTE: type hints for TinyDB.Table.update are incorrect, so we have to suppress Mypy below
+        self._db.update(updater, doc_ids=[doc.doc_id for doc in docs])  # type: ignore
+
+    def delete_many(self, uuids: Iterable[str]) -> None:
+        """Delete the records of several UUIDs, in a single pass over the database.
+
+        Args:
+            uuids: UUIDs of the records to delete
+
+        Returns:
+            None
+        """
+        uuids = list(uuids)
+        if not uuids:
+            return
+
+        self._db.remove(tinydb.Query().uuid.one_of(uuids))
+        self._dateranges.remove(tinydb.Query().uuid.one_of(uuids))
+        self._daterange_index = None
+
+    def set_daterange(self, uuid: str, start_date: Timestamp | str, end_date: Timestamp | str) -> None:
+        """Record the start and end dates of the data stored for a UUID.
+
+        The dates are stored as integer nanoseconds since the epoch in a separate table,
+        so that searches by date don't need to parse the dates of each record.
+
+        Args:
+            uuid: UUID of Datasource
+            start_date: start date of data
+            end_date: end date of data
+
+        Returns:
+            None
+        """
+        row = {"uuid": uuid, "start": to_epoch_ns(start_date), "end": to_epoch_ns(end_date)}
+        self._dateranges.upsert(row, tinydb.Query().uuid == uuid)
+        self._daterange_index = None
+
+    def daterange_index(self) -> DateRangeIndex:
+        """Return the index of the dates recorded by `set_daterange`.
+
+        The index is kept until the dates are changed or the metastore is flushed.
+
+        Returns:
+            DateRangeIndex: index of recorded dates
+        """
+        if self._daterange_index is None:
+            self._daterange_index = DateRangeIndex(self._dateranges.all())
+        return self._daterange_index
+
+    def flush(self) -> None:
+        """Write any pending changes to the Metastore.
+
+        Changes cached by the TinyDB storage middleware are written when
+        the database is closed; the database is read again on next use.
+        """
+        self._daterange_index = None
+        self._db.close()
+
+    def discard(self) -> None:
+        """Discard any pending changes that haven't been written to the Metastore.
+
+        Changes cached by the TinyDB storage middleware are dropped, so the database
+        is read again on next use.
+        """
+        self._daterange_index = None
+        storage = self._db.storage
+        if hasattr(storage, "discard"):
+            storage.discard()
+        for table in (self._db.table(self._db.default_table_name), self._dateranges):
+            table.clear_cache()
+
     def close(self) -> None:
         """Clean up any resources used by the Metastore.
 
         Closes the TinyDB store.
         """
+        self._daterange_index = None
         self._db.close()
@@ -1,3 +1,18 @@
-from ._footprint import plot_footprint
-from ._timeseries import plot_timeseries
-from ._met_timeseries import plot_met_timeseries
+from typing import TYPE_CHECKING
+
+from openghg._lazy import lazy_exports
+
+# Attributes are imported from their submodules on first access, see openghg._lazy
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "._footprint": ["plot_footprint"],
+        "._timeseries": ["plot_timeseries"],
+        "._met_timeseries": ["plot_met_timeseries"],
+    },
+)
+
+if TYPE_CHECKING:
+    from ._footprint import plot_footprint
+    from ._timeseries import plot_timeseries
+    from ._met_timeseries import plot_met_timeseries
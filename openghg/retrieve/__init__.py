@@ -1,18 +1,50 @@
-from ._access import (
-    get_bc,
-    get_flux,
-    get_footprint,
-    get_obs_column,
-    get_obs_surface,
-)
-from ._export import get_ceda_file
-from ._search import (
-    search,
-    search_bc,
-    search_column,
-    search_flux,
-    search_eulerian,
-    search_footprints,
-    search_site_met,
-    search_surface,
+from typing import TYPE_CHECKING
+
+from openghg._lazy import lazy_exports
+
+# Attributes are imported from their submodules on first access, see openghg._lazy
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "._access": [
+            "get_bc",
+            "get_flux",
+            "get_footprint",
+            "get_footprint_coords",
+            "get_obs_column",
+            "get_obs_surface",
+        ],
+        "._export": ["get_ceda_file"],
+        "._search": [
+            "search",
+            "search_bc",
+            "search_column",
+            "search_flux",
+            "search_eulerian",
+            "search_footprints",
+            "search_site_met",
+            "search_surface",
+        ],
+    },
 )
+
+if TYPE_CHECKING:
+    from ._access import (
+        get_bc,
+        get_flux,
+        get_footprint,
+        get_footprint_coords,
+        get_obs_column,
+        get_obs_surface,
+    )
+    from ._export import get_ceda_file
+    from ._search import (
+        search,
+        search_bc,
+        search_column,
+        search_flux,
+        search_eulerian,
+        search_footprints,
+        search_site_met,
+        search_surface,
+    )
@@ -1,6 +1,9 @@
 import logging
+from collections.abc import Iterable
 from typing import Any, Union
 
+import numpy as np
+
 from openghg.data_processing import surface_obs_resampler, column_obs_resampler
 from openghg.dataobjects._basedata import _BaseData  # TODO: expose this type?
 from openghg.dataobjects import (
@@ -11,7 +14,7 @@ from openghg.dataobjects import (
     ObsData,
 )
 from openghg.types import SearchError
-from openghg.util import combine_and_elevate_inlet, assign_units, update_scale
+from openghg.util import combine_and_elevate_inlet, assign_units, get_spatial_bounds, update_scale
 
 from pandas import Timestamp
 
@@ -28,6 +31,7 @@ def _get_generic(
     combine_multiple_inlets: bool = False,
     ambig_check_params: list | None = None,
     version: str = "latest",
+    spatial_bounds: dict[str, tuple[float, float]] | None = None,
     **kwargs: Any,
 ) -> _BaseData:
     """Perform a search and create a dataclass object with the results if any are found.
@@ -38,6 +42,8 @@ def _get_generic(
             to a data variable.
         ambig_check_params: Parameters to check and print if result is ambiguous.
         version: Version of data to retrieve. Default = "latest".
+        spatial_bounds: Minimum and maximum values of the "lat" and / or "lon" coordinates to select,
+            only the data within these is read.
         kwargs: Additional search terms
 
     Returns:
@@ -54,7 +60,7 @@ def _get_generic(
         raise SearchError(err_msg)
 
     # TODO: UPDATE THIS - just use retrieve when retrieve_all is removed.
-    retrieved_data = results.retrieve_all(version=version)
+    retrieved_data = results.retrieve_all(version=version, spatial_bounds=spatial_bounds)
 
     if retrieved_data is None:
         err_msg = f"Unable to retrieve results for {keyword_string}"
@@ -424,6 +430,9 @@ def get_flux(
     target_units: dict | None = None,
     is_dequantified: bool = True,
     version: str = "latest",
+    lat_bounds: tuple[float, float] | None = None,
+    lon_bounds: tuple[float, float] | None = None,
+    sub_domain: str | None = None,
     **kwargs: Any,
 ) -> FluxData:
     """The flux function reads in all flux files for the domain and species as an xarray Dataset.
@@ -445,6 +454,12 @@ def get_flux(
         }
         is_dequantified: To dequantify the dataset after getting assigned with pint units. By default it will dequantify the data upon return. To keep the quantification applied supply `False`.
         version: Version of data to retrieve. Default = "latest".
+        lat_bounds: Minimum and maximum latitude to select, in degrees
+        lon_bounds: Minimum and maximum longitude to select, in degrees. This must use the
+            same convention (-180 to 180 or 0 to 360) as the stored data.
+        sub_domain: Name of a pre-defined domain to select, e.g. "EUROPE". Any lat_bounds or
+            lon_bounds given are used in preference to the extent of this domain.
+            Only the stored chunks overlapping the selected region are read.
         kwargs: Additional search terms
     Returns:
         FluxData: FluxData object
@@ -461,6 +476,9 @@ def get_flux(
         end_date=end_date,
         data_type="flux",
         version=version,
+        spatial_bounds=get_spatial_bounds(
+            lat_bounds=lat_bounds, lon_bounds=lon_bounds, sub_domain=sub_domain
+        ),
         **kwargs,
     )
 
@@ -486,6 +504,9 @@ def get_bc(
     target_units: dict | None = None,
     is_dequantified: bool = True,
     version: str = "latest",
+    lat_bounds: tuple[float, float] | None = None,
+    lon_bounds: tuple[float, float] | None = None,
+    sub_domain: str | None = None,
     **kwargs: Any,
 ) -> BoundaryConditionsData:
     """Get boundary conditions for a given species, domain and bc_input name.
@@ -506,6 +527,12 @@ def get_bc(
         }
         is_dequantified: To dequantify the dataset after getting assigned with pint units. By default it will dequantify the data upon return. To keep the quantification applied supply `False`.
         version: Version of data to retrieve. Default = "latest".
+        lat_bounds: Minimum and maximum latitude to select, in degrees
+        lon_bounds: Minimum and maximum longitude to select, in degrees. This must use the
+            same convention (-180 to 180 or 0 to 360) as the stored data.
+        sub_domain: Name of a pre-defined domain to select, e.g. "EUROPE". Any lat_bounds or
+            lon_bounds given are used in preference to the extent of this domain.
+            Only the stored chunks overlapping the selected region are read.
     Returns:
         BoundaryConditionsData: BoundaryConditionsData object
     """
@@ -517,6 +544,9 @@ def get_bc(
         end_date=end_date,
         data_type="boundary_conditions",
         version=version,
+        spatial_bounds=get_spatial_bounds(
+            lat_bounds=lat_bounds, lon_bounds=lon_bounds, sub_domain=sub_domain
+        ),
         **kwargs,
     )
 
@@ -538,6 +568,9 @@ def get_footprint(
     target_units: dict | None = None,
     is_dequantified: bool = True,
     version: str = "latest",
+    lat_bounds: tuple[float, float] | None = None,
+    lon_bounds: tuple[float, float] | None = None,
+    sub_domain: str | None = None,
     **kwargs: Any,
 ) -> FootprintData:
     """Get footprints from one site.
@@ -568,6 +601,12 @@ def get_footprint(
         }
         is_dequantified: To dequantify the dataset after getting assigned with pint units. By default it will dequantify the data upon return. To keep the quantification applied supply `False`.
         version: Version of data to retrieve. Default = "latest".
+        lat_bounds: Minimum and maximum latitude to select, in degrees
+        lon_bounds: Minimum and maximum longitude to select, in degrees. This must use the
+            same convention (-180 to 180 or 0 to 360) as the stored data.
+        sub_domain: Name of a pre-defined domain to select, e.g. "EUROPE". Any lat_bounds or
+            lon_bounds given are used in preference to the extent of this domain.
+            Only the stored chunks overlapping the selected region are read.
         kwargs: Additional search terms
     Returns:
         FootprintData: FootprintData dataclass
@@ -596,6 +635,9 @@ def get_footprint(
         species=species,
         data_type="footprints",
         version=version,
+        spatial_bounds=get_spatial_bounds(
+            lat_bounds=lat_bounds, lon_bounds=lon_bounds, sub_domain=sub_domain
+        ),
         **kwargs,
     )
 
@@ -659,6 +701,83 @@ def get_footprint(
 #     return data
 
 
+def get_footprint_coords(
+    domain: str,
+    site: str | None = None,
+    satellite: str | None = None,
+    obs_region: str | None = None,
+    inlet: str | None = None,
+    height: str | None = None,
+    model: str | None = None,
+    species: str | None = None,
+    coords: Iterable[str] = ("lat", "lon", "height"),
+    version: str = "latest",
+    **kwargs: Any,
+) -> dict[str, np.ndarray]:
+    """Get the coordinates of the grid used by a stored footprint.
+
+    This accepts the same search terms as `get_footprint` but only reads the
+    coordinate arrays from the object store, rather than opening the full
+    footprint data. This is useful when only the grid is needed, e.g. to
+    interpolate other data onto the footprint domain.
+
+    Args:
+        domain: Domain name for the footprints
+        site: The name of the site given in the footprints
+        satellite: The name of the satellite footprints data. e.g GOSAT
+        obs_region: The geographic region covered by the data ("BRAZIL", "INDIA", "UK").
+        inlet: Height above ground level in metres
+        height: Alias for inlet
+        model: Model used to create footprint (e.g. NAME or FLEXPART)
+        species: Species identifier for species specific footprints
+        coords: Names of the coordinates to extract. Default = ("lat", "lon", "height")
+        version: Version of data to retrieve. Default = "latest".
+        kwargs: Additional search terms
+    Returns:
+        dict: Coordinate names mapped to numpy arrays of their values
+    """
+    from openghg.objectstore import get_datasource
+    from openghg.retrieve import search
+    from openghg.util import clean_string, format_inlet, synonyms
+
+    if species is not None:
+        species = clean_string(synonyms(species))
+
+    search_terms = dict(
+        site=site,
+        domain=domain,
+        satellite=satellite,
+        obs_region=obs_region,
+        inlet=format_inlet(inlet),
+        height=format_inlet(height),
+        model=model,
+        species=species,
+        data_type="footprints",
+        **kwargs,
+    )
+
+    results = search(**search_terms)
+
+    keyword_string = _create_keyword_string(**search_terms)
+    if not results:
+        err_msg = f"Unable to find results for {keyword_string}"
+        logger.exception(err_msg)
+        raise SearchError(err_msg)
+    elif len(results) > 1:
+        err_msg = (
+            f"Multiple entries found for input parameters for {keyword_string}."
+            " Please supply additional parameters."
+        )
+        logger.exception(err_msg)
+        raise SearchError(err_msg)
+
+    uuid, metadata = next(iter(results.metadata.items()))
+
+    datasource = get_datasource(bucket=metadata["object_store"], uuid=uuid, data_type="footprints")
+
+    return datasource.get_coords(names=coords, version=version)
+
+
 def _create_keyword_string(**kwargs: Any) -> str:
     """Create a formatted string for supplied keyword values. This will ignore
     keywords where the value is None.
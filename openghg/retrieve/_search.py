@@ -9,7 +9,7 @@ from typing import Any
 import warnings
 from openghg.objectstore import open_object_store
 from openghg.store.spec import define_data_types
-from openghg.objectstore import get_readable_buckets
+from openghg.objectstore import get_readable_buckets, load_catalog
 from openghg.types import ObjectStoreError
 from openghg.dataobjects import SearchResults
 from ._search_helpers import process_search_kwargs, define_list_search
@@ -461,12 +461,14 @@ def search(**kwargs: Any) -> SearchResults:
         If None a start datetime of UNIX epoch (1970-01-01) is set
         end_date: End datetime for search.
         If None an end datetime of the current datetime is set
+        summary_filter: Narrow the results using the summary statistics recorded when the data
+        was stored, e.g. {"variable": "ch4", "above": 2100}. See `SearchResults.filter_summary`
+        for the options.
     Returns:
         SearchResults or None: SearchResults object is results found, otherwise None
     """
     from openghg.util import (
         clean_string,
-        dates_overlap,
         format_inlet,
         synonyms,
         timestamp_epoch,
@@ -477,6 +479,8 @@ def search(**kwargs: Any) -> SearchResults:
     from pandas import Timedelta as pd_Timedelta
     from openghg.util import handle_direct_store_path
 
+    summary_filter = kwargs.pop("summary_filter", None)
+
     # Select and format the search terms
     # - ignore any kwargs which are None
     # - clean search terms directly or within data structures
@@ -561,19 +565,48 @@ def search(**kwargs: Any) -> SearchResults:
     start_date = search_kwargs.pop("start_date", None)
     end_date = search_kwargs.pop("end_date", None)
 
+    # Narrow the search to a daterange if dates passed, the metastore checks the dates of each Datasource
+    daterange = None
+    if start_date is not None or end_date is not None:
+        if start_date is None:
+            start_date = timestamp_epoch()
+        else:
+            start_date = timestamp_tzaware(start_date) + pd_Timedelta("1s")
+
+        if end_date is None:
+            end_date = timestamp_now()
+        else:
+            end_date = timestamp_tzaware(end_date) - pd_Timedelta("1s")
+
+        daterange = (start_date, end_date)
+
     expanded_search = process_search_kwargs(search_kwargs, list_search=list_search)
     general_metadata = {}
 
     for bucket_name, bucket in readable_buckets.items():
+        # Only open the metastores of data types the catalog shows may have matching results
+        catalog = load_catalog(bucket)
+        if catalog is None:
+            bucket_types = types_to_search
+        else:
+            bucket_types = catalog.data_types_to_search(types_to_search, expanded_search)
+
         metastore_records = []
-        for data_type in types_to_search:
+        outside_daterange = False
+        for data_type in bucket_types:
             with open_object_store(bucket=bucket, data_type=data_type, mode="r") as objstore:
                 for v in expanded_search:
-                    res = objstore.search(**v)
+                    res = objstore.search(**v, daterange=daterange)
                     if res:
                         metastore_records.extend(res)
+                    elif daterange is not None and not outside_daterange:
+                        outside_daterange = bool(objstore.search(**v))
 
         if not metastore_records:
+            if outside_daterange:
+                logger.warning(
+                    f"No data found for the dates given in the {bucket_name} store, please try a wider search."
+                )
             continue
 
         # Add in a quick check to make sure we don't have dupes
@@ -592,35 +625,6 @@ def search(**kwargs: Any) -> SearchResults:
         for m in metadata.values():
             m.update({"object_store": bucket})
 
-        # Narrow the search to a daterange if dates passed
-        if start_date is not None or end_date is not None:
-            if start_date is None:
-                start_date = timestamp_epoch()
-            else:
-                start_date = timestamp_tzaware(start_date) + pd_Timedelta("1s")
-
-            if end_date is None:
-                end_date = timestamp_now()
-            else:
-                end_date = timestamp_tzaware(end_date) - pd_Timedelta("1s")
-
-            metadata_in_daterange = {}
-
-            # TODO - we can remove this now the metastore contains the start and end dates of the Datasources
-            for uid, record in metadata.items():
-                meta_start = record["start_date"]
-                meta_end = record["end_date"]
-
-                if dates_overlap(start_a=start_date, end_a=end_date, start_b=meta_start, end_b=meta_end):
-                    metadata_in_daterange[uid] = record
-
-            if not metadata_in_daterange:
-                logger.warning(
-                    f"No data found for the dates given in the {bucket_name} store, please try a wider search."
-                )
-            # Update the metadata we'll use to create the SearchResults object
-            metadata = metadata_in_daterange
-
         # Remove once more comprehensive tests are done
         dupe_uuids = [k for k in metadata if k in general_metadata]
         if dupe_uuids:
@@ -628,6 +632,11 @@ def search(**kwargs: Any) -> SearchResults:
 
         general_metadata.update(metadata)
 
-    return SearchResults(
+    results = SearchResults(
         metadata=general_metadata, start_result="data_type", start_date=start_date, end_date=end_date
     )
+
+    if summary_filter is not None:
+        results = results.filter_summary(**summary_filter)
+
+    return results
@@ -1 +1,2 @@
 from ._retrieve import retrieve_atmospheric
+from ._cache import ICOSResponseCache, get_icos_cache, set_icos_cache
@@ -0,0 +1,495 @@
+"""Local cache for responses from the ICOS Carbon Portal.
+
+SPARQL query results and data object payloads are stored on disc so that
+repeated retrievals (e.g. refreshing data for a network of stations) don't
+re-query and re-download everything from the Carbon Portal.
+
+Payloads are content-addressed: each response body is stored once under its
+SHA1 hash and each request (method, URL and body) has a small JSON entry
+pointing to the payload along with the time it was fetched and any
+"ETag" / "Last-Modified" validators returned by the server.
+
+Entries younger than the time-to-live (TTL) are used directly. Older entries are
+revalidated with a conditional request ("If-None-Match" / "If-Modified-Since") so the
+payload is only downloaded again if it has changed.
+
+To use a cache for the ICOS retrieval functions, call `set_icos_cache`:
+
+>>> set_icos_cache("~/.openghg/icos_cache", ttl=3600)
+"""
+
+import io
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+from urllib.request import Request, urlopen
+
+from icoscp_core.cpb import ArraysDict, TableRequest, codec_from_dobj_meta
+from icoscp_core.envri import ICOS_CONFIG
+from icoscp_core.metacore import DataObject, parse_cp_json
+from icoscp_core.sparql import BoundLiteral, BoundUri, BoundValue, SparqlResults
+
+from openghg.types import pathType
+from openghg.util import hash_bytes, hash_string
+
+logger = logging.getLogger("openghg.retrieve")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Default time-to-live for cached responses in seconds (1 day)
+DEFAULT_TTL = 24 * 60 * 60.0
+
+_icos_cache: "ICOSResponseCache | None" = None
+
+
+class ICOSResponseCache:
+    """Content-addressed local cache for ICOS Carbon Portal HTTP responses.
+
+    The cache is safe to use from multiple threads: entries and payloads are written to
+    temporary files and moved into place.
+    """
+
+    def __init__(
+        self,
+        cache_dir: pathType,
+        ttl: float = DEFAULT_TTL,
+        sparql_endpoint: str = ICOS_CONFIG.sparql_endpoint,
+        data_service_url: str = ICOS_CONFIG.data_service_base_url,
+        auth: Any | None = None,
+        timeout: float = 300.0,
+    ):
+        """
+        Args:
+            cache_dir: Directory to store cached responses in. This will be created if needed.
+            ttl: Time-to-live for cached responses in seconds. After this time, responses will be
+                revalidated with the server. Default = 1 day.
+            sparql_endpoint: URL of the SPARQL endpoint
+            data_service_url: Base URL of the data service used to download data objects
+            auth: Authentication token provider for data object downloads. If not specified,
+                the authentication configured for icoscp_core will be used when downloading
+                from the ICOS data service.
+            timeout: Timeout for each request in seconds
+        """
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.ttl = ttl
+        self.sparql_endpoint = sparql_endpoint
+        self.data_service_url = data_service_url.rstrip("/")
+        self.timeout = timeout
+        self._auth = auth
+
+        self._entries_dir = self.cache_dir / "entries"
+        self._objects_dir = self.cache_dir / "objects"
+        self._entries_dir.mkdir(parents=True, exist_ok=True)
+        self._objects_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def request_key(url: str, method: str = "GET", data: bytes | None = None) -> str:
+        """Create the cache key for a request.
+
+        Args:
+            url: URL of the request
+            method: HTTP method
+            data: Body of the request
+        Returns:
+            str: SHA1 hash identifying the request
+        """
+        body_hash = hash_bytes(data) if data is not None else ""
+        return hash_string(f"{method.upper()} {url} {body_hash}")
+
+    def _entry_path(self, key: str) -> Path:
+        return self._entries_dir / f"{key}.json"
+
+    def _object_path(self, content_hash: str) -> Path:
+        return self._objects_dir / content_hash[:2] / content_hash
+
+    @staticmethod
+    def _write_atomic(path: Path, content: bytes) -> None:
+        """Write to a temporary file and move this into place so readers never see partial files."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, path)
+
+    def get_entry(self, key: str) -> dict | None:
+        """Get the cache entry for a request key, if present and its payload exists.
+
+        Args:
+            key: Request key (see request_key())
+        Returns:
+            dict / None: Cache entry details
+        """
+        entry_path = self._entry_path(key)
+        try:
+            entry: dict = json.loads(entry_path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if not self._object_path(entry["content_hash"]).exists():
+            return None
+
+        return entry
+
+    def read_payload(self, entry: dict) -> bytes:
+        """Read the cached payload for an entry.
+
+        Args:
+            entry: Cache entry (see get_entry())
+        Returns:
+            bytes: Payload
+        """
+        return self._object_path(entry["content_hash"]).read_bytes()
+
+    def store(
+        self, key: str, url: str, payload: bytes, etag: str | None = None, last_modified: str | None = None
+    ) -> dict:
+        """Store a response payload within the cache.
+
+        Args:
+            key: Request key (see request_key())
+            url: URL of the request
+            payload: Response body
+            etag: ETag header returned by the server
+            last_modified: Last-Modified header returned by the server
+        Returns:
+            dict: Cache entry
+        """
+        content_hash = hash_bytes(payload)
+        object_path = self._object_path(content_hash)
+        if not object_path.exists():
+            self._write_atomic(object_path, payload)
+
+        entry = {
+            "url": url,
+            "content_hash": content_hash,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+        }
+        self._write_atomic(self._entry_path(key), json.dumps(entry).encode("utf-8"))
+
+        return entry
+
+    def _touch(self, key: str, entry: dict) -> None:
+        """Update the fetched time for an entry which has been revalidated."""
+        entry = entry | {"fetched_at": time.time()}
+        self._write_atomic(self._entry_path(key), json.dumps(entry).encode("utf-8"))
+
+    def is_fresh(self, entry: dict, ttl: float | None = None) -> bool:
+        """Check whether an entry is within its time-to-live.
+
+        Args:
+            entry: Cache entry (see get_entry())
+            ttl: Time-to-live in seconds. Defaults to the TTL for the cache.
+        Returns:
+            bool: True if the entry can be used without revalidation
+        """
+        ttl = self.ttl if ttl is None else ttl
+        return bool((time.time() - entry["fetched_at"]) < ttl)
+
+    def fetch(
+        self,
+        url: str,
+        method: str = "GET",
+        data: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        ttl: float | None = None,
+    ) -> bytes:
+        """Fetch the response body for a request, using the cache where possible.
+
+        If a cached entry is within the TTL this is returned directly. Otherwise a conditional
+        request is made using any validators for the cached entry and the cached payload is
+        returned if the server responds with "304 Not Modified". If the server can't be reached
+        a stale cached payload will be returned, if available.
+
+        Args:
+            url: URL of the request
+            method: HTTP method
+            data: Body of the request
+            headers: Additional request headers
+            ttl: Time-to-live in seconds. Defaults to the TTL for the cache.
+        Returns:
+            bytes: Response body
+        """
+        key = self.request_key(url, method=method, data=data)
+        entry = self.get_entry(key)
+
+        if entry is not None and self.is_fresh(entry, ttl=ttl):
+            logger.debug(f"Using cached response for {url}")
+            return self.read_payload(entry)
+
+        request_headers = dict(headers) if headers is not None else {}
+        if entry is not None:
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        request = Request(url=url, data=data, headers=request_headers, method=method)
+
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                payload: bytes = response.read()
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+        except HTTPError as err:
+            if err.code == 304 and entry is not None:
+                logger.debug(f"Cached response for {url} is still valid")
+                self._touch(key, entry)
+                return self.read_payload(entry)
+            raise
+        except OSError as err:
+            if entry is not None:
+                logger.warning(f"Unable to reach {url} ({err}). Using cached response.")
+                return self.read_payload(entry)
+            raise
+
+        self.store(key, url, payload, etag=etag, last_modified=last_modified)
+
+        return payload
+
+    def _sparql_json(self, query: str, ttl: float | None = None) -> dict:
+        """Run a SPARQL query, using the cache where possible, returning the JSON results."""
+        payload = self.fetch(
+            self.sparql_endpoint,
+            method="POST",
+            data=query.encode("utf-8"),
+            headers={"Accept": "application/json", "Content-Type": "text/plain"},
+            ttl=ttl,
+        )
+        results: dict = json.loads(payload)
+        return results
+
+    def sparql_select(self, query: str, ttl: float | None = None) -> SparqlResults:
+        """Run a SPARQL SELECT query, using the cache where possible.
+
+        This returns the same SparqlResults object as `icoscp_core.icos.meta.sparql_select`.
+
+        Args:
+            query: SPARQL query
+            ttl: Time-to-live in seconds. Defaults to the TTL for the cache.
+        Returns:
+            SparqlResults: Query results
+        """
+        results = self._sparql_json(query, ttl=ttl)
+        variable_names: list[str] = results["head"]["vars"]
+        bindings = [
+            {name: _parse_bound_value(value) for name, value in binding.items()}
+            for binding in results["results"]["bindings"]
+        ]
+        return SparqlResults(variable_names, bindings)
+
+    def sparql_records(self, query: str, ttl: float | None = None) -> list[dict[str, str | None]]:
+        """Run a SPARQL SELECT query, using the cache where possible, returning the
+        plain value of each binding (the same values as `icoscp.sparql.runsparql.RunSparql`).
+
+        Args:
+            query: SPARQL query
+            ttl: Time-to-live in seconds. Defaults to the TTL for the cache.
+        Returns:
+            list: Dictionary of variable name to value (None if unbound) for each result
+        """
+        results = self._sparql_json(query, ttl=ttl)
+        variable_names: list[str] = results["head"]["vars"]
+        return [
+            {name: binding.get(name, {}).get("value") for name in variable_names}
+            for binding in results["results"]["bindings"]
+        ]
+
+    def _auth_headers(self) -> dict[str, str]:
+        """Headers needed to authenticate with the data service."""
+        headers = {}
+        auth = self._auth
+        if auth is None and self.data_service_url == ICOS_CONFIG.data_service_base_url.rstrip("/"):
+            from icoscp_core.icos import auth
+
+        if auth is not None:
+            headers["Cookie"] = auth.get_token().cookie_value
+
+        return headers
+
+    def get_dobj_bytes(self, dobj_uri: str, ttl: float | None = None) -> bytes:
+        """Download the contents of a data object, using the cache where possible.
+
+        Args:
+            dobj_uri: Landing page URI of the data object
+            ttl: Time-to-live in seconds. Defaults to the TTL for the cache.
+        Returns:
+            bytes: Contents of the data object
+        """
+        url = self.data_service_url + urlsplit(dobj_uri).path
+
+        return self.fetch(url, headers=self._auth_headers(), ttl=ttl)
+
+    def get_dobj_meta(self, dobj_uri: str, ttl: float | None = None) -> dict:
+        """Get the metadata for a data object from its landing page, using the cache where possible.
+
+        This is the same JSON metadata used by `icoscp` (e.g. `Dobj.meta`).
+
+        Args:
+            dobj_uri: Landing page URI of the data object
+            ttl: Time-to-live in seconds. Defaults to the TTL for the cache.
+        Returns:
+            dict: Data object metadata
+        """
+        payload = self.fetch(dobj_uri, headers={"Accept": "application/json"}, ttl=ttl)
+        dobj_meta: dict = json.loads(payload)
+        return dobj_meta
+
+    def get_dobj_columns(
+        self, dobj_meta: dict, columns: list[str] | None = None, ttl: float | None = None
+    ) -> ArraysDict:
+        """Download the columns of a station time series data object, using the cache where possible.
+
+        The data is requested in the binary format used by the Carbon Portal and decoded using
+        `icoscp_core`, as for `icoscp_core.icos.data.get_columns_as_arrays`. Values flagged
+        as bad data are kept.
+
+        Args:
+            dobj_meta: Data object metadata (see get_dobj_meta())
+            columns: Columns to retrieve. Defaults to all columns.
+            ttl: Time-to-live in seconds. Defaults to the TTL for the cache.
+        Returns:
+            dict: Column name to numpy array of values
+        """
+        dobj = parse_cp_json(json.dumps(dobj_meta), data_class=DataObject)
+        codec = codec_from_dobj_meta(dobj, TableRequest(desired_columns=columns, offset=None, length=None))
+
+        headers = {"Accept": "application/octet-stream", "Content-Type": "application/json"}
+        headers.update(self._auth_headers())
+
+        payload = self.fetch(
+            self.data_service_url + "/cpb",
+            method="POST",
+            data=json.dumps(codec.json_payload, sort_keys=True).encode("utf-8"),
+            headers=headers,
+            ttl=ttl,
+        )
+
+        return codec.parse_cpb_response(io.BytesIO(payload), keep_bad_data=True)  # type: ignore[arg-type]
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        shutil.rmtree(self._entries_dir, ignore_errors=True)
+        shutil.rmtree(self._objects_dir, ignore_errors=True)
+        self._entries_dir.mkdir(parents=True, exist_ok=True)
+        self._objects_dir.mkdir(parents=True, exist_ok=True)
+
+
+def _parse_bound_value(value: dict) -> BoundValue:
+    """Convert a value from SPARQL JSON results to the icoscp_core equivalent."""
+    if value["type"] == "uri":
+        return BoundUri(uri=value["value"])
+    if value["type"] == "literal":
+        return BoundLiteral(value=value["value"], datatype=value.get("datatype"))
+    raise ValueError(f"Unsupported SPARQL value type: {value['type']}")
+
+
+def set_icos_cache(
+    cache_dir: pathType | None, ttl: float = DEFAULT_TTL, **kwargs: Any
+) -> ICOSResponseCache | None:
+    """Set the local cache used when retrieving data from the ICOS Carbon Portal.
+
+    Args:
+        cache_dir: Directory to store cached responses. Pass None to disable the cache.
+        ttl: Time-to-live for cached responses in seconds. Default = 1 day.
+        kwargs: Additional arguments to pass to ICOSResponseCache
+    Returns:
+        ICOSResponseCache / None: The cache that will be used
+    """
+    global _icos_cache
+
+    _icos_cache = ICOSResponseCache(cache_dir, ttl=ttl, **kwargs) if cache_dir is not None else None
+    return _icos_cache
+
+
+def get_icos_cache() -> ICOSResponseCache | None:
+    """Get the local cache used when retrieving data from the ICOS Carbon Portal.
+
+    If no cache has been set with set_icos_cache(), the "OPENGHG_ICOS_CACHE" environment
+    variable can be used to specify a cache directory.
+
+    Returns:
+        ICOSResponseCache / None: Cache or None if caching is not enabled
+    """
+    global _icos_cache
+
+    if _icos_cache is None:
+        cache_dir = os.getenv("OPENGHG_ICOS_CACHE")
+        if cache_dir:
+            _icos_cache = ICOSResponseCache(cache_dir)
+
+    return _icos_cache
+
+
+def fetch_concurrently(fn: Callable[[T], R], items: Iterable[T], max_workers: int = 4) -> list[R]:
+    """Apply a fetch function to each item using a pool of at most max_workers threads.
+
+    Results are returned in the same order as the input items. If any call raises an
+    exception this is raised once all submitted calls have finished.
+
+    Args:
+        fn: Function to call for each item
+        items: Items to fetch
+        max_workers: Maximum number of concurrent requests
+    Returns:
+        list: Results for each item
+    """
+    items = list(items)
+
+    if max_workers <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(fn, items))
+
+
+def fetch_as_completed(
+    fn: Callable[[T], R], items: Iterable[T], max_workers: int = 4
+) -> Iterator[tuple[int, R]]:
+    """Apply a fetch function to each item using a pool of at most max_workers threads,
+    yielding results as each call completes.
+
+    At most max_workers calls are in progress at once and each result is yielded as soon as
+    it is available, so results can be processed (and released) without waiting for every
+    item to be fetched. If a call raises an exception this is raised when its result is reached.
+
+    Args:
+        fn: Function to call for each item
+        items: Items to fetch
+        max_workers: Maximum number of concurrent requests
+    Returns:
+        Iterator: (index, result) pairs where index is the position of the item within items
+    """
+    if max_workers <= 1:
+        for index, item in enumerate(items):
+            yield index, fn(item)
+        return
+
+    to_submit = enumerate(items)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: dict[Future, int] = {}
+
+        def _submit_next() -> None:
+            for index, item in to_submit:
+                pending[executor.submit(fn, item)] = index
+                return
+
+        for _ in range(max_workers):
+            _submit_next()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                _submit_next()
+                yield index, future.result()
@@ -15,7 +15,8 @@ from icoscp_core.icos import data, meta
 from icoscp_core.metacore import DataObject, References, StationTimeSeriesMeta
 from icoscp_core.metaclient import Station
 
-from ._queries import attrs_query, icos_format_info
+from ._cache import fetch_concurrently, get_icos_cache
+from ._queries import attrs_query, icos_format_info, run_query
 
 logger = logging.getLogger("openghg.retrieve.icos")
 logger.setLevel(logging.DEBUG)  # Have to set level for logger as well as handler
@@ -330,7 +331,7 @@ def get_data_attrs(dobj_uri: str, species: str) -> dict[str, dict]:
 
     from icoscp_core.sparql import BoundLiteral, BoundUri
 
-    res = meta.sparql_select(attrs_query(dobj_uri))
+    res = run_query(attrs_query(dobj_uri))
 
     # mypy casting: basically anything ending with
     # _label has .value and otherwise it has .uri, but this
@@ -407,6 +408,24 @@ def _retrieve_dobj_format(data_info: dict | pd.Series | None = None, spec_label:
     return dobj_format
 
 
+def get_icos_file_bytes(dobj_uri: str) -> bytes:
+    """
+    Retrieve the contents of a data object from the ICOS Carbon Portal. If a local cache
+    has been set (see set_icos_cache()) this will be used.
+
+    Args:
+        dobj_uri: Data object URI details
+    Returns:
+        bytes: Contents of the data object
+    """
+    cache = get_icos_cache()
+    if cache is not None:
+        return cache.get_dobj_bytes(dobj_uri)
+
+    _, resp = data.get_file_stream(dobj_uri)
+    return resp.read()
+
+
 def get_icos_text_file(dobj_uri: str) -> str:
     """
     Files on ICOS Carbon Portal can sometimes be stored as netcdf or zipped text file format.
@@ -416,9 +435,7 @@ def get_icos_text_file(dobj_uri: str) -> str:
     - ICOS ATC time series
     - ICOS ATC Flask time series
     """
-    _, resp = data.get_file_stream(dobj_uri)
-
-    with ZipFile(io.BytesIO(resp.read()), "r") as z:
+    with ZipFile(io.BytesIO(get_icos_file_bytes(dobj_uri)), "r") as z:
         with z.open(z.infolist()[0].filename) as f:
             text = f.read().decode("utf-8")
 
@@ -431,9 +448,7 @@ def get_icos_nc_file(dobj_uri: str) -> xr.Dataset:
     TODO: this requires h5py... there is a workaround if
     you just have netcdf4: https://github.com/pydata/xarray/issues/1075
     """
-    _, resp = data.get_file_stream(dobj_uri)
-
-    ds = xr.open_dataset(io.BytesIO(resp.read()))
+    ds = xr.open_dataset(io.BytesIO(get_icos_file_bytes(dobj_uri)))
 
     return ds
 
@@ -740,3 +755,26 @@ def get_icos_data(data_info: dict | pd.Series) -> xr.Dataset:
         return ds.rename(rename_dict)
 
     raise NotImplementedError(f"Cannot parse ICOS format {fmt}.")
+
+
+def get_icos_data_concurrent(data_info: pd.DataFrame | list[dict], max_workers: int = 4) -> list[xr.Dataset]:
+    """
+    Retrieve and format multiple ICOS data objects using a pool of worker threads.
+    See get_icos_data() for details of how each data object is retrieved.
+
+    Args:
+        data_info: "data query" DataFrame (e.g. from dobj_info()) or list of dicts with the details
+            for each data object.
+        max_workers: Maximum number of data objects to retrieve at the same time.
+    Returns:
+        list[xr.Dataset]: Datasets in the same order as data_info
+    """
+    if isinstance(data_info, pd.DataFrame):
+        rows: list[dict | pd.Series] = [row for _, row in data_info.iterrows()]
+    else:
+        rows = list(data_info)
+
+    # make sure the format info is only queried once
+    icos_format_info()
+
+    return fetch_concurrently(get_icos_data, rows, max_workers=max_workers)
@@ -5,7 +5,9 @@ print the result, and paste it into the ICOS Sparql endpoint:
 https://meta.icos-cp.eu/sparqlclient/?type=CSV
 
 To run these queries programmatically, we use `meta.sparql_select`,
-where `meta` is imported from `icoscp_core.icos`.
+where `meta` is imported from `icoscp_core.icos`. If a local cache has been
+set (see `openghg.retrieve.icos.set_icos_cache`), queries are run through
+this cache instead.
 This function returns two values: a list of variable names (the columns
 in the CSV output from on the SPARQL endpoint), and a list of "Bindings".
 The `parse_bindings` function in this module will convert this list of bindings
@@ -35,10 +37,13 @@ from functools import lru_cache
 # import re
 
 from icoscp_core.icos import meta
+from icoscp_core.sparql import SparqlResults
 import pandas as pd
 
 from openghg.util import extract_float
 
+from ._cache import get_icos_cache
+
 
 def sparql_header() -> str:
     """Define header for SPARQL query"""
@@ -513,6 +518,22 @@ def parse_binding(b: dict) -> dict:
     return res
 
 
+def run_query(query: str) -> SparqlResults:
+    """
+    Run a SPARQL query against the ICOS Carbon Portal. If a local cache has been
+    set (see set_icos_cache()) this will be used.
+
+    Args:
+        query: SPARQL query
+    Returns:
+        SparqlResults: Results containing variable_names and bindings
+    """
+    cache = get_icos_cache()
+    if cache is not None:
+        return cache.sparql_select(query)
+    return meta.sparql_select(query=query)
+
+
 def make_query_df(query: str) -> pd.DataFrame:
     """
     Helper function to create a DataFrame from the data returned from the SPARQL search.
@@ -522,7 +543,7 @@ def make_query_df(query: str) -> pd.DataFrame:
     Returns:
         pandas.DataFrame: Output from SPARQL query parsed into a DataFrame
     """
-    res = meta.sparql_select(query=query)
+    res = run_query(query)
     return pd.DataFrame([parse_binding(b) for b in res.bindings])
 
 
@@ -7,6 +7,8 @@ from openghg.types import convert_to_list_of_metadata_and_data, MetadataAndData,
 import openghg_defs
 import logging
 
+from ._cache import fetch_as_completed, get_icos_cache
+
 logger = logging.getLogger("openghg.retrieve")
 logger.setLevel(logging.DEBUG)  # Have to set level for logger as well as handler
 
@@ -24,6 +26,7 @@ def retrieve_atmospheric(
     store: str | None = None,
     update_mismatch: str = "never",
     force: bool = False,
+    max_workers: int = 4,
 ) -> ObsData | list[ObsData] | None:
     """Retrieve ICOS atmospheric measurement data. If data is found in the object store it is returned. Otherwise
     data will be retrieved from the ICOS Carbon Portal. Data retrieval from the Carbon Portal may take a short time.
@@ -55,6 +58,7 @@ def retrieve_atmospheric(
                 - "from_source" / "attributes" - update mismatches based on attributes from ICOS Header
                 - "from_definition" / "metadata" - update mismatches based on input metadata
         force: Force adding of data even if this is identical to data stored (checked based on previously retrieved file hashes).
+        max_workers: Maximum number of data objects to download from the ICOS Carbon Portal at the same time.
     Returns:
         ObsData, list[ObsData] or None
     """
@@ -108,6 +112,7 @@ def retrieve_atmospheric(
             inlet=inlet,
             sampling_height=sampling_height,
             update_mismatch=update_mismatch,
+            max_workers=max_workers,
         )
         if standardised_data is None:
             return None
@@ -136,6 +141,144 @@ def retrieve_atmospheric(
         return obs_data
 
 
+def _fetch_dobj(
+    dobj_url: str, dataset_source: str | None, species_upper: list[str]
+) -> tuple[dict, str, Any] | None:
+    """Fetch a data object from the ICOS Carbon Portal if this matches the dataset source.
+    If a local cache has been set (see set_icos_cache()) this will be used.
+
+    Args:
+        dobj_url: URL of the data object
+        dataset_source: Dataset source name (see _retrieve_remote)
+        species_upper: Upper case species names
+    Returns:
+        tuple / None: Data object metadata, dataset source name and data as a DataFrame or None
+            if the data object does not match the dataset source.
+    """
+    import re
+    from pandas import DataFrame
+
+    cache = get_icos_cache()
+
+    dobj: Any = None
+
+    if cache is not None:
+        dobj_meta = cache.get_dobj_meta(dobj_url)
+    else:
+        try:
+            from icoscp.cpb.dobj import Dobj  # type: ignore
+        except ImportError:
+            raise ImportError(
+                "Cannot import icoscp, if you've installed OpenGHG using conda please run: pip install icoscp"
+            )
+
+        dobj = Dobj(dobj_url)
+        dobj.dateTimeConvert = False
+        dobj_meta = dobj.meta
+
+    logger.info(f"Retrieving {dobj_url}...")
+
+    if dataset_source == "ICOS FastTrack":
+        species_fname = re.split("[_.]", dobj_meta["fileName"])[-2]
+        if "FAST_TRACK" in dobj_meta["fileName"] or species_fname in species_upper:
+            dobj_dataset_source = "ICOS FastTrack"
+        else:
+            return None
+    elif dataset_source == "EYE-AVE-PAR":
+        species_fname = dobj_meta["fileName"].split(".")[-2]
+        if "EYE-AVE-PAR" in dobj_meta["fileName"] or species_fname in species_upper:
+            dobj_dataset_source = "EYE-AVE-PAR"
+        else:
+            return None
+    elif dataset_source == "ICOS Combined":
+        dobj_dataset_source = "ICOS Combined"
+    else:
+        try:
+            dobj_dataset_source = dobj_meta["specification"]["project"]["self"]["label"]
+        except KeyError:
+            dobj_dataset_source = "NA"
+            logger.warning("Unable to read project information from dobj.")
+
+        if dataset_source is not None and dataset_source.lower() != dobj_dataset_source.lower():
+            return None
+
+    if cache is not None:
+        columns = cache.get_dobj_columns(dobj_meta)
+        dataframe = DataFrame(columns)
+        dataframe = dataframe.reindex(sorted(dataframe.columns), axis=1)
+    else:
+        # We need to pull the data down as .info (metadata) is populated further on this step
+        dataframe = dobj.get()
+
+    return dobj_meta, dobj_dataset_source, dataframe
+
+
+def _get_station_data(site: str, data_level: int) -> tuple[Any, dict[str, Any]] | None:
+    """Get the data objects available for an ICOS station along with details of the station PI.
+    If a local cache has been set (see set_icos_cache()) the Carbon Portal is queried through this,
+    otherwise icoscp is used directly.
+
+    Args:
+        site: Site code
+        data_level: ICOS data level (1, 2)
+    Returns:
+        tuple / None: DataFrame of data objects for the data level (as from icoscp Station.data())
+            and the PI "firstName", "lastName" and "email" or None if the station isn't valid.
+    """
+    import pandas as pd
+
+    cache = get_icos_cache()
+
+    if cache is None:
+        # icoscp isn't available to conda so we've got to resort to this for now
+        try:
+            from icoscp.station import station  # type: ignore
+        except ImportError:
+            raise ImportError(
+                "Cannot import icoscp, if you've installed OpenGHG using conda please run: pip install icoscp"
+            )
+
+        stat = station.get(stationId=site.upper())
+        if not stat.valid:
+            return None
+
+        pi_details = {"firstName": stat.firstName, "lastName": stat.lastName, "email": stat.email}
+        data_pids = stat.data(level=data_level)
+        if not isinstance(data_pids, pd.DataFrame):
+            data_pids = pd.DataFrame(columns=["specLabel", "station", "samplingheight", "dobj"])
+
+        return data_pids, pi_details
+
+    from icoscp.sparql import sparqls  # type: ignore
+
+    stations = pd.DataFrame(
+        cache.sparql_records(sparqls.station_query(filter={"project": "ALL", "theme": None}))
+    )
+    if stations.empty:
+        return None
+
+    stations = stations[stations["id"].str.upper() == site.upper()]
+    if stations.empty:
+        return None
+
+    # As for icoscp, PI details are only included for ICOS stations
+    # (the "AS", "ES" and "OS" themes of the station URI)
+    is_icos = stations["uri"].map(lambda uri: uri.lower().split("/")[-1].split("_")[0] in ("as", "es", "os"))
+    if is_icos.any():
+        pi_details = {key: stations[key].iloc[0] for key in ("firstName", "lastName", "email")}
+    else:
+        pi_details = {"firstName": None, "lastName": None, "email": None}
+
+    data = pd.DataFrame(cache.sparql_records(sparqls.stationData(stations["uri"].tolist(), "all")))
+    if data.empty:
+        return pd.DataFrame(columns=["specLabel", "station", "samplingheight", "dobj"]), pi_details
+
+    data["samplingheight"] = data["samplingheight"].fillna("")
+    data_pids = data[data["datalevel"] == str(data_level)]
+
+    return data_pids, pi_details
+
+
 def _retrieve_remote(
     site: str,
     data_level: int,
@@ -144,6 +287,7 @@ def _retrieve_remote(
     sampling_height: str | None = None,
     dataset_source: str | None = None,
     update_mismatch: str = "never",
+    max_workers: int = 4,
 ) -> list[MetadataAndData] | None:
     """Retrieve ICOS data from the ICOS Carbon Portal and standardise it into
     a format expected by OpenGHG. A dictionary of metadata and Datasets
@@ -168,18 +312,10 @@ def _retrieve_remote(
                 - "never" - don't update mismatches and raise an AttrMismatchError
                 - "from_source" / "attributes" - update mismatches based on attributes from ICOS Header
                 - "from_definition" / "metadata" - update mismatches based on input metadata
+        max_workers: Maximum number of data objects to download at the same time.
     Returns:
         dict or None: Dictionary of processed data and metadata if found
     """
-    # icoscp isn't available to conda so we've got to resort to this for now
-    try:
-        from icoscp.cpb.dobj import Dobj  # type: ignore
-        from icoscp.station import station  # type: ignore
-    except ImportError:
-        raise ImportError(
-            "Cannot import icoscp, if you've installed OpenGHG using conda please run: pip install icoscp"
-        )
-
     import re
     from openghg.standardise.meta import assign_attributes
     from openghg.util import format_inlet, format_data_level, load_internal_json
@@ -199,13 +335,13 @@ def _retrieve_remote(
     # We should first check if it's stored in the object store
     # Will need to make sure ObsSurface can accept the datasets we
     # create from the ICOS data
-    stat = station.get(stationId=site.upper())
+    station_details = _get_station_data(site=site, data_level=data_level)
 
-    if not stat.valid:
+    if station_details is None:
         logger.error("Please check you have passed a valid ICOS site and have a working internet connection.")
         return None
 
-    data_pids = stat.data(level=data_level)
+    data_pids, pi_details = station_details
 
     species_upper = [s.upper() for s in species]
 
@@ -223,7 +359,9 @@ def _retrieve_remote(
     # Otherwise filter out any data that contains "Obspack" or "csv" in the specLabel
     # Also filter out some drought files which cause trouble being read in
     # For some reason they have separate station record pages that contain "ATMO_"
-    if dataset_source == "ICOS Combined":
+    if data_pids.empty:
+        filtered_sources = data_pids
+    elif dataset_source == "ICOS Combined":
         filtered_sources = data_pids[
             data_pids["specLabel"].str.contains(search_str) & data_pids["specLabel"].str.contains("Obspack")
         ]
@@ -256,40 +394,17 @@ def _retrieve_remote(
 
     standardised_data: dict[str, dict] = {}
 
-    for n, dobj_url in enumerate(dobj_urls):
-        dobj = Dobj(dobj_url)
-        dobj.dateTimeConvert = False
-        logger.info(f"Retrieving {dobj_url}...")
+    def _fetch(dobj_url: str) -> tuple[dict, str, Any] | None:
+        return _fetch_dobj(dobj_url, dataset_source=dataset_source, species_upper=species_upper)
 
-        if dataset_source == "ICOS FastTrack":
-            species_fname = re.split("[_.]", dobj.meta["fileName"])[-2]
-            if "FAST_TRACK" in dobj.meta["fileName"] or species_fname in species_upper:
-                dobj_dataset_source = "ICOS FastTrack"
-            else:
-                continue
-        elif dataset_source == "EYE-AVE-PAR":
-            species_fname = dobj.meta["fileName"].split(".")[-2]
-            if "EYE-AVE-PAR" in dobj.meta["fileName"] or species_fname in species_upper:
-                dobj_dataset_source = "EYE-AVE-PAR"
-            else:
-                continue
-        elif dataset_source == "ICOS Combined":
-            dobj_dataset_source = "ICOS Combined"
-        else:
-            try:
-                dobj_dataset_source = dobj.meta["specification"]["project"]["self"]["label"]
-            except KeyError:
-                dobj_dataset_source = "NA"
-                logger.warning("Unable to read project information from dobj.")
-
-            if dataset_source is not None and dataset_source.lower() != dobj_dataset_source.lower():
-                continue
+    # Download the data objects concurrently and process each as soon as it has been downloaded
+    # so only the data objects currently being fetched are held in memory
+    for n, fetched in fetch_as_completed(_fetch, dobj_urls, max_workers=max_workers):
+        if fetched is None:
+            continue
 
-        # We need to pull the data down as .info (metadata) is populated further on this step
-        dataframe = dobj.get()
-
-        # This is the metadata, dobj.info and dobj.meta are equal
-        dobj_info = dobj.meta
+        dobj_url = dobj_urls[n]
+        dobj_info, dobj_dataset_source, dataframe = fetched
 
         attributes = {}
 
@@ -388,8 +503,8 @@ def _retrieve_remote(
         # attributes["station_height_masl"] = format_inlet(str(stat.eas), key_name="station_height_masl")
         attributes["station_height_masl"] = format_inlet(loc_data["alt"], key_name="station_height_masl")
 
-        attributes["data_owner"] = f"{stat.firstName} {stat.lastName}"
-        attributes["data_owner_email"] = str(stat.email)
+        attributes["data_owner"] = f"{pi_details['firstName']} {pi_details['lastName']}"
+        attributes["data_owner_email"] = str(pi_details["email"])
 
         attributes["citation_string"] = dobj_info["references"]["citationString"]
         attributes["licence_name"] = dobj_info["references"]["licence"]["name"]
@@ -484,6 +599,9 @@ def _retrieve_remote(
             "data": dataset,
             "attributes": attributes,
         }
+    # Data objects are processed as they're downloaded so restore the order of the data objects
+    standardised_data = dict(sorted(standardised_data.items(), key=lambda item: int(item[0].split("-")[-1])))
+
     standardised_data = dataset_formatter(data=standardised_data)
     standardised_data = assign_attributes(data=standardised_data, update_mismatch=update_mismatch)
 
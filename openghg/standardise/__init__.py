@@ -1,13 +1,38 @@
-from ._standardise import (
-    standardise,
-    standardise_bc,
-    standardise_flux,
-    standardise_footprint,
-    standardise_column,
-    standardise_surface,
-    standardise_eulerian,
-    standardise_from_binary_data,
-    standardise_flux_timeseries,
-    standardise_site_met,
+from typing import TYPE_CHECKING
+
+from openghg._lazy import lazy_exports
+
+# Attributes are imported from their submodules on first access, see openghg._lazy
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "._standardise": [
+            "standardise",
+            "standardise_bc",
+            "standardise_flux",
+            "standardise_footprint",
+            "standardise_column",
+            "standardise_surface",
+            "standardise_eulerian",
+            "standardise_from_binary_data",
+            "standardise_flux_timeseries",
+            "standardise_site_met",
+        ],
+        "._summarise": ["summary_source_formats", "summary_site_codes"],
+    },
 )
-from ._summarise import summary_source_formats, summary_site_codes
+
+if TYPE_CHECKING:
+    from ._standardise import (
+        standardise,
+        standardise_bc,
+        standardise_flux,
+        standardise_footprint,
+        standardise_column,
+        standardise_surface,
+        standardise_eulerian,
+        standardise_from_binary_data,
+        standardise_flux_timeseries,
+        standardise_site_met,
+    )
+    from ._summarise import summary_source_formats, summary_site_codes
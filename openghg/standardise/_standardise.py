@@ -5,7 +5,7 @@ from pandas import Timedelta
 import warnings
 
 from openghg.objectstore import get_writable_bucket
-from openghg.util import sort_by_filenames
+from openghg.util import sort_by_filenames, uses_execution_options
 from openghg.types import multiPathType
 from numcodecs import Blosc
 import logging
@@ -13,6 +13,7 @@ import logging
 logger = logging.getLogger("openghg.standardise")
 
 
+@uses_execution_options
 def standardise(
     data_type: str,
     filepath: str | Path | list[str] | list[Path] | None = None,
@@ -31,7 +32,7 @@ def standardise(
     Returns:
         dict: Dictionary of result data.
     """
-    from openghg.store import get_data_class
+    from openghg.store import get_data_class, get_ingest_session
 
     filepath_missing = filepath is None or (
         isinstance(filepath, (list, tuple)) and all(f is None for f in filepath)
@@ -60,6 +61,12 @@ def standardise(
     except KeyError:
         pass
 
+    # Reuse the storage class of an active ingest session writing to this bucket
+    if (session := get_ingest_session(bucket=bucket)) is not None:
+        result = session.data_class(data_type).standardise_and_store(data=data, filepath=filepath, **kwargs)
+        session.file_processed()
+        return result
+
     with dclass(bucket=bucket) as dc:
         result = dc.standardise_and_store(data=data, filepath=filepath, **kwargs)
     return result
@@ -98,6 +105,7 @@ def standardise_surface(
     info_metadata: dict | None = None,
     sort_files: bool = False,
     concat_nc_files: bool | None = None,
+    tail: bool = False,
 ) -> list[dict]:
     """Standardise surface measurements and store the data in the object store.
 
@@ -168,6 +176,9 @@ def standardise_surface(
             - None - check all file extensions and set to True is all are ".nc" or ".nc4"
             - True - attempt to open concatenated if all files are recognised as netcdf files.
             - False - open and standardise each file individually.
+        tail: Only standardise the rows appended to a file since it was last standardised with
+            tail=True, for files which grow continuously. If the header or earlier content of the file has
+            changed the whole file is standardised. Only available for CRDS and GCWERKS files.
     Returns:
         dict: Dictionary of result data
     """
@@ -218,6 +229,7 @@ def standardise_surface(
         chunks=chunks,
         info_metadata=info_metadata,
         concat_nc_files=concat_nc_files,
+        tail=tail,
     )
 
 
@@ -455,6 +467,7 @@ def standardise_footprint(
     sort_files: bool = False,
     concat_nc_files: bool | None = None,
     inner_domain: str | None = None,
+    time_slab: int | None = None,
 ) -> list[dict]:
     """Reads footprint data files and returns the UUIDs of the Datasources
     the processed data has been assigned to
@@ -516,6 +529,11 @@ def standardise_footprint(
             - False - open and standardise each file individually.
         inner_domain: For nested domains, specify the inner part of the domain (e.g. "6km").
             When both ``domain`` and ``inner_domain`` are provided, they are combined as ``"{domain}{inner_domain}"`` (e.g. "EUROPE6km") to form the full domain identifier used for the footprint metadata. However it is written as {domain}-{inner_domain} in the metadata.
+        time_slab: Number of time points to read and store at a time. If given, the data is
+            read and stored in slabs of this many time points, so only one slab needs to be held
+            in memory. This is only supported by some source formats (currently "openghg" for flux
+            and "acrg_org" for footprints). For the best storage layout, this should be a multiple
+            of the time chunk size.
     Returns:
         dict / None: Dictionary containing confirmation of standardisation process. None
         if file already processed.
@@ -571,6 +589,7 @@ def standardise_footprint(
         info_metadata=info_metadata,
         concat_nc_files=concat_nc_files,
         inner_domain=inner_domain,
+        time_slab=time_slab,
     )
 
 
@@ -599,6 +618,7 @@ def standardise_flux(
     filters: Any | None = None,
     info_metadata: dict | None = None,
     concat_nc_files: bool | None = None,
+    time_slab: int | None = None,
 ) -> list[dict]:
     """Process flux / emissions data
 
@@ -644,6 +664,11 @@ def standardise_flux(
             - None - check all file extensions and set to True is all are ".nc" or ".nc4"
             - True - attempt to open concatenated if all files are recognised as netcdf files.
             - False - open and standardise each file individually.
+        time_slab: Number of time points to read and store at a time. If given, the data is
+            read and stored in slabs of this many time points, so only one slab needs to be held
+            in memory. This is only supported by some source formats (currently "openghg" for flux
+            and "acrg_org" for footprints). For the best storage layout, this should be a multiple
+            of the time chunk size.
     returns:
         dict: Dictionary of Datasource UUIDs data assigned to
     """
@@ -680,6 +705,7 @@ def standardise_flux(
         filters=filters,
         info_metadata=info_metadata,
         concat_nc_files=concat_nc_files,
+        time_slab=time_slab,
     )
 
 
@@ -1,9 +1,11 @@
+from collections.abc import Iterator
 from pathlib import Path
 import warnings
 
 from openghg.util import timestamp_now, open_time_nc_fn
 from openghg.store import infer_date_range, update_zero_dim
 from openghg.standardise.meta import assign_flux_attributes
+from openghg.types import MetadataAndData, split_time_slabs
 
 
 def parse_openghg(
@@ -19,7 +21,8 @@ def parse_openghg(
     period: str | tuple | None = None,
     chunks: dict | None = None,
     continuous: bool = True,
-) -> dict:
+    time_slab: int | None = None,
+) -> dict | Iterator[list[MetadataAndData]]:
     """
     Read and parse input flux / emissions data already in OpenGHG format.
 
@@ -39,8 +42,10 @@ def parse_openghg(
             See documentation for guidance on chunking: https://docs.openghg.org/tutorials/local/Adding_data/Adding_ancillary_data.html#chunking.
             To disable chunking pass in an empty dictionary.
         continuous: Flag indicating whether the data is continuous or not
+        time_slab: If given, the data is yielded in slabs of this many time points, so only
+            one slab is read into memory at a time when the data is stored.
     Returns:
-        dict: Dictionary of data
+        dict: Dictionary of data, or an iterator over the slabs of data if time_slab is given
     """
 
     if high_time_resolution:
@@ -125,4 +130,7 @@ def parse_openghg(
 
     flux_data = assign_flux_attributes(flux_data)
 
+    if time_slab is not None:
+        return split_time_slabs(flux_data, time_slab=time_slab)
+
     return flux_data
@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Iterator
 from pathlib import Path
 from collections import defaultdict
 import warnings
@@ -12,7 +13,7 @@ from openghg.util import (
     open_time_nc_fn,
 )
 from openghg.store import infer_date_range, update_zero_dim
-from openghg.types import ParseError
+from openghg.types import MetadataAndData, ParseError, split_time_slabs
 
 logger = logging.getLogger("openghg.standardise.footprint")
 logger.setLevel(logging.DEBUG)  # Have to set level for logger as well as handler
@@ -35,7 +36,8 @@ def parse_acrg_org(
     time_resolved: bool = False,
     high_time_resolution: bool = False,
     short_lifetime: bool = False,
-) -> dict:
+    time_slab: int | None = None,
+) -> dict | Iterator[list[MetadataAndData]]:
     """
     Read and parse input emissions data in original ACRG format.
 
@@ -58,8 +60,10 @@ def parse_acrg_org(
         high_time_resolution:  This argument is deprecated and will be replaced in future versions with time_resolved.
         short_lifetime: Indicate footprint is for a short-lived species. Needs species input.
             Note this will be set to True if species has an associated lifetime.
+        time_slab: If given, the data is yielded in slabs of this many time points, so only
+            one slab is read into memory at a time when the data is stored.
     Returns:
-        dict: Dictionary of data
+        dict: Dictionary of data, or an iterator over the slabs of data if time_slab is given
     """
 
     if high_time_resolution:
@@ -271,4 +275,7 @@ def parse_acrg_org(
     footprint_data[key]["data"] = fp_data
     footprint_data[key]["metadata"] = metadata
 
+    if time_slab is not None:
+        return split_time_slabs(footprint_data, time_slab=time_slab)
+
     return footprint_data
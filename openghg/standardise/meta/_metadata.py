@@ -3,7 +3,6 @@ from copy import deepcopy
 import logging
 import math
 
-from openghg.store.spec import validate_data_type
 from openghg.types import AttrMismatchError, MetadataAndData
 from openghg.util import is_number
 
@@ -22,6 +21,8 @@ def attributes_default_keys(data_type: str) -> list:
     Returns:
         list: keys required in attributes
     """
+    from openghg.store.spec import validate_data_type
+
     validate_data_type(data_type)
     if data_type == "surface":
         default_keys = [
@@ -57,6 +58,8 @@ def metadata_keys_as_floats(data_type: str) -> list:
     Returns:
         list: keys required to be floats in metadata
     """
+    from openghg.store.spec import validate_data_type
+
     validate_data_type(data_type)
     if data_type == "surface":
         values_as_floats = [
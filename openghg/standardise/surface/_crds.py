@@ -13,6 +13,8 @@ from openghg.util import (
 import pandas as pd
 from pandas import Timedelta
 
+from ._text_tables import datetime_from_components, read_whitespace_table, split_yymmdd, two_digit_year
+
 
 def parse_crds(
     filepath: pathType,
@@ -96,16 +98,18 @@ def _get_raw_dataframe(filepath: Path, drop_duplicates: bool = True) -> pd.DataF
         ValueError: if duplicate times found and `drop_duplicates` is False.
 
     """
-    # parse with multiindex for columns
-    combined_df = pd.read_csv(filepath, header=[0, 1], skiprows=1, sep=r"\s+")
-
-    # parse dates
-    datetime_series = (
-        combined_df.pop(("-", "date")).astype(str)
-        + " "
-        + combined_df.pop(("-", "time")).astype(str).str.zfill(6)
+    # parse with multiindex for columns, dates (yymmdd) and times (hhmmss) are read as integers
+    combined_df = read_whitespace_table(
+        filepath,
+        column_types={("-", "date"): "int64", ("-", "time"): "int64"},
+        header=[0, 1],
+        skiprows=1,
     )
-    combined_df["time"] = pd.to_datetime(datetime_series, format="%y%m%d %H%M%S")
+
+    # build timestamps from the date and time components
+    year, month, day = split_yymmdd(combined_df.pop(("-", "date")).to_numpy())
+    hour, minute, second = split_yymmdd(combined_df.pop(("-", "time")).to_numpy())
+    combined_df["time"] = datetime_from_components(two_digit_year(year), month, day, hour, minute, second)
     combined_df = combined_df.set_index("time")
 
     # drop duplicate times
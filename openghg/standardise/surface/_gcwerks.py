@@ -1,11 +1,14 @@
 import logging
 from pathlib import Path
-import pandas as pd
 from pandas import DataFrame
 
+import numpy as np
+
 from openghg.standardise.meta import dataset_formatter
 from openghg.types import pathType, multiPathType
 
+from ._text_tables import datetime_from_components, flag_characters_set, read_whitespace_table
+
 logger = logging.getLogger("openghg.standardise")
 
 
@@ -235,36 +238,22 @@ def _read_data(
     Returns:
         dict: Dictionary of gas data keyed by species
     """
-    from pandas import Series
     from pandas import Timedelta as pd_Timedelta
     from pandas import read_csv
 
     # Read header
     header = read_csv(filepath, skiprows=2, nrows=2, header=None, sep=r"\s+")
 
-    # Read the data in and automatically create a datetime column from the 5 columns
-    # Read data without parse_dates to avoid nested sequence deprecation
-    data = read_csv(
+    # Read the data in, with the 5 date and time columns (yyyy, mm, dd, hh, mi) as integers
+    datetime_cols = range(1, 6)
+    data = read_whitespace_table(
         filepath,
+        column_types={col: "int64" for col in datetime_cols},
         skiprows=4,
-        sep=r"\s+",
         index_col=False,
     )
 
-    # Combine columns 1-5 for datetime (yyyy, mm, dd, hh, mi)
-    datetime_cols = data.iloc[:, 1:6].astype(str)
-    data["Datetime"] = pd.to_datetime(
-        datetime_cols.iloc[:, 0]
-        + "-"
-        + datetime_cols.iloc[:, 1]
-        + "-"
-        + datetime_cols.iloc[:, 2]
-        + " "
-        + datetime_cols.iloc[:, 3]
-        + ":"
-        + datetime_cols.iloc[:, 4],
-        format="%Y-%m-%d %H:%M",
-    )
+    data["Datetime"] = datetime_from_components(*(data.iloc[:, col].to_numpy() for col in datetime_cols))
     data = data.drop(columns=data.columns[1:6]).set_index("Datetime")
 
     if data.empty:
@@ -296,9 +285,9 @@ def _read_data(
     units = {}
     scale = {}
 
-    flag_columns: list[Series] = []
     species = []
     columns_renamed = {}
+    flag_names: list[str] = []
     for column in data.columns:
         if "Flag" in column:
             # Location of this column in a range (0, n_columns-1)
@@ -308,11 +297,7 @@ def _read_data(
             # Add it to the dictionary for renaming later
             columns_renamed[column] = gas_name + "_flag"
 
-            # Create 2 new series based on the flag columns
-            status_flag = (data[column].str[0] != "-").astype(int).rename(f"{gas_name} status_flag")
-            integration_flag = (data[column].str[1] != "-").astype(int).rename(f"{gas_name} integration_flag")
-
-            flag_columns.extend((status_flag, integration_flag))
+            flag_names.extend((f"{gas_name} status_flag", f"{gas_name} integration_flag"))
 
             col_shift = 4
             units[gas_name] = header.iloc[1, col_loc + col_shift]
@@ -326,7 +311,12 @@ def _read_data(
 
             species.append(gas_name)
 
-    data = data.join(flag_columns)
+    # Create status and integration flags from the first and second characters of each flag column
+    if columns_renamed:
+        status_flags, integration_flags = flag_characters_set(data[list(columns_renamed)], positions=(0, 1))
+        flags = np.stack((status_flags, integration_flags), axis=-1).reshape(len(data), -1).astype(int)
+        data = data.join(DataFrame(flags, index=data.index, columns=flag_names))
+
     # Rename columns to include the gas this flag represents
     data = data.rename(columns=columns_renamed, inplace=False)
 
@@ -445,6 +435,14 @@ def _split_species(
         if data[spec].isnull().all():
             continue
 
+        spec_columns = [
+            spec,
+            spec + " repeatability",
+            spec + " status_flag",
+            spec + " integration_flag",
+            "Inlet",
+        ]
+
         # Here inlet is the inlet in the data and inlet_label is the label we want to use as metadata
         for inlet, inlet_label in expected_inlets.items():
             inlet_label = format_inlet(inlet_label)
@@ -455,30 +453,12 @@ def _split_species(
 
             # If we've only got a single inlet
             if inlet == "any" or inlet == "air":
-                spec_data = data[
-                    [
-                        spec,
-                        spec + " repeatability",
-                        spec + " status_flag",
-                        spec + " integration_flag",
-                        "Inlet",
-                    ]
-                ]
+                spec_data = data[spec_columns]
                 spec_data = spec_data.dropna(axis="index", how="any")
                 spec_metadata["inlet"] = inlet_label
             elif "date" in inlet:
                 dates = inlet.split("_")[1:]
-                data_sliced = data.loc[dates[0] : dates[1]]
-
-                spec_data = data_sliced[
-                    [
-                        spec,
-                        spec + " repeatability",
-                        spec + " status_flag",
-                        spec + " integration_flag",
-                        "Inlet",
-                    ]
-                ]
+                spec_data = data.loc[dates[0] : dates[1], spec_columns]
                 spec_data = spec_data.dropna(axis="index", how="any")
                 spec_metadata["inlet"] = inlet_label
             else:
@@ -492,19 +472,9 @@ def _split_species(
                 spec_metadata["inlet"] = inlet_label
                 # There should only be one matching label
                 select_inlet = matching_inlets[0]
-                # Take only data for this inlet from the dataframe
-                inlet_data = data.loc[data["Inlet"] == select_inlet]
-
-                spec_data = inlet_data[
-                    [
-                        spec,
-                        spec + " repeatability",
-                        spec + " status_flag",
-                        spec + " integration_flag",
-                        "Inlet",
-                    ]
-                ]
-
+                # Take only data for this inlet from the dataframe, selecting the columns
+                # first so we don't copy the data for every species
+                spec_data = data.loc[data["Inlet"] == select_inlet, spec_columns]
                 spec_data = spec_data.dropna(axis="index", how="any")
 
             # Now we drop the inlet column
@@ -0,0 +1,158 @@
+"""Helpers for reading whitespace-delimited text tables written by instrument software,
+such as CRDS and GCWERKS output files.
+
+Columns holding date and time components are read as integers and combined
+into timestamps using integer arithmetic, avoiding building and parsing a string for
+each row. Single character flags are decoded for all flag columns at once.
+"""
+
+from collections.abc import Hashable, Mapping, Sequence
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from openghg.types import pathType
+
+__all__ = [
+    "read_whitespace_table",
+    "datetime_from_components",
+    "split_yymmdd",
+    "two_digit_year",
+    "flag_characters_set",
+]
+
+
+def read_whitespace_table(
+    filepath: pathType,
+    column_types: Mapping[Hashable, Any] | None = None,
+    **kwargs: Any,
+) -> pd.DataFrame:
+    """Read a whitespace-delimited text table using the pandas C parser.
+
+    Args:
+        filepath: Path to file
+        column_types: Types of columns, keyed by column name or by position. Values which
+            can't be converted to the given type raise a ValueError. Other column types are inferred.
+        kwargs: Additional arguments for pandas.read_csv, e.g. skiprows, header
+    Returns:
+        pandas.DataFrame: Table data
+    """
+    dtype: dict[Hashable, Any] | None = None
+
+    if column_types:
+        # Positions are converted to names by reading just the header
+        if any(isinstance(key, int) for key in column_types):
+            header_kwargs = {k: v for k, v in kwargs.items() if k in ("skiprows", "header", "index_col")}
+            names = pd.read_csv(filepath, sep=r"\s+", engine="c", nrows=0, **header_kwargs).columns
+            dtype = {
+                names[key] if isinstance(key, int) else key: value for key, value in column_types.items()
+            }
+        else:
+            dtype = dict(column_types)
+
+    return pd.read_csv(filepath, sep=r"\s+", engine="c", dtype=dtype, **kwargs)
+
+
+def _check_range(name: str, values: np.ndarray, lower: int | np.ndarray, upper: int | np.ndarray) -> None:
+    invalid = (values < lower) | (values > upper)
+    if invalid.any():
+        raise ValueError(f"Invalid {name} value(s) found: {np.unique(values[invalid])[:5].tolist()}")
+
+
+def datetime_from_components(
+    year: Sequence[int] | np.ndarray,
+    month: Sequence[int] | np.ndarray,
+    day: Sequence[int] | np.ndarray,
+    hour: Sequence[int] | np.ndarray | int = 0,
+    minute: Sequence[int] | np.ndarray | int = 0,
+    second: Sequence[int] | np.ndarray | int = 0,
+) -> pd.DatetimeIndex:
+    """Create timestamps from integer date and time components.
+
+    Args:
+        year: Four digit years
+        month: Months, 1 - 12
+        day: Days of the month
+        hour: Hours, 0 - 23
+        minute: Minutes, 0 - 59
+        second: Seconds, 0 - 59
+    Returns:
+        pandas.DatetimeIndex: Timestamps with nanosecond precision
+    """
+    components = [np.asarray(c) for c in (year, month, day, hour, minute, second)]
+    for c in components:
+        if not np.issubdtype(c.dtype, np.integer):
+            raise ValueError("Date and time components must be integers.")
+
+    year_, month_, day_, hour_, minute_, second_ = (c.astype(np.int64) for c in components)
+
+    _check_range("month", month_, 1, 12)
+    _check_range("hour", hour_, 0, 23)
+    _check_range("minute", minute_, 0, 59)
+    _check_range("second", second_, 0, 59)
+
+    months = (year_ - 1970) * 12 + (month_ - 1)
+    month_start = months.astype("datetime64[M]").astype("datetime64[D]")
+    days_in_month = ((months + 1).astype("datetime64[M]").astype("datetime64[D]") - month_start).astype(
+        np.int64
+    )
+    _check_range("day", day_, 1, days_in_month)
+
+    seconds = hour_ * 3600 + minute_ * 60 + second_
+    times = (month_start + (day_ - 1)).astype("datetime64[ns]") + seconds.astype("timedelta64[s]")
+
+    return pd.DatetimeIndex(times)
+
+
+def split_yymmdd(values: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Split integers of the form yymmdd (or hhmmss) into their three two digit components.
+
+    Args:
+        values: Integer values
+    Returns:
+        tuple: Arrays of the three components
+    """
+    values = np.asarray(values)
+    if not np.issubdtype(values.dtype, np.integer):
+        raise ValueError("Values must be integers of the form yymmdd or hhmmss.")
+
+    first, second, third = values // 10000, (values // 100) % 100, values % 100
+    return first, second, third
+
+
+def two_digit_year(year: np.ndarray) -> np.ndarray:
+    """Convert two digit years to four digit years, matching the %y strptime directive."""
+    return np.where(year <= 68, year + 2000, year + 1900)
+
+
+def flag_characters_set(flags: pd.DataFrame, positions: Sequence[int], unset: str = "-") -> list[np.ndarray]:
+    """Check which characters of flag strings are set.
+
+    A character is considered set if it is not the `unset` character, or if it is missing
+    (i.e. the flag string is shorter than the position, or the flag itself is missing).
+
+    Args:
+        flags: Flag strings, e.g. "--B-", with one column per flag
+        positions: Character positions to check
+        unset: Character used to show the flag is not set
+    Returns:
+        list: For each position, a 2D boolean array of the same shape as `flags`
+    """
+    # Missing flags become "nan", which counts as set as the first character isn't `unset`
+    strings = flags.to_numpy(dtype=str)
+    width = strings.dtype.itemsize // np.dtype("U1").itemsize
+
+    if width == 0:
+        return [np.ones(strings.shape, dtype=bool) for _ in positions]
+
+    codes = np.ascontiguousarray(strings).view(np.uint32).reshape(*strings.shape, width)
+
+    set_flags = []
+    for position in positions:
+        if position >= width:
+            set_flags.append(np.ones(strings.shape, dtype=bool))
+        else:
+            set_flags.append(codes[..., position] != ord(unset))
+
+    return set_flags
@@ -1,6 +1,8 @@
 """Storage for Xarray Datasets."""
 
+from ._encoding import CodecPolicy, get_policy_encoding
 from ._store import Store, MemoryStore, VersionedMemoryStore
+from ._sharded_store import ShardedDirectoryStore, is_sharded_store
 from ._zarr_store import (
     get_zarr_directory_store,
     get_zarr_memory_store,
@@ -9,11 +11,15 @@ from ._zarr_store import (
 )
 
 __all__ = (
+    "CodecPolicy",
     "MemoryStore",
+    "ShardedDirectoryStore",
     "Store",
     "VersionedMemoryStore",
+    "get_policy_encoding",
     "get_versioned_zarr_directory_store",
     "get_versioned_zarr_memory_store",
     "get_zarr_directory_store",
     "get_zarr_memory_store",
+    "is_sharded_store",
 )
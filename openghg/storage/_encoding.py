@@ -1,7 +1,14 @@
 """Utilities for managing encodings of Xarray Datasets."""
 
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import asdict, dataclass
+from fnmatch import fnmatch
 from typing import Any
-from collections.abc import Iterable
+
+import numpy as np
+import xarray as xr
 
 
 def get_zarr_encoding(data_vars: Iterable, compressor: Any | None = None, filters: Any | None = None) -> dict:
@@ -25,3 +32,225 @@ def get_zarr_encoding(data_vars: Iterable, compressor: Any | None = None, filter
         encoding["filters"] = filters
 
     return {var: encoding for var in data_vars}
+
+
+@dataclass(frozen=True)
+class CodecPolicy:
+    """Codecs for the variables (and coordinates) of a dataset whose names match a pattern.
+
+    Float variables may be stored with reduced precision:
+        keepbits: number of mantissa bits to keep, using the BitRound filter. The relative error
+            is at most 2 ** -(keepbits + 1); float32 has 23 mantissa bits and float64 has 52.
+        digits: number of decimal digits to keep after the decimal point, using the Quantize filter.
+
+    Integer, float and datetime variables may be stored losslessly with:
+        delta: store differences between consecutive values, using the Delta filter.
+            Useful for monotonic coordinates. Datetimes are differenced as their int64 encoding
+            and floats as integers of the same size.
+
+    Integer variables may also be stored with:
+        downcast: integer dtype to store values as, e.g. "int8" for flags. All values
+            stored, including those appended later, must fit in this dtype; a ValueError
+            is raised when writing values that don't.
+
+    Policies without any of these options may be used to select a different Blosc `shuffle`
+    ("noshuffle", "shuffle" or "bitshuffle") for some variables.
+
+    Args:
+        pattern: Glob pattern for variable names, e.g. "fp*"
+    """
+
+    pattern: str
+    keepbits: int | None = None
+    digits: int | None = None
+    delta: bool = False
+    downcast: str | None = None
+    shuffle: str | None = None
+
+    def __post_init__(self) -> None:
+        if self.keepbits is not None and self.digits is not None:
+            raise ValueError("Only one of keepbits and digits can be set.")
+        if self.keepbits is not None and not 0 <= self.keepbits <= 52:
+            raise ValueError("keepbits must be between 0 and 52.")
+        if self.downcast is not None and not np.issubdtype(np.dtype(self.downcast), np.integer):
+            raise ValueError(f"Can only downcast to an integer dtype, not {self.downcast}.")
+        if self.shuffle is not None and self.shuffle not in _SHUFFLES:
+            raise ValueError(f"Invalid shuffle {self.shuffle}, select from {tuple(_SHUFFLES)}.")
+
+    def matches(self, name: str) -> bool:
+        return fnmatch(name, self.pattern)
+
+    def to_dict(self) -> dict:
+        return {k: v for k, v in asdict(self).items() if v not in (None, False)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> CodecPolicy:
+        return cls(**data)
+
+
+_SHUFFLES = {"noshuffle": 0, "shuffle": 1, "bitshuffle": 2}
+
+
+def _check_range(name: str, low: int, high: int, dtype: np.dtype, hint: str) -> None:
+    """Raise a ValueError if integer values from low to high don't fit in an integer dtype."""
+    info = np.iinfo(dtype)
+    if low < info.min or high > info.max:
+        raise ValueError(f"Values of {name} ({low} to {high}) don't fit in {dtype}, {hint}")
+
+
+def _stored_integer_dtype(array: Any) -> np.dtype | None:
+    """Integer dtype the chunks of a zarr array are stored as, taking `AsType` filters into account."""
+    from numcodecs import AsType
+
+    if not np.issubdtype(array.dtype, np.integer):
+        return None
+
+    dtype: np.dtype = np.dtype(array.dtype)
+    for f in array.filters or []:
+        if isinstance(f, AsType) and np.issubdtype(np.dtype(f.encode_dtype), np.integer):
+            encode_dtype = np.dtype(f.encode_dtype)
+            if encode_dtype.itemsize < dtype.itemsize:
+                dtype = encode_dtype
+    return dtype
+
+
+def check_stored_dtypes(data: xr.Dataset, group: Any) -> None:
+    """Check the values of the integer variables of a dataset fit in the dtypes they are stored as.
+
+    Integer values written to a zarr array with a downcasting `AsType` filter silently wrap
+    around if they don't fit, so check data before appending to or updating stored arrays.
+
+    Args:
+        data: Data to write
+        group: zarr group the data will be written to
+    Returns:
+        None
+    Raises:
+        ValueError: if the values of a variable don't fit in its stored dtype
+    """
+    stored_dtypes = {}
+    for name, variable in data.variables.items():
+        if not variable.size or not np.issubdtype(variable.dtype, np.integer) or str(name) not in group:
+            continue
+        stored = _stored_integer_dtype(group[str(name)])
+        if stored is not None and stored.itemsize < variable.dtype.itemsize:
+            stored_dtypes[str(name)] = stored
+
+    if not stored_dtypes:
+        return
+
+    import dask
+
+    subset = data[list(stored_dtypes)]
+    lows, highs = dask.compute(subset.min(), subset.max())
+    for name, stored in stored_dtypes.items():
+        _check_range(
+            name,
+            int(lows[name]),
+            int(highs[name]),
+            stored,
+            "as set by the codec policy the data was stored with.",
+        )
+
+
+def _policy_filters(policy: CodecPolicy, variable: xr.DataArray) -> list:
+    """Filters applying a codec policy to a variable.
+
+    Args:
+        policy: Codec policy
+        variable: Variable to encode
+    Returns:
+        list: Filters
+    Raises:
+        ValueError: if the policy uses `delta` and the variable isn't a number or datetime
+    """
+    from numcodecs import AsType, BitRound, Delta, Quantize
+
+    dtype = variable.dtype
+    filters: list = []
+
+    if np.issubdtype(dtype, np.floating):
+        if policy.keepbits is not None:
+            # BitRound can't keep more bits than the dtype has
+            filters.append(BitRound(keepbits=min(policy.keepbits, np.finfo(dtype).nmant)))
+        elif policy.digits is not None:
+            filters.append(Quantize(digits=policy.digits, dtype=dtype.str))
+        if policy.delta:
+            # Difference the bits of the values as integers, so decoding is exact; zarr views the
+            # decoded integers as floats again
+            int_dtype = np.dtype(f"<i{dtype.itemsize}").str
+            filters.append(Delta(dtype=int_dtype, astype=int_dtype))
+    elif dtype.kind in "mM":
+        # xarray encodes datetimes and timedeltas as int64 before they are written
+        if policy.delta:
+            filters.append(Delta(dtype="<i8"))
+    elif np.issubdtype(dtype, np.integer):
+        stored = dtype
+        if policy.downcast is not None:
+            stored = np.dtype(policy.downcast)
+            if variable.size:
+                _check_range(
+                    str(variable.name),
+                    int(variable.min()),
+                    int(variable.max()),
+                    stored,
+                    f"check the codec policy for {policy.pattern}.",
+                )
+            filters.append(AsType(encode_dtype=stored.str, decode_dtype=dtype.str))
+        if policy.delta:
+            # Differences wrap around in the stored dtype, which is still lossless
+            filters.append(Delta(dtype=stored.str))
+    elif policy.delta:
+        raise ValueError(
+            f"Cannot apply delta to {variable.name} with dtype {dtype}, check the codec policy for {policy.pattern}."
+        )
+
+    return filters
+
+
+def get_policy_encoding(
+    data: xr.Dataset,
+    policies: Sequence[CodecPolicy] | None,
+    compressor: Any | None = None,
+    filters: Any | None = None,
+) -> dict:
+    """Return zarr encodings for the variables of a dataset given codec policies.
+
+    The first policy whose pattern matches the name of a variable (or coordinate) is used;
+    variables not matching any policy are not included.
+
+    Args:
+        data: Dataset to encode
+        policies: Codec policies, see `CodecPolicy`
+        compressor: Compressor to use, see https://zarr.readthedocs.io/en/stable/tutorial.html#compressors
+        filters: Filters to apply after those of the policy
+    Returns:
+        dict: Dictionary of encoding settings for zarr store
+    """
+    if not policies:
+        return {}
+
+    encoding = {}
+    for name, variable in data.variables.items():
+        policy = next((p for p in policies if p.matches(str(name))), None)
+        if policy is None:
+            continue
+
+        var_filters = _policy_filters(policy, data[name]) + list(filters or [])
+        var_encoding: dict[str, Any] = {"filters": var_filters or None}
+
+        var_compressor = compressor
+        if policy.shuffle is not None:
+            from numcodecs import Blosc
+
+            cname = getattr(compressor, "cname", "zstd")
+            clevel = getattr(compressor, "clevel", 5)
+            var_compressor = Blosc(cname=cname, clevel=clevel, shuffle=_SHUFFLES[policy.shuffle])
+
+        if var_compressor is not None:
+            var_encoding["compressor"] = var_compressor
+            var_encoding["compressors"] = [var_compressor]
+
+        encoding[name] = var_encoding
+
+    return encoding
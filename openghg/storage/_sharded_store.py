@@ -0,0 +1,515 @@
+"""Zarr directory store packing the chunks of each array into a small number of shard files.
+
+A `zarr.DirectoryStore` writes one file per chunk of each array, so a Datasource with
+many variables and many time chunks can hold thousands of files per version. The
+`ShardedDirectoryStore` keeps the zarr (v2) metadata files where a `DirectoryStore`
+would put them, but appends the chunks of each array to shard files, grouped along the
+first dimension of the array. For an array "ch4" the directory holds
+
+    ch4/.zarray
+    ch4/.zattrs
+    ch4/.zshardindex
+    ch4/shard.0
+    ch4/shard.1
+    ...
+
+The index is an append-only log with a line per chunk written or deleted; the last line
+for a chunk wins. Rewriting a chunk appends the new bytes to its shard, so space used by
+the old bytes is only reclaimed by `compact`.
+
+Appending to the shards and the index of an array is done while holding a file lock on
+the array (`.zshardlock`), so chunks can be written by several threads or processes,
+e.g. by the dask "processes" scheduler.
+
+Readers don't take the lock. `compact` writes the chunks still in use to shards with new
+names (e.g. `shard.0.1` for the first compaction), replaces the index in a single rename
+and only then removes the old shards. A reader holding the old index either reads the old
+shards or, if these have been removed, reads the new index and tries again.
+
+Stores written with this layout contain a `.zshards` file at their root, see `is_sharded_store`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+import json
+import logging
+import os
+from pathlib import Path
+import re
+import threading
+from typing import Any
+
+from filelock import FileLock
+from numcodecs.compat import ensure_contiguous_ndarray_like  # type: ignore
+import zarr
+from zarr.util import normalize_storage_path
+
+logger = logging.getLogger("openghg.storage")
+logger.setLevel(logging.DEBUG)
+
+__all__ = ["ShardedDirectoryStore", "is_sharded_store"]
+
+SHARD_MARKER = ".zshards"
+SHARD_INDEX = ".zshardindex"
+SHARD_PREFIX = "shard."
+SHARD_LOCK = ".zshardlock"
+DELETED = -1
+
+# Number of times to read chunks from the shards listed in the index, see `ShardedDirectoryStore._read_chunks`
+_READ_ATTEMPTS = 3
+
+_chunk_id = re.compile(r"^\d+(\.\d+)*$")
+
+
+def _shard_name(shard: int, generation: int) -> str:
+    """Name of a shard file, shards written by `compact` have the number of the compaction appended."""
+    return f"{SHARD_PREFIX}{shard}" if generation == 0 else f"{SHARD_PREFIX}{shard}.{generation}"
+
+
+def is_sharded_store(path: str | Path) -> bool:
+    """Check if a zarr store directory was written by `ShardedDirectoryStore`.
+
+    Args:
+        path: Path to zarr store directory
+    Returns:
+        bool: True if the store uses the sharded layout
+    """
+    return Path(path, SHARD_MARKER).is_file()
+
+
+class _ShardIndex:
+    """In memory copy of the index log of an array, kept in step with the file as it grows.
+
+    Each entry gives the name of the shard file holding a chunk, and the offset and length
+    of the chunk in the file.
+    """
+
+    def __init__(self) -> None:
+        self.entries: dict[str, tuple[str, int, int]] = {}
+        self.generation = 0
+        self.position = 0
+        self.signature: tuple[int, int, int] | None = None
+
+    def _reset(self) -> None:
+        self.entries.clear()
+        self.generation = 0
+        self.position = 0
+        self.signature = None
+
+    def read(self, filepath: str) -> None:
+        try:
+            stat = os.stat(filepath)
+        except FileNotFoundError:
+            self._reset()
+            return
+
+        if (stat.st_ino, stat.st_size, stat.st_mtime_ns) == self.signature:
+            return
+
+        try:
+            f = open(filepath, "rb")
+        except FileNotFoundError:
+            self._reset()
+            return
+
+        with f:
+            stat = os.fstat(f.fileno())
+
+            # Indexes written by `compact` start with the number of the compaction, if this
+            # differs the index has been replaced so start again
+            header = f.readline()
+            generation = int(header.split()[-1]) if header.startswith(b"#") else 0
+            if generation != self.generation or stat.st_size < self.position:
+                self._reset()
+
+            self.signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            if stat.st_size == self.position:
+                return
+
+            f.seek(self.position)
+            new_lines = f.read(stat.st_size - self.position)
+
+        # Only read complete lines, a partial line is completed by the next write
+        end = new_lines.rfind(b"\n") + 1
+        for line in new_lines[:end].splitlines():
+            if line.startswith(b"#"):
+                self.generation = int(line.split()[-1])
+                continue
+
+            chunk, shard, offset, length = line.decode().split(" ")
+            if int(shard.split(".", 1)[0]) == DELETED:
+                self.entries.pop(chunk, None)
+            else:
+                name = SHARD_PREFIX + shard
+                self.entries[chunk] = (name, int(offset), int(length))
+
+        self.position += end
+
+
+class ShardedDirectoryStore(zarr.DirectoryStore):
+    """Zarr directory store writing the chunks of each array to shard files.
+
+    Metadata keys are stored as files, as in `zarr.DirectoryStore`, so the store can be opened
+    by xarray and zarr in the same way, including consolidated metadata.
+
+    Only chunk keys using the default "." dimension separator are sharded.
+    """
+
+    def __init__(self, path: str | Path, chunks_per_shard: int = 256, **kwargs: Any) -> None:
+        """Create or open a sharded directory store.
+
+        Args:
+            path: Path of store directory
+            chunks_per_shard: Number of chunks along the first dimension of an array
+                to write to each shard file. This is only used for new stores; existing stores
+                keep the value they were written with.
+            kwargs: Arguments for zarr.DirectoryStore
+        """
+        super().__init__(path, **kwargs)
+
+        marker = Path(self.path, SHARD_MARKER)
+        if marker.is_file():
+            chunks_per_shard = int(json.loads(marker.read_text())["chunks_per_shard"])
+
+        if chunks_per_shard < 1:
+            raise ValueError("chunks_per_shard must be a positive integer.")
+
+        self.chunks_per_shard = chunks_per_shard
+        self._indexes: dict[str, _ShardIndex] = {}
+        self._lock = threading.RLock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_indexes"] = {}
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ShardedDirectoryStore) and self.path == other.path
+
+    @staticmethod
+    def _split_chunk_key(key: str) -> tuple[str, str] | None:
+        """Split a chunk key into the path of its array and the chunk id, or return None for other keys."""
+        prefix, _, name = key.rpartition("/")
+        if _chunk_id.match(name):
+            return prefix, name
+        return None
+
+    def _shard_number(self, chunk: str) -> int:
+        return int(chunk.split(".", 1)[0]) // self.chunks_per_shard
+
+    def _array_dir(self, prefix: str) -> str:
+        return os.path.join(str(self.path), prefix) if prefix else str(self.path)
+
+    def _read_index(self, prefix: str) -> _ShardIndex:
+        """Read any new entries in the index of an array and return the index."""
+        with self._lock:
+            index = self._indexes.setdefault(prefix, _ShardIndex())
+            index.read(os.path.join(self._array_dir(prefix), SHARD_INDEX))
+            return index
+
+    def _index(self, prefix: str) -> dict[str, tuple[str, int, int]]:
+        """Read any new entries in the index of an array and return its entries."""
+        return self._read_index(prefix).entries
+
+    def _read_chunks(self, prefix: str, chunks: dict[str, str]) -> dict[str, bytes]:
+        """Read chunks of an array, opening each shard file once.
+
+        If `compact` has removed the shards listed in the index held in memory, the
+        index is read again and the chunks are read from the new shards.
+
+        Args:
+            prefix: Path of the array
+            chunks: Chunk ids keyed by the key to return them under
+        Returns:
+            dict: Bytes of the chunks present in the array
+        """
+        for _ in range(_READ_ATTEMPTS - 1):
+            try:
+                return self._read_shards(prefix, chunks)
+            except FileNotFoundError:
+                logger.debug(
+                    f"Shards of {prefix} in {self.path} were compacted while reading, reading again."
+                )
+                with self._lock:
+                    self._indexes.pop(prefix, None)
+
+        # The shards keep being replaced, so stop `compact` replacing them while reading
+        with self._array_lock(self._array_dir(prefix)):
+            return self._read_shards(prefix, chunks)
+
+    def _read_shards(self, prefix: str, chunks: dict[str, str]) -> dict[str, bytes]:
+        """Read chunks of an array from the shards listed in its index, see `_read_chunks`."""
+        by_shard: dict[str, list[tuple[str, int, int]]] = {}
+        index = self._index(prefix)
+        for key, chunk in chunks.items():
+            entry = index.get(chunk)
+            if entry is not None:
+                shard, offset, length = entry
+                by_shard.setdefault(shard, []).append((key, offset, length))
+
+        result = {}
+        for shard, entries in by_shard.items():
+            with open(os.path.join(self._array_dir(prefix), shard), "rb") as f:
+                for key, offset, length in sorted(entries, key=lambda e: e[1]):
+                    f.seek(offset)
+                    result[key] = f.read(length)
+
+        return result
+
+    def _array_lock(self, array_dir: str) -> FileLock:
+        """File lock held while appending to the shards and index of an array."""
+        return FileLock(os.path.join(array_dir, SHARD_LOCK), timeout=600)
+
+    def _write_marker(self) -> None:
+        marker = Path(self.path, SHARD_MARKER)
+        if not marker.is_file():
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            # Write atomically, other processes may be reading the marker when opening the store
+            tmp_marker = marker.with_name(f"{SHARD_MARKER}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_marker.write_text(json.dumps({"format": 1, "chunks_per_shard": self.chunks_per_shard}))
+            os.replace(tmp_marker, marker)
+
+    def _append_to_shards(
+        self, array_dir: str, chunks: Mapping[str, Any], generation: int, mode: str = "ab"
+    ) -> list[str]:
+        """Append chunks of one array to their shards, returning the lines to add to the index.
+        Pass `mode="wb"` to replace existing shard files."""
+        by_shard: dict[int, list[tuple[str, Any]]] = {}
+        for chunk, value in chunks.items():
+            by_shard.setdefault(self._shard_number(chunk), []).append(
+                (chunk, ensure_contiguous_ndarray_like(value))
+            )
+
+        lines = []
+        for shard, values in by_shard.items():
+            name = _shard_name(shard, generation)
+            with open(os.path.join(array_dir, name), mode) as f:
+                offset = f.tell()
+                for chunk, value in values:
+                    f.write(value)
+                    length = value.nbytes
+                    lines.append(f"{chunk} {name[len(SHARD_PREFIX):]} {offset} {length}\n")
+                    offset += length
+
+        return lines
+
+    def _write_chunks(self, prefix: str, chunks: Mapping[str, Any]) -> None:
+        """Append chunks of one array to their shards and record them in the index."""
+        array_dir = self._array_dir(prefix)
+        os.makedirs(array_dir, exist_ok=True)
+
+        # The offsets are only valid if no other process appends to the shard before
+        # the index lines are written, so hold the lock for the array throughout
+        with self._array_lock(array_dir):
+            generation = self._read_index(prefix).generation
+            lines = self._append_to_shards(array_dir, chunks, generation)
+
+            with open(os.path.join(array_dir, SHARD_INDEX), "ab") as f:
+                f.write("".join(lines).encode())
+
+    def setitems(self, values: Mapping[str, Any]) -> None:
+        """Write several keys at once, appending the chunks of each array with a single write to its index."""
+        chunks: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            self._write_marker()
+            for key, value in values.items():
+                key = self._normalize_key(key)
+                split = self._split_chunk_key(key)
+                if split is None:
+                    super().__setitem__(key, value)
+                else:
+                    chunks.setdefault(split[0], {})[split[1]] = value
+
+            for prefix, array_chunks in chunks.items():
+                self._write_chunks(prefix, array_chunks)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.setitems({key: value})
+
+    def __getitem__(self, key: str) -> bytes:
+        key = self._normalize_key(key)
+        split = self._split_chunk_key(key)
+        if split is None:
+            return bytes(super().__getitem__(key))
+
+        prefix, chunk = split
+        try:
+            return self._read_chunks(prefix, {key: chunk})[key]
+        except KeyError:
+            raise KeyError(key) from None
+
+    def getitems(self, keys: Any, *, contexts: Any = None) -> dict[str, Any]:
+        """Read several keys at once, opening each shard file once."""
+        result: dict[str, Any] = {}
+        by_array: dict[str, dict[str, str]] = {}
+
+        for key in keys:
+            split = self._split_chunk_key(self._normalize_key(key))
+            if split is None:
+                if key in self:
+                    result[key] = self[key]
+                continue
+
+            prefix, chunk = split
+            by_array.setdefault(prefix, {})[key] = chunk
+
+        for prefix, chunks in by_array.items():
+            result.update(self._read_chunks(prefix, chunks))
+
+        return result
+
+    def __delitem__(self, key: str) -> None:
+        key = self._normalize_key(key)
+        split = self._split_chunk_key(key)
+        if split is None:
+            super().__delitem__(key)
+            return
+
+        prefix, chunk = split
+        with self._lock, self._array_lock(self._array_dir(prefix)):
+            if chunk not in self._index(prefix):
+                raise KeyError(key)
+            with open(os.path.join(self._array_dir(prefix), SHARD_INDEX), "ab") as f:
+                f.write(f"{chunk} {DELETED} 0 0\n".encode())
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        key = str(self._normalize_key(key))
+        split = self._split_chunk_key(key)
+        if split is None:
+            return bool(super().__contains__(key))
+        return split[1] in self._index(split[0])
+
+    def _is_internal(self, name: str) -> bool:
+        return name in (SHARD_MARKER, SHARD_LOCK) or name.startswith((SHARD_INDEX, SHARD_PREFIX))
+
+    def keys(self) -> Iterator[str]:
+        for key in super().keys():
+            prefix, _, name = key.rpartition("/")
+            if name == SHARD_INDEX:
+                for chunk in self._index(prefix):
+                    yield f"{prefix}/{chunk}" if prefix else chunk
+            elif not self._is_internal(name):
+                yield key
+
+    def listdir(self, path: str | None = None) -> list[str]:
+        store_path = normalize_storage_path(path)
+        children = [name for name in super().listdir(path) if not self._is_internal(name)]
+        if os.path.isfile(os.path.join(self.dir_path(path), SHARD_INDEX)):
+            children.extend(self._index(store_path))
+        return sorted(children)
+
+    def getsize(self, path: str | None = None) -> int:
+        """Size of a key, or of the keys directly under a path, in bytes."""
+        store_path = normalize_storage_path(path)
+        split = self._split_chunk_key(store_path)
+        if split is not None and not os.path.isdir(self.dir_path(path)):
+            entry = self._index(split[0]).get(split[1])
+            return 0 if entry is None else entry[2]
+
+        dir_path = self.dir_path(path)
+        if os.path.isfile(dir_path):
+            return os.path.getsize(dir_path)
+
+        size = 0
+        if os.path.isdir(dir_path):
+            for name in os.listdir(dir_path):
+                if not self._is_internal(name) and os.path.isfile(os.path.join(dir_path, name)):
+                    size += os.path.getsize(os.path.join(dir_path, name))
+            size += sum(entry[2] for entry in self._index(store_path).values())
+        return size
+
+    def rmdir(self, path: str | None = None) -> None:
+        with self._lock:
+            super().rmdir(path)
+            store_path = normalize_storage_path(path)
+            for prefix in list(self._indexes):
+                if not store_path or prefix == store_path or prefix.startswith(store_path + "/"):
+                    del self._indexes[prefix]
+
+    def rename(self, src_path: str, dst_path: str) -> None:
+        with self._lock:
+            super().rename(src_path, dst_path)
+            self._indexes.clear()
+
+    def clear(self) -> None:
+        self.rmdir()
+
+    def compact(self, min_unused_fraction: float = 0.0, arrays: Iterable[str] | None = None) -> int:
+        """Rewrite the shards of each array, dropping chunks which have been overwritten or deleted.
+
+        This is safe while the store is being read or written by other threads and processes.
+
+        Args:
+            min_unused_fraction: Only rewrite the shards of arrays where at least this
+                fraction of the bytes in the shard files is no longer used
+            arrays: Paths of the arrays to compact, e.g. ["ch4"]. By default all arrays
+                in the store are found and compacted.
+        Returns:
+            int: Number of bytes reclaimed
+        """
+        if arrays is None:
+            prefixes = []
+            for dirpath, _, filenames in os.walk(self.path):
+                if SHARD_INDEX in filenames:
+                    prefix = os.path.relpath(dirpath, self.path).replace("\\", "/")
+                    prefixes.append("" if prefix == os.curdir else prefix)
+        else:
+            prefixes = [normalize_storage_path(prefix) for prefix in arrays]
+
+        reclaimed = 0
+        with self._lock:
+            for prefix in prefixes:
+                if os.path.isfile(os.path.join(self._array_dir(prefix), SHARD_INDEX)):
+                    reclaimed += self._compact_array(prefix, min_unused_fraction)
+
+        return reclaimed
+
+    def _compact_array(self, prefix: str, min_unused_fraction: float) -> int:
+        """Rewrite the shards of an array, see `compact`."""
+        array_dir = self._array_dir(prefix)
+
+        # Chunks written by other processes while compacting would be lost when the index is replaced
+        with self._array_lock(array_dir):
+            index = self._read_index(prefix)
+            entries = dict(index.entries)
+
+            old_shards = [name for name in os.listdir(array_dir) if name.startswith(SHARD_PREFIX)]
+            before = sum(os.path.getsize(os.path.join(array_dir, name)) for name in old_shards)
+            unused = before - sum(length for _, _, length in entries.values())
+            if unused == 0 or unused < min_unused_fraction * before:
+                return 0
+
+            chunks = self._read_chunks(prefix, {chunk: chunk for chunk in entries})
+
+            # Write the chunks to shards with new names, so readers holding the current
+            # index can still read the current shards, then swap in the new index
+            generation = index.generation + 1
+            lines = [f"# generation {generation}\n"]
+            lines.extend(self._append_to_shards(array_dir, chunks, generation, mode="wb"))
+            new_shards = {line.split(" ")[1] for line in lines[1:]}
+
+            tmp_index = os.path.join(array_dir, f"{SHARD_INDEX}.tmp")
+            with open(tmp_index, "wb") as f:
+                f.write("".join(lines).encode())
+            os.replace(tmp_index, os.path.join(array_dir, SHARD_INDEX))
+
+            for name in old_shards:
+                if name[len(SHARD_PREFIX) :] in new_shards:
+                    continue
+                try:
+                    os.remove(os.path.join(array_dir, name))
+                except OSError:
+                    # e.g. the file is open on Windows, it is removed by the next compaction
+                    pass
+
+            self._indexes.pop(prefix, None)
+
+        return unused
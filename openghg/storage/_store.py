@@ -41,8 +41,10 @@ implement the ``Versioning`` interface.
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 from typing import Literal
 
+import numpy as np
 import pandas as pd
 import xarray as xr
 
@@ -119,6 +121,15 @@ class Store(ABC):
             return xr.Dataset()
         raise NotImplementedError
 
+    def get_coords(self, names: Iterable[str]) -> dict[str, np.ndarray]:
+        """Return the values of the given coordinates without reading any data variables.
+
+        Override this method if the store can read coordinates more efficiently than
+        via ``get``.
+        """
+        ds = self.get()
+        return {name: ds[name].values for name in names}
+
     @abstractmethod
     def clear(self) -> None:
         """Clear data from store."""
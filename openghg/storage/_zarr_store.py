@@ -1,9 +1,10 @@
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Sequence
 import logging
 from pathlib import Path
 import re
 from typing import Any, cast, Generic, Literal, TypeVar
 
+import numpy as np
 import pandas as pd
 import xarray as xr
 import zarr
@@ -11,9 +12,11 @@ import zarr.convenience
 from zarr._storage.store import Store as AbstractZarrStore
 
 from openghg.types import DataOverlapError
+from openghg.util._execution import uses_execution_options
 from openghg.util._versioning import SimpleVersioning
-from ._encoding import get_zarr_encoding
+from ._encoding import check_stored_dtypes, CodecPolicy, get_policy_encoding, get_zarr_encoding
 from ._indexing import contiguous_regions, IndexingError, OverlapDeterminer
+from ._sharded_store import is_sharded_store, ShardedDirectoryStore
 from ._store import Store, UpdateError, VersionedStore
 
 logger = logging.getLogger("openghg.storage")
@@ -43,6 +46,7 @@ class ZarrStore(Store, Generic[ZST]):
         compressor: Any | None = None,
         filters: Any | None = None,
         encoding: dict | None = None,
+        codec_policies: Sequence[CodecPolicy] | None = None,
         **to_zarr_kwargs: Any,
     ) -> None:
         """Pass an instantiated Zarr Store.
@@ -57,6 +61,8 @@ class ZarrStore(Store, Generic[ZST]):
             compressor: compressor to use, see https://zarr.readthedocs.io/en/stable/tutorial.html#compressors
             filters: filters to use, see https://zarr.readthedocs.io/en/stable/tutorial.html#filters
             encoding: dictionary mapping data variables to encoding dictionary
+            codec_policies: codecs for variables matching name patterns, see `CodecPolicy`;
+              `encoding` takes precedence over these.
             to_zarr_kwargs: arguments that could be passed to `xr.Dataset.to_zarr`.
               Not all parameters will be passed on. See here for the full description
               of the parameters: https://docs.xarray.dev/en/latest/generated/xarray.Dataset.to_zarr.html
@@ -75,6 +81,7 @@ class ZarrStore(Store, Generic[ZST]):
         self.compressor = compressor
         self.filters = filters
         self.encoding = encoding or {}
+        self.codec_policies = list(codec_policies or [])
         self.to_zarr_kwargs = to_zarr_kwargs
 
     # use property to control assignment of `to_zarr_kwargs`
@@ -134,9 +141,21 @@ class ZarrStore(Store, Generic[ZST]):
     def get(self) -> xr.Dataset:
         return self._get(sort=True)
 
+    def get_coords(self, names: Iterable[str]) -> dict[str, np.ndarray]:
+        """Read coordinate arrays directly from the zarr group.
+
+        Only the consolidated metadata and the chunks of the requested arrays are read.
+        Values are returned as stored (no CF decoding is applied), so this is intended
+        for spatial coordinates such as lat, lon and height.
+        """
+        group = zarr.open_consolidated(self.store, mode="r")
+        return {name: group[name][:] for name in names}
+
+    @uses_execution_options
     def insert(self, data: xr.Dataset, on_overlap: Literal["error", "ignore"] = "error") -> None:
         if not self.store:
             encoding = get_zarr_encoding(data.data_vars, self.compressor, self.filters)
+            encoding.update(get_policy_encoding(data, self.codec_policies, self.compressor, self.filters))
             encoding.update(self.encoding)
             data.to_zarr(
                 store=self.store,
@@ -155,17 +174,76 @@ class ZarrStore(Store, Generic[ZST]):
                 # otherwise, select non-overlaps
                 data = self._overlap_determiner.select_nonoverlaps(data, self.append_dim)
 
-            data.to_zarr(
-                store=self.store,
-                mode="a",
-                append_dim=self.append_dim,
-                consolidated=True,
-                compute=True,
-                synchronizer=zarr.ThreadSynchronizer(),
-                safe_chunks=False,
-                **self.to_zarr_kwargs,
+            self._append(data)
+
+    @uses_execution_options
+    def append(self, data: xr.Dataset) -> None:
+        """Append data along the append dimension without checking for overlaps.
+
+        This avoids reading the index of the stored data, so the caller must make sure
+        the new data comes after the data already stored.
+        """
+        if not self.store:
+            return self.insert(data)
+
+        self._append(data)
+
+    def _prepare_write(self, data: xr.Dataset) -> xr.Dataset:
+        """Check integer values fit in the (possibly downcast) dtypes of the stored arrays,
+        and chunk the data to match the stored arrays.
+
+        Data is written with `safe_chunks=False`, so if a stored chunk were written from
+        several dask chunks these writes could overwrite each other. Dask backed variables
+        are given the chunk sizes of the stored array along all dimensions other than the
+        append dimension, e.g. if the default chunks have changed since the store was written.
+
+        Args:
+            data: Data to write to the store
+        Returns:
+            xr.Dataset: Data chunked to match the stored arrays
+        """
+        group = zarr.open_consolidated(self.store, mode="r")
+        check_stored_dtypes(data, group)
+
+        rechunked = {}
+        for name, variable in data.variables.items():
+            if variable.chunks is None or name not in group:
+                continue
+
+            stored = group[name]
+            stored_dims = stored.attrs.get("_ARRAY_DIMENSIONS", [])
+            chunks = {
+                dim: size
+                for dim, size in zip(stored_dims, stored.chunks)
+                if dim != self.append_dim and dim in variable.dims
+            }
+            aligned = all(
+                all(size == chunks[dim] for size in sizes[:-1]) and sizes[-1] <= chunks[dim]
+                for dim, sizes in ((dim, variable.chunksizes[dim]) for dim in chunks)
             )
+            if not aligned:
+                rechunked[name] = variable.chunk(chunks)
+
+        if rechunked:
+            logger.debug(f"Rechunking {sorted(map(str, rechunked))} to match the stored chunks.")
+            data = data.assign(rechunked)
+
+        return data
+
+    def _append(self, data: xr.Dataset) -> None:
+        data = self._prepare_write(data)
+        data.to_zarr(
+            store=self.store,
+            mode="a",
+            append_dim=self.append_dim,
+            consolidated=True,
+            compute=True,
+            synchronizer=zarr.ThreadSynchronizer(),
+            safe_chunks=False,
+            **self.to_zarr_kwargs,
+        )
 
+    @uses_execution_options
     def update(self, data: xr.Dataset, on_nonoverlap: Literal["error", "ignore"] = "error") -> None:
 
         if not self.store:
@@ -183,6 +261,12 @@ class ZarrStore(Store, Generic[ZST]):
                 logger.warning("No data to update with.")
                 return None
 
+            # no overlapping values, e.g. when called by `upsert` with only new values
+            if not data.sizes.get(self.append_dim, 1):
+                return None
+
+            data = self._prepare_write(data)
+
             try:
                 data.to_zarr(
                     store=self.store,
@@ -316,6 +400,7 @@ class VersionedZarrStore(VersionedStore, SimpleVersioning[ZST], ZarrStore[ZST]):
         compressor: Any | None = None,
         filters: Any | None = None,
         encoding: dict | None = None,
+        codec_policies: Sequence[CodecPolicy] | None = None,
         **to_zarr_kwargs: Any,
     ) -> None:
         """Create VersionedZarrStore object.
@@ -335,6 +420,8 @@ class VersionedZarrStore(VersionedStore, SimpleVersioning[ZST], ZarrStore[ZST]):
             compressor: compressor to use, see https://zarr.readthedocs.io/en/stable/tutorial.html#compressors
             filters: filters to use, see https://zarr.readthedocs.io/en/stable/tutorial.html#filters
             encoding: dictionary mapping data variables to encoding dictionary
+            codec_policies: codecs for variables matching name patterns, see `CodecPolicy`;
+              `encoding` takes precedence over these.
             to_zarr_kwargs: arguments that could be passed to `xr.Dataset.to_zarr`.
               Not all parameters will be passed on. See here for the full description
               of the parameters: https://docs.xarray.dev/en/latest/generated/xarray.Dataset.to_zarr.html
@@ -358,6 +445,7 @@ class VersionedZarrStore(VersionedStore, SimpleVersioning[ZST], ZarrStore[ZST]):
         self.compressor = compressor
         self.filters = filters
         self.encoding = encoding or {}
+        self.codec_policies = list(codec_policies or [])
         self.to_zarr_kwargs = parse_to_zarr_kwargs(to_zarr_kwargs)
 
     # make ._store an alias for ._current
@@ -398,6 +486,8 @@ def get_versioned_zarr_directory_store(
     append_dim: str = "time",
     index_options: dict | None = None,
     version_pat: str = r"v\d+",
+    sharded: bool = False,
+    chunks_per_shard: int = 256,
     **kwargs: Any,
 ) -> VersionedZarrStore[zarr.DirectoryStore]:
     """Factory function to create VersionedZarrStore objects based on a zarr.DirectoryStore.
@@ -409,12 +499,16 @@ def get_versioned_zarr_directory_store(
         index_options: options for the index used to resolve overlaps/conflicts when
             adding data to the store.
         version_pat: regex pattern to match existing versions
+        sharded: if True, new versions are written with `ShardedDirectoryStore`, which packs
+          chunks into shard files. Existing versions are opened with the layout they were written with.
+        chunks_per_shard: number of chunks along the first dimension of each array to put
+          in a shard file, for new sharded versions.
         kwargs: `compressor`, `filters`, `encoding`, or arguments that could be
           passed to `xr.Dataset.to_zarr`.
 
     Returns:
-        VersionedZarrStore object with zarr.DirectoryStore as the underlying
-        storage.
+        VersionedZarrStore object with zarr.DirectoryStore (or its subclass
+        ShardedDirectoryStore) as the underlying storage.
 
     """
     versions = set([]) if versions is None else set(versions)
@@ -432,7 +526,10 @@ def get_versioned_zarr_directory_store(
     # factory function to create a Directory Stores corresponding to versions
     def factory(v: str) -> zarr.DirectoryStore:
         """Factory function to create a Directory Store corresponding to version."""
-        return zarr.DirectoryStore(path / v)
+        version_path = path / v
+        if is_sharded_store(version_path) or (sharded and not version_path.exists()):
+            return ShardedDirectoryStore(version_path, chunks_per_shard=chunks_per_shard)
+        return zarr.DirectoryStore(version_path)
 
     return VersionedZarrStore[zarr.DirectoryStore](
         factory=factory,
@@ -7,6 +7,7 @@ from ._infer_time import infer_date_range, update_zero_dim
 from ._obsmobile import ObsMobile
 from ._obscolumn import ObsColumn
 from ._obssurface import ObsSurface
+from ._ingest import IngestSession, get_ingest_session, ingest_session
 from ._populate import add_noaa_obspack
 from ._met import SiteMet
 
@@ -446,4 +446,14 @@ class Footprints(BaseStore):
             time_chunk_size = 480
             secondary_vars = ["lat", "lon"]
 
-        return ChunkingSchema(variable=var, chunks={"time": time_chunk_size}, secondary_dims=secondary_vars)
+        # Chunk spatially too, so reading a sub-region only reads the chunks which overlap it.
+        # Smaller domains are stored as a single spatial chunk, see `BaseStore.check_chunks`.
+        # These chunks only apply to new stores, data appended to an existing store is given
+        # the stored chunk sizes by `ZarrStore`
+        spatial_chunk_size = 128
+
+        return ChunkingSchema(
+            variable=var,
+            chunks={"time": time_chunk_size, "lat": spatial_chunk_size, "lon": spatial_chunk_size},
+            secondary_dims=secondary_vars,
+        )
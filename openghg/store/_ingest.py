@@ -0,0 +1,195 @@
+"""Ingest sessions for adding many files to an object store.
+
+Each call to a standardise function opens the storage class for its data type,
+reads the metastore, acquires the object store lock and, once finished, writes
+the metastore and releases the lock again. When adding thousands of files this
+repeated I/O can take longer than standardising the data itself.
+
+Within an `ingest_session` the storage classes, metastores and Datasources are kept
+loaded and the locks held for the whole session. Changes are committed once at the end
+of the session or every `commit_every` files.
+
+    >>> with ingest_session(store="user", commit_every=100):
+    >>>     for filepath in filepaths:
+    >>>         standardise_surface(filepath=filepath, site="tac", network="decc", source_format="crds", store="user")
+"""
+
+from __future__ import annotations
+
+from contextvars import ContextVar, Token
+import logging
+from types import TracebackType
+
+from openghg.objectstore import get_writable_bucket
+from openghg.store.base import BaseStore
+
+from ._meta import get_data_class
+
+logger = logging.getLogger("openghg.store")
+logger.setLevel(logging.DEBUG)  # Have to set level for logger as well as handler
+
+_active_session: ContextVar[IngestSession | None] = ContextVar("openghg_ingest_session", default=None)
+
+
+class IngestSession:
+    """Keep storage classes loaded and object store locks held across many standardise calls.
+
+    Use `ingest_session` to create a session.
+    """
+
+    def __init__(self, bucket: str, commit_every: int | None = None) -> None:
+        """Create an IngestSession.
+
+        Args:
+            bucket: Object store bucket to write to
+            commit_every: Commit changes every this many files. If None changes are only
+                committed at the end of the session.
+        """
+        if commit_every is not None and commit_every < 1:
+            raise ValueError("commit_every must be a positive integer.")
+
+        self.bucket = bucket
+        self.commit_every = commit_every
+        self._data_classes: dict[str, BaseStore] = {}
+        self._n_uncommitted = 0
+        self._n_commits = 0
+        self._token: Token | None = None
+        self._closed = False
+
+    def __enter__(self) -> IngestSession:
+        if _active_session.get() is not None:
+            raise ValueError("An ingest session is already active.")
+
+        self._token = _active_session.set(self)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        # Data for files processed before any error has already been written,
+        # so we always commit the corresponding metadata
+        try:
+            self.close()
+        finally:
+            if self._token is not None:
+                _active_session.reset(self._token)
+                self._token = None
+
+    @property
+    def n_commits(self) -> int:
+        """Number of times changes have been committed during this session."""
+        return self._n_commits
+
+    def data_class(self, data_type: str) -> BaseStore:
+        """Get the storage class for a data type, loading it and holding its lock
+        if this is the first time it's used in this session.
+
+        Args:
+            data_type: Type of data, e.g. "surface"
+        Returns:
+            BaseStore: Storage class
+        """
+        if self._closed:
+            raise ValueError("This ingest session has been closed.")
+
+        if data_type not in self._data_classes:
+            dclass = get_data_class(data_type)(bucket=self.bucket)
+            dclass._objectstore.hold()
+            self._data_classes[data_type] = dclass
+
+        return self._data_classes[data_type]
+
+    def file_processed(self, n_files: int = 1) -> None:
+        """Record that files have been processed, committing if `commit_every` files
+        have been processed since the last commit.
+
+        Args:
+            n_files: Number of files processed
+        Returns:
+            None
+        """
+        self._n_uncommitted += n_files
+
+        if self.commit_every is not None and self._n_uncommitted >= self.commit_every:
+            self.commit()
+
+    def commit(self) -> None:
+        """Write the metastores, Datasources and storage classes loaded in this session
+        to the object store. The locks are kept.
+
+        Returns:
+            None
+        """
+        for dclass in self._data_classes.values():
+            dclass.commit()
+
+        logger.debug(f"Committed {self._n_uncommitted} files to {self.bucket}.")
+        self._n_uncommitted = 0
+        self._n_commits += 1
+
+    def close(self) -> None:
+        """Commit any changes and release the locks held by this session.
+
+        Calling this more than once has no further effect.
+
+        Returns:
+            None
+        """
+        if self._closed:
+            return
+
+        self._closed = True
+
+        if not self._data_classes:
+            return
+
+        while self._data_classes:
+            _, dclass = self._data_classes.popitem()
+            # Releasing the object store closes its metastore, so the storage class
+            # is written by `commit` while the lock is still held
+            try:
+                dclass.commit()
+            finally:
+                dclass._objectstore.release()
+
+        self._n_uncommitted = 0
+        self._n_commits += 1
+
+
+def get_ingest_session(bucket: str | None = None) -> IngestSession | None:
+    """Get the active ingest session, if any.
+
+    Args:
+        bucket: Only return the session if it writes to this bucket
+    Returns:
+        IngestSession or None
+    """
+    session = _active_session.get()
+
+    if session is not None and bucket is not None and session.bucket != bucket:
+        return None
+
+    return session
+
+
+def ingest_session(store: str | None = None, commit_every: int | None = None) -> IngestSession:
+    """Create a session for adding many files to an object store.
+
+    Standardise functions called within the session writing to the same object store
+    reuse the loaded storage classes, metastores and Datasources, and changes to these
+    are only written at the end of the session or every `commit_every` files. The object
+    store locks are held for the whole session.
+
+    Args:
+        store: Name of object store to write to, required if user has access to more than one
+            writable store
+        commit_every: Commit changes every this many files. If None changes are only
+            committed at the end of the session.
+    Returns:
+        IngestSession: Context manager for the session
+    """
+    bucket = get_writable_bucket(name=store)
+    return IngestSession(bucket=bucket, commit_every=commit_every)
@@ -2,6 +2,7 @@ from pathlib import Path
 from rich.progress import track
 import logging
 from openghg.standardise import standardise_surface
+from openghg.store._ingest import ingest_session
 
 logger = logging.getLogger("openghg.store")
 logger.setLevel(logging.DEBUG)  # Have to set level for logger as well as handler
@@ -12,6 +13,7 @@ def add_noaa_obspack(
     project: str | None = None,
     overwrite: bool = False,
     store: str | None = None,
+    commit_every: int | None = 100,
 ) -> list[dict]:
     """
     Function to detect and add files from the NOAA ObsPack to the object store.
@@ -22,6 +24,8 @@ def add_noaa_obspack(
         or "surface-flask"
         overwrite : Whether to overwrite existing entries in the object store
         store: Name of object store to write to
+        commit_every: Number of files to add between writes of the metastore and Datasource
+            metadata. If None, these are only written once all files have been added.
 
     Returns:
         list: of dicts with details of data which has been processed into the object store
@@ -87,34 +91,35 @@ def add_noaa_obspack(
     files_with_errors = []
     # Find relevant details for each file and call parse_noaa() function
     processed_summary: list[dict] = []
-    for filepath in track(files, description="Standardising "):
-        param = _param_from_filename(filepath)
-        site = param["site"]
-        _project = param["project"]
-        measurement_type = param["measurement_type"]
-
-        processed: list[dict] = []
-        if _project in projects_to_read:
-            try:
-                # TODO - can we streamline this a bit to save repeated loads?
-                processed = standardise_surface(
-                    store=store,
-                    filepath=filepath,
-                    site=site,
-                    measurement_type=measurement_type,
-                    network="NOAA",
-                    source_format="NOAA",
-                    overwrite=overwrite,
+    # Keep the object store open across all files, see `ingest_session`
+    with ingest_session(store=store, commit_every=commit_every):
+        for filepath in track(files, description="Standardising "):
+            param = _param_from_filename(filepath)
+            site = param["site"]
+            _project = param["project"]
+            measurement_type = param["measurement_type"]
+
+            processed: list[dict] = []
+            if _project in projects_to_read:
+                try:
+                    processed = standardise_surface(
+                        store=store,
+                        filepath=filepath,
+                        site=site,
+                        measurement_type=measurement_type,
+                        network="NOAA",
+                        source_format="NOAA",
+                        overwrite=overwrite,
+                    )
+                except Exception:
+                    files_with_errors.append(filepath.name)
+                else:
+                    processed_summary.extend(processed)
+
+            elif _project in project_names_not_implemented:
+                logger.warning(
+                    f"Not processing {filepath.name} - no standardisation for {_project} data implemented yet."
                 )
-            except Exception:
-                files_with_errors.append(filepath.name)
-            else:
-                processed_summary.extend(processed)
-
-        elif _project in project_names_not_implemented:
-            logger.warning(
-                f"Not processing {filepath.name} - no standardisation for {_project} data implemented yet."
-            )
 
     if files_with_errors:
         err_string = "\n".join(files_with_errors)
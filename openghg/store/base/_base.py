@@ -7,7 +7,7 @@ import logging
 from pathlib import Path
 from types import TracebackType
 from typing import Any, TypeVar
-from collections.abc import MutableSequence, Sequence, Callable
+from collections.abc import Iterator, MutableSequence, Sequence, Callable
 import warnings
 
 from pandas import Timestamp
@@ -27,6 +27,7 @@ from openghg.types import (
 from openghg.util import timestamp_now, to_lowercase, hash_file, normalise_to_filepath_list
 
 from .._metakeys_config import get_metakeys
+from ._tail import TAIL_FORMATS, TailCheckpoint, scan_file, write_tail_file
 
 T = TypeVar("T", bound="BaseStore")
 
@@ -50,6 +51,8 @@ class BaseStore:
         self._stored = False
         # Hashes of previously uploaded files
         self._file_hashes: dict[str, str] = {}
+        # Checkpoints of files ingested incrementally, see `_tail.py`
+        self._tail_checkpoints: dict[str, dict] = {}
         # Hashes of previously stored data from other data platforms
         self._retrieved_hashes: dict[str, dict] = {}
         # Where we'll store this object's metastore
@@ -104,6 +107,15 @@ class BaseStore:
         self._objectstore.close()
         set_object_from_json(bucket=self._bucket, key=self.key(), data=self.to_data())
 
+    def commit(self) -> None:
+        """Write the metastore, any Datasources held in memory and this object
+        to the object store, without releasing the object store lock.
+
+        This is used by ingest sessions, see `openghg.store.ingest_session`.
+        """
+        self._objectstore.commit()
+        set_object_from_json(bucket=self._bucket, key=self.key(), data=self.to_data())
+
     def to_data(self) -> dict:
         # We don't need to store the metadata store, it has its own location
         # QUESTION - Is this cleaner than the previous specifying
@@ -129,11 +141,15 @@ class BaseStore:
         filters: Any | None = None,
         chunks: dict | None = None,
         info_metadata: dict | None = None,
+        append_only: bool = False,
     ) -> list[dict]:
         """
         Standardise input data from a filepath or set of filepaths. This will also
         store the data in the object store.
 
+        If the parser function yields the data in time slabs (see `openghg.types.split_time_slabs`)
+        rather than returning it all at once, the slabs are stored one at a time, see `_store_slabs`.
+
         Args:
             filepath: Filepath or filepaths to data to be standardised.
             fn_input_parameters: Set of input parameters from read_file
@@ -164,6 +180,8 @@ class BaseStore:
                 https://docs.openghg.org/tutorials/local/Adding_data/Adding_ancillary_data.html#chunking.
 
             info_metadata: Allows to pass in additional tags to describe the data. e.g {"comment":"Quality checks have been applied"}
+            append_only: The data is expected to come after the data already stored and is appended
+                to the latest version without checking for overlaps where possible.
         Returns:
             list[dict]: List of datasources and their uuids
 
@@ -195,48 +213,58 @@ class BaseStore:
 
         # Call appropriate standardisation function with input parameters
         try:
-            parsed_data: list[MetadataAndData] = parser_fn(**parser_input_parameters)
+            parsed_data: list[MetadataAndData] | Iterator[list[MetadataAndData]] = parser_fn(
+                **parser_input_parameters
+            )
         except (TypeError, ValueError) as err:
             msg = f"Error during standardisation of file(s): {filepath}. Error: {err}"
             logger.exception(msg)
             raise StandardiseError(msg)
 
-        # Check any specified chunks / default chunks for the data_type are not too large
-        # - currently checking the first MetadataAndData object returned only
-        # - if an empty dictionary has been passed we shouldn't allow chunks to be updated ("empty dictionary should disable chunking")
-        if chunks != {}:
-            chunks = self._check_chunks_datasource(parsed_data[0], fn_input_parameters, chunks=chunks)
-
-        # Current workflow: if any datasource fails validation, whole filepath fails
-        self._validate_datasources(parsed_data, fn_input_parameters, filepath=filepath)
-
-        # Ensure the parsed_data is chunked
-        if chunks:
-            logger.info(f"Rechunking with chunks={chunks}")
-            for datasource in parsed_data:
-                datasource.data = datasource.data.chunk(chunks)
-
-        self.align_metadata_attributes(data=parsed_data, update_mismatch=update_mismatch)
-
         # Check to ensure no required keys are being passed through info_metadata dict
         # before adding details
         self.check_info_keys(info_metadata)
         if info_metadata is None:
             info_metadata = {}
 
-        # Mop up and add additional keys to metadata which weren't passed to the parser
-        updated_data = self.update_metadata(
-            parsed_data, additional_input_parameters, additional_metadata=info_metadata
+        prepare_kwargs: dict[str, Any] = dict(
+            fn_input_parameters=fn_input_parameters,
+            additional_input_parameters=additional_input_parameters,
+            info_metadata=info_metadata,
+            filepath=filepath,
+            update_mismatch=update_mismatch,
         )
 
-        # Create Datasources, save them to the object store and get their UUIDs
-        datasource_uuids = self.assign_data(
-            data=updated_data,
-            if_exists=if_exists,
-            new_version=new_version,
-            compressor=compressor,
-            filters=filters,
-        )
+        if isinstance(parsed_data, Iterator):
+            # The parser yields the data in time slabs
+            datasource_uuids = self._store_slabs(
+                slabs=parsed_data,
+                chunks=chunks,
+                if_exists=if_exists,
+                new_version=new_version,
+                compressor=compressor,
+                filters=filters,
+                append_only=append_only,
+                **prepare_kwargs,
+            )
+        else:
+            # Check any specified chunks / default chunks for the data_type are not too large
+            # - currently checking the first MetadataAndData object returned only
+            # - if an empty dictionary has been passed we shouldn't allow chunks to be updated ("empty dictionary should disable chunking")
+            if chunks != {}:
+                chunks = self._check_chunks_datasource(parsed_data[0], fn_input_parameters, chunks=chunks)
+
+            updated_data = self._prepare_parsed_data(parsed_data=parsed_data, chunks=chunks, **prepare_kwargs)
+
+            # Create Datasources, save them to the object store and get their UUIDs
+            datasource_uuids = self.assign_data(
+                data=updated_data,
+                if_exists=if_exists,
+                new_version=new_version,
+                compressor=compressor,
+                filters=filters,
+                append_only=append_only,
+            )
 
         if filepath is not None:
             filepaths = normalise_to_filepath_list(filepath)
@@ -257,6 +285,161 @@ class BaseStore:
 
         return datasource_uuids
 
+    def _prepare_parsed_data(
+        self,
+        parsed_data: list[MetadataAndData],
+        fn_input_parameters: dict,
+        additional_input_parameters: dict,
+        info_metadata: dict,
+        filepath: Path | list[Path] | None = None,
+        chunks: dict | None = None,
+        update_mismatch: str = "never",
+    ) -> list[MetadataAndData]:
+        """Validate and chunk parsed data and add the additional metadata, ready to be stored.
+
+        Args:
+            parsed_data: Data and metadata returned by the parser function
+            fn_input_parameters: Set of input parameters from read_file
+            additional_input_parameters: Input parameters which weren't passed to the parser function
+            info_metadata: Additional informational metadata
+            filepath: Filepath or filepaths the data was read from, if present
+            chunks: Chunks to apply to the data, these should already have been checked
+            update_mismatch: How mismatches between the data attributes and metadata are handled,
+                see `_standardise_and_store`
+        Returns:
+            list: Data and metadata with updated metadata
+        """
+        # Current workflow: if any datasource fails validation, whole filepath fails
+        self._validate_datasources(parsed_data, fn_input_parameters, filepath=filepath)
+
+        # Ensure the parsed_data is chunked
+        if chunks:
+            logger.info(f"Rechunking with chunks={chunks}")
+            for datasource in parsed_data:
+                datasource.data = datasource.data.chunk(chunks)
+
+        self.align_metadata_attributes(data=parsed_data, update_mismatch=update_mismatch)
+
+        # Mop up and add additional keys to metadata which weren't passed to the parser
+        return self.update_metadata(
+            parsed_data, additional_input_parameters, additional_metadata=info_metadata
+        )
+
+    def _store_slabs(
+        self,
+        slabs: Iterator[list[MetadataAndData]],
+        fn_input_parameters: dict,
+        additional_input_parameters: dict,
+        info_metadata: dict,
+        filepath: Path | list[Path] | None = None,
+        chunks: dict | None = None,
+        update_mismatch: str = "never",
+        if_exists: str = "auto",
+        new_version: bool = True,
+        compressor: Any | None = None,
+        filters: Any | None = None,
+        append_only: bool = False,
+    ) -> list[dict]:
+        """Store data yielded by a parser in time slabs, one slab at a time, so only one slab
+        needs to be held in memory.
+
+        The first slab is stored as determined by `if_exists` and `new_version`. Later slabs are
+        added to the same version: these are appended if they come after the data already stored,
+        otherwise they are combined with it (if `if_exists` is "new" or "combine") or a DataOverlapError
+        is raised (if `if_exists` is "auto"). The Datasources and metastore are only written once all
+        slabs have been stored, unless this is left to an ingest session.
+
+        If an error occurs part of the way through, the changes made are rolled back (see
+        `ObjectStore.rollback`) and the error is re-raised: versions and Datasources created by
+        the slabs already stored are deleted. Slabs added to a version which already existed
+        (e.g. with `new_version=False`) can't be removed. If the object store is held by an
+        ingest session, rolling back is left to the session.
+
+        Args:
+            slabs: Lists of data and metadata, one for each slab, in time order
+            fn_input_parameters: Set of input parameters from read_file
+            additional_input_parameters: Input parameters which weren't passed to the parser function
+            info_metadata: Additional informational metadata
+            filepath: Filepath or filepaths the data was read from, if present
+            chunks: Chunking schema to use when storing data, see `_standardise_and_store`.
+                This is checked using the first slab.
+            update_mismatch: How mismatches between the data attributes and metadata are handled
+            if_exists: What to do if existing data is present, see `_standardise_and_store`
+            new_version: Whether to create a new version of the datasource
+            compressor: Compression for zarr encoding
+            filters: Filters for zarr encoding
+            append_only: The first slab is expected to come after the data already stored
+        Returns:
+            list[dict]: List of datasources and their uuids
+        """
+        # Keep the lock on the object store, and the Datasources in memory, until all slabs are stored.
+        # If the object store is held by an ingest session, the session writes them
+        held = self._objectstore._held
+        if not held:
+            self._objectstore.hold()
+
+        results: dict[str, dict] = {}
+        n_slabs = 0
+        try:
+            while True:
+                # Parsers may only read the file as each slab is requested
+                try:
+                    slab = next(slabs, None)
+                except (TypeError, ValueError) as err:
+                    msg = f"Error during standardisation of file(s): {filepath}. Error: {err}"
+                    logger.exception(msg)
+                    raise StandardiseError(msg)
+
+                if slab is None:
+                    break
+                if not slab:
+                    continue
+
+                if n_slabs == 0:
+                    if chunks != {}:
+                        chunks = self._check_chunks_datasource(slab[0], fn_input_parameters, chunks=chunks)
+                    store_kwargs: dict[str, Any] = {
+                        "if_exists": if_exists,
+                        "new_version": new_version,
+                        "append_only": append_only,
+                    }
+                else:
+                    # Later slabs replace data from earlier slabs rather than creating another version
+                    slab_if_exists = "combine" if if_exists == "new" else if_exists
+                    store_kwargs = {"if_exists": slab_if_exists, "new_version": False, "append_only": True}
+
+                updated_data = self._prepare_parsed_data(
+                    parsed_data=slab,
+                    fn_input_parameters=fn_input_parameters,
+                    additional_input_parameters=additional_input_parameters,
+                    info_metadata=info_metadata,
+                    filepath=filepath,
+                    chunks=chunks,
+                    update_mismatch=update_mismatch,
+                )
+
+                for result in self.assign_data(
+                    data=updated_data, compressor=compressor, filters=filters, **store_kwargs
+                ):
+                    results.setdefault(result["uuid"], result)
+
+                n_slabs += 1
+                logger.debug(f"Stored slab {n_slabs} of file(s): {filepath}.")
+        except BaseException:
+            # Don't keep a partially stored file
+            if not held:
+                if n_slabs:
+                    logger.warning(
+                        f"Error after storing {n_slabs} slabs of file(s): {filepath}, discarding these."
+                    )
+                self._objectstore.abort()
+            raise
+
+        if not held:
+            self._objectstore.release()
+
+        return list(results.values())
+
     def standardise_and_store(
         self,
         source_format: str,
@@ -272,6 +455,7 @@ class BaseStore:
         update_mismatch: str = "never",
         concat_nc_files: bool | None = None,
         info_metadata: dict | None = None,
+        tail: bool = False,
         **kwargs: Any,
     ) -> list[dict]:
         """
@@ -317,6 +501,11 @@ class BaseStore:
                 - True - attempt to open concatenated if all files are recognised as netcdf files.
                 - False - open and standardise each file individually.
             info_metadata: Allows to pass in additional tags to describe the data. e.g {"comment":"Quality checks have been applied"}
+            tail: Ingest files which grow by having rows appended incrementally. If a file has been
+                standardised before with `tail=True` and its header and previously read content are unchanged,
+                only the rows appended since then are parsed and added to the latest version of the data.
+                Otherwise the whole file is standardised. Only available for source formats which
+                support this (currently CRDS and GCWERKS).
             **kwargs: Specific keywords associated with the data type. See
                 the openghg.standardise.standardise_* functions for details
                 of what keywords are expected for this.
@@ -374,6 +563,21 @@ class BaseStore:
         if filepath is not None:
             filepaths = normalise_to_filepath_list(filepath)
 
+            if tail:
+                return self._standardise_and_store_tail(
+                    filepaths=filepaths,
+                    fn_input_parameters=fn_input_parameters,
+                    source_format=source_format,
+                    force=force,
+                    update_mismatch=update_mismatch,
+                    if_exists=if_exists,
+                    new_version=new_version,
+                    compressor=compressor,
+                    filters=filters,
+                    chunks=chunks,
+                    info_metadata=info_metadata,
+                )
+
             # Check hashes of previous files (included after any filepath(s) formatting)
             _, unseen_hashes = self.check_hashes(filepaths=filepaths, force=force)
 
@@ -461,6 +665,121 @@ class BaseStore:
 
         return results
 
+    def _standardise_and_store_tail(
+        self,
+        filepaths: list[Path],
+        fn_input_parameters: dict,
+        source_format: str,
+        force: bool = False,
+        new_version: bool = True,
+        **kwargs: Any,
+    ) -> list[dict]:
+        """Standardise files which grow by having rows appended, only parsing the rows
+        appended since a file was last standardised where possible.
+
+        For each file a checkpoint is recorded (see `openghg.store.base._tail`). If the header
+        and the content up to the checkpoint are unchanged, the appended rows are written to a
+        temporary file alongside the header, standardised and appended to the latest version
+        of the data. Otherwise the whole file is standardised.
+
+        Args:
+            filepaths: Filepaths to standardise
+            fn_input_parameters: Set of input parameters from format_inputs
+            source_format: Name of associated format for the filepaths
+            force: Standardise the whole of each file, even if seen before
+            new_version: Whether to create a new version when standardising a whole file
+            kwargs: Remaining arguments to pass to _standardise_and_store
+        Returns:
+            list[dict]: Details of the datasource uuids for the processed files.
+        """
+        import tempfile
+
+        try:
+            tail_format = TAIL_FORMATS[source_format.lower()]
+        except KeyError:
+            raise ValueError(
+                f"Tail ingestion is not available for source format {source_format}. "
+                f"Available formats: {', '.join(TAIL_FORMATS)}"
+            )
+
+        loop_values = {
+            key1: fn_input_parameters[key2]
+            for key1, key2 in self.define_loop_params().items()
+            if fn_input_parameters.get(key2) is not None
+        }
+
+        results = []
+        for i, fp in enumerate(filepaths):
+            for key, values in loop_values.items():
+                fn_input_parameters[key] = values[i]
+
+            checkpoint_key = str(fp.expanduser().resolve())
+            checkpoint = None
+            if not force and checkpoint_key in self._tail_checkpoints:
+                checkpoint = TailCheckpoint.from_dict(self._tail_checkpoints[checkpoint_key])
+
+            scan = scan_file(
+                filepath=fp,
+                tail_format=tail_format,
+                checkpoint_offset=checkpoint.offset if checkpoint is not None else None,
+            )
+
+            if scan.file_hash in self._file_hashes and not force:
+                logger.info(f"Skipping previously standardised file: {fp.name}")
+                continue
+
+            try:
+                if checkpoint is not None and checkpoint.matches(scan):
+                    with tempfile.TemporaryDirectory() as tmpdir:
+                        # Keep the same filename as this may be used by the parser
+                        tail_fp = Path(tmpdir) / fp.name
+                        n_rows, in_order = write_tail_file(
+                            filepath=fp,
+                            tail_filepath=tail_fp,
+                            tail_format=tail_format,
+                            scan=scan,
+                            checkpoint=checkpoint,
+                        )
+
+                        if n_rows:
+                            logger.info(f"Adding {n_rows} appended rows from {fp.name}.")
+                            if not in_order:
+                                logger.info("Appended rows are not in time order, checking for overlaps.")
+                            datasource_uuids = self._standardise_and_store(
+                                filepath=tail_fp,
+                                fn_input_parameters=fn_input_parameters,
+                                source_format=source_format,
+                                new_version=False,
+                                append_only=in_order,
+                                **kwargs,
+                            )
+                        else:
+                            logger.info(f"No new rows to add from {fp.name}.")
+                            datasource_uuids = []
+                else:
+                    if checkpoint is not None:
+                        logger.info(
+                            f"Header or previously standardised content of {fp.name} has changed, "
+                            "standardising whole file."
+                        )
+                    datasource_uuids = self._standardise_and_store(
+                        filepath=fp,
+                        fn_input_parameters=fn_input_parameters,
+                        source_format=source_format,
+                        new_version=new_version,
+                        **kwargs,
+                    )
+            except ValidationError as err:
+                logger.error(f"Unable to validate and store data from file: {fp.name}. Error: {err}")
+                break
+
+            results.extend(datasource_uuids)
+
+            self._tail_checkpoints[checkpoint_key] = scan.checkpoint().to_dict()
+            self.store_hashes({scan.file_hash: fp})
+
+        return results
+
     def store_data(self, *args: Any, **kwargs: Any) -> list[dict] | None:
         raise NotImplementedError
 
@@ -677,7 +996,14 @@ class BaseStore:
                 raise ValueError(f"The following dimensions are missing: {missing_dims}")
 
         # Make the 'chunks' dict, using dim_sizes for any unspecified dims
-        specified_chunks = default_chunks if chunks is None else chunks
+        if chunks is None:
+            # Default chunks along secondary dimensions can't be larger than the dimension
+            specified_chunks = {
+                k: min(v, dim_sizes[k]) if k in (secondary_dimensions or []) and k in dim_sizes else v
+                for k, v in default_chunks.items()
+            }
+        else:
+            specified_chunks = chunks
 
         chunks = dim_sizes
         chunks.update(specified_chunks)
@@ -956,6 +1282,7 @@ class BaseStore:
         new_version: bool = True,
         compressor: Any | None = None,
         filters: Any | None = None,
+        append_only: bool = False,
     ) -> list[dict]:
         """Assign data to a Datasource. This will either create a new Datasource
         Create or get an existing Datasource for each gas in the file
@@ -978,6 +1305,8 @@ class BaseStore:
                     data to a previous version.
                 compressor: Compression for zarr encoding
                 filters: Filters for zarr encoding
+                append_only: Data is expected to come after the data already stored, see
+                    `Datasource.add_timed_data`
             Returns:
                 dict mapping key based on required keys to Datasource UUIDs created or updated
         """
@@ -1027,6 +1356,8 @@ class BaseStore:
                     filters=filters,
                     period=period,
                 )
+                if append_only:
+                    cu_kwargs["append_only"] = True
 
                 # Make sure all the metadata is lowercase for easier searching later
                 # TODO - do we want to do this or should be just perform lowercase comparisons?
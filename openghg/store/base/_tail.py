@@ -0,0 +1,246 @@
+"""Incremental ("tail") ingestion of data files which grow by having rows appended.
+
+Instrument output files such as those written by CRDS and GCWERKS grow continuously. Each time
+a file is standardised we record a checkpoint: the number of bytes read, the time of the last row
+and fingerprints of the header and of the content read so far. The next time the file is
+standardised, if the header and the content up to the checkpoint are unchanged, only the rows
+appended since the checkpoint are parsed and stored.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+import hashlib
+from pathlib import Path
+
+from pandas import Timestamp
+
+BUF_SIZE = 65536
+
+
+def _crds_line_time(line: bytes) -> Timestamp:
+    date, time = line.split()[:2]
+    return Timestamp(datetime.strptime(date.decode() + time.decode().zfill(6), "%y%m%d%H%M%S"))
+
+
+def _gcwerks_line_time(line: bytes) -> Timestamp:
+    yyyy, mm, dd, hh, mi = (int(f) for f in line.split()[1:6])
+    return Timestamp(year=yyyy, month=mm, day=dd, hour=hh, minute=mi)
+
+
+@dataclass(frozen=True)
+class TailFormat:
+    """Layout of a data file which can be ingested incrementally.
+
+    Args:
+        n_header_lines: Number of lines before the first row of data
+        line_time: Function returning the time of a row of data
+    """
+
+    n_header_lines: int
+    line_time: Callable[[bytes], Timestamp]
+
+
+TAIL_FORMATS = {
+    "crds": TailFormat(n_header_lines=3, line_time=_crds_line_time),
+    "gcwerks": TailFormat(n_header_lines=5, line_time=_gcwerks_line_time),
+}
+
+
+@dataclass
+class TailCheckpoint:
+    """Position up to which a data file has been ingested.
+
+    Args:
+        offset: Number of bytes ingested, always the end of a complete line
+        last_timestamp: Time of the last row ingested
+        header_hash: SHA1 hash of the header lines
+        prefix_hash: SHA1 hash of the first `offset` bytes of the file
+    """
+
+    offset: int
+    last_timestamp: str | None
+    header_hash: str
+    prefix_hash: str
+
+    def to_dict(self) -> dict:
+        return {
+            "offset": self.offset,
+            "last_timestamp": self.last_timestamp,
+            "header_hash": self.header_hash,
+            "prefix_hash": self.prefix_hash,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> TailCheckpoint:
+        return cls(
+            offset=int(data["offset"]),
+            last_timestamp=data.get("last_timestamp"),
+            header_hash=data["header_hash"],
+            prefix_hash=data["prefix_hash"],
+        )
+
+    def matches(self, scan: TailScan) -> bool:
+        """Check the header and the content up to this checkpoint are unchanged.
+
+        Args:
+            scan: Scan of the current file, see `scan_file`
+        Returns:
+            bool: True if only rows have been appended since this checkpoint
+        """
+        return (
+            scan.header_hash == self.header_hash
+            and scan.checkpoint_prefix_hash == self.prefix_hash
+            and scan.complete_offset >= self.offset
+        )
+
+
+@dataclass
+class TailScan:
+    """Fingerprints of a data file, see `scan_file`.
+
+    Args:
+        file_hash: SHA1 hash of the whole file, as given by `openghg.util.hash_file`
+        header_hash: SHA1 hash of the header lines
+        header_offset: Number of bytes in the header lines
+        complete_offset: Number of bytes up to the end of the last complete line
+        prefix_hash: SHA1 hash of the first `complete_offset` bytes
+        checkpoint_prefix_hash: SHA1 hash of the bytes up to the checkpoint offset, if given
+        last_timestamp: Time of the last complete row, if any
+    """
+
+    file_hash: str
+    header_hash: str
+    header_offset: int
+    complete_offset: int
+    prefix_hash: str
+    checkpoint_prefix_hash: str | None
+    last_timestamp: Timestamp | None
+
+    def checkpoint(self) -> TailCheckpoint:
+        """Checkpoint for the complete lines in the scanned file."""
+        return TailCheckpoint(
+            offset=self.complete_offset,
+            last_timestamp=None if self.last_timestamp is None else str(self.last_timestamp),
+            header_hash=self.header_hash,
+            prefix_hash=self.prefix_hash,
+        )
+
+
+def _last_complete_line(filepath: Path, size: int) -> tuple[int, bytes]:
+    """Find the end offset and content of the last complete (newline terminated) line."""
+    read_size = BUF_SIZE
+    with open(filepath, "rb") as f:
+        while True:
+            start = max(0, size - read_size)
+            f.seek(start)
+            tail = f.read(size - start)
+
+            newline = tail.rfind(b"\n")
+            if newline != -1:
+                line_start = tail.rfind(b"\n", 0, newline) + 1
+                if line_start > 0 or start == 0:
+                    return start + newline + 1, tail[line_start:newline]
+            elif start == 0:
+                return 0, b""
+
+            read_size *= 2
+
+
+def scan_file(filepath: Path, tail_format: TailFormat, checkpoint_offset: int | None = None) -> TailScan:
+    """Fingerprint a data file in a single pass over its content.
+
+    Args:
+        filepath: Path to data file
+        tail_format: Layout of the data file
+        checkpoint_offset: Offset of a previous checkpoint, the content up to which will be hashed
+    Returns:
+        TailScan: Fingerprints of the file
+    """
+    filepath = Path(filepath).expanduser().resolve()
+    size = filepath.stat().st_size
+
+    with open(filepath, "rb") as f:
+        header = b"".join(f.readline() for _ in range(tail_format.n_header_lines))
+
+    complete_offset, last_line = _last_complete_line(filepath, size)
+
+    last_timestamp = None
+    if complete_offset > len(header) and last_line.strip():
+        try:
+            last_timestamp = tail_format.line_time(last_line)
+        except ValueError:
+            last_timestamp = None
+
+    # Hash the whole file, keeping copies of the hash state at the offsets we need
+    sha1 = hashlib.sha1()
+    pending: dict[int, list[str]] = {complete_offset: ["prefix"]}
+    if checkpoint_offset is not None and checkpoint_offset <= size:
+        pending.setdefault(checkpoint_offset, []).append("checkpoint")
+    hashes: dict[str, str] = {}
+
+    position = 0
+    with open(filepath, "rb") as f:
+        while True:
+            data = f.read(BUF_SIZE)
+            for offset in [o for o in pending if o <= position + len(data)]:
+                partial = sha1.copy()
+                partial.update(data[: offset - position])
+                for name in pending.pop(offset):
+                    hashes[name] = partial.hexdigest()
+            if not data:
+                break
+            sha1.update(data)
+            position += len(data)
+
+    return TailScan(
+        file_hash=sha1.hexdigest(),
+        header_hash=hashlib.sha1(header).hexdigest(),
+        header_offset=len(header),
+        complete_offset=complete_offset,
+        prefix_hash=hashes["prefix"],
+        checkpoint_prefix_hash=hashes.get("checkpoint"),
+        last_timestamp=last_timestamp,
+    )
+
+
+def write_tail_file(
+    filepath: Path,
+    tail_filepath: Path,
+    tail_format: TailFormat,
+    scan: TailScan,
+    checkpoint: TailCheckpoint,
+) -> tuple[int, bool]:
+    """Write the header of a data file and the complete rows appended since a checkpoint to a new file.
+
+    Args:
+        filepath: Path to data file
+        tail_filepath: Path to write to
+        tail_format: Layout of the data file
+        scan: Scan of the current data file
+        checkpoint: Checkpoint to read from
+    Returns:
+        tuple: Number of rows written and whether all rows come after the last row in the checkpoint
+    """
+    after = None if checkpoint.last_timestamp is None else Timestamp(checkpoint.last_timestamp)
+
+    with open(filepath, "rb") as f:
+        header = f.read(scan.header_offset)
+        f.seek(checkpoint.offset)
+        appended = f.read(scan.complete_offset - checkpoint.offset)
+
+    n_rows = 0
+    in_order = True
+    with open(tail_filepath, "wb") as f:
+        f.write(header)
+        for line in appended.splitlines(keepends=True):
+            if not line.strip():
+                continue
+            if after is not None and in_order and tail_format.line_time(line) <= after:
+                in_order = False
+            f.write(line)
+            n_rows += 1
+
+    return n_rows, in_order
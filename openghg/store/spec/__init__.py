@@ -1,6 +1,7 @@
 from ._specification import (
     define_data_types,
     define_data_type_classes,
+    define_timeseries_data_types,
     validate_data_type,
     define_standardise_parsers,
     define_transform_parsers,
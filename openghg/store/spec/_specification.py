@@ -14,6 +14,7 @@ from openghg.types import (
 __all__ = [
     "define_data_types",
     "define_data_type_classes",
+    "define_timeseries_data_types",
     "define_standardise_parsers",
     "define_transform_parsers",
     "check_parser",
@@ -36,6 +37,13 @@ def define_data_types() -> tuple[str, ...]:
     return tuple(define_data_type_classes().keys())
 
 
+def define_timeseries_data_types() -> tuple[str, ...]:
+    """
+    Define names of data types holding timeseries, rather than gridded data
+    """
+    return ("surface", "column", "mobile", "site_met", "flux_timeseries")
+
+
 def validate_data_type(data_type: str) -> None:
     """Raise TypeError if given data type is not a valid data type class."""
     expected_data_types = define_data_types()
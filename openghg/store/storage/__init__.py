@@ -1,5 +1,15 @@
 from ._chunking import ChunkingSchema, chunk_size_in_megabytes
 from ._store import Store
 from ._localzarrstore import LocalZarrStore
-from ._compression import compare_compression
-from ._convert import convert_store
+from ._read_cache import (
+    CachedZarrStore,
+    ReadCache,
+    configure_read_cache,
+    get_read_cache,
+    invalidate_read_cache,
+)
+from ._compression import compare_compression, evaluate_codec_policies
+from ._codec_policies import get_codec_policies, set_codec_policies
+from ._convert import convert_store, convert_store_layout
+from ._layout import get_storage_layout, set_storage_layout
+from ._rechunk import AccessStats, configure_access_stats, rechunk_zarr, suggest_chunks
@@ -0,0 +1,74 @@
+"""Selection of the codecs used to store the variables of each data type in an object store.
+
+Codec policies choose filters for variables whose names match a pattern, for instance to
+store footprints with reduced precision:
+
+    set_codec_policies(bucket, "footprints", [CodecPolicy("fp*", keepbits=12)])
+
+or flags as single bytes:
+
+    set_codec_policies(bucket, "surface", [CodecPolicy("*flag*", downcast="int8")])
+
+See `openghg.storage.CodecPolicy` for the options. No policies are set by default, so data is
+stored losslessly with the compressor passed to `standardise`.
+
+Like the storage layout, policies are recorded in the object store and used for versions of data
+written after they are set; existing data keeps its encoding. Use `evaluate_codec_policies` to
+compare the size, speed and error of policies on data already in the store.
+"""
+
+from collections.abc import Sequence
+
+from openghg.objectstore import get_object_from_json, set_object_from_json
+from openghg.storage import CodecPolicy
+from openghg.types import ObjectStoreError
+
+__all__ = ["get_codec_policies", "set_codec_policies"]
+
+CODEC_POLICIES_KEY = "config/codec_policies"
+
+
+def _get_all_policies(bucket: str) -> dict:
+    try:
+        return get_object_from_json(bucket=bucket, key=CODEC_POLICIES_KEY)
+    except ObjectStoreError:
+        return {}
+
+
+def get_codec_policies(bucket: str, data_type: str) -> list[CodecPolicy]:
+    """Get the codec policies used for new zarr stores of a data type in an object store.
+
+    Args:
+        bucket: Object store path
+        data_type: Data type, e.g. "footprints"
+    Returns:
+        list: Codec policies, in order of precedence
+    """
+    stored = _get_all_policies(bucket=bucket).get(data_type.lower(), [])
+    return [CodecPolicy.from_dict(policy) for policy in stored]
+
+
+def set_codec_policies(bucket: str, data_type: str, policies: Sequence[CodecPolicy]) -> None:
+    """Set the codec policies used for new zarr stores of a data type in an object store.
+
+    Args:
+        bucket: Object store path
+        data_type: Data type, e.g. "footprints"
+        policies: Codec policies; the first policy matching the name of a variable is used.
+            Pass an empty list to remove the policies for the data type.
+    Returns:
+        None
+    """
+    from openghg.store.spec import define_data_types
+
+    data_type = data_type.lower()
+    if data_type not in define_data_types():
+        raise ValueError(f"Invalid data type {data_type}, select from {define_data_types()}")
+
+    all_policies = _get_all_policies(bucket=bucket)
+    if policies:
+        all_policies[data_type] = [policy.to_dict() for policy in policies]
+    else:
+        all_policies.pop(data_type, None)
+
+    set_object_from_json(bucket=bucket, key=CODEC_POLICIES_KEY, data=all_policies)
@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Any
 import time
@@ -6,9 +7,11 @@ import numcodecs
 import itertools
 import tempfile
 from numcodecs import Blosc
+import numpy as np
+import pandas as pd
 import xarray as xr
 
-from openghg.storage._encoding import get_zarr_encoding
+from openghg.storage._encoding import CodecPolicy, get_policy_encoding, get_zarr_encoding
 
 
 def compare_compression(filepath: Path) -> dict:
@@ -76,3 +79,114 @@ def compare_compression(filepath: Path) -> dict:
     compression_info["quickest_codec"] = quickest_codec
 
     return compression_info
+
+
+def _directory_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def _max_relative_error(original: xr.Dataset, decoded: xr.Dataset) -> float:
+    """Largest error of the float variables of a dataset, relative to the largest value of each variable."""
+    max_error = 0.0
+    for name, variable in original.data_vars.items():
+        if not np.issubdtype(variable.dtype, np.floating):
+            continue
+        scale = float(np.abs(variable).max())
+        if not scale > 0:
+            continue
+        error = float(np.abs(decoded[name] - variable).max())
+        max_error = max(max_error, error / scale)
+    return max_error
+
+
+def _sample_chunks(data: xr.Dataset, max_chunks: int, dim: str = "time") -> xr.Dataset:
+    """Select up to `max_chunks` chunks of a dataset along a dimension, spread evenly through the data."""
+    chunks = data.chunksizes.get(dim)
+    if chunks is None or len(chunks) <= max_chunks:
+        return data
+
+    bounds = np.cumsum((0, *chunks))
+    selected = np.unique(np.linspace(0, len(chunks) - 1, max_chunks).round().astype(int))
+    index = np.concatenate([np.arange(bounds[i], bounds[i + 1]) for i in selected])
+    return data.isel({dim: index})
+
+
+def evaluate_codec_policies(
+    bucket: str,
+    data_type: str,
+    policies: dict[str, Sequence[CodecPolicy]],
+    n_datasources: int = 3,
+    compressor: Any | None = None,
+    max_chunks: int | None = 10,
+) -> pd.DataFrame:
+    """Compare codec policies by writing the data of some Datasources in an object store to
+    temporary zarr stores using each set of policies.
+
+    Data is also written without any policies, as "none", for comparison. Only a sample of the
+    stored chunks of each Datasource, spread evenly along the time dimension, is read.
+
+    Args:
+        bucket: Object store path
+        data_type: Data type of Datasources to sample
+        policies: Sets of codec policies to compare, keyed by name
+        n_datasources: Number of Datasources to sample
+        compressor: Compressor, defaults to the compressor used by `standardise`
+        max_chunks: Maximum number of time chunks to read from each Datasource, None to read all the data
+    Returns:
+        pandas.DataFrame: For each Datasource and set of policies, the size in bytes, the size
+            relative to no policies, the write and read throughput in MB/s (of uncompressed data)
+            and the largest error of any float variable, relative to the largest value of that variable
+    """
+    from openghg.objectstore import get_datasource
+    from openghg.objectstore.metastore import open_metastore
+
+    if compressor is None:
+        compressor = Blosc(cname="zstd", clevel=5, shuffle=Blosc.SHUFFLE)
+
+    with open_metastore(bucket=bucket, data_type=data_type, mode="r") as metastore:
+        uuids = sorted(record["uuid"] for record in metastore.search())[:n_datasources]
+
+    all_policies: dict[str, Sequence[CodecPolicy]] = {"none": [], **policies}
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for uuid in uuids:
+            data = get_datasource(bucket=bucket, uuid=uuid, data_type=data_type).get_data()
+            if max_chunks is not None:
+                data = _sample_chunks(data, max_chunks)
+            data = data.drop_encoding().load()
+            megabytes = data.nbytes / 1e6
+
+            for name, policy_set in all_policies.items():
+                zarr_path = Path(tmpdir, uuid, name)
+                encoding = get_zarr_encoding(data_vars=data.data_vars, compressor=compressor)
+                encoding.update(get_policy_encoding(data, policy_set, compressor))
+
+                start = time.perf_counter()
+                data.to_zarr(store=zarr.DirectoryStore(zarr_path), encoding=encoding, consolidated=True)
+                write_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                with xr.open_zarr(zarr.DirectoryStore(zarr_path), consolidated=True) as stored:
+                    decoded = stored.load()
+                read_time = time.perf_counter() - start
+
+                rows.append(
+                    {
+                        "uuid": uuid,
+                        "policy": name,
+                        "size_bytes": _directory_size(zarr_path),
+                        "write_MBps": megabytes / write_time,
+                        "read_MBps": megabytes / read_time,
+                        "max_relative_error": _max_relative_error(data, decoded),
+                    }
+                )
+
+    results = pd.DataFrame(
+        rows, columns=["uuid", "policy", "size_bytes", "write_MBps", "read_MBps", "max_relative_error"]
+    )
+    if not results.empty:
+        baseline = results[results["policy"] == "none"].set_index("uuid")["size_bytes"]
+        results.insert(3, "relative_size", results["size_bytes"] / results["uuid"].map(baseline))
+
+    return results
@@ -7,14 +7,19 @@ import inspect
 import json
 from pathlib import Path
 import re
+import shutil
+from typing import Literal
 import tinydb
-import dask
+import zarr
 
 import openghg.standardise
 from openghg.standardise import standardise
 from openghg.objectstore import get_writable_bucket
 from openghg.objectstore.metastore import open_metastore
 from openghg.objectstore.metastore._classic_metastore import BucketKeyStorage
+from openghg.storage import is_sharded_store, ShardedDirectoryStore
+from openghg.util import execution_options, get_execution_options
+from openghg.store.storage._layout import set_storage_layout
 
 from openghg.types import ObjectStoreError, DataOverlapError
 
@@ -30,6 +35,9 @@ def convert_store(
 ) -> None:
     """Convert object store to new style Zarr based object store.
 
+    This uses the dask scheduler set in the execution options (see `openghg.util.execution_options`),
+    or the synchronous scheduler if none is set.
+
     Args:
         path_in: Path to current old style object store
         store_out: Name of new object store. The store must exist in your OpenGHG config file.
@@ -37,11 +45,23 @@ def convert_store(
         for the compressor
         to_convert: List of storage classes to convert, if None will convert all storage classes
     """
-    from openghg.store import data_class_info, get_data_class
-
-    # Tell dask to use the sync scheduler as I was getting Dask queue/thread hanging issues
+    # Use the sync scheduler by default as I was getting Dask queue/thread hanging issues
     # when running this locally
-    dask.config.set(scheduler="sync")
+    options = get_execution_options()
+    options.setdefault("scheduler", "synchronous")
+
+    with execution_options(**options):
+        _convert_store(path_in=path_in, store_out=store_out, chunks=chunks, to_convert=to_convert)
+
+
+def _convert_store(
+    path_in: str | Path,
+    store_out: str,
+    chunks: dict | None = None,
+    to_convert: list | None = None,
+) -> None:
+    """Convert object store to new style Zarr based object store, see `convert_store`."""
+    from openghg.store import data_class_info, get_data_class, ingest_session
 
     logger.warning(
         "This function is provided as is and although it has been tested, may not duplicate the "
@@ -101,97 +121,99 @@ def convert_store(
             continue
 
         valid_args = standardise_args[data_type]
-        # Now let's iterate over the records
-        for record in records:
-            # Open the dataset for this record
-            # First get the paths
-            uuid = record["uuid"]
-            data_folderpath = Path(old_store_path).joinpath("data", "uuid", uuid)
-
-            if "latest_version" in record:
-                version = record["latest_version"]
-            else:
-                try:
-                    version = max([v.name for v in data_folderpath.iterdir()], key=lambda x: int(x[1:]))
-                except (ValueError, AttributeError):
-                    # .iterdir gives empty sequence or some version name doesn't match r"v\d+" (e.g. "v10", etc.)
-                    logger.warning(
-                        f"Unable to find a data version for {data_type} data with UUID {uuid}, skipping..."
-                    )
-                    continue
-
-            # Now get the files to restandardise
-            version_folderpath = data_folderpath.joinpath(version)
-            data_filepaths = sorted(list(version_folderpath.glob("*._data")))
-
-            # Now we handle the metadata for the args we want to pass into the standardise functions
-            standardise_kwargs = {k: v for k, v in record.items() if k in valid_args}
-
-            # Parse some values to the format required for standardising
-            tf_none = {"true": True, "false": False, "none": None}
-            for k, v in standardise_kwargs.items():
-                if isinstance(v, str) and v.lower() in tf_none:
-                    standardise_kwargs[k] = tf_none[v.lower()]
-                if k == "sampling_period":
-                    if m := re.search(r"(\d+\.?\d*)", v):
-                        val = str(int(float(m.group(1))) // 60) + "m"
-                        standardise_kwargs[k] = val
-                    else:
-                        standardise_kwargs[k] = None
-
-            # The number of Datasources converted
-            n_converted = 0
-            # An error will be raised if we get daterange overlaps, we'll just warn the user
-            overlap_msg = f"Data overlap error for {data_type} data with UUID {uuid}"
-
-            if data_type == "surface":
-                try:
-                    standardise(
-                        data_type=data_type,
-                        store=store_out,
-                        filepath=data_filepaths,
-                        source_format="openghg",
-                        chunks=chunks,
-                        **standardise_kwargs,
-                    )
-                except DataOverlapError:
-                    logger.warning(overlap_msg)
+        # Keep the object store open while adding all records, see `ingest_session`
+        with ingest_session(store=store_out):
+            # Now let's iterate over the records
+            for record in records:
+                # Open the dataset for this record
+                # First get the paths
+                uuid = record["uuid"]
+                data_folderpath = Path(old_store_path).joinpath("data", "uuid", uuid)
+
+                if "latest_version" in record:
+                    version = record["latest_version"]
                 else:
-                    n_converted += 1
+                    try:
+                        version = max([v.name for v in data_folderpath.iterdir()], key=lambda x: int(x[1:]))
+                    except (ValueError, AttributeError):
+                        # .iterdir gives empty sequence or some version name doesn't match r"v\d+" (e.g. "v10", etc.)
+                        logger.warning(
+                            f"Unable to find a data version for {data_type} data with UUID {uuid}, skipping..."
+                        )
+                        continue
+
+                # Now get the files to restandardise
+                version_folderpath = data_folderpath.joinpath(version)
+                data_filepaths = sorted(list(version_folderpath.glob("*._data")))
+
+                # Now we handle the metadata for the args we want to pass into the standardise functions
+                standardise_kwargs = {k: v for k, v in record.items() if k in valid_args}
+
+                # Parse some values to the format required for standardising
+                tf_none = {"true": True, "false": False, "none": None}
+                for k, v in standardise_kwargs.items():
+                    if isinstance(v, str) and v.lower() in tf_none:
+                        standardise_kwargs[k] = tf_none[v.lower()]
+                    if k == "sampling_period":
+                        if m := re.search(r"(\d+\.?\d*)", v):
+                            val = str(int(float(m.group(1))) // 60) + "m"
+                            standardise_kwargs[k] = val
+                        else:
+                            standardise_kwargs[k] = None
+
+                # The number of Datasources converted
+                n_converted = 0
+                # An error will be raised if we get daterange overlaps, we'll just warn the user
+                overlap_msg = f"Data overlap error for {data_type} data with UUID {uuid}"
+
+                if data_type == "surface":
+                    try:
+                        standardise(
+                            data_type=data_type,
+                            store=store_out,
+                            filepath=data_filepaths,
+                            source_format="openghg",
+                            chunks=chunks,
+                            **standardise_kwargs,
+                        )
+                    except DataOverlapError:
+                        logger.warning(overlap_msg)
+                    else:
+                        n_converted += 1
 
-            elif data_type == "footprints":
-                if standardise_kwargs["time_resolved"]:
-                    chunks = {"time": 24}
-                else:
-                    chunks = {"time": 480}
-                try:
-                    standardise(
-                        data_type=data_type,
-                        store=store_out,
-                        filepath=data_filepaths,
-                        chunks=chunks,
-                        **standardise_kwargs,
-                    )
-                except DataOverlapError:
-                    logger.warning(overlap_msg)
-                else:
-                    n_converted += 1
-            else:
-                for data_file in data_filepaths:
+                elif data_type == "footprints":
+                    if standardise_kwargs["time_resolved"]:
+                        chunks = {"time": 24}
+                    else:
+                        chunks = {"time": 480}
                     try:
                         standardise(
                             data_type=data_type,
                             store=store_out,
-                            filepath=data_file,
+                            filepath=data_filepaths,
                             chunks=chunks,
                             **standardise_kwargs,
                         )
                     except DataOverlapError:
                         logger.warning(overlap_msg)
-                    except ValueError as e:
-                        logger.warning(f"Error standardising {data_type} data with UUID {uuid}: {e}")
                     else:
                         n_converted += 1
+                else:
+                    for data_file in data_filepaths:
+                        try:
+                            standardise(
+                                data_type=data_type,
+                                store=store_out,
+                                filepath=data_file,
+                                chunks=chunks,
+                                **standardise_kwargs,
+                            )
+                        except DataOverlapError:
+                            logger.warning(overlap_msg)
+                        except ValueError as e:
+                            logger.warning(f"Error standardising {data_type} data with UUID {uuid}: {e}")
+                        else:
+                            n_converted += 1
 
         # We only want to update the file hashes if we've converted some data
         if n_converted > 0:
@@ -217,6 +239,79 @@ def convert_store(
         logger.info(f"Finished converting {data_type} data.")
 
 
+def convert_store_layout(
+    store: str,
+    layout: Literal["directory", "sharded"] = "sharded",
+    chunks_per_shard: int = 256,
+) -> int:
+    """Rewrite the zarr stores of all Datasources in an object store to use the given layout.
+
+    The layout is also set for the object store, so data added later uses it too,
+    see `openghg.store.storage.set_storage_layout`. Each version of the data is copied
+    to a new zarr store which then replaces the original, so the data can't be read or
+    written by other processes while this is running.
+
+    Args:
+        store: Name of object store
+        layout: "sharded" to pack chunks into shard files, "directory" for one file per chunk
+        chunks_per_shard: Number of chunks along the first dimension of each variable
+            to put in a shard file, for the "sharded" layout
+    Returns:
+        int: Number of versions converted
+    """
+    bucket = get_writable_bucket(name=store)
+    set_storage_layout(bucket=bucket, layout=layout, chunks_per_shard=chunks_per_shard)
+
+    to_sharded = layout == "sharded"
+    version_pat = re.compile(r"v\d+$")
+
+    n_converted = 0
+    for version_path in sorted(Path(bucket, "data").glob("*/zarr/v*")):
+        if not version_pat.match(version_path.name) or is_sharded_store(version_path) == to_sharded:
+            continue
+
+        # Names which don't match the version pattern, so these aren't loaded as versions
+        new_path = version_path.with_name(f".{version_path.name}.converting")
+        old_path = version_path.with_name(f".{version_path.name}.old")
+        shutil.rmtree(new_path, ignore_errors=True)
+
+        if to_sharded:
+            source = zarr.DirectoryStore(version_path)
+            dest: zarr.DirectoryStore = ShardedDirectoryStore(new_path, chunks_per_shard=chunks_per_shard)
+        else:
+            source = ShardedDirectoryStore(version_path)
+            dest = zarr.DirectoryStore(new_path)
+
+        _copy_zarr_store(source=source, dest=dest)
+
+        version_path.replace(old_path)
+        new_path.replace(version_path)
+        shutil.rmtree(old_path)
+
+        n_converted += 1
+
+    logger.info(f"Converted {n_converted} versions of data to the {layout} layout.")
+
+    return n_converted
+
+
+def _copy_zarr_store(source: zarr.DirectoryStore, dest: zarr.DirectoryStore, batch_size: int = 256) -> None:
+    """Copy all keys from one zarr store to another, writing in batches if the destination supports it."""
+    if not isinstance(dest, ShardedDirectoryStore):
+        zarr.convenience.copy_store(source, dest)
+        return
+
+    batch = {}
+    for key in source.keys():
+        batch[key] = source[key]
+        if len(batch) >= batch_size:
+            dest.setitems(batch)
+            batch = {}
+
+    if batch:
+        dest.setitems(batch)
+
+
 def _get_standardise_args() -> dict[str, list[str]]:
     """Get dictionary mapping OpenGHG storage classes to a list of the arguments for the standardise
     function of that data class.
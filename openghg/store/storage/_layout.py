@@ -0,0 +1,64 @@
+"""Selection of the on-disk layout used for the zarr stores of the Datasources in an object store.
+
+The "directory" layout writes one file per chunk of each variable, the "sharded" layout
+packs the chunks of each variable into a small number of shard files,
+see `openghg.storage.ShardedDirectoryStore`.
+
+The layout is a property of the object store, recorded in the store itself, and is used for
+versions of data written after it is set. Existing versions are always read with the layout they
+were written with; use `openghg.store.storage.convert_store_layout` to rewrite them.
+"""
+
+from typing import Literal, TypedDict
+
+from openghg.objectstore import get_object_from_json, set_object_from_json
+from openghg.types import ObjectStoreError
+
+__all__ = ["StorageLayout", "get_storage_layout", "set_storage_layout"]
+
+LAYOUT_KEY = "config/storage_layout"
+STORAGE_LAYOUTS = ("directory", "sharded")
+
+
+class StorageLayout(TypedDict):
+    layout: Literal["directory", "sharded"]
+    chunks_per_shard: int
+
+
+def get_storage_layout(bucket: str) -> StorageLayout:
+    """Get the layout used for new zarr stores in an object store.
+
+    Args:
+        bucket: Object store path
+    Returns:
+        dict: Layout name and number of chunks per shard file
+    """
+    try:
+        stored = get_object_from_json(bucket=bucket, key=LAYOUT_KEY)
+    except ObjectStoreError:
+        return {"layout": "directory", "chunks_per_shard": 256}
+
+    return {"layout": stored["layout"], "chunks_per_shard": int(stored["chunks_per_shard"])}  # type: ignore
+
+
+def set_storage_layout(
+    bucket: str, layout: Literal["directory", "sharded"], chunks_per_shard: int = 256
+) -> None:
+    """Set the layout used for new zarr stores in an object store.
+
+    Args:
+        bucket: Object store path
+        layout: "directory" for one file per chunk, "sharded" to pack chunks into shard files
+        chunks_per_shard: Number of chunks along the first dimension (usually time) of each
+            variable to put in a shard file, only used by the "sharded" layout
+    Returns:
+        None
+    """
+    if layout not in STORAGE_LAYOUTS:
+        raise ValueError(f"Invalid storage layout {layout}, select from {STORAGE_LAYOUTS}")
+    if chunks_per_shard < 1:
+        raise ValueError("chunks_per_shard must be a positive integer.")
+
+    set_object_from_json(
+        bucket=bucket, key=LAYOUT_KEY, data={"layout": layout, "chunks_per_shard": chunks_per_shard}
+    )
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator, Sequence
+import json
 import logging
+import os
 from pathlib import Path
+import shutil
 from typing import Any, Literal, cast
+from uuid import uuid4
 
+from filelock import FileLock, Timeout
+from numpy import ndarray
 import xarray as xr
+import zarr
 
-from openghg.storage import get_versioned_zarr_directory_store
+from openghg.storage import CodecPolicy, get_versioned_zarr_directory_store, ShardedDirectoryStore
+from openghg.store.storage._layout import get_storage_layout, StorageLayout
+from openghg.store.storage._read_cache import CachedZarrStore, get_read_cache, invalidate_read_cache
+from openghg.store.storage._rechunk import AccessStats, access_stats_enabled, rechunk_zarr
 from openghg.store.storage._store import Store
 from openghg.types import ZarrStoreError
 
@@ -16,14 +26,41 @@ logger.setLevel(logging.DEBUG)
 
 
 class LocalZarrStore(Store):
-    def __init__(self, bucket: str, datasource_uuid: str, mode: Literal["rw", "r"] = "rw") -> None:
+    def __init__(
+        self,
+        bucket: str,
+        datasource_uuid: str,
+        mode: Literal["rw", "r"] = "rw",
+        layout: StorageLayout | None = None,
+    ) -> None:
+        """Zarr stores holding the versions of the data of a Datasource.
+
+        Args:
+            bucket: Object store path
+            datasource_uuid: UUID of Datasource
+            mode: "rw" to allow writing, "r" for read only
+            layout: Layout for new versions, if None the layout set for the object store is used,
+                see `openghg.store.storage.set_storage_layout`. Existing versions are read
+                using the layout they were written with.
+        """
         self._bucket = bucket
         self._mode = mode
         self._datasource_uuid = datasource_uuid
         self._root_store_key = f"data/{datasource_uuid}/zarr"
         self._stores_path = Path(bucket, self._root_store_key).expanduser().resolve()
+        self._access_stats_path = self._stores_path.parent / "access_stats.json"
+        self._summaries_path = self._stores_path.parent / "summaries"
+        self._write_counts_path = self._stores_path.parent / "write_counts.json"
+
+        if layout is None:
+            layout = get_storage_layout(bucket=bucket)
+        self._layout = layout
 
-        self._vzds = get_versioned_zarr_directory_store(path=self._stores_path)
+        self._vzds = get_versioned_zarr_directory_store(
+            path=self._stores_path,
+            sharded=layout["layout"] == "sharded",
+            chunks_per_shard=layout["chunks_per_shard"],
+        )
 
     def __bool__(self) -> bool:
         """Return True if any version of the store is not empty."""
@@ -109,7 +146,9 @@ class LocalZarrStore(Store):
         dataset: xr.Dataset,
         compressor: Any | None = None,
         filters: Any | None = None,
+        codec_policies: Sequence[CodecPolicy] | None = None,
         append_dim: str = "time",
+        check_overlaps: bool = True,
     ) -> None:
         """Add an xr.Dataset to the zarr store.
 
@@ -118,7 +157,10 @@ class LocalZarrStore(Store):
             dataset: xr.Dataset to add
             compressor: Compression for zarr encoding
             filters: Filters for zarr encoding
+            codec_policies: Codecs for variables matching name patterns, see `openghg.storage.CodecPolicy`
             append_dim: Dimension to append to
+            check_overlaps: If False the data is appended without checking for overlaps
+                with the stored data. Only use this if the data is known to come after the stored data.
 
         Returns:
             None
@@ -140,6 +182,8 @@ class LocalZarrStore(Store):
             self._vzds.compressor = compressor
         if filters:
             self._vzds.filters = filters
+        if codec_policies is not None:
+            self._vzds.codec_policies = list(codec_policies)
 
         # Append new data to the zarr store for the current version
         if self.version_exists(version):
@@ -150,7 +194,13 @@ class LocalZarrStore(Store):
                 raise ValueError("First version must be v1")
             self._vzds.create_version(version, checkout=True)
 
-        self._vzds.insert(dataset)
+        if check_overlaps:
+            self._vzds.insert(dataset)
+        else:
+            self._vzds.append(dataset)
+
+        self._compact_shards(dataset)
+        self._record_write(version)
 
     def update(
         self,
@@ -158,6 +208,7 @@ class LocalZarrStore(Store):
         dataset: xr.Dataset,
         compressor: Any | None = None,
         filters: Any | None = None,
+        codec_policies: Sequence[CodecPolicy] | None = None,
         append_dim: str = "time",
     ) -> None:
         """Update existing data in the zarr store with an ``xr.Dataset``.
@@ -176,6 +227,7 @@ class LocalZarrStore(Store):
             dataset: ``xr.Dataset`` containing data to upsert into the store.
             compressor: Compression for zarr encoding.
             filters: Filters for zarr encoding.
+            codec_policies: Codecs for variables matching name patterns, see `openghg.storage.CodecPolicy`
             append_dim: Dimension along which data are appended / matched.
 
         Returns:
@@ -201,6 +253,8 @@ class LocalZarrStore(Store):
             self._vzds.compressor = compressor
         if filters:
             self._vzds.filters = filters
+        if codec_policies is not None:
+            self._vzds.codec_policies = list(codec_policies)
 
         # Append new data to the zarr store for the current version
         if self.version_exists(version):
@@ -211,6 +265,26 @@ class LocalZarrStore(Store):
 
         self._vzds.upsert(dataset)
 
+        self._compact_shards(dataset)
+        self._record_write(version)
+
+    def _compact_shards(self, dataset: xr.Dataset) -> None:
+        """Reclaim space in the shard files of the variables written, if the store is sharded,
+        once at least half of the space is unused.
+
+        Rewritten chunks are appended to the shard files, both when data is updated and when
+        data is appended to the last, partially filled, chunk of each variable.
+
+        Args:
+            dataset: Data written to the store
+        Returns:
+            None
+        """
+        if isinstance(self._vzds.store, ShardedDirectoryStore):
+            self._vzds.store.compact(
+                min_unused_fraction=0.5, arrays=[str(name) for name in dataset.variables]
+            )
+
     def get(self, version: str) -> xr.Dataset:
         """Get the version of the dataset stored in the zarr store.
 
@@ -224,7 +298,73 @@ class LocalZarrStore(Store):
         except ValueError as e:
             raise ZarrStoreError(f"Invalid version: {version}") from e
 
-        return self._vzds.get()
+        cache = get_read_cache()
+        if cache is None or not self._vzds:
+            return self._vzds.get()
+
+        store = CachedZarrStore(
+            self._vzds.store,
+            cache=cache,
+            uuid=self._datasource_uuid,
+            version=version.lower(),
+            stamp=self._modification_stamp(version.lower()),
+        )
+        return cast(xr.Dataset, xr.open_zarr(store, consolidated=True).sortby(self._vzds.append_dim))
+
+    def _modification_stamp(self, version: str) -> tuple[int, int, int]:
+        """Size and modification time of the consolidated metadata of a version, rewritten by every write,
+        and the number of writes to the version.
+
+        Two writes within the resolution of the file system timestamps can leave the size and
+        modification time unchanged, the write count still changes.
+        """
+        count = self._write_counts().get(version, 0)
+        try:
+            stat = (self._stores_path / version / ".zmetadata").stat()
+        except FileNotFoundError:
+            return (0, 0, count)
+        return (stat.st_size, stat.st_mtime_ns, count)
+
+    def _write_counts(self) -> dict[str, int]:
+        try:
+            counts: dict[str, int] = json.loads(self._write_counts_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+        return counts
+
+    def _record_write(self, version: str) -> None:
+        """Increment the write count of a version, used in the modification stamp of the data.
+
+        Counts are kept when a version is deleted, so a version written again gets a new stamp.
+        """
+        counts = self._write_counts()
+        counts[version] = counts.get(version, 0) + 1
+
+        self._write_counts_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._write_counts_path.with_name(f".{self._write_counts_path.name}.{uuid4().hex}.tmp")
+        tmp_path.write_text(json.dumps(counts))
+        os.replace(tmp_path, self._write_counts_path)
+
+    def get_coords(self, version: str, names: Iterable[str]) -> dict[str, ndarray]:
+        """Get the values of coordinates from a version of the zarr store.
+
+        This only reads the requested coordinate arrays, not the data variables.
+
+        Args:
+            version: Data version
+            names: Names of coordinates (e.g. ["lat", "lon"])
+        Returns:
+            dict: Coordinate names mapped to their values
+        """
+        try:
+            self._vzds.checkout_version(version.lower())
+        except ValueError as e:
+            raise ZarrStoreError(f"Invalid version: {version}") from e
+
+        try:
+            return self._vzds.get_coords(names)
+        except KeyError as e:
+            raise ZarrStoreError(f"Coordinate {e} not found in version {version}") from e
 
     def delete_version(self, version: str) -> None:
         """Delete a version from the store.
@@ -241,6 +381,9 @@ class LocalZarrStore(Store):
         except ValueError as e:
             raise ZarrStoreError(f"Invalid version: {version}") from e
 
+        invalidate_read_cache(self._datasource_uuid)
+        self._summary_path(version).unlink(missing_ok=True)
+
     def delete_all(self) -> None:
         """Delete all data from the zarr store.
 
@@ -249,16 +392,23 @@ class LocalZarrStore(Store):
         """
         self._check_writable()
         self._vzds.delete_all_versions()
+        invalidate_read_cache(self._datasource_uuid)
 
         if self._stores_path.exists():
             self._stores_path.rmdir()
 
+        self._access_stats_path.unlink(missing_ok=True)
+        self._write_counts_path.unlink(missing_ok=True)
+        shutil.rmtree(self._summaries_path, ignore_errors=True)
+        self._access_stats_path.with_name(f"{self._access_stats_path.name}.lock").unlink(missing_ok=True)
+
     def overwrite(
         self,
         version: str,
         dataset: xr.Dataset,
         compressor: Any | None = None,
         filters: Any | None = None,
+        codec_policies: Sequence[CodecPolicy] | None = None,
     ) -> None:
         """Update a version of the data.
 
@@ -270,6 +420,7 @@ class LocalZarrStore(Store):
             dataset: Dataset to add
             compressor: Compression for zarr encoding
             filters: Filters for zarr encoding
+            codec_policies: Codecs for variables matching name patterns, see `openghg.storage.CodecPolicy`
 
         Returns:
             None
@@ -287,8 +438,11 @@ class LocalZarrStore(Store):
             self._vzds.compressor = compressor
         if filters:
             self._vzds.filters = filters
+        if codec_policies is not None:
+            self._vzds.codec_policies = list(codec_policies)
 
         self._vzds.overwrite(dataset)
+        self._record_write(version.lower())
 
     def bytes_stored(self) -> int:
         """Return the number of bytes stored in the zarr store.
@@ -297,3 +451,144 @@ class LocalZarrStore(Store):
             int: Number of bytes stored in zarr store
         """
         return self._vzds.bytes_stored()
+
+    def rechunk(self, version: str, new_version: str, chunks: dict[str, int], max_mem: int = 500) -> None:
+        """Copy a version of the data into a new version with a different chunk layout.
+
+        The data is copied out of core, holding at most `max_mem` MB in memory. The
+        source version is left untouched, so it can still be read while the new version
+        is being written.
+
+        Args:
+            version: Data version to rechunk
+            new_version: Version to create for the rechunked data
+            chunks: Dictionary of dimension name and chunk size, for example {"time": 24}.
+                Dimensions not included keep their current chunk size.
+            max_mem: Maximum amount of data to hold in memory, in megabytes
+
+        Returns:
+            None
+
+        Raises:
+            ZarrStoreError if the new version already exists.
+
+        """
+        self._check_writable()
+        version = self._check_version(version)
+        new_version = new_version.lower()
+
+        if self.version_exists(new_version):
+            raise ZarrStoreError(f"Version {new_version} already exists.")
+
+        self._vzds.checkout_version(version)
+        source = self._vzds.store
+
+        self._vzds.create_version(new_version, checkout=True)
+
+        try:
+            rechunk_zarr(source=source, target=self._vzds.store, chunks=chunks, max_mem=max_mem)
+        except BaseException:
+            # Don't leave a partially written version behind
+            self._vzds.delete_version(new_version)
+            raise
+
+        self._record_write(new_version)
+
+    def get_chunks(self, version: str) -> dict[str, tuple[int, ...]]:
+        """Get the chunk shape of each array in a version of the store.
+
+        Args:
+            version: Data version
+        Returns:
+            dict: Array names mapped to their chunk shape
+        """
+        version = self._check_version(version)
+        self._vzds.checkout_version(version)
+        group = zarr.open_consolidated(self._vzds.store, mode="r")
+        return {name: array.chunks for name, array in group.arrays()}
+
+    def _summary_path(self, version: str) -> Path:
+        return self._summaries_path / f"{version.lower()}.json"
+
+    def get_summary(self, version: str) -> dict | None:
+        """Summary statistics stored for a version of the data,
+        see `openghg.objectstore._summary`.
+
+        Args:
+            version: Data version
+        Returns:
+            dict or None: Summary, or None if no summary is stored for this version
+        """
+        try:
+            summary: dict = json.loads(self._summary_path(version).read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+
+        return summary
+
+    def set_summary(self, version: str, summary: dict) -> None:
+        """Store the summary statistics for a version of the data.
+
+        The file is replaced atomically so concurrent readers never see a partial file.
+
+        Args:
+            version: Data version
+            summary: Summary of the data, see `openghg.objectstore._summary`
+        Returns:
+            None
+        """
+        self._check_writable()
+
+        summary_path = self._summary_path(version)
+        summary_path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = summary_path.with_name(f".{summary_path.name}.{uuid4().hex}.tmp")
+        tmp_path.write_text(json.dumps(summary))
+        os.replace(tmp_path, summary_path)
+
+    def delete_summary(self, version: str) -> None:
+        """Delete the summary statistics stored for a version of the data, if any.
+
+        Args:
+            version: Data version
+        Returns:
+            None
+        """
+        self._check_writable()
+        self._summary_path(version).unlink(missing_ok=True)
+
+    def access_stats(self) -> AccessStats:
+        """Access statistics recorded for the data in this store.
+
+        Returns:
+            AccessStats: Recorded access statistics
+        """
+        return AccessStats.load(self._access_stats_path)
+
+    def record_access(self, read_sizes: dict[str, int], dim_sizes: dict[str, int]) -> None:
+        """Record a read of the data in this store, if recording access statistics is enabled
+        (see `configure_access_stats`).
+
+        The statistics are updated under a file lock so concurrent readers, including those in
+        other processes, don't lose updates. Failure to record the read (e.g. in a read-only
+        object store) is not an error.
+
+        Args:
+            read_sizes: Number of elements read along each dimension
+            dim_sizes: Total size of each dimension of the stored data
+        Returns:
+            None
+        """
+        if not access_stats_enabled():
+            return
+
+        lock_path = self._access_stats_path.with_name(f"{self._access_stats_path.name}.lock")
+
+        try:
+            lock_path.parent.mkdir(parents=True, exist_ok=True)
+            with FileLock(lock_path, timeout=10):
+                stats = self.access_stats()
+                stats.record(read_sizes=read_sizes, dim_sizes=dim_sizes)
+                stats.save(self._access_stats_path)
+        except (OSError, Timeout) as e:
+            logger.debug(f"Unable to record access statistics: {e}")
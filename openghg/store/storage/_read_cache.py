@@ -0,0 +1,509 @@
+"""Node-local cache of data read from the zarr stores of Datasources.
+
+Analysis jobs often read the same footprints and fluxes many times. With the read cache enabled,
+`LocalZarrStore.get` reads each version of a Datasource through a `CachedZarrStore`, which keeps
+the decompressed chunks (and consolidated metadata) in a `ReadCache`, and the JSON of each
+Datasource is kept when it is loaded. Repeated reads then take chunks from memory instead of
+reading and decompressing them again.
+
+The cache is disabled by default. It can be enabled in the "read_cache" section of the user
+config file, for example
+
+    [read_cache]
+    max_size = "2GB"
+    spill_dir = "/tmp/openghg_cache"
+    max_spill_size = "20GB"
+
+or with `configure_read_cache`, which takes precedence over the config file. Changes to the config
+file are picked up when the cache is next used. If `spill_dir` is set, chunks are also written to
+that directory and read back as memory-mapped arrays, so processes on the same node share
+decompressed chunks.
+
+Entries are keyed by Datasource UUID, version and a modification stamp of the stored data
+(the size and modification time of its consolidated metadata, which is rewritten by every write,
+and a count of the writes to the version), so data written elsewhere is never read from the cache.
+Entries for a Datasource are also dropped when it is saved.
+
+Datasets read through the cache can be computed with the dask "processes" scheduler: when a
+`ReadCache` is unpickled in another process it uses the read cache of that process if it has the
+same options, otherwise it becomes the read cache of that process, sharing chunks through the
+spill directory.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Hashable, Iterator, MutableMapping
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import shutil
+import tempfile
+import threading
+from typing import Any
+
+import numpy as np
+import zarr
+
+from openghg.util._user import read_config_section
+
+logger = logging.getLogger("openghg.store.storage")
+logger.setLevel(logging.DEBUG)
+
+__all__ = [
+    "CachedZarrStore",
+    "ReadCache",
+    "configure_read_cache",
+    "get_read_cache",
+    "invalidate_read_cache",
+]
+
+_METADATA_KEYS = (".zmetadata", ".zarray")
+
+# The cache used by this process, set by `configure_read_cache` or from the user config
+_read_cache: dict[str, ReadCache | None] = {}
+# The config options the cache was created from, empty if it was set by `configure_read_cache`
+_read_cache_options: dict[str, dict] = {}
+_configure_lock = threading.Lock()
+
+
+def _parse_size(size: int | str | None) -> int | None:
+    """Parse a size in bytes, e.g. 1024 or "2GB"."""
+    if size is None or isinstance(size, int):
+        return size
+
+    from dask.utils import parse_bytes
+
+    return int(parse_bytes(size))
+
+
+def _is_decodable(meta: dict) -> bool:
+    """Chunks of an array can be cached decoded unless it holds objects or structured values."""
+    dtype = meta.get("dtype")
+    return isinstance(dtype, str) and "O" not in dtype
+
+
+def _nbytes(value: bytes | np.ndarray) -> int:
+    return value.nbytes if isinstance(value, np.ndarray) else len(value)
+
+
+class ReadCache:
+    """Bounded LRU cache of bytes, safe to share between threads.
+
+    Keys are tuples starting with the UUID of a Datasource, so all entries for a Datasource
+    can be removed with `invalidate`.
+
+    Args:
+        max_size: Maximum number of bytes held in memory
+        spill_dir: Directory to write entries to, shared by processes on the same node
+        max_spill_size: Maximum number of bytes in `spill_dir`, defaults to ten times `max_size`
+    """
+
+    def __init__(
+        self, max_size: int, spill_dir: str | Path | None = None, max_spill_size: int | None = None
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be a positive number of bytes.")
+
+        self.max_size = max_size
+        self.spill_dir = Path(spill_dir).expanduser() if spill_dir is not None else None
+        self.max_spill_size = max_spill_size if max_spill_size is not None else 10 * max_size
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: OrderedDict[tuple, bytes | np.ndarray] = OrderedDict()
+        self._size = 0
+        self._spill_size: int | None = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        # Entries held in memory aren't sent to other processes, they can read the spill directory
+        return {"max_size": self.max_size, "spill_dir": self.spill_dir, "max_spill_size": self.max_spill_size}
+
+    def __setstate__(self, state: dict) -> None:
+        ReadCache.__init__(self, **state)
+
+    def _options(self) -> tuple[int, Path | None, int]:
+        return (self.max_size, self.spill_dir, self.max_spill_size)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Number of bytes held in memory."""
+        return self._size
+
+    def _spill_path(self, key: tuple) -> Path:
+        if self.spill_dir is None:
+            raise ValueError("No spill directory set.")
+        digest = hashlib.sha1(repr(key[1:]).encode()).hexdigest()
+        return self.spill_dir / str(key[0]) / digest
+
+    def get(self, key: tuple[Hashable, ...]) -> bytes | np.ndarray | None:
+        """Get a value from the cache.
+
+        Args:
+            key: Tuple starting with the Datasource UUID
+        Returns:
+            bytes, numpy.ndarray or None: Value, or None if not cached
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        if self.spill_dir is not None:
+            value = self._read_spilled(key)
+            if value is not None:
+                self._insert(key, value)
+                with self._lock:
+                    self.hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: tuple[Hashable, ...], value: bytes | np.ndarray) -> None:
+        """Add a value to the cache.
+
+        Values larger than `max_size` are not cached.
+
+        Args:
+            key: Tuple starting with the Datasource UUID
+            value: Value to cache, this should not be modified once cached
+        Returns:
+            None
+        """
+        if _nbytes(value) > self.max_size:
+            return
+
+        self._insert(key, value)
+
+        if self.spill_dir is not None:
+            self._spill(key, value)
+
+    def _insert(self, key: tuple, value: bytes | np.ndarray) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= _nbytes(previous)
+
+            self._entries[key] = value
+            self._size += _nbytes(value)
+
+            while self._size > self.max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= _nbytes(evicted)
+
+    def _read_spilled(self, key: tuple) -> np.ndarray | None:
+        path = self._spill_path(key)
+        try:
+            if path.stat().st_size == 0:
+                return np.empty(0, dtype=np.uint8)
+            return np.memmap(path, dtype=np.uint8, mode="r")
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+
+    def _spill(self, key: tuple, value: bytes | np.ndarray) -> None:
+        path = self._spill_path(key)
+        if path.exists():
+            return
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so other processes never see partial entries
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(value if isinstance(value, bytes) else value.tobytes())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Unable to write to read cache spill directory: {e}")
+            return
+
+        with self._lock:
+            if self._spill_size is not None:
+                self._spill_size += _nbytes(value)
+            over_limit = self._spill_size is None or self._spill_size > self.max_spill_size
+
+        if over_limit:
+            self._prune_spill_dir()
+
+    def _prune_spill_dir(self) -> None:
+        """Delete the least recently used spilled entries until the spill directory is within its limit."""
+        if self.spill_dir is None:
+            return
+
+        files = []
+        for path in self.spill_dir.glob("*/*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_atime_ns, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        if total > self.max_spill_size:
+            # Leave some space so we don't prune on every write
+            target = 0.8 * self.max_spill_size
+            for _, size, path in sorted(files):
+                if total <= target:
+                    break
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError:
+                    # e.g. still memory mapped on Windows
+                    continue
+                total -= size
+
+        with self._lock:
+            self._spill_size = total
+
+    def invalidate(self, uuid: str) -> None:
+        """Remove all entries for a Datasource.
+
+        Args:
+            uuid: UUID of Datasource
+        Returns:
+            None
+        """
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == uuid]:
+                self._size -= _nbytes(self._entries.pop(key))
+            self._spill_size = None
+
+        if self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir / uuid, ignore_errors=True)
+
+    def clear(self) -> None:
+        """Remove all entries held in memory.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+def _create_read_cache(
+    max_size: int | str | None, spill_dir: str | Path | None, max_spill_size: int | str | None
+) -> ReadCache | None:
+    """Create a read cache, or return None if `max_size` is None or 0."""
+    size = _parse_size(max_size)
+    if not size:
+        return None
+    return ReadCache(max_size=size, spill_dir=spill_dir, max_spill_size=_parse_size(max_spill_size))
+
+
+def configure_read_cache(
+    max_size: int | str | None, spill_dir: str | Path | None = None, max_spill_size: int | str | None = None
+) -> ReadCache | None:
+    """Set the read cache used by this process, replacing any existing cache.
+
+    Args:
+        max_size: Maximum number of bytes to hold in memory, e.g. 2**30 or "1GB".
+            Pass None or 0 to disable the cache.
+        spill_dir: Directory to share cached chunks with other processes on this node
+        max_spill_size: Maximum number of bytes in `spill_dir`, defaults to ten times `max_size`
+    Returns:
+        ReadCache or None: The new cache, or None if disabled
+    """
+    cache = _create_read_cache(max_size=max_size, spill_dir=spill_dir, max_spill_size=max_spill_size)
+
+    with _configure_lock:
+        _read_cache["cache"] = cache
+        _read_cache_options.clear()
+
+    return cache
+
+
+def get_read_cache() -> ReadCache | None:
+    """Get the read cache used by this process.
+
+    Unless `configure_read_cache` has been called, the cache is created from the "read_cache"
+    section of the user config file, and created again if these options change.
+
+    Returns:
+        ReadCache or None: Read cache, or None if disabled
+    """
+    if "cache" in _read_cache and not _read_cache_options:
+        return _read_cache["cache"]
+
+    options = read_config_section("read_cache")
+    if "cache" in _read_cache and _read_cache_options.get("options") == options:
+        return _read_cache["cache"]
+
+    try:
+        cache = _create_read_cache(
+            max_size=options.get("max_size"),
+            spill_dir=options.get("spill_dir"),
+            max_spill_size=options.get("max_spill_size"),
+        )
+    except ValueError as e:
+        logger.warning(f"Invalid read cache options in config file, read cache disabled: {e}")
+        cache = None
+
+    with _configure_lock:
+        # The cache may have been set by `configure_read_cache` in another thread
+        if "cache" in _read_cache and not _read_cache_options:
+            return _read_cache["cache"]
+        _read_cache["cache"] = cache
+        _read_cache_options["options"] = options
+
+    return cache
+
+
+def _attach_read_cache(cache: ReadCache) -> ReadCache:
+    """Get the read cache of this process to use in place of an unpickled cache.
+
+    Args:
+        cache: Cache unpickled in this process
+    Returns:
+        ReadCache: The read cache of this process if it has the same options as `cache`,
+            otherwise `cache`, which becomes the read cache of this process if none is set
+    """
+    with _configure_lock:
+        if "cache" not in _read_cache:
+            _read_cache["cache"] = cache
+            return cache
+
+        current = _read_cache["cache"]
+        if current is not None and current._options() == cache._options():
+            return current
+
+    return cache
+
+
+def invalidate_read_cache(uuid: str) -> None:
+    """Remove the entries for a Datasource from the read cache, if enabled.
+
+    Args:
+        uuid: UUID of Datasource
+    Returns:
+        None
+    """
+    cache = _read_cache.get("cache")
+    if cache is not None:
+        cache.invalidate(uuid)
+
+
+class CachedZarrStore(MutableMapping):
+    """Read only view of a zarr store with consolidated metadata, reading through a `ReadCache`.
+
+    Chunks are cached decompressed: the metadata of arrays is rewritten without their compressor
+    and filters, and their chunks are decoded when first read. Arrays of objects (e.g. strings)
+    are cached as stored.
+
+    Args:
+        store: zarr store to read
+        cache: Read cache
+        uuid: UUID of the Datasource
+        version: Data version
+        stamp: Modification stamp of the data, included in cache keys
+    """
+
+    def __init__(
+        self, store: MutableMapping, cache: ReadCache, uuid: str, version: str, stamp: Hashable
+    ) -> None:
+        from numcodecs import get_codec
+
+        self._store = store
+        self._cache = cache
+        self._prefix = (uuid, version, stamp)
+
+        self._metadata = json.loads(bytes(self._get_cached(".zmetadata", raw=True)))
+
+        # Codecs of the arrays whose chunks are cached decoded, keyed by array path
+        self._codecs: dict[str, tuple[Any, list]] = {}
+        for key, meta in self._metadata["metadata"].items():
+            if not key.endswith("/.zarray") or not _is_decodable(meta):
+                continue
+            compressor = get_codec(meta["compressor"]) if meta.get("compressor") else None
+            filters = [get_codec(f) for f in meta.get("filters") or []]
+            if compressor or filters:
+                self._codecs[key[: -len("/.zarray")]] = (compressor, filters)
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        # Share the in memory entries of the read cache of this process
+        self._cache = _attach_read_cache(self._cache)
+
+    def _rewrite(self, key: str, meta: dict) -> dict:
+        if key.endswith("/.zarray") and key[: -len("/.zarray")] in self._codecs:
+            return {**meta, "compressor": None, "filters": None}
+        return meta
+
+    def _rewritten_metadata(self, key: str) -> bytes:
+        if key == ".zmetadata":
+            metadata = {k: self._rewrite(k, v) for k, v in self._metadata["metadata"].items()}
+            rewritten: dict = {**self._metadata, "metadata": metadata}
+        elif key in self._metadata["metadata"]:
+            rewritten = self._rewrite(key, self._metadata["metadata"][key])
+        else:
+            rewritten = self._rewrite(key, json.loads(self._store[key]))
+
+        return json.dumps(rewritten).encode("utf-8")
+
+    def _decode(self, key: str, raw: bytes | np.ndarray) -> bytes | np.ndarray:
+        # chunk keys are the array path followed by the chunk index, which may contain "/"
+        array = key
+        while "/" in array:
+            array = array.rsplit("/", 1)[0]
+            if array in self._codecs:
+                break
+        else:
+            return raw
+
+        compressor, filters = self._codecs[array]
+
+        chunk = compressor.decode(raw) if compressor else raw
+        for f in reversed(filters):
+            chunk = f.decode(chunk)
+
+        decoded = np.ascontiguousarray(chunk).reshape(-1).view(np.uint8)
+        decoded.setflags(write=False)
+        return decoded
+
+    def _get_cached(self, key: str, raw: bool = False) -> bytes | np.ndarray:
+        cache_key = (*self._prefix, key, raw)
+
+        value = self._cache.get(cache_key)
+        if value is None:
+            if raw:
+                value = self._store[key]
+            elif key.endswith(_METADATA_KEYS):
+                value = self._rewritten_metadata(key)
+            else:
+                value = self._decode(key, self._store[key])
+            self._cache.put(cache_key, value)
+
+        # values read back from the spill directory are arrays, metadata is expected as bytes
+        if (raw or key.endswith(_METADATA_KEYS)) and isinstance(value, np.ndarray):
+            return value.tobytes()
+
+        return value
+
+    def __getitem__(self, key: str) -> bytes | np.ndarray:
+        return self._get_cached(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._store
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        raise zarr.errors.ReadOnlyError()
+
+    def __delitem__(self, key: str) -> None:
+        raise zarr.errors.ReadOnlyError()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store)
+
+    def __len__(self) -> int:
+        return len(self._store)
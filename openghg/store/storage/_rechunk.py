@@ -0,0 +1,350 @@
+"""Out-of-core rechunking of data stored in zarr stores.
+
+Arrays are copied between zarr stores block by block, where each block is a whole
+number of target chunks and no larger than a given memory limit. The raw (encoded)
+values are copied, so the rechunked store holds exactly the same data as the source.
+
+Chunk layouts can be suggested from the access statistics recorded for a Datasource,
+see `AccessStats` and `suggest_chunks`. Recording access statistics writes to the object
+store on each read, so this is disabled by default. It can be enabled in the "access_stats"
+section of the user config file
+
+    [access_stats]
+    record = true
+
+or using `configure_access_stats`.
+"""
+
+from collections.abc import Iterator, MutableMapping
+from dataclasses import dataclass, field
+import itertools
+import json
+import logging
+import math
+import os
+from pathlib import Path
+import tempfile
+from typing import Any
+
+import numpy as np
+import zarr
+
+from openghg.util._user import read_config_section
+
+logger = logging.getLogger("openghg.store.storage")
+logger.setLevel(logging.DEBUG)
+
+MB_to_bytes = 1024 * 1024
+
+# Whether access statistics are recorded, if set by `configure_access_stats`
+_access_stats_options: dict[str, bool] = {}
+
+
+@dataclass
+class AccessStats:
+    """Summary of how the data in a store is read.
+
+    For each dimension we keep the sum of the fraction of that dimension
+    covered by each read. Dividing by the number of reads gives the typical
+    extent of a read, e.g. a time series at a point reads all of "time"
+    but a single "lat" and "lon", whereas a map reads a single "time".
+
+    Args:
+        reads: Number of reads recorded
+        extent: Summed fraction of each dimension covered by the reads
+    """
+
+    reads: int = 0
+    extent: dict[str, float] = field(default_factory=dict)
+
+    def record(self, read_sizes: dict[str, int], dim_sizes: dict[str, int]) -> None:
+        """Record a read of the data.
+
+        Args:
+            read_sizes: Number of elements read along each dimension. Dimensions
+                not included are assumed to have been read in full.
+            dim_sizes: Total size of each dimension of the stored data
+        Returns:
+            None
+        """
+        self.reads += 1
+        for dim, size in dim_sizes.items():
+            read = min(read_sizes.get(dim, size), size)
+            fraction = read / size if size else 1.0
+            self.extent[dim] = self.extent.get(dim, 0.0) + fraction
+
+    def mean_extent(self) -> dict[str, float]:
+        """Mean fraction of each dimension covered by a read.
+
+        Returns:
+            dict: Dimension names mapped to mean fraction read
+        """
+        if not self.reads:
+            return {}
+
+        return {dim: total / self.reads for dim, total in self.extent.items()}
+
+    def to_dict(self) -> dict:
+        return {"reads": self.reads, "extent": self.extent}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AccessStats":
+        return cls(reads=int(data.get("reads", 0)), extent=dict(data.get("extent", {})))
+
+    @classmethod
+    def load(cls, filepath: Path) -> "AccessStats":
+        """Load access statistics from a JSON file, returning empty statistics
+        if the file doesn't exist or can't be read.
+
+        Args:
+            filepath: Path to JSON file
+        Returns:
+            AccessStats: Access statistics
+        """
+        try:
+            return cls.from_dict(json.loads(filepath.read_text()))
+        except (OSError, ValueError):
+            return cls()
+
+    def save(self, filepath: Path) -> None:
+        """Save access statistics to a JSON file.
+
+        The file is replaced atomically so concurrent readers never see a partial file.
+
+        Args:
+            filepath: Path to JSON file
+        Returns:
+            None
+        """
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=filepath.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.to_dict(), f)
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+
+def configure_access_stats(record: bool | None) -> None:
+    """Set whether reads of stored data are recorded in access statistics by this process.
+
+    Args:
+        record: Record access statistics, or None to use the setting in the user config file
+    Returns:
+        None
+    """
+    if record is None:
+        _access_stats_options.pop("record", None)
+    else:
+        _access_stats_options["record"] = bool(record)
+
+
+def access_stats_enabled() -> bool:
+    """Check whether reads of stored data should be recorded in access statistics.
+
+    The setting is read from the "access_stats" section of the user config file,
+    unless `configure_access_stats` has been called.
+
+    Returns:
+        bool: True if access statistics are recorded
+    """
+    if "record" in _access_stats_options:
+        return _access_stats_options["record"]
+
+    return bool(read_config_section("access_stats").get("record", False))
+
+
+def _chunk_megabytes(dtype_bytes: int, chunks: dict[str, int]) -> float:
+    return dtype_bytes * math.prod(chunks.values()) / MB_to_bytes
+
+
+def suggest_chunks(
+    dim_sizes: dict[str, int],
+    dtype_bytes: int,
+    access_stats: AccessStats,
+    max_chunk_size: int = 300,
+    min_chunk_size: float = 1,
+) -> dict[str, int]:
+    """Suggest a chunk layout matching the typical read recorded in the access statistics.
+
+    Each chunk is given the shape of a typical read, so that most reads touch as few
+    chunks as possible without reading much unwanted data. The chunks are then shrunk
+    (longest dimension first) to fit within `max_chunk_size` and grown (least covered
+    dimension first) to reach `min_chunk_size`, to avoid very large numbers of tiny chunks.
+
+    Args:
+        dim_sizes: Size of each dimension of the variable to chunk
+        dtype_bytes: Number of bytes per value of the variable
+        access_stats: Recorded access statistics
+        max_chunk_size: Maximum chunk size in megabytes, defaults to 300 MB
+        min_chunk_size: Minimum chunk size in megabytes, defaults to 1 MB
+    Returns:
+        dict: Dictionary of chunk sizes
+    """
+    if not access_stats.reads:
+        raise ValueError("No reads have been recorded, unable to suggest chunks.")
+
+    mean_extent = access_stats.mean_extent()
+
+    chunks = {}
+    for dim, size in dim_sizes.items():
+        fraction = mean_extent.get(dim, 1.0)
+        chunks[dim] = min(max(round(fraction * size), 1), max(size, 1))
+
+    while _chunk_megabytes(dtype_bytes, chunks) > max_chunk_size:
+        dim = max(chunks, key=lambda d: chunks[d])
+        if chunks[dim] == 1:
+            break
+        chunks[dim] = math.ceil(chunks[dim] / 2)
+
+    while _chunk_megabytes(dtype_bytes, chunks) < min_chunk_size:
+        growable = [d for d in chunks if chunks[d] < dim_sizes[d]]
+        if not growable:
+            break
+
+        dim = min(growable, key=lambda d: chunks[d] / dim_sizes[d])
+        grown = dict(chunks)
+        grown[dim] = min(chunks[dim] * 2, dim_sizes[dim])
+
+        if _chunk_megabytes(dtype_bytes, grown) > max_chunk_size:
+            break
+
+        chunks = grown
+
+    return chunks
+
+
+def _copy_block_shape(
+    shape: tuple[int, ...],
+    source_chunks: tuple[int, ...],
+    target_chunks: tuple[int, ...],
+    itemsize: int,
+    max_mem: int,
+) -> tuple[int, ...]:
+    """Shape of the blocks used to copy an array, in elements.
+
+    Blocks are whole multiples of the target chunks so that each target chunk
+    is written exactly once. Where memory allows, blocks are extended to cover the
+    source chunks so each source chunk is read as few times as possible.
+
+    Args:
+        shape: Shape of the array
+        source_chunks: Chunks of the source array
+        target_chunks: Chunks of the target array
+        itemsize: Number of bytes per value
+        max_mem: Maximum size of a block in bytes
+    Returns:
+        tuple: Block shape
+    """
+    block = [min(c, s) for c, s in zip(target_chunks, shape)]
+
+    def nbytes(b: list[int]) -> int:
+        return itemsize * math.prod(b)
+
+    if nbytes(block) > max_mem:
+        raise ValueError(
+            f"Target chunks {tuple(target_chunks)} need {nbytes(block) / MB_to_bytes:.1f} MB, "
+            f"which is larger than the memory limit of {max_mem / MB_to_bytes:.1f} MB."
+        )
+
+    # First try to cover the source chunks
+    for i, (src, tgt, size) in enumerate(zip(source_chunks, target_chunks, shape)):
+        extended = list(block)
+        extended[i] = min(math.ceil(src / tgt) * tgt, size)
+        if nbytes(extended) <= max_mem:
+            block = extended
+
+    # Then grow along the last dimensions first, which are contiguous in memory
+    grown = True
+    while grown:
+        grown = False
+        for i in reversed(range(len(block))):
+            if block[i] >= shape[i]:
+                continue
+
+            extended = list(block)
+            extended[i] = min(block[i] * 2, shape[i])
+            if nbytes(extended) <= max_mem:
+                block = extended
+                grown = True
+
+    return tuple(block)
+
+
+def _iter_blocks(shape: tuple[int, ...], block: tuple[int, ...]) -> Iterator[tuple[slice, ...]]:
+    """Iterate over the slices of an array with the given shape in blocks."""
+    starts = [range(0, size, step) for size, step in zip(shape, block)]
+    for start in itertools.product(*starts):
+        yield tuple(slice(s, min(s + b, size)) for s, b, size in zip(start, block, shape))
+
+
+def rechunk_zarr(
+    source: MutableMapping,
+    target: MutableMapping,
+    chunks: dict[str, int],
+    max_mem: int = 500,
+) -> None:
+    """Copy the xarray Dataset in a zarr store to another zarr store with a new chunk layout.
+
+    Only `max_mem` MB of data (plus one source chunk) is held in memory at a time. The
+    encoded values, compressors, filters and attributes of each array are copied as they are.
+
+    Args:
+        source: Zarr store to copy from
+        target: Empty zarr store to copy to
+        chunks: Dictionary of dimension name and chunk size, for example {"time": 24}.
+            Dimensions not included keep their current chunk size.
+        max_mem: Maximum amount of data to hold in memory, in megabytes
+    Returns:
+        None
+    """
+    max_mem_bytes = int(max_mem * MB_to_bytes)
+
+    source_group = zarr.open_consolidated(source, mode="r")
+    target_group = zarr.open_group(target, mode="w")
+    target_group.attrs.update(source_group.attrs.asdict())
+
+    for name, source_array in source_group.arrays():
+        attrs: dict[str, Any] = source_array.attrs.asdict()
+        dims = attrs.get("_ARRAY_DIMENSIONS", [])
+
+        target_chunks = tuple(
+            max(min(chunks.get(dim, current), size), 1)
+            for dim, current, size in zip(dims, source_array.chunks, source_array.shape)
+        )
+
+        target_array = target_group.create(
+            name,
+            shape=source_array.shape,
+            chunks=target_chunks or source_array.chunks,
+            dtype=source_array.dtype,
+            compressor=source_array.compressor,
+            filters=source_array.filters,
+            fill_value=source_array.fill_value,
+            order=source_array.order,
+        )
+        target_array.attrs.update(attrs)
+
+        if source_array.ndim == 0:
+            target_array[...] = source_array[...]
+            continue
+
+        if 0 in source_array.shape:
+            continue
+
+        block = _copy_block_shape(
+            shape=source_array.shape,
+            source_chunks=source_array.chunks,
+            target_chunks=target_array.chunks,
+            itemsize=np.dtype(source_array.dtype).itemsize,
+            max_mem=max_mem_bytes,
+        )
+
+        logger.debug(f"Rechunking {name} from {source_array.chunks} to {target_array.chunks}.")
+
+        for region in _iter_blocks(source_array.shape, block):
+            target_array[region] = source_array[region]
+
+    zarr.consolidate_metadata(target)
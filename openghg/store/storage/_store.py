@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import Any
+from numpy import ndarray
 from xarray import Dataset
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
 
 
 class Store(ABC):
@@ -49,6 +50,11 @@ class Store(ABC):
         """Get the version of the dataset stored in the zarr store."""
         pass
 
+    def get_coords(self, version: str, names: Iterable[str]) -> dict[str, ndarray]:
+        """Get the values of coordinates for a version without loading any data variables."""
+        ds = self.get(version=version)
+        return {name: ds[name].values for name in names}
+
     @abstractmethod
     def overwrite(self, version: str, dataset: Dataset, compressor: Any | None, filters: Any | None) -> None:
         """Overwrite the data at the given key"""
@@ -1,2 +1,2 @@
 from ._transform import transform_flux_data, transform_bc_data
-from ._regrid import regrid_uniform_cc
+from ._regrid import create_uniform_cc_regridder, regrid_uniform_cc
@@ -1,4 +1,4 @@
-from typing import cast
+from typing import Any, cast
 
 import numpy as np
 import xarray as xr
@@ -74,6 +74,50 @@ def convert_to_ndarray(array: ndarray | xr.DataArray) -> ndarray:
     return cast(ndarray, values)
 
 
+def create_uniform_cc_regridder(
+    lat_in: ArrayLike,
+    lon_in: ArrayLike,
+    lat_out: ArrayLike,
+    lon_out: ArrayLike,
+    method: str = "conservative",
+) -> Any:
+    """
+    Create a regridder between two uniform, cell centered grids.
+
+    Calculating the regridding weights is the expensive step when regridding,
+    so the returned regridder can be reused for any number of arrays on the
+    same input grid. The regridder accepts numpy, dask and xarray inputs with
+    the (lat, lon) dimensions last and will apply the same weights to all
+    leading dimensions (e.g. time) in one operation.
+
+    Args:
+        lat_in: 1D array for input latitude grid
+        lon_in: 1D array for input longitude grid
+        lat_out: 1D array for output latitude grid
+        lon_out: 1D array for output longitude grid
+        method: Method to use for regridding. See regrid_uniform_cc for details.
+
+    Returns:
+        xesmf.Regridder: Regridder containing the calculated weights
+    """
+    try:
+        import xesmf  # type: ignore
+    except ImportError as e:
+        raise ImportError(construct_xesmf_import_error(e))
+
+    lat_in = convert_to_ndarray(lat_in)
+    lon_in = convert_to_ndarray(lon_in)
+    lat_out = convert_to_ndarray(lat_out)
+    lon_out = convert_to_ndarray(lon_out)
+
+    # 09/03/2023: Don't seem to need inputs with centre and bounding boxes for
+    # uniform grid and xesmf "conservative" method anymore.
+    input_grid = _create_uniform_coords(lat_in, lon_in)
+    output_grid = _create_uniform_coords(lat_out, lon_out)
+
+    return xesmf.Regridder(input_grid, output_grid, method)
+
+
 def regrid_uniform_cc(
     data: ArrayLikeMatch,
     lat_out: ArrayLike,
@@ -109,11 +153,6 @@ def regrid_uniform_cc(
     Returns:
         ndarray / DataArray : Regridded data using specified method
     """
-    try:
-        import xesmf  # type: ignore
-    except ImportError as e:
-        raise ImportError(construct_xesmf_import_error(e))
-
     if latlon is None:
         latlon = ["lat", "lon"]
 
@@ -147,17 +186,7 @@ def regrid_uniform_cc(
             f"does not match 'lat_in' and 'lon_in' lengths: {len(lat_in)}, {len(lon_in)}"
         )
 
-    lat_in = convert_to_ndarray(lat_in)
-    lon_in = convert_to_ndarray(lon_in)
-    lat_out = convert_to_ndarray(lat_out)
-    lon_out = convert_to_ndarray(lon_out)
-
-    # 09/03/2023: Don't seem to need inputs with centre and bounding boxes for
-    # uniform grid and xesmf "conservative" method anymore.
-    input_grid = _create_uniform_coords(lat_in, lon_in)
-    output_grid = _create_uniform_coords(lat_out, lon_out)
-
-    regridder = xesmf.Regridder(input_grid, output_grid, method)
+    regridder = create_uniform_cc_regridder(lat_in, lon_in, lat_out, lon_out, method=method)
     regridded: ArrayLikeMatch = regridder(data)
 
     # # 09/03/2023: Don't need this for uniform grid anymore due to changes above
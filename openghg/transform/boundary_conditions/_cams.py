@@ -1,5 +1,6 @@
 import os
 import logging
+from functools import lru_cache
 from pathlib import Path
 import pathlib
 from typing import Any, Callable, cast, Literal
@@ -16,7 +17,7 @@ from openghg.util import (
     cf_ureg,
 )
 from openghg.store import infer_date_range, update_zero_dim
-from openghg.retrieve import get_footprint
+from openghg.retrieve import get_footprint_coords
 
 logger = logging.getLogger("openghg.transform.boundary_conditions")
 logger.setLevel(logging.DEBUG)  # Have to set level for logger as well as handler
@@ -82,25 +83,151 @@ def xr_interp(
     return result
 
 
+@lru_cache(maxsize=32)
+def _linear_interp_weights(x: tuple[float, ...], xi: tuple[float, ...]) -> tuple[np.ndarray, ...]:
+    """Calculate the neighbours and weights for linear interpolation from points x to points xi.
+
+    Combining the neighbouring values using these weights gives the same result as
+    `xr.DataArray.interp` with method="linear": values outside the range of x are NaN.
+
+    The weights only depend on the grids, so they are cached and reused for each
+    CAMS grid / domain pair.
+
+    Args:
+        x: Source coordinate values, sorted in increasing order
+        xi: Target coordinate values
+    Returns:
+        tuple: indices of lower neighbours, indices of upper neighbours and fractional distance
+            from the lower neighbour for each value in xi
+    """
+    x_arr = np.asarray(x)
+    xi_arr = np.asarray(xi)
+
+    upper = np.clip(np.searchsorted(x_arr, xi_arr, side="right"), 1, x_arr.size - 1)
+    lower = upper - 1
+    frac = (xi_arr - x_arr[lower]) / (x_arr[upper] - x_arr[lower])
+
+    outside = (xi_arr < x_arr[0]) | (xi_arr > x_arr[-1])
+    frac[outside] = np.nan
+
+    return lower, upper, frac
+
+
+def _combine_neighbours(lower_vals: np.ndarray, upper_vals: np.ndarray, frac: np.ndarray) -> np.ndarray:
+    """Linearly combine neighbouring values, ignoring the upper value where it has zero weight."""
+    return np.where(frac == 0, lower_vals, lower_vals + frac * (upper_vals - lower_vals))
+
+
+def _interp_curtains_np(
+    data: np.ndarray, z: np.ndarray, height: np.ndarray, horizontal_weights: tuple[np.ndarray, ...]
+) -> np.ndarray:
+    """Interpolate curtains vertically (onto height) and then horizontally (using cached weights).
+
+    The vertical interpolation is equivalent to `np.interp` along the last axis but the
+    weights are calculated for all columns in one vectorised step. When z does not vary
+    along the leading (e.g. time) dimensions these weights are only calculated once.
+
+    Args:
+        data: values with shape (..., horizontal, level)
+        z: altitude of each level, broadcastable to data; must be increasing along the last axis.
+        height: heights to interpolate to
+        horizontal_weights: output of `_linear_interp_weights` for the horizontal grids
+    Returns:
+        ndarray: values with shape (..., target horizontal, height)
+    """
+    n_level = z.shape[-1]
+
+    # number of levels at or below each height gives the upper neighbour for each column;
+    # heights outside of the levels are clamped to the end values (as for np.interp)
+    n_below = (z[..., np.newaxis, :] <= height[:, np.newaxis]).sum(axis=-1)
+    lower = np.clip(n_below - 1, 0, n_level - 1)
+    upper = np.clip(n_below, 0, n_level - 1)
+
+    z_lower = np.take_along_axis(z, lower, axis=-1)
+    z_upper = np.take_along_axis(z, upper, axis=-1)
+    dz = z_upper - z_lower
+    frac = np.divide(height - z_lower, dz, out=np.zeros(dz.shape), where=dz > 0)
+
+    index_shape = np.broadcast_shapes(data.shape[:-1], lower.shape[:-1]) + (height.size,)
+    data_lower = np.take_along_axis(data, np.broadcast_to(lower, index_shape), axis=-1)
+    data_upper = np.take_along_axis(data, np.broadcast_to(upper, index_shape), axis=-1)
+    frac = np.broadcast_to(frac, index_shape)
+
+    vertical = _combine_neighbours(data_lower, data_upper, frac)
+
+    # (..., horizontal, height) -> (..., target horizontal, height)
+    h_lower, h_upper, h_frac = horizontal_weights
+    return _combine_neighbours(vertical[..., h_lower, :], vertical[..., h_upper, :], h_frac[:, np.newaxis])
+
+
+def interp_curtains(
+    curtains: xr.Dataset, horizontal_dim: str, horizontal_vals: np.ndarray, height: np.ndarray
+) -> xr.DataArray:
+    """Interpolate stacked curtains of CAMS data onto domain heights and a horizontal grid.
+
+    This gives the same result as applying `xr_interp` along "level" (using the "z" coordinate)
+    followed by `.interp` along the horizontal dimension, but calculates the interpolation
+    weights once and applies them to all times and curtains in one batched operation.
+
+    Args:
+        curtains: Dataset containing "species" and "z", with dimensions "level" and horizontal_dim.
+            Any other dimensions (e.g. time or a stacked "curtain" dimension) are batched over.
+        horizontal_dim: Name of horizontal dimension for the curtain ("lat" or "lon")
+        horizontal_vals: Values to interpolate to along horizontal_dim
+        height: Heights to interpolate to, on the same scale as "z"
+    Returns:
+        DataArray: interpolated species, with dimensions (..., horizontal_dim, "level")
+    """
+    source_vals = curtains[horizontal_dim].values
+    horizontal_weights = _linear_interp_weights(
+        tuple(source_vals.tolist()), tuple(np.asarray(horizontal_vals).tolist())
+    )
+
+    core_dims = [horizontal_dim, "level"]
+    result: xr.DataArray = xr.apply_ufunc(
+        _interp_curtains_np,
+        curtains["species"],
+        curtains["z"],
+        kwargs={"height": np.asarray(height), "horizontal_weights": horizontal_weights},
+        input_core_dims=[core_dims, core_dims],
+        output_core_dims=[core_dims],
+        exclude_dims=set(core_dims),
+        dask="parallelized",
+        output_dtypes=[curtains["species"].dtype],
+        dask_gufunc_kwargs={
+            "output_sizes": {horizontal_dim: len(horizontal_vals), "level": len(height)},
+            "allow_rechunk": True,
+        },
+    )
+
+    return result.assign_coords({horizontal_dim: horizontal_vals, "level": height})
+
+
 def cams_to_domain(
-    ds: xr.Dataset, domain: str, xr_interp_fn: Callable = xr_interp, get_footprint_kwargs: dict | None = None
+    ds: xr.Dataset,
+    domain: str,
+    xr_interp_fn: Callable | None = None,
+    get_footprint_kwargs: dict | None = None,
 ) -> xr.Dataset:
     """
     Interpolate CAMS data on another grid (should be one commonly used in openghg)
     Args:
         ds: datset to
-        xr_interp_fn: interpolation function to use
-        get_footprint_kwargs: kwargs passed to get_footprint from openghg_retrieve to find the footprint data from which the grid will be taken.
+        xr_interp_fn: interpolation function to use for each curtain (e.g. `xr_interp`). By default,
+            the interpolation weights are calculated once and applied to the north/south and east/west
+            curtains together (see `interp_curtains`).
+        get_footprint_kwargs: kwargs passed to get_footprint_coords from openghg.retrieve to find the footprint
+            from which the grid will be taken. Only the coordinates of the footprint are read.
             If None, will use function find_domain from openghg.util to get lat/lon and set the height as np.linspace(500.0, 19500.0, 20, endpoint=True)
     Returns:
         interpolated Dataset with 4 variables: vmr_n/e/s/w
     """
 
     if get_footprint_kwargs:
-        fp = get_footprint(**get_footprint_kwargs).data
-        lat = fp["lat"].values
-        lon = fp["lon"].values
-        height = fp["height"].values
+        fp_coords = get_footprint_coords(**get_footprint_kwargs)
+        lat = fp_coords["lat"]
+        lon = fp_coords["lon"]
+        height = fp_coords["height"]
     else:
         lat, lon = find_domain(domain)[:2]
         height = np.linspace(500.0, 19500.0, 20, endpoint=True)
@@ -120,11 +247,28 @@ def cams_to_domain(
     east = ds[["species", "z"]].sel(lon=lon_e, lat=slice(lat_s, lat_n)).drop_vars("lon")
     west = ds[["species", "z"]].sel(lon=lon_w, lat=slice(lat_s, lat_n)).drop_vars("lon")
 
+    if xr_interp_fn is not None:
+        data_vars = {
+            "vmr_n": xr_interp_fn(north.species, "level", height, "z").interp(lon=lon).astype("float32"),
+            "vmr_e": xr_interp_fn(east.species, "level", height, "z").interp(lat=lat).astype("float32"),
+            "vmr_s": xr_interp_fn(south.species, "level", height, "z").interp(lon=lon).astype("float32"),
+            "vmr_w": xr_interp_fn(west.species, "level", height, "z").interp(lat=lat).astype("float32"),
+        }
+        return xr.Dataset(data_vars)
+
+    # north/south and east/west curtains share the same horizontal grid,
+    # so these can be interpolated together
+    north_south = xr.concat([north, south], dim="curtain", coords="different", compat="equals")
+    east_west = xr.concat([east, west], dim="curtain", coords="different", compat="equals")
+
+    vmr_ns = interp_curtains(north_south, "lon", lon, height).astype("float32")
+    vmr_ew = interp_curtains(east_west, "lat", lat, height).astype("float32")
+
     data_vars = {
-        "vmr_n": xr_interp_fn(north.species, "level", height, "z").interp(lon=lon).astype("float32"),
-        "vmr_e": xr_interp_fn(east.species, "level", height, "z").interp(lat=lat).astype("float32"),
-        "vmr_s": xr_interp_fn(south.species, "level", height, "z").interp(lon=lon).astype("float32"),
-        "vmr_w": xr_interp_fn(west.species, "level", height, "z").interp(lat=lat).astype("float32"),
+        "vmr_n": vmr_ns.isel(curtain=0, drop=True),
+        "vmr_e": vmr_ew.isel(curtain=0, drop=True),
+        "vmr_s": vmr_ns.isel(curtain=1, drop=True),
+        "vmr_w": vmr_ew.isel(curtain=1, drop=True),
     }
     return xr.Dataset(data_vars)
 
@@ -1 +1 @@
-from ._edgar import parse_edgar
+from ._edgar import parse_edgar, parse_edgar_batch
@@ -47,12 +47,15 @@ For EDGAR v8.0,
 import pathlib
 import re
 import zipfile
-from collections import namedtuple
+from collections import defaultdict, namedtuple
 from typing import Any, Optional, cast
 import logging
+import dask
+import dask.array as da
 import numpy as np
 import xarray as xr
 from numpy import ndarray
+from pandas import Timedelta
 
 from openghg.standardise.meta import assign_flux_attributes, define_species_label
 from openghg.store import infer_date_range
@@ -62,7 +65,10 @@ from openghg.util import (
     synonyms,
     find_coord_name,
     convert_internal_longitude,
+    create_frequency_str,
+    relative_time_offset,
     timestamp_now,
+    timestamp_tzaware,
 )
 
 logger = logging.getLogger("openghg.transform.flux")
@@ -72,6 +78,8 @@ logger.setLevel(logging.DEBUG)  # Have to set level for logger as well as handle
 ArrayType = Optional[ndarray | xr.DataArray]
 
 
+EdgarFileInfo = namedtuple("EdgarFileInfo", "path metadata")
+
 _edgar_known_versions = ("v432", "v4.3.2", "v50", "v5.0", "v60", "v6.0", "v70", "v7.0", "v80", "v8.0")
 
 
@@ -205,29 +213,6 @@ def parse_edgar(
 
     # TODO: Add check for period? Only monthly or yearly (or equivalent inputs)
 
-    if zipfile.is_zipfile(datapath):
-        datapath = zipfile.Path(datapath)  # type: ignore
-
-    # NOTE: the built-in `open` method doesn't work with zipfile.Path
-    # but there is a zipfile.Path.open method that works the same as
-    # pathlib.Path.open
-
-    folder_filelist = [x for x in datapath.iterdir() if x.is_file()]
-
-    # Extract netcdf files (only, for now) - ".txt" is also an option (not implemented)
-    # Path(file.name).suffix workaround because zipfile.Path.suffix is Python 3.11+
-    data_files = [file for file in folder_filelist if pathlib.Path(file.name).suffix == ".nc"]
-
-    if not data_files:
-        raise ValueError(f"No '.nc' files found in datapath: {datapath}")
-
-    if edgar_version is None:
-        # check if _readme.html is in folder_filelist, and if so, try to extract version
-        readme = datapath / "_readme.html"
-        if readme.exists():
-            with readme.open("r") as f:  # pathlib.Path and zipfile.Path have .open method
-                edgar_version = _check_readme_data(f.read())
-
     if len(date) == 4:
         year = int(date)
     else:
@@ -235,22 +220,15 @@ def parse_edgar(
             f"Date {date} does not represent a year;" " only annual EDGAR data can be processed currently."
         )
 
-    FileInfo = namedtuple("FileInfo", "path metadata")
-    files_by_year: dict[int, FileInfo] = {}
-    for data_file in data_files:
-        try:
-            metadata = assemble_edgar_metadata(data_file, species, edgar_version)
-        except ValueError:
-            continue
-        else:
-            # Check if data is actually monthly "...2015_1" etc. - can't parse yet
-            if "month" in metadata:
-                raise NotImplementedError("Unable to parse monthly EDGAR data at present.")
+    edgar_version, edgar_files = _scan_edgar_datapath(datapath, species=species, edgar_version=edgar_version)
 
-            files_by_year[metadata["year"]] = FileInfo(data_file, metadata)
+    files_by_year: dict[int, EdgarFileInfo] = {}
+    for file_info in edgar_files:
+        # Check if data is actually monthly "...2015_1" etc. - can't parse yet
+        if "month" in file_info.metadata:
+            raise NotImplementedError("Unable to parse monthly EDGAR data at present.")
 
-    if not files_by_year:
-        raise ValueError(f"Unable to extract EDGAR file info from any files in {datapath}.")
+        files_by_year[file_info.metadata["year"]] = file_info
 
     try:
         edgar_file, edgar_file_info = files_by_year[year]
@@ -271,36 +249,16 @@ def parse_edgar(
     # using .open("rb") for pathlib.Path and zipfile.Path compatibility
     edgar_ds = xr.open_dataset(edgar_file.open("rb"), engine="h5netcdf")
 
-    # Expected name e.g. "emi_ch4", "emi_co2" for version <= 7; "fluxes" for version 8
-    name = "fluxes" if version.startswith("v8") else f"emi_{species_label}"
-
-    # check that data variable `name` is in `edgar_ds`
-    if name not in edgar_ds.data_vars:
-        if version.startswith("v8"):
-            raise ValueError(
-                f"Data variable {name} not present. We only support 'flx_nc' files, not 'emi_nc' files, for EDGAR v8.0"
-            )
-        else:
-            raise ValueError(f"Data variable {name} not present.")
+    name = _edgar_variable_name(edgar_ds, species_label, version)
 
     # Convert from kg/m2/s to mol/m2/s
-    species_molar_mass = molar_mass(species_label)
-    kg_to_g = 1e3
-
-    flux_da = edgar_ds[name]
-    flux_da = flux_da * kg_to_g / species_molar_mass
+    flux_da = _convert_edgar_flux(edgar_ds[name], species_label)
     units = "mol/m2/s"
 
     # TODO: some options for f-gases (.emi files) have different units...
     # need to catch this
 
-    lat_name = find_coord_name(flux_da, options=["lat", "latitude"])
-    lon_name = find_coord_name(flux_da, options=["lon", "longitude"])
-    if lat_name is None or lon_name is None:
-        raise ValueError(
-            f"Could not find '{lat_name}' or '{lon_name}' in EDGAR file.\n"
-            " Please check this is a 2D grid map."
-        )
+    lat_name, lon_name = _edgar_lat_lon_names(flux_da)
 
     # Check range of longitude values and convert to -180 - +180
     flux_da = convert_internal_longitude(
@@ -420,6 +378,356 @@ def parse_edgar(
     return emissions_data
 
 
+def parse_edgar_batch(
+    datapath: pathlib.Path,
+    species: str | None = None,
+    domain: str | None = None,
+    lat_out: ArrayType = None,
+    lon_out: ArrayType = None,
+    start_year: int | str | None = None,
+    end_year: int | str | None = None,
+    sectors: list[str] | None = None,
+    edgar_version: str | None = None,
+) -> dict:
+    """
+    Read and parse all EDGAR grid maps within a folder or zip archive in one pass.
+
+    This is the multi-year, multi-sector equivalent of `parse_edgar`. The
+    archive is only listed once and the metadata for each file is only
+    extracted once. Files are then grouped by sector (source) and all years
+    (and months, if present) for a sector are stacked along the time dimension
+    to create one dataset per sector.
+
+    The data is not loaded at this point. Each grid map is read lazily (as one
+    dask chunk) when the data is stored, so peak memory use is bounded by the
+    chunk size used for storage rather than the size of the archive. When
+    regridding, the regridding weights are calculated once and applied to the
+    full time stack for every sector.
+
+    Region information can be specified in the same way as for `parse_edgar`.
+
+    Args:
+        datapath: Path to data folder or zip archive for EDGAR data
+        species: Species name being extracted
+        domain: Domain name for new or pre-existing domain
+        lat_out: Latitude values for new domain
+        lon_out: Longitude values for new domain
+        start_year: First year to include. If not specified, starts from the first year available.
+        end_year: Last year to include (inclusive). If not specified, ends with the last year available.
+        sectors: Sectors (sources) to include, as extracted from the filenames
+            (e.g. ["anthro", "ene", "tnr-ship"]). All sectors are included by default.
+        edgar_version: EDGAR version in file. Will be inferred otherwise.
+
+    Returns:
+        dict: Dictionary of data, with one entry per sector
+    """
+    edgar_version, edgar_files = _scan_edgar_datapath(datapath, species=species, edgar_version=edgar_version)
+
+    start = int(start_year) if start_year is not None else None
+    end = int(end_year) if end_year is not None else None
+    if sectors is not None:
+        sectors = [clean_string(sector) for sector in sectors]
+
+    files_by_source: dict[str, dict[tuple[int, int], EdgarFileInfo]] = defaultdict(dict)
+    for file_info in edgar_files:
+        file_metadata = file_info.metadata
+        year = file_metadata["year"]
+        if (start is not None and year < start) or (end is not None and year > end):
+            continue
+        if sectors is not None and file_metadata["source"] not in sectors:
+            continue
+
+        month = file_metadata.get("month", 1)
+        files_by_source[file_metadata["source"]][(year, month)] = file_info
+
+    if not files_by_source:
+        raise ValueError(f"No EDGAR files in {datapath} match the selected years and sectors.")
+
+    lat_out, lon_out = _check_lat_lon(domain, lat_out, lon_out)
+
+    if domain is None:
+        domain = "globaledgar"
+
+    units = "mol/m2/s"
+    author_name = "OpenGHG Cloud"
+    regridders: dict[tuple[bytes, bytes], Any] = {}
+
+    emissions_data: dict[str, dict] = {}
+    for source, files_by_time in sorted(files_by_source.items()):
+        year_months = sorted(files_by_time)
+        sector_files = [files_by_time[year_month] for year_month in year_months]
+        times = np.array([f"{year}-{month:02}-01" for year, month in year_months], dtype="datetime64[ns]")
+
+        first_file, first_file_info = sector_files[0]
+        species_label = first_file_info["species"]
+        version = first_file_info["version"]
+        monthly = any("month" in file_info.metadata for file_info in sector_files)
+
+        # Only the coordinates and attributes are read from the first file here.
+        # This defines the input grid which all other files must match.
+        with xr.open_dataset(first_file.open("rb"), engine="h5netcdf") as edgar_ds:
+            name = _edgar_variable_name(edgar_ds, species_label, version)
+            template = _edgar_grid_template(edgar_ds[name], lat_out, lon_out)
+            edgar_attrs = dict(edgar_ds.attrs)
+
+        lat_name, lon_name = _edgar_lat_lon_names(template)
+        lat_in = template[lat_name].values
+        lon_in = template[lon_name].values
+        dtype = np.result_type(template.dtype, 1.0)
+
+        read_grid = dask.delayed(_read_edgar_grid)
+        grids = [
+            da.from_delayed(
+                read_grid(file_info.path, species_label, version, lat_out, lon_out, template.shape),
+                shape=template.shape,
+                dtype=dtype,
+            )
+            for file_info in sector_files
+        ]
+        flux = da.stack(grids, axis=0)
+
+        if lat_out is not None and lon_out is not None:
+            grid_key = (lat_in.tobytes(), lon_in.tobytes())
+            if grid_key not in regridders:
+                # Will produce import error if xesmf has not been installed.
+                from openghg.transform import create_uniform_cc_regridder
+
+                regridders[grid_key] = create_uniform_cc_regridder(lat_in, lon_in, lat_out, lon_out)
+            flux = regridders[grid_key](flux)
+            lat_values, lon_values = lat_out, lon_out
+        else:
+            lat_values, lon_values = lat_in, lon_in
+
+        em_data = xr.Dataset(
+            {"flux": (("time", "lat", "lon"), flux)},
+            coords={"time": times, "lat": lat_values, "lon": lon_values},
+            attrs=edgar_attrs,
+        )
+
+        # Some attributes are numpy types we can't serialise to JSON so convert them
+        # to their native types here
+        metadata: dict[str, Any] = {}
+        for key, value in em_data.attrs.items():
+            try:
+                metadata[key] = value.item()
+            except AttributeError:
+                metadata[key] = value
+
+        em_data.attrs["author"] = author_name
+
+        metadata["species"] = species_label
+        metadata["domain"] = domain
+        metadata["source"] = source
+        metadata["database"] = "EDGAR"
+        metadata["database_version"] = version
+        metadata["author"] = author_name
+        metadata["processed"] = str(timestamp_now())
+        metadata["data_type"] = "flux"
+
+        attrs = {"author": metadata["author"], "processed": metadata["processed"]}
+
+        # Each grid map covers a whole month or year so the date range can't be
+        # inferred from the (possibly irregular) time stamps alone
+        period = "monthly" if monthly else "yearly"
+        start_date = timestamp_tzaware(times[0])
+        end_date = timestamp_tzaware(times[-1]) + relative_time_offset(period=period) - Timedelta(seconds=1)
+        period_str = create_frequency_str(period=period)
+
+        metadata["start_date"] = str(start_date)
+        metadata["end_date"] = str(end_date)
+
+        metadata["min_longitude"] = round(float(em_data["lon"].min()), 5)
+        metadata["max_longitude"] = round(float(em_data["lon"].max()), 5)
+        metadata["min_latitude"] = round(float(em_data["lat"].min()), 5)
+        metadata["max_latitude"] = round(float(em_data["lat"].max()), 5)
+
+        metadata["time_resolution"] = "standard"
+        metadata["time_period"] = period_str
+
+        prior_info_dict = {
+            "EDGAR": {
+                "version": f"EDGAR {edgar_version}",
+                "filename": ", ".join(file_info.path.name for file_info in sector_files),
+                "raw_resolution": "0.1 degrees x 0.1 degrees",
+                "reference": edgar_attrs["source"],
+            }
+        }
+
+        key = "_".join((species_label, source, domain))
+        sector_data = {key: {"data": em_data, "metadata": metadata, "attributes": attrs}}
+        sector_data = assign_flux_attributes(sector_data, units=units, prior_info_dict=prior_info_dict)
+
+        emissions_data.update(sector_data)
+
+    return emissions_data
+
+
+def _scan_edgar_datapath(
+    datapath: pathlib.Path,
+    species: str | None = None,
+    edgar_version: str | None = None,
+) -> tuple[str | None, list[EdgarFileInfo]]:
+    """List the netcdf files within an EDGAR folder or zip archive and extract
+    the metadata for each of these from the filename.
+
+    Files which are not recognised as EDGAR files are skipped.
+
+    Args:
+        datapath: Path to data folder or zip archive for EDGAR data
+        species: Species name being extracted
+        edgar_version: EDGAR version in file. Will be extracted from the readme file if not specified.
+
+    Returns:
+        str | None, list: EDGAR version and details (path and metadata) for each EDGAR file
+    """
+    archive: pathlib.Path | zipfile.Path = datapath
+    if zipfile.is_zipfile(datapath):
+        archive = zipfile.Path(datapath)
+
+    # NOTE: the built-in `open` method doesn't work with zipfile.Path
+    # but there is a zipfile.Path.open method that works the same as
+    # pathlib.Path.open
+
+    folder_filelist = [x for x in archive.iterdir() if x.is_file()]
+
+    # Extract netcdf files (only, for now) - ".txt" is also an option (not implemented)
+    # Path(file.name).suffix workaround because zipfile.Path.suffix is Python 3.11+
+    data_files = [file for file in folder_filelist if pathlib.Path(file.name).suffix == ".nc"]
+
+    if not data_files:
+        raise ValueError(f"No '.nc' files found in datapath: {datapath}")
+
+    if edgar_version is None:
+        # check if _readme.html is in folder_filelist, and if so, try to extract version
+        readme = archive / "_readme.html"
+        if readme.exists():
+            with readme.open("r") as f:  # pathlib.Path and zipfile.Path have .open method
+                edgar_version = _check_readme_data(f.read())
+
+    edgar_files = []
+    for data_file in data_files:
+        try:
+            metadata = assemble_edgar_metadata(data_file, species, edgar_version)
+        except ValueError:
+            continue
+        else:
+            edgar_files.append(EdgarFileInfo(data_file, metadata))
+
+    if not edgar_files:
+        raise ValueError(f"Unable to extract EDGAR file info from any files in {datapath}.")
+
+    return edgar_version, edgar_files
+
+
+def _edgar_variable_name(edgar_ds: xr.Dataset, species_label: str, version: str) -> str:
+    """Find the name of the flux variable within an EDGAR dataset.
+
+    Args:
+        edgar_ds: Dataset opened from an EDGAR file
+        species_label: Species label for the data
+        version: EDGAR version
+
+    Returns:
+        str: Name of the flux data variable
+    """
+    # Expected name e.g. "emi_ch4", "emi_co2" for version <= 7; "fluxes" for version 8
+    name = "fluxes" if version.startswith("v8") else f"emi_{species_label}"
+
+    # check that data variable `name` is in `edgar_ds`
+    if name not in edgar_ds.data_vars:
+        if version.startswith("v8"):
+            raise ValueError(
+                f"Data variable {name} not present. We only support 'flx_nc' files, not 'emi_nc' files, for EDGAR v8.0"
+            )
+        else:
+            raise ValueError(f"Data variable {name} not present.")
+
+    return name
+
+
+def _edgar_lat_lon_names(flux_da: xr.DataArray) -> tuple[str, str]:
+    """Find the names of the latitude and longitude coordinates for an EDGAR grid map."""
+    lat_name = find_coord_name(flux_da, options=["lat", "latitude"])
+    lon_name = find_coord_name(flux_da, options=["lon", "longitude"])
+    if lat_name is None or lon_name is None:
+        raise ValueError(
+            f"Could not find '{lat_name}' or '{lon_name}' in EDGAR file.\n"
+            " Please check this is a 2D grid map."
+        )
+
+    return lat_name, lon_name
+
+
+def _convert_edgar_flux(flux_da: xr.DataArray, species_label: str) -> xr.DataArray:
+    """Convert EDGAR flux from kg/m2/s to mol/m2/s."""
+    species_molar_mass = molar_mass(species_label)
+    kg_to_g = 1e3
+
+    return flux_da * kg_to_g / species_molar_mass
+
+
+def _edgar_grid_template(flux_da: xr.DataArray, lat_out: ArrayType, lon_out: ArrayType) -> xr.DataArray:
+    """Select the 2D grid map from an EDGAR flux variable, converting to a -180 - +180
+    longitude range and cutting this down to the output grid (with buffer) if specified.
+
+    This does not load the underlying data.
+    """
+    from openghg.util import cut_data_extent
+
+    if "time" in flux_da.dims:
+        if flux_da.sizes["time"] != 1:
+            raise ValueError("Expected EDGAR file to contain a single grid map for one year or month.")
+        flux_da = flux_da.squeeze("time", drop=True)
+
+    if flux_da.ndim != 2:
+        raise ValueError(f"Expected EDGAR flux to be a 2D grid map but found dimensions: {flux_da.dims}.")
+
+    _, lon_name = _edgar_lat_lon_names(flux_da)
+    flux_da = convert_internal_longitude(flux_da, lon_name=lon_name)
+
+    if lat_out is not None and lon_out is not None:
+        # To improve performance of regridding algorithm cut down the data
+        # to match the output grid (with buffer).
+        flux_da = cut_data_extent(flux_da, lat_out, lon_out)
+
+    return flux_da
+
+
+def _read_edgar_grid(
+    edgar_file: pathlib.Path | zipfile.Path,
+    species_label: str,
+    version: str,
+    lat_out: ArrayType,
+    lon_out: ArrayType,
+    shape: tuple[int, ...],
+) -> ndarray:
+    """Read the (cut down) 2D grid map from one EDGAR file in mol/m2/s.
+
+    Args:
+        edgar_file: Path to the EDGAR file
+        species_label: Species label for the data
+        version: EDGAR version
+        lat_out: Latitude values for output domain, if regridding
+        lon_out: Longitude values for output domain, if regridding
+        shape: Expected shape of the grid map
+
+    Returns:
+        ndarray: flux values
+    """
+    with xr.open_dataset(edgar_file.open("rb"), engine="h5netcdf") as edgar_ds:
+        name = _edgar_variable_name(edgar_ds, species_label, version)
+        flux_da = _edgar_grid_template(edgar_ds[name], lat_out, lon_out)
+        flux_values = _convert_edgar_flux(flux_da, species_label).values
+
+    if flux_values.shape != shape:
+        raise ValueError(
+            f"Grid map in {edgar_file.name} has shape {flux_values.shape} but expected {shape}."
+            " All EDGAR files within a batch must be on the same grid."
+        )
+
+    return flux_values
+
+
 def _check_lat_lon(
     domain: str | None = None, lat_out: ArrayType = None, lon_out: ArrayType = None
 ) -> tuple[ndarray | None, ndarray | None]:
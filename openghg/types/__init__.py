@@ -54,4 +54,6 @@ from ._types import (
     MetadataAndData,
     Comparable,
     convert_to_list_of_metadata_and_data,
+    convert_to_slabs_of_metadata_and_data,
+    split_time_slabs,
 )
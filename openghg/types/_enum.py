@@ -41,6 +41,7 @@ class FluxDatabases(Enum):
     """For extracting and transforming flux/emissions databases"""
 
     EDGAR = "EDGAR"
+    EDGAR_BATCH = "EDGAR_BATCH"
 
 
 class FootprintTypes(Enum):
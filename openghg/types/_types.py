@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from pathlib import Path
 from typing import (
@@ -62,6 +62,56 @@ def convert_to_list_of_metadata_and_data(
     )
 
 
+def convert_to_slabs_of_metadata_and_data(
+    parser_output: Iterator[dict | HasMetadataAndData | Iterable[HasMetadataAndData]],
+) -> Iterator[list[MetadataAndData]]:
+    """Convert the output of a parser which yields its data in time slabs, without reading ahead.
+
+    Each item yielded by the parser may be a single object with .metadata and .data attributes,
+    or any of the formats accepted by `convert_to_list_of_metadata_and_data`.
+    """
+    for slab in parser_output:
+        if isinstance(slab, HasMetadataAndData):
+            slab = [slab]
+        yield convert_to_list_of_metadata_and_data(slab)
+
+
+def split_time_slabs(
+    parser_output: dict | Iterable[HasMetadataAndData], time_slab: int, dim: str = "time"
+) -> Iterator[list[MetadataAndData]]:
+    """Split parsed data into slabs of at most `time_slab` time points.
+
+    The data is selected lazily, so if the data was opened lazily only one slab
+    is read into memory at a time when the slabs are stored. Parsers which read the whole
+    file into memory gain nothing from this, so only parsers opening their data lazily
+    (the `openghg` flux and `acrg_org` footprint parsers) accept a `time_slab` argument.
+
+    Args:
+        parser_output: Parsed data, in any format accepted by `convert_to_list_of_metadata_and_data`
+        time_slab: Number of time points in each slab
+        dim: Name of time dimension
+    Returns:
+        Iterator: Lists of data and metadata, one for each slab
+    """
+    if time_slab < 1:
+        raise ValueError("time_slab must be a positive integer.")
+
+    parsed = convert_to_list_of_metadata_and_data(parser_output)
+    n_time = max(x.data.sizes.get(dim, 0) for x in parsed)
+
+    for start in range(0, max(n_time, 1), time_slab):
+        slab = []
+        for x in parsed:
+            if dim not in x.data.dims:
+                # Data without a time dimension is stored whole with the first slab
+                if start == 0:
+                    slab.append(MetadataAndData(metadata=x.metadata.copy(), data=x.data))
+            elif start < x.data.sizes[dim]:
+                data = x.data.isel({dim: slice(start, start + time_slab)})
+                slab.append(MetadataAndData(metadata=x.metadata.copy(), data=data))
+        yield slab
+
+
 @runtime_checkable
 class HasMetadataAndData(Protocol):
     """Protocol that includes _BaseData and its subclasses, as well as
@@ -15,6 +15,8 @@ from ._domain import (
     convert_internal_longitude,
     cut_data_extent,
     align_lat_lon,
+    get_spatial_bounds,
+    spatial_index_slices,
 )
 from ._download import download_data, parse_url_filename
 from ._export import to_dashboard, to_dashboard_mobile
@@ -108,11 +110,13 @@ from ._time import (
     trim_daterange,
     valid_daterange,
 )
+from ._execution import dask_scheduler, execution_options, get_execution_options, uses_execution_options
 from ._user import (
     create_config,
     get_user_id,
     get_user_config_path,
     read_local_config,
+    read_config_section,
     check_config,
     handle_direct_store_path,
 )
@@ -131,7 +135,7 @@ from ._util import (
     collate_strings,
 )
 
-from ._units import assign_units, cf_ureg
+from ._units import add_with_units, assign_units, cf_ureg, conversion_factor, multiply_with_units, parse_units
 from ._versions import show_versions, check_if_need_new_version
 
 from ._met import _get_ecmwf_area, _altitude_to_ecmwf_pressure, _get_site_pressure
@@ -7,7 +7,9 @@ from xarray.core.coordinates import Coordinates
 
 import numpy as np
 import xarray as xr
+from xarray.core import dtypes
 from xarray.core.types import CompatOptions
+from xarray.core.utils import equivalent
 
 from openghg.types import HasMetadataAndData
 
@@ -47,7 +49,12 @@ def combine_data_objects(
     # combine data by coordinates (this is what is used by xr.open_mfdataset by default; it combines and sorts)
     datasets = [do.data for do in data_objects]
 
-    if concat_dim is not None:
+    if concat_dim is not None and drop_duplicates == concat_dim and _can_merge_sorted(datasets, concat_dim):
+        # Merge the (sorted) datasets along concat_dim, keeping the first value for each
+        # coordinate, without concatenating and then dropping duplicates
+        new_data = merge_sorted(datasets, dim=concat_dim)
+        drop_duplicates = None
+    elif concat_dim is not None:
         if compat is None:
             compat = "equals"
         new_data = cast(
@@ -74,6 +81,219 @@ def combine_data_objects(
     return result
 
 
+# merging datasets sorted along a dimension
+
+
+def _drop_conflicts(attrs_list: list[dict]) -> dict:
+    """Combine attributes, dropping any with conflicting values (as `combine_attrs="drop_conflicts"`)."""
+    result: dict = {}
+    dropped: set = set()
+    for attrs in attrs_list:
+        for key, value in attrs.items():
+            if key in dropped:
+                continue
+            if key not in result:
+                result[key] = value
+            elif not equivalent(result[key], value):
+                del result[key]
+                dropped.add(key)
+    return result
+
+
+def _can_merge_sorted(datasets: list[xr.Dataset], dim: str) -> bool:
+    """Check if datasets can be combined by `merge_sorted`.
+
+    Every data variable must have dimension `dim`, the only coordinates must be dimension
+    coordinates and the coordinates of the other dimensions must be the same in each dataset.
+    Otherwise the datasets need to be aligned, which is left to xr.concat.
+    """
+    first = datasets[0]
+
+    for ds in datasets:
+        if dim not in ds.dims or dim not in ds.indexes:
+            return False
+        if any(dim not in da.dims for da in ds.data_vars.values()):
+            return False
+        if any(name not in ds.dims for name in ds.coords):
+            return False
+        for name in ds.dims:
+            if name == dim:
+                continue
+            if name not in first.coords or name not in ds.coords:
+                return False
+            if not first[name].equals(ds[name]):
+                return False
+
+    return True
+
+
+def _merge_plan(indexes: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Work out where each value of a merge of sorted indexes comes from.
+
+    For values present in more than one index, the value from the first index is used.
+
+    Args:
+        indexes: Sorted coordinate values of each dataset
+    Returns:
+        tuple: Merged coordinate values, and for each merged value the dataset it comes from
+        and its position in that dataset
+    """
+    lengths = np.array([len(index) for index in indexes])
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    source = np.repeat(np.arange(len(indexes)), lengths)
+    combined = np.concatenate(indexes)
+
+    # The stable sort (timsort) merges the sorted runs, keeping equal values in dataset order
+    order = np.argsort(combined, kind="stable")
+    merged = combined[order]
+
+    first_of_value = np.ones(len(merged), dtype=bool)
+    first_of_value[1:] = merged[1:] != merged[:-1]
+    order = order[first_of_value]
+
+    out_source = source[order]
+    return combined[order], out_source, order - offsets[out_source]
+
+
+def _fill_block(
+    shape: tuple[int, ...],
+    dtype: np.dtype,
+    fill_value: Any,
+    *parts: tuple[np.ndarray, np.ndarray, np.ndarray],
+) -> np.ndarray:
+    """Create a block of merged values from the values of each dataset.
+
+    Args:
+        shape: Shape of the block, with the merged dimension first
+        dtype: Data type of the block
+        fill_value: Value for positions without a value, if there are any
+        parts: For each dataset, the positions in the block, the positions in `values` and `values`
+    Returns:
+        numpy.ndarray: Block of merged values
+    """
+    # Without a fill value every position has a value
+    block = np.empty(shape, dtype=dtype) if fill_value is None else np.full(shape, fill_value, dtype=dtype)
+    for positions, rows, values in parts:
+        block[positions] = np.asarray(values)[rows]
+    return block
+
+
+def merge_sorted(datasets: list[xr.Dataset], dim: str = "time") -> xr.Dataset:
+    """Merge datasets along a dimension, keeping the value from the first dataset where the same
+    coordinate value is present in more than one dataset.
+
+    This gives the same result as concatenating the datasets with xr.concat (with NaN fill and
+    conflicting attributes dropped), dropping duplicates along `dim` and sorting by `dim`. As each
+    dataset is (usually) already sorted, only the coordinate values are sorted to plan the merge and each
+    value is copied once. Variables with dask arrays are merged block by block, taking contiguous
+    slices of each dataset, so no dataset is loaded in full.
+
+    Args:
+        datasets: Datasets to merge, see `_can_merge_sorted` for the requirements
+        dim: Dimension to merge along
+    Returns:
+        xarray.Dataset: Merged dataset, sorted along `dim`
+    """
+    sorted_datasets = []
+    for ds in datasets:
+        if not ds.indexes[dim].is_monotonic_increasing:
+            ds = ds.isel({dim: np.argsort(ds[dim].values, kind="stable")})
+        sorted_datasets.append(ds)
+
+    merged_index, out_source, out_position = _merge_plan([ds[dim].values for ds in sorted_datasets])
+    n_out = len(merged_index)
+
+    # Positions in the merged dataset and in each dataset of the values taken from that dataset
+    positions = [np.flatnonzero(out_source == k) for k in range(len(sorted_datasets))]
+    rows = [out_position[p] for p in positions]
+
+    names: list = []
+    for ds in sorted_datasets:
+        names.extend(name for name in ds.data_vars if name not in names)
+
+    data_vars = {}
+    for name in names:
+        variables = [(k, ds[name]) for k, ds in enumerate(sorted_datasets) if name in ds.data_vars]
+        template = variables[0][1]
+        dims = template.dims
+
+        dtype = np.result_type(*(da.dtype for _, da in variables))
+        fill_value: Any = None
+        if len(variables) < len(sorted_datasets):
+            dtype, fill_value = dtypes.maybe_promote(dtype)
+
+        # Merged dimension first, for filling the values
+        transposed = [(k, da.transpose(dim, *(d for d in dims if d != dim))) for k, da in variables]
+        shape = (n_out,) + transposed[0][1].shape[1:]
+
+        if any(da.chunks is not None for _, da in transposed):
+            values = _merge_dask(transposed, positions, rows, shape, dtype, fill_value)
+        else:
+            values = _fill_block(
+                shape, dtype, fill_value, *((positions[k], rows[k], da.values) for k, da in transposed)
+            )
+
+        merged_dims = (dim,) + tuple(d for d in dims if d != dim)
+        merged = xr.Variable(merged_dims, values, attrs=_drop_conflicts([da.attrs for _, da in variables]))
+        data_vars[name] = merged.transpose(*dims)
+
+    first = sorted_datasets[0]
+    coords = {name: first[name].variable for name in first.coords if name != dim}
+    coords[dim] = xr.Variable(
+        dim, merged_index, attrs=_drop_conflicts([ds[dim].attrs for ds in sorted_datasets])
+    )
+
+    return xr.Dataset(data_vars, coords=coords, attrs=_drop_conflicts([ds.attrs for ds in sorted_datasets]))
+
+
+def _merge_dask(
+    variables: list[tuple[int, xr.DataArray]],
+    positions: list[np.ndarray],
+    rows: list[np.ndarray],
+    shape: tuple[int, ...],
+    dtype: np.dtype,
+    fill_value: Any,
+) -> Any:
+    """Merge variables block by block, using the plan from `merge_sorted`.
+
+    The merged values are split into blocks along the merged dimension. As each dataset and the
+    merged values are sorted, the values a block takes from a dataset are within a contiguous slice
+    of that dataset, so only that slice is read to create the block.
+    """
+    import dask
+    import dask.array as da
+
+    block_size = max(
+        (max(v.chunks[0]) for _, v in variables if v.chunks is not None),
+        default=shape[0],
+    )
+    block_size = max(block_size, 1)
+
+    blocks = []
+    for start in range(0, shape[0], block_size):
+        end = min(start + block_size, shape[0])
+
+        parts = []
+        for k, variable in variables:
+            first, last = np.searchsorted(positions[k], [start, end])
+            if first == last:
+                continue
+
+            block_rows = rows[k][first:last]
+            row_start, row_end = int(block_rows[0]), int(block_rows[-1]) + 1
+            values = variable.data[row_start:row_end]
+            parts.append((positions[k][first:last] - start, block_rows - row_start, values))
+
+        block_shape = (end - start,) + shape[1:]
+        block = dask.delayed(_fill_block)(block_shape, dtype, fill_value, *parts)
+        blocks.append(da.from_delayed(block, shape=block_shape, dtype=dtype))
+
+    if not blocks:
+        return da.empty(shape, dtype=dtype)
+
+    return da.concatenate(blocks, axis=0)
+
+
 # metadata combination methods
 
 
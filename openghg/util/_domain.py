@@ -282,6 +282,84 @@ def cut_data_extent(
     return data_cut
 
 
+def get_spatial_bounds(
+    lat_bounds: tuple[float, float] | None = None,
+    lon_bounds: tuple[float, float] | None = None,
+    sub_domain: str | None = None,
+    domain_filepath: pathType | None = None,
+) -> dict[str, tuple[float, float]]:
+    """
+    Get the latitude and longitude bounds of a region, from explicit bounds and / or
+    the extent of a pre-defined domain. Explicit bounds take precedence over those of the domain.
+
+    Args:
+        lat_bounds: Minimum and maximum latitude in degrees
+        lon_bounds: Minimum and maximum longitude in degrees
+        sub_domain: Pre-defined domain name, see `find_domain`
+        domain_filepath: Alternative domain info file. Defaults to openghg_defs input.
+    Returns:
+        dict: Bounds for the "lat" and / or "lon" coordinates, empty if none were given
+    """
+    bounds = {}
+
+    if sub_domain is not None:
+        latitude, longitude, _, _ = find_domain(sub_domain, domain_filepath=domain_filepath)
+        bounds["lat"] = (float(np.min(latitude)), float(np.max(latitude)))
+        bounds["lon"] = (float(np.min(longitude)), float(np.max(longitude)))
+
+    for name, coord_bounds in (("lat", lat_bounds), ("lon", lon_bounds)):
+        if coord_bounds is not None:
+            low, high = coord_bounds
+            bounds[name] = (float(min(low, high)), float(max(low, high)))
+
+    return bounds
+
+
+def spatial_index_slices(
+    coords: dict[str, ndarray], bounds: dict[str, tuple[float, float]]
+) -> dict[str, slice]:
+    """
+    Find the index slices along coordinates which select values within bounds (inclusive).
+
+    This only needs the coordinate values, so the slices can be used to select a region
+    before any data is read. The coordinates must be sorted (ascending or descending) and
+    the bounds must use the same longitude convention as the coordinates.
+
+    Args:
+        coords: Coordinate values, keyed by coordinate name
+        bounds: Minimum and maximum values, keyed by coordinate name. Coordinates not in
+            `coords` are ignored.
+    Returns:
+        dict: Index slices keyed by coordinate name
+    Raises:
+        ValueError: if no coordinate values are within the bounds
+    """
+    slices = {}
+    for name, (low, high) in bounds.items():
+        if name not in coords:
+            continue
+
+        values = np.asarray(coords[name])
+        descending = values.size > 1 and values[0] > values[-1]
+        ascending_values = values[::-1] if descending else values
+
+        start = int(np.searchsorted(ascending_values, low, side="left"))
+        stop = int(np.searchsorted(ascending_values, high, side="right"))
+
+        if start >= stop:
+            raise ValueError(
+                f"No {name} values within bounds ({low}, {high}), the data covers "
+                f"({values.min()}, {values.max()})."
+            )
+
+        if descending:
+            start, stop = values.size - stop, values.size - start
+
+        slices[name] = slice(start, stop)
+
+    return slices
+
+
 def check_coord_alignment(data: XrDataLikeMatch, domain: str, coord: str) -> XrDataLikeMatch:
     """
     Check that the values of a given coordinate (lat/lon or latitude/longitude) in
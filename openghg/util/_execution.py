@@ -0,0 +1,224 @@
+"""Configuration of the dask scheduler used by OpenGHG.
+
+By default OpenGHG uses whichever dask scheduler is active. A scheduler can be chosen in the
+"execution" section of the user config file, for example
+
+    [execution]
+    scheduler = "threads"
+    num_workers = 16
+
+or for a block of code using `execution_options`:
+
+    with execution_options(scheduler="distributed", num_workers=8, memory_limit="16GB"):
+        standardise_footprint(...)
+
+Options set with `execution_options` take precedence over the config file.
+
+The schedulers are:
+    "threads", "processes", "synchronous": the local dask schedulers, using `num_workers` workers.
+    "distributed": a local `dask.distributed` cluster of `num_workers` worker processes, each with
+        `threads_per_worker` threads and a `memory_limit` (e.g. "4GB"). The cluster is started on
+        first use and reused while OpenGHG is running. This requires the `distributed` package.
+
+The scheduler is used when writing data to the object store, standardising data and in the
+calculations of `ModelScenario`. All of the schedulers can be used with both zarr store layouts
+and with the read cache: chunks are appended to shard files while holding a file lock, and the
+read cache is shared with worker processes through its spill directory.
+
+Functions using the execution options only use the scheduler for the computations they run.
+Lazy results, such as the datasets returned by `ModelScenario.footprints_data_merge` or the data
+of search results, are computed with the scheduler in effect when they are computed, so compute
+them within `execution_options` to use the same scheduler:
+
+    with execution_options(scheduler="processes", num_workers=8):
+        combined = scenario.footprints_data_merge().compute()
+"""
+
+from __future__ import annotations
+
+import atexit
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import functools
+import logging
+from typing import Any, TypeVar, cast
+
+from openghg.util._user import read_config_section
+
+logger = logging.getLogger("openghg.util")
+logger.setLevel(logging.DEBUG)  # Have to set level for logger as well as handler
+
+__all__ = ["execution_options", "get_execution_options", "dask_scheduler", "uses_execution_options"]
+
+SCHEDULERS = ("threads", "processes", "synchronous", "distributed")
+_OPTION_KEYS = ("scheduler", "num_workers", "threads_per_worker", "memory_limit")
+
+# Options set by `execution_options`, these take precedence over the user config
+_options_override: ContextVar[dict | None] = ContextVar("openghg_execution_options", default=None)
+
+# Clients of the local clusters started for the "distributed" scheduler, keyed by their options
+_clients: dict[tuple, Any] = {}
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _validate_options(options: dict) -> dict:
+    """Check execution options, removing those set to None.
+
+    Args:
+        options: Execution options
+    Returns:
+        dict: Execution options
+    """
+    unknown = set(options) - set(_OPTION_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown execution options {sorted(unknown)}, valid options are {_OPTION_KEYS}.")
+
+    options = {k: v for k, v in options.items() if v is not None}
+
+    scheduler = options.get("scheduler")
+    if scheduler is not None and scheduler not in SCHEDULERS:
+        raise ValueError(f"Invalid scheduler {scheduler}, please choose one of {SCHEDULERS}.")
+
+    for key in ("num_workers", "threads_per_worker"):
+        value = options.get(key)
+        if value is not None and (not isinstance(value, int) or value < 1):
+            raise ValueError(f"{key} must be a positive integer.")
+
+    return options
+
+
+def get_execution_options() -> dict:
+    """Get the execution options in effect.
+
+    These are the options set by `execution_options`, if used, otherwise those in the user config.
+
+    Returns:
+        dict: Execution options; empty if none are set
+    """
+    override = _options_override.get()
+    if override is not None:
+        return dict(override)
+    return _validate_options(read_config_section("execution"))
+
+
+def _get_client(options: dict) -> Any:
+    """Get a client for a local distributed cluster, starting the cluster if needed."""
+    try:
+        from distributed import Client, LocalCluster
+    except ImportError:
+        raise ImportError(
+            "Cannot import distributed, which is needed for the distributed scheduler, please run: pip install distributed"
+        )
+
+    key = (options.get("num_workers"), options.get("threads_per_worker"), options.get("memory_limit"))
+
+    client = _clients.get(key)
+    if client is None or client.status != "running":
+        logger.info(f"Starting local dask cluster with options {options}.")
+        cluster = LocalCluster(
+            n_workers=options.get("num_workers"),
+            threads_per_worker=options.get("threads_per_worker"),
+            memory_limit=options.get("memory_limit", "auto"),
+        )
+        client = Client(cluster, set_as_default=False)
+        _clients[key] = client
+
+    return client
+
+
+@atexit.register
+def _close_clients() -> None:
+    for client in _clients.values():
+        try:
+            client.close()
+            client.cluster.close()
+        except Exception as e:
+            logger.debug(f"Error closing dask client: {e}")
+    _clients.clear()
+
+
+@contextmanager
+def dask_scheduler() -> Generator[None, None, None]:
+    """Use the dask scheduler from the execution options in effect, see `get_execution_options`.
+
+    If no scheduler is set, the active dask scheduler is used.
+
+    Returns:
+        None
+    """
+    options = get_execution_options()
+    scheduler = options.get("scheduler")
+
+    if scheduler is None:
+        yield
+        return
+
+    import dask
+
+    if scheduler == "distributed":
+        client = _get_client(options)
+        with dask.config.set(scheduler=client.get):
+            yield
+    else:
+        if "memory_limit" in options or "threads_per_worker" in options:
+            logger.debug("memory_limit and threads_per_worker are only used by the distributed scheduler.")
+
+        settings: dict[str, Any] = {"scheduler": scheduler}
+        if "num_workers" in options:
+            settings["num_workers"] = options["num_workers"]
+
+        with dask.config.set(settings):
+            yield
+
+
+@contextmanager
+def execution_options(
+    scheduler: str | None = None,
+    num_workers: int | None = None,
+    threads_per_worker: int | None = None,
+    memory_limit: str | int | None = None,
+) -> Generator[None, None, None]:
+    """Set the dask scheduler used by OpenGHG (and any dask computations) within a block of code.
+
+    These options replace those in the user config file.
+
+    Args:
+        scheduler: One of "threads", "processes", "synchronous" or "distributed"
+        num_workers: Number of workers (threads or processes)
+        threads_per_worker: Threads per worker process, for the distributed scheduler
+        memory_limit: Memory limit per worker process, e.g. "4GB", for the distributed scheduler
+    Returns:
+        None
+    """
+    options = _validate_options(
+        {
+            "scheduler": scheduler,
+            "num_workers": num_workers,
+            "threads_per_worker": threads_per_worker,
+            "memory_limit": memory_limit,
+        }
+    )
+
+    token = _options_override.set(options)
+    try:
+        with dask_scheduler():
+            yield
+    finally:
+        _options_override.reset(token)
+
+
+def uses_execution_options(func: F) -> F:
+    """Decorator to run a function using the dask scheduler from the execution options, see `dask_scheduler`.
+
+    The scheduler is only used while the function runs; lazy (dask) results returned by the
+    function are computed with the scheduler in effect when they are computed.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with dask_scheduler():
+            return func(*args, **kwargs)
+
+    return cast(F, wrapper)
@@ -10,7 +10,13 @@ import xarray as xr
 from contextlib import contextmanager
 
 
-from openghg.types import pathType, multiPathType, convert_to_list_of_metadata_and_data, XrDataLikeMatch
+from openghg.types import (
+    pathType,
+    multiPathType,
+    convert_to_list_of_metadata_and_data,
+    convert_to_slabs_of_metadata_and_data,
+    XrDataLikeMatch,
+)
 from openghg.util import align_lat_lon
 
 logger = logging.getLogger("openghg.util.file")
@@ -41,6 +47,9 @@ def load_parser(data_name: str, module_name: str) -> Callable:
         - parse_{data_name}()
     and for this to have been imported with an appropriate __init__.py module.
 
+    The parse function may return its data all at once, or as an iterator yielding
+    the data in time slabs, which is passed on as an iterator of lists of MetadataAndData.
+
     Args:
         data_name: Name of data type / database / data source for the
         parse function.
@@ -57,7 +66,11 @@ def load_parser(data_name: str, module_name: str) -> Callable:
 
     @wraps(fn)
     def wrapped_fn(*args, **kwargs):  # type: ignore
-        return convert_to_list_of_metadata_and_data(fn(*args, **kwargs))
+        parser_output = fn(*args, **kwargs)
+        # Parsers may yield their data in time slabs, these are converted as they are read
+        if isinstance(parser_output, Iterator):
+            return convert_to_slabs_of_metadata_and_data(parser_output)
+        return convert_to_list_of_metadata_and_data(parser_output)
 
     return wrapped_fn
 
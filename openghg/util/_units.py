@@ -1,4 +1,7 @@
+from functools import lru_cache
 import logging
+from typing import cast
+
 import pint
 
 import cf_xarray.units  # noqa: F401  # Needed to register units
@@ -106,3 +109,116 @@ def assign_units(
         data = data.pint.dequantify()
 
     return data
+
+
+# Unit arithmetic on scalar factors
+#
+# Quantifying large (possibly dask backed) arrays with pint wraps every chunk in a pint Quantity.
+# Where only the units of the result are needed, these can be worked out once from the `units`
+# attributes, and the arithmetic done on the raw arrays. The results are the same as those from
+# `.pint.quantify()` followed by `.pint.dequantify()`.
+
+
+@lru_cache(maxsize=256)
+def parse_units(units: str) -> pint.Unit:
+    """Parse a units string, as `.pint.quantify()` would.
+
+    Args:
+        units: units string, e.g. from the "units" attribute of a DataArray
+    Returns:
+        pint.Unit
+    """
+    return cf_ureg.parse_units(units)
+
+
+def _get_units(data: xr.DataArray | float) -> pint.Unit | None:
+    """Get the units from the "units" attribute of a DataArray, if present."""
+    if isinstance(data, xr.DataArray) and data.attrs.get("units") is not None:
+        return parse_units(data.attrs["units"])
+    return None
+
+
+def _without_units(data: xr.DataArray | float) -> xr.DataArray | float:
+    """Return a shallow copy of a DataArray without its "units" attribute."""
+    if not isinstance(data, xr.DataArray) or "units" not in data.attrs:
+        return data
+    result = data.copy(deep=False)
+    result.attrs = {k: v for k, v in data.attrs.items() if k != "units"}
+    return result
+
+
+def _with_units(data: xr.DataArray, units: pint.Unit | None) -> xr.DataArray:
+    if units is not None:
+        data.attrs["units"] = str(units)
+    return data
+
+
+def conversion_factor(from_units: str | pint.Unit, to_units: str | pint.Unit) -> float:
+    """Scalar factor to multiply values by to convert them between units.
+
+    Args:
+        from_units: units of values
+        to_units: units to convert to
+    Returns:
+        float: conversion factor
+    Raises:
+        pint.DimensionalityError: if the units can't be converted
+    """
+    if isinstance(from_units, str):
+        from_units = parse_units(from_units)
+    if isinstance(to_units, str):
+        to_units = parse_units(to_units)
+
+    if from_units == to_units:
+        return 1.0
+    return float(cf_ureg.Quantity(1.0, from_units).to(to_units).magnitude)
+
+
+def multiply_with_units(*factors: xr.DataArray | float) -> xr.DataArray:
+    """Multiply DataArrays, setting the "units" attribute of the result from those of the inputs.
+
+    The units of the result are the product of the units of the inputs, as with pint;
+    inputs without units (and numbers) are treated as dimensionless.
+
+    Args:
+        factors: DataArrays (and numbers) to multiply; at least one must be a DataArray
+    Returns:
+        xr.DataArray: product of the inputs
+    """
+    units = None
+    for factor in factors:
+        factor_units = _get_units(factor)
+        if factor_units is not None:
+            units = factor_units if units is None else units * factor_units
+
+    result = _without_units(factors[0])
+    for factor in factors[1:]:
+        result = result * _without_units(factor)
+
+    return _with_units(cast(xr.DataArray, result), units)
+
+
+def add_with_units(a: xr.DataArray, b: xr.DataArray) -> xr.DataArray:
+    """Add two DataArrays, converting the second to the units of the first, as with pint.
+
+    Args:
+        a: DataArray
+        b: DataArray to add to `a`
+    Returns:
+        xr.DataArray: sum, in the units of `a`
+    Raises:
+        pint.DimensionalityError: if the units of `b` can't be converted to those of `a`
+    """
+    a_units = _get_units(a)
+    b_units = _get_units(b)
+    dimensionless = cf_ureg.dimensionless
+
+    factor = conversion_factor(
+        b_units if b_units is not None else dimensionless, a_units if a_units is not None else dimensionless
+    )
+    b_values = _without_units(b)
+    if factor != 1.0:
+        b_values = b_values * factor
+
+    result = cast(xr.DataArray, _without_units(a) + b_values)
+    return _with_units(result, a_units if a_units is not None else b_units)
@@ -12,6 +12,13 @@ logger.setLevel(logging.DEBUG)  # Have to set level for logger as well as handle
 
 openghg_config_filename = "openghg.conf"
 
+# Sections of the user config holding options other than the object stores, these are kept
+# when the config is updated by `create_config`
+_option_sections = ("execution", "access_stats", "read_cache")
+
+# The parsed user config, with the path, modification time and size of the config file
+_config_cache: dict[str, tuple] = {}
+
 
 # @lru_cache
 def get_user_id() -> str:
@@ -147,7 +154,11 @@ def create_config(silent: bool = False) -> None:
 
         # Some users may not have a user ID if they've used previous versions of OpenGHG
         user_id = config.get("user_id")
+        options = {section: config[section] for section in _option_sections if config.get(section)}
         config = _combine_config(config_version=config_version, object_stores=stores, user_id=user_id)
+
+        # Keep options such as the dask execution options, see `read_config_section`
+        config.update(options)
     else:
         # Let's try migrating the old config
         # If it works we call this function again
@@ -298,6 +309,40 @@ def read_local_config() -> dict:
     return config
 
 
+def read_config_section(section: str) -> dict:
+    """Read a section of options from the user config file, e.g. "execution".
+
+    Unlike `read_local_config` the object stores aren't checked, so this can be called often.
+    The file is only parsed again after it has been modified.
+
+    Args:
+        section: Name of the section
+    Returns:
+        dict: Options in the section, empty if the config file or section doesn't exist
+    """
+    config_path = get_user_config_path()
+
+    try:
+        stat = config_path.stat()
+    except FileNotFoundError:
+        return {}
+
+    signature = (str(config_path), stat.st_mtime_ns, stat.st_size)
+
+    cached = _config_cache.get("config")
+    if cached is None or cached[0] != signature:
+        try:
+            config = toml.loads(config_path.read_text())
+        except (FileNotFoundError, toml.TomlDecodeError) as e:
+            logger.warning(f"Unable to read config file {config_path}: {e}")
+            config = {}
+
+        cached = (signature, config)
+        _config_cache["config"] = cached
+
+    return dict(cached[1].get(section, {}))
+
+
 def check_config() -> None:
     """Check that the user config file is valid and the paths
     given in it exist. Raises ConfigFileError if problems found.
@@ -0,0 +1,197 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+from helpers import clear_test_stores, get_surface_datapath
+from openghg.aggregation import (
+    affected_windows,
+    climatology,
+    get_aggregate,
+    get_aggregate_variables,
+    get_aggregates,
+    growth_rate,
+    list_aggregates,
+    rebuild_aggregates,
+    set_aggregates,
+    window_statistics,
+)
+from openghg.dataobjects import data_manager
+from openghg.objectstore import get_writable_bucket
+from openghg.retrieve import search_surface
+from openghg.standardise import standardise_surface
+from openghg.types import ObjectStoreError
+
+
+@pytest.fixture
+def hourly():
+    times = pd.date_range("2020-01-01", "2021-12-31 23:00", freq="h")
+    values = np.arange(times.size, dtype=float)
+    values[:24] = np.nan
+    return xr.Dataset(
+        {"ch4": ("time", values), "inlet": ("time", np.full(times.size, "10m"))}, coords={"time": times}
+    )
+
+
+def test_window_statistics(hourly):
+    monthly = window_statistics(hourly, freq="MS")
+
+    assert sorted(monthly.data_vars) == ["ch4", "ch4_count", "ch4_std"]
+    assert monthly.time.size == 24
+    assert monthly.ch4_count.values[0] == 31 * 24 - 24
+
+    january = hourly.ch4.sel(time="2020-01")
+    assert monthly.ch4.values[0] == pytest.approx(float(january.mean()))
+    assert monthly.ch4_std.values[0] == pytest.approx(float(january.std()))
+
+    seasonal = climatology(monthly)
+    assert seasonal.month.values.tolist() == list(range(1, 13))
+    assert seasonal.ch4_count.sel(month=2).item() == (29 + 28) * 24
+
+    annual = window_statistics(hourly, freq="YS")
+    growth = growth_rate(annual)
+    assert growth.time.values[0] == np.datetime64("2021-01-01")
+    assert growth.ch4.item() == pytest.approx(annual.ch4.values[1] - annual.ch4.values[0])
+
+    start, end = affected_windows("2020-02-10 12:00", "2020-03-01", "MS")
+    assert (start, end) == (pd.Timestamp("2020-02-01"), pd.Timestamp("2020-04-01"))
+
+
+@pytest.fixture
+def bucket():
+    clear_test_stores()
+    bucket = get_writable_bucket(name="user")
+    yield bucket
+    set_aggregates(bucket=bucket, data_type="surface", aggregates=[])
+    clear_test_stores()
+
+
+def _standardise(filename, **kwargs):
+    standardise_surface(
+        filepath=get_surface_datapath(filename, source_format="CRDS"),
+        source_format="CRDS",
+        site="tac",
+        network="decc",
+        store="user",
+        **kwargs,
+    )
+
+
+def test_aggregates_updated_as_data_added(bucket, mocker):
+    import openghg.aggregation._store
+
+    with pytest.raises(ValueError):
+        set_aggregates(bucket=bucket, data_type="surface", aggregates=["fortnightly"])
+
+    set_aggregates(bucket=bucket, data_type="surface", aggregates=["monthly", "annual"])
+    assert get_aggregates(bucket=bucket, data_type="surface") == ["monthly", "annual"]
+
+    _standardise("tac.picarro.1minute.100m.201208.dat")
+
+    uuid = next(iter(search_surface(site="tac", species="ch4", store="user").metadata))
+    assert sorted(list_aggregates(bucket=bucket, source_uuid=uuid)) == ["annual", "monthly"]
+
+    def _months(data):
+        return sorted(set(data.time.dt.strftime("%Y-%m").values.tolist()))
+
+    first_months = _months(search_surface(site="tac", species="ch4", store="user").retrieve_all().data)
+
+    first = get_aggregate(bucket=bucket, source_uuid=uuid, name="monthly")
+    assert _months(first) == first_months
+
+    # Only the windows of the new data are recomputed
+    stats_spy = mocker.spy(openghg.aggregation._store, "window_statistics")
+    _standardise("tac.picarro.1minute.100m.201407.dat")
+
+    stored = search_surface(site="tac", species="ch4", store="user").retrieve_all().data
+    new_months = sorted(set(_months(stored)) - set(first_months))
+
+    assert stats_spy.call_count
+    assert all(_months(c.args[0]) == new_months for c in stats_spy.call_args_list)
+
+    monthly = get_aggregate(bucket=bucket, source_uuid=uuid, name="monthly", version="v1").compute()
+    assert _months(monthly) == first_months + new_months
+    xr.testing.assert_equal(monthly.isel(time=slice(0, first.time.size)).compute(), first.compute())
+
+    month = new_months[0]
+    values = stored.ch4.sel(time=month)
+    assert monthly.ch4.sel(time=month).item() == pytest.approx(float(values.mean()))
+    assert monthly.ch4_count.sel(time=month).item() == int(values.count())
+
+    rebuild_aggregates(bucket=bucket, source_uuid=uuid, aggregates=["monthly"])
+    rebuilt = get_aggregate(bucket=bucket, source_uuid=uuid, name="monthly")
+    xr.testing.assert_allclose(rebuilt.compute(), monthly.compute())
+
+    dm = data_manager(data_type="surface", site="tac", species="ch4", store="user")
+    dm.delete_datasource(uuid=uuid)
+
+    assert list_aggregates(bucket=bucket, source_uuid=uuid) == {}
+    with pytest.raises(ObjectStoreError):
+        get_aggregate(bucket=bucket, source_uuid=uuid, name="monthly")
+
+
+def test_window_statistics_timeseries_variables(hourly):
+    gridded = hourly.assign(fp=(("time", "lat"), np.ones((hourly.time.size, 2)))).assign_coords(
+        lat=[1.0, 2.0]
+    )
+
+    assert sorted(window_statistics(gridded, freq="MS").data_vars) == ["ch4", "ch4_count", "ch4_std"]
+    assert not window_statistics(gridded, freq="MS", variables=["fp"]).data_vars
+
+
+def test_aggregates_only_for_timeseries(bucket):
+    with pytest.raises(ValueError, match="timeseries"):
+        set_aggregates(bucket=bucket, data_type="footprints", aggregates=["monthly"])
+
+    set_aggregates(bucket=bucket, data_type="surface", aggregates=["monthly"], variables=["ch4"])
+    assert get_aggregates(bucket=bucket, data_type="surface") == ["monthly"]
+    assert get_aggregate_variables(bucket=bucket, data_type="surface") == ["ch4"]
+
+    _standardise("tac.picarro.1minute.100m.201208.dat")
+
+    uuid = next(iter(search_surface(site="tac", species="ch4", store="user").metadata))
+    monthly = get_aggregate(bucket=bucket, source_uuid=uuid, name="monthly")
+    assert sorted(monthly.data_vars) == ["ch4", "ch4_count", "ch4_std"]
+
+
+def test_aggregates_updated_once_on_save(bucket, mocker):
+    import openghg.aggregation._store
+    from openghg.objectstore._legacy_datasource import Datasource
+
+    set_aggregates(bucket=bucket, data_type="surface", aggregates=["monthly"])
+
+    times = pd.date_range("2020-01-01", "2020-06-30", freq="D")
+    data = xr.Dataset({"mf": ("time", np.arange(times.size, dtype=float))}, coords={"time": times})
+    metadata = {"species": "ch4", "site": "tac", "inlet": "100m", "sampling_period": "3600.0"}
+
+    update_spy = mocker.spy(openghg.aggregation, "update_aggregates")
+    stats_spy = mocker.spy(openghg.aggregation._store, "window_statistics")
+
+    d = Datasource(bucket=bucket, uuid="test-aggregates-123")
+    try:
+        # Data added in slabs is aggregated once, when the Datasource is saved
+        for month in range(0, 6, 2):
+            slab = data.isel(time=slice(30 * month, 30 * (month + 2)))
+            d.add_data(metadata=metadata, data=slab, data_type="surface", new_version=False)
+
+        assert update_spy.call_count == 0
+        d.save()
+        assert update_spy.call_count == 1
+
+        v1 = get_aggregate(bucket=bucket, source_uuid=d.uuid, name="monthly", version="v1").compute()
+        assert v1.time.size == 6
+
+        # A new version combining new data with the previous version starts from its aggregate
+        stats_spy.reset_mock()
+        update = data.sel(time="2020-03").assign(mf=lambda ds: ds.mf + 100)
+        d.add_data(metadata=metadata, data=update, data_type="surface", if_exists="combine", new_version=True)
+        d.save()
+
+        assert [c.args[0].time.dt.month.values.tolist() for c in stats_spy.call_args_list] == [[3] * 31]
+
+        v2 = get_aggregate(bucket=bucket, source_uuid=d.uuid, name="monthly", version="v2").compute()
+        xr.testing.assert_allclose(v2, window_statistics(d.get_data(version="v2"), freq="MS").compute())
+        xr.testing.assert_identical(
+            get_aggregate(bucket=bucket, source_uuid=d.uuid, name="monthly", version="v1").compute(), v1
+        )
+    finally:
+        d.delete_all_data()
@@ -3,7 +3,7 @@ import pandas as pd
 import pytest
 import xarray as xr
 
-from openghg.analyse._utils import stack_datasets
+from openghg.analyse._utils import align_time_ffill, stack_datasets, time_index_map
 from openghg.util import cf_ureg
 
 
@@ -154,3 +154,34 @@ def test_stack_datasets_with_different_units(flux_co2_dummy):
     xr.testing.assert_allclose(
         stacked.pint.quantify().pint.to("ppb mol m-2 s-1"), 2 * fluxes[1].pint.quantify()
     )
+
+
+def test_time_index_map():
+    source = pd.date_range("2012-01-01", periods=3, freq="MS")
+    target = pd.DatetimeIndex(["2011-12-31", "2012-01-01", "2012-01-15", "2012-03-01", "2013-01-01"])
+
+    np.testing.assert_array_equal(time_index_map(source, target), [-1, 0, 0, 2, 2])
+
+    with pytest.raises(ValueError):
+        time_index_map(source[::-1], target)
+
+
+@pytest.mark.parametrize("chunks", [None, (24, 24, 1)])
+def test_align_time_ffill_matches_reindex(flux_co2_dummy, chunks):
+    """Check that monthly flux aligned to hourly times matches reindexing with forward fill."""
+    flux = flux_co2_dummy.data.resample(time="MS").mean()
+    flux["region"] = ("time", ["a", "b"])
+    hourly = xr.Dataset(coords={"time": pd.date_range("2011-12-30 12:00", periods=49, freq="h")})
+
+    expected = flux.reindex_like(hourly, method="ffill")
+    aligned = align_time_ffill(flux, hourly, chunks=chunks)
+
+    if chunks is not None:
+        assert aligned.flux.chunksizes["time"] == chunks
+        assert aligned.region.chunksizes["time"] == chunks
+
+    xr.testing.assert_identical(aligned.compute(), expected)
+
+    flux_array = align_time_ffill(flux.flux, hourly, chunks=chunks)
+    assert flux_array.name == "flux"
+    xr.testing.assert_identical(flux_array.compute(), expected.flux)
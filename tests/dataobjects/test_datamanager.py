@@ -11,6 +11,7 @@ from openghg.objectstore import get_writable_bucket, exists
 from openghg.objectstore import open_object_store
 from openghg.retrieve import search_surface, get_footprint
 from openghg.standardise import standardise_footprint, standardise_surface
+from openghg.store.storage import configure_access_stats
 from openghg.types import ObjectStoreError
 
 
@@ -454,3 +455,91 @@ def test_metadata_backup_restore_multiple_changes():
     res_one.restore(uuid=uid, version=1)
 
     assert res_one.metadata[uid] == first_backup
+
+
+def test_rechunk_footprint_data(footprint_read):
+    # Reading the data records its access statistics, if enabled
+    configure_access_stats(True)
+    try:
+        fp_before = get_footprint(site="tmb", domain="europe", store="user").data
+    finally:
+        configure_access_stats(None)
+
+    search_res = data_manager(data_type="footprints", site="tmb", network="lghg", store="user")
+    uuid = next(iter(search_res.metadata))
+
+    # Chunks are suggested from the recorded reads
+    search_res.rechunk(uuid=uuid)
+
+    assert search_res.metadata[uuid]["latest_version"] == "v2"
+
+    search_res = data_manager(data_type="footprints", site="tmb", network="lghg", store="user")
+    assert search_res.metadata[uuid]["latest_version"] == "v2"
+    assert set(search_res.metadata[uuid]["versions"]) == {"v1", "v2"}
+
+    search_res.rechunk(uuid=uuid, chunks={"index": 1000})
+
+    fp_after = get_footprint(site="tmb", domain="europe", store="user").data
+    assert dict(zip(fp_after.fp.dims, fp_after.fp.encoding["chunks"]))["index"] == 1000
+    assert fp_after.equals(fp_before)
+
+
+def test_bulk_update_metadata():
+    res = data_manager(data_type="surface", site="tac", store="user")
+    uuids = sorted(res.metadata)
+
+    to_add = {"data_owner": "michael palin", "comment": "bulk"}
+    report = res.bulk_update_metadata(uuid=uuids, to_update=to_add, to_delete="not_a_key", dry_run=True)
+
+    assert sorted(report["uuid"].unique()) == uuids
+    assert set(report["key"]) == {"data_owner", "comment"}
+    assert search_surface(site="tac", store="user").metadata[uuids[0]]["data_owner"] != "michael palin"
+
+    report = res.bulk_update_metadata(uuid=uuids, to_update=to_add, to_delete="not_a_key")
+    assert len(report) == 2 * len(uuids)
+
+    for uuid, metadata in search_surface(site="tac", store="user").metadata.items():
+        assert metadata["data_owner"] == "michael palin"
+        assert res.metadata[uuid]["comment"] == "bulk"
+
+    report = res.bulk_update_metadata(uuid=uuids, to_delete="comment")
+    assert set(report["action"]) == {"delete"}
+    assert all("comment" not in m for m in search_surface(site="tac", store="user").metadata.values())
+    assert "comment" in res.view_backup(uuid=uuids[0], version=2)
+
+    with pytest.raises(ValueError):
+        res.bulk_update_metadata(uuid=uuids, to_update={"uuid": "123"})
+
+
+def test_bulk_update_attributes_and_delete():
+    res = data_manager(data_type="surface", site="tac", store="user")
+    uuids = sorted(res.metadata)
+
+    report = res.bulk_update_attributes(
+        uuid=uuids,
+        to_update={"station_long_name": "Tacolneston"},
+        data_vars="ch4",
+        dry_run=True,
+        progress=False,
+    )
+    # global attributes of each Datasource, and the ch4 variable of the ch4 Datasource
+    assert len(report) == len(uuids) + 1
+    assert set(report["variable"].dropna()) == {"ch4"}
+    assert report["action"].isin(["add", "update"]).all()
+
+    res.bulk_update_attributes(
+        uuid=uuids, to_update={"station_long_name": "Tacolneston"}, to_delete="not_an_attr", progress=False
+    )
+
+    for obs in search_surface(site="tac", store="user").retrieve_all():
+        assert obs.data.attrs["station_long_name"] == "Tacolneston"
+
+    report = res.bulk_delete_datasource(uuid=uuids, dry_run=True, progress=False)
+    assert sorted(report["uuid"]) == uuids
+
+    bucket = get_writable_bucket(name="user")
+    res.bulk_delete_datasource(uuid=uuids, progress=False)
+
+    with open_object_store(bucket=bucket, data_type="surface") as objstore:
+        assert not set(uuids) & set(objstore.uuids)
+    assert not res.metadata
@@ -419,3 +419,71 @@ def test_retrieve_by_terms():
 
 #     assert retrieved.data.equals(ds)
 #     assert mock_call.call_count == 2
+
+
+def test_summaries_and_filter_summary():
+    results = search(site="bsd", store="user")
+
+    summaries = results.summaries(variable="ch4")
+    assert len(summaries) == 3
+    assert set(summaries["uuid"]) == set(search(site="bsd", species="ch4", store="user").uuids())
+
+    obs = results.retrieve(species="ch4", inlet="42m")
+    row = summaries[summaries["uuid"] == obs.metadata["uuid"]].iloc[0]
+    assert row["count"] == obs.data["ch4"].count()
+    assert row["max"] == pytest.approx(float(obs.data["ch4"].max()))
+    assert row["mean"] == pytest.approx(float(obs.data["ch4"].mean()))
+
+    max_value = summaries["max"].max()
+    assert len(results.filter_summary(variable="ch4", above=max_value)) == 0
+    assert len(results.filter_summary(variable="ch4", above=max_value - 1e-3)) >= 1
+    assert len(results.filter_summary(variable="ch4", end_date="2000-01-01")) == 0
+    assert len(results.filter_summary(variable="ch4", min_count=int(summaries["count"].max()) + 1)) == 0
+
+    filtered = search(site="bsd", store="user", summary_filter={"variable": "ch4", "above": max_value - 1e-3})
+    assert filtered.uuids() == results.filter_summary(variable="ch4", above=max_value - 1e-3).uuids()
+
+
+def test_retrieve_lazy(mocker):
+    import openghg.objectstore
+    from openghg.objectstore import Datasource
+
+    results = search(site="bsd", store="user")
+
+    open_spy = mocker.spy(openghg.objectstore, "open_object_store")
+    get_data_spy = mocker.spy(Datasource, "get_data")
+
+    lazy = results.retrieve_all(lazy=True, max_workers=4)
+
+    # The object store is opened once and no data is opened until it's accessed
+    assert open_spy.call_count == 1
+    assert get_data_spy.call_count == 0
+
+    eager = results.retrieve_all(max_workers=1)
+    assert get_data_spy.call_count == len(eager) == 9
+
+    for lazy_obs, eager_obs in zip(lazy, eager):
+        assert lazy_obs.metadata["uuid"] == eager_obs.metadata["uuid"]
+        assert lazy_obs.data.equals(eager_obs.data)
+
+    assert get_data_spy.call_count == 18
+
+
+def test_filter_results():
+    results = search(store="user")
+    assert results._results is None
+
+    bsd = results.filter(site="BSD")
+    assert len(bsd) == 9
+    assert all(m["site"] == "bsd" for m in bsd.metadata.values())
+
+    ch4 = bsd.filter(species="ch4", inlet=["42m", "108m"])
+    assert sorted(m["inlet"] for m in ch4.metadata.values()) == ["108m", "42m"]
+
+    # filtering doesn't need the results DataFrame
+    assert results._results is None and ch4._results is None
+    assert list(ch4.results["species"]) == ["ch4", "ch4"]
+
+    assert not results.filter(site="bsd", inlet="888m")
+    assert not results.filter(not_a_key="bsd")
+    assert len(results.filter(site=None)) == len(results)
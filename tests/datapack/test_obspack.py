@@ -342,3 +342,119 @@ def test_create_obspack_search(tmp_path):
 
     ds = xr.open_dataset(filename)
     assert species in ds.data_vars  # Make sure species name is still used
+
+
+def test_obspack_write_manifest_incremental(obspack_1, tmp_path, monkeypatch):
+    """
+    Check the manifest is written for the obspack and only files with changed
+    source details are written again when creating a new obspack from a previous one.
+    """
+    obspack_1.output_folder = tmp_path
+    obspack_1.add_stored_data_filenames(name_components=["species", "site", "inlet"])
+    obspack_1.write(include_release_files=False, include_site_index=False, max_workers=2)
+
+    manifest = obspack_1.read_manifest()
+    files = manifest["files"]
+
+    assert manifest["obspack_name"] == "test_gemma"
+    assert sorted(files) == [
+        "surface-insitu/ch4_WAO_10m_1_surface-insitu_v1.nc",
+        "surface-insitu/ch4_WAO_10m_2_surface-insitu_v1.nc",
+    ]
+    for entry in files.values():
+        assert entry["data_version"] == "v1"
+        assert entry.keys() >= {"uuid", "source_hash", "file_hash"}
+
+    written = []
+    original_write = StoredData.write
+
+    def _record_write(self, *args, **kwargs):
+        written.append(self.filename)
+        original_write(self, *args, **kwargs)
+
+    monkeypatch.setattr(StoredData, "write", _record_write)
+
+    previous_obspack = obspack_1.define_obspack_path()
+
+    # Change the metadata for one of the datasets and write to a new obspack
+    obspack_1.retrieved_data[1].metadata["data_owner"] = "new owner"
+    obspack_1.obspack_name = "test_gemma_v2"
+    obspack_1.write(include_release_files=False, include_site_index=False, previous_obspack=previous_obspack)
+
+    assert [str(filename) for filename in written] == ["ch4_WAO_10m_2_surface-insitu_v1.nc"]
+
+    new_files = obspack_1.read_manifest()["files"]
+    assert sorted(new_files) == sorted(files)
+    assert (tmp_path / "test_gemma_v2" / "surface-insitu" / "ch4_WAO_10m_1_surface-insitu_v1.nc").exists()
+
+    key_1 = "surface-insitu/ch4_WAO_10m_1_surface-insitu_v1.nc"
+    key_2 = "surface-insitu/ch4_WAO_10m_2_surface-insitu_v1.nc"
+    assert new_files[key_1] == files[key_1]
+    assert new_files[key_2]["source_hash"] != files[key_2]["source_hash"]
+
+    # Nothing has changed so nothing should be written when updating in place
+    written.clear()
+    obspack_1.write(include_release_files=False, include_site_index=False)
+    assert written == []
+
+
+def test_obspack_manifest_detects_data_change(obspack_1, tmp_path, monkeypatch):
+    """
+    Check the previous manifest is found within the output folder and that files
+    are written again when only the data values (not the metadata) have changed.
+    """
+    obspack_1.output_folder = tmp_path
+    obspack_1.add_stored_data_filenames(name_components=["species", "site", "inlet"])
+    obspack_1.write(include_release_files=False, include_site_index=False)
+
+    written = []
+    original_write = StoredData.write
+
+    def _record_write(self, *args, **kwargs):
+        written.append(self.filename)
+        original_write(self, *args, **kwargs)
+
+    monkeypatch.setattr(StoredData, "write", _record_write)
+
+    stored = obspack_1.retrieved_data[0]
+    stored.data = stored.data.copy(deep=True)
+    stored.data["mf"] = stored.data["mf"] + 1.0
+
+    obspack_1.obspack_name = "test_gemma_v2"
+    assert obspack_1.find_previous_obspack() == tmp_path / "test_gemma"
+
+    obspack_1.write(include_release_files=False, include_site_index=False)
+
+    assert [str(filename) for filename in written] == ["ch4_WAO_10m_1_surface-insitu_v1.nc"]
+
+
+def test_create_obspack_parallel(tmp_path):
+    """
+    Check an obspack created using multiple workers matches the obspack created serially.
+    """
+    populate_object_store()
+    filename = get_obspack_datapath("example_search_input_full.csv")
+
+    serial_path = create_obspack(
+        search_filename=filename, output_folder=tmp_path, obspack_name="test_serial_v1", store="user"
+    )
+    parallel_path = create_obspack(
+        search_filename=filename,
+        output_folder=tmp_path,
+        obspack_name="test_parallel_v1",
+        store="user",
+        max_workers=3,
+    )
+
+    serial_files = ObsPack(tmp_path).read_manifest(serial_path)["files"]
+    parallel_files = ObsPack(tmp_path).read_manifest(parallel_path)["files"]
+
+    assert len(parallel_files) == 3
+    assert serial_files.keys() == parallel_files.keys()
+
+    for key, entry in parallel_files.items():
+        assert entry["uuid"] == serial_files[key]["uuid"]
+        assert entry["source_hash"] == serial_files[key]["source_hash"]
+
+        with xr.open_dataset(serial_path / key) as expected, xr.open_dataset(parallel_path / key) as result:
+            xr.testing.assert_identical(result, expected)
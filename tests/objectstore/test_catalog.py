@@ -0,0 +1,118 @@
+import pytest
+from helpers import clear_test_stores, get_surface_datapath
+from openghg.dataobjects import data_manager
+from openghg.objectstore import get_datasource, get_writable_bucket, load_catalog, rebuild_catalog
+from openghg.objectstore.metastore import open_metastore
+from openghg.retrieve import search
+from openghg.standardise import standardise_surface
+
+
+@pytest.fixture(autouse=True)
+def populate_store():
+    clear_test_stores()
+    standardise_surface(
+        filepath=get_surface_datapath("tac.picarro.1minute.100m.min.dat", source_format="CRDS"),
+        source_format="CRDS",
+        site="tac",
+        network="decc",
+        store="user",
+    )
+    yield
+    clear_test_stores()
+
+
+def _surface_uuids():
+    return sorted(search(site="tac", data_type="surface", store="user").metadata)
+
+
+def test_catalog_rows_maintained():
+    bucket = get_writable_bucket(name="user")
+    uuids = _surface_uuids()
+
+    catalog = load_catalog(bucket)
+    assert sorted(catalog.rows) == uuids
+
+    row = catalog.rows[uuids[0]]
+    assert row["data_type"] == "surface"
+    assert row["metadata"]["site"] == "tac"
+    assert row["latest_version"] == "v1"
+    assert row["size"] > 0
+    assert catalog.is_current("surface")
+
+    # Updating the metadata keeps the values from the Datasource
+    dm = data_manager(data_type="surface", site="tac", store="user")
+    dm.update_metadata(uuid=uuids[0], to_update={"comment": "catalog test"})
+
+    row = load_catalog(bucket).rows[uuids[0]]
+    assert row["metadata"]["comment"] == "catalog test"
+    assert row["size"] > 0
+
+    dm.delete_datasource(uuid=uuids[0])
+    assert sorted(load_catalog(bucket).rows) == uuids[1:]
+
+
+def test_search_by_uuid_uses_catalog(mocker):
+    import openghg.retrieve._search
+
+    uuids = _surface_uuids()
+
+    open_spy = mocker.spy(openghg.retrieve._search, "open_object_store")
+    results = search(uuid=uuids[0], store="user")
+
+    assert list(results.metadata) == [uuids[0]]
+    assert open_spy.call_count == 1
+    assert open_spy.call_args.kwargs["data_type"] == "surface"
+
+    open_spy.reset_mock()
+    assert search(site="tac", data_type=["surface", "flux"], species="co2", store="user").metadata
+    assert [c.kwargs["data_type"] for c in open_spy.call_args_list] == ["surface"]
+
+    bucket = get_writable_bucket(name="user")
+    assert get_datasource(bucket=bucket, uuid=uuids[0]).uuid == uuids[0]
+
+
+def test_catalog_out_of_date_falls_back_to_metastore(mocker):
+    import openghg.retrieve._search
+
+    bucket = get_writable_bucket(name="user")
+    uuids = _surface_uuids()
+
+    # Change the metastore without going through the object store, as an older version would
+    with open_metastore(bucket=bucket, data_type="surface") as metastore:
+        metastore.update(where={"uuid": uuids[0]}, to_update={"site": "xyz"})
+
+    assert not load_catalog(bucket).is_current("surface")
+
+    open_spy = mocker.spy(openghg.retrieve._search, "open_object_store")
+    assert list(search(site="xyz", store="user").metadata) == [uuids[0]]
+    assert "surface" in [c.kwargs["data_type"] for c in open_spy.call_args_list]
+
+    catalog = rebuild_catalog(bucket)
+    assert catalog.is_current("surface")
+    assert catalog.rows[uuids[0]]["metadata"]["site"] == "xyz"
+    assert sorted(catalog.rows) == uuids
+
+
+def test_catalog_written_while_locked(mocker):
+    from openghg.objectstore._catalog import CatalogWriter
+    from openghg.objectstore import locking_object_store
+
+    bucket = get_writable_bucket(name="user")
+    uuid = _surface_uuids()[0]
+    objectstore = locking_object_store(bucket=bucket, data_type="surface")
+
+    locked_on_flush = []
+    flush = CatalogWriter.flush
+
+    def check_lock(self, get_records):
+        locked_on_flush.append(objectstore.lock.is_locked())
+        flush(self, get_records)
+
+    mocker.patch.object(CatalogWriter, "flush", check_lock)
+
+    with objectstore:
+        objectstore.update(uuid=uuid, metadata={"comment": "written while locked"})
+
+    assert locked_on_flush == [True]
+    assert not objectstore.lock.is_locked()
+    assert load_catalog(bucket).rows[uuid]["metadata"]["comment"] == "written while locked"
@@ -0,0 +1,56 @@
+import pytest
+from helpers import clear_test_stores, get_surface_datapath
+from openghg.objectstore import get_writable_bucket
+from openghg.objectstore.metastore import open_metastore
+from openghg.objectstore.metastore._metastore import DATERANGE_TABLE
+from openghg.retrieve import search
+from openghg.standardise import standardise_surface
+
+
+@pytest.fixture(autouse=True)
+def populate_store():
+    clear_test_stores()
+    standardise_surface(
+        filepath=get_surface_datapath("tac.picarro.1minute.100m.min.dat", source_format="CRDS"),
+        source_format="CRDS",
+        site="tac",
+        network="decc",
+        store="user",
+    )
+    yield
+    clear_test_stores()
+
+
+def _found(start_date, end_date):
+    res = search(site="tac", data_type="surface", store="user", start_date=start_date, end_date=end_date)
+    return sorted(res.metadata) if res else []
+
+
+def test_dates_recorded_in_metastore():
+    bucket = get_writable_bucket(name="user")
+    uuids = sorted(search(site="tac", data_type="surface", store="user").metadata)
+
+    with open_metastore(bucket=bucket, data_type="surface", mode="r") as metastore:
+        index = metastore.daterange_index()
+        assert all(uuid in index for uuid in uuids)
+
+    # The data is from 2012-07-24 to 2020-07-04
+    assert _found("2015-01-01", "2015-02-01") == uuids
+    assert _found("2021-01-01", "2021-02-01") == []
+    assert _found(None, "2012-07-01") == []
+
+
+def test_search_dates_not_recorded_in_metastore():
+    bucket = get_writable_bucket(name="user")
+    uuids = sorted(search(site="tac", data_type="surface", store="user").metadata)
+
+    # Remove the recorded dates, as for a metastore written by an older version
+    with open_metastore(bucket=bucket, data_type="surface") as metastore:
+        metastore._db.drop_table(DATERANGE_TABLE)
+
+    with open_metastore(bucket=bucket, data_type="surface", mode="r") as metastore:
+        assert len(metastore.daterange_index()) == 0
+
+    # The dates of the Datasources are used instead
+    assert _found("2015-01-01", "2015-02-01") == uuids
+    assert _found("2021-01-01", "2021-02-01") == []
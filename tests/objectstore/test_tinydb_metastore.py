@@ -266,3 +266,50 @@ def test_search_list(metastore, search_list_keys, expected_names):
 
     for name in expected_names:
         assert name in names
+
+
+def test_search_daterange(metastore):
+    for name in ["a", "b", "c", "d"]:
+        metastore.insert({"uuid": name, "site": "tac"})
+
+    metastore.set_daterange("a", "2012-01-01", "2012-12-31")
+    metastore.set_daterange("b", "2013-01-01", "2013-12-31")
+    metastore.set_daterange("c", "2014-01-01", "2014-12-31")
+    # "d" has no recorded dates, so it can't be excluded by the metastore
+
+    def found(start, end):
+        return sorted(r["uuid"] for r in metastore.search({"site": "tac"}, daterange=(start, end)))
+
+    assert found("2012-06-01", "2012-07-01") == ["a", "d"]
+    assert found("2012-06-01", "2013-01-01") == ["a", "b", "d"]
+    assert found("2015-01-01", "2016-01-01") == ["d"]
+
+    # Updating the dates of a UUID replaces them
+    metastore.set_daterange("c", "2015-06-01", "2015-07-01")
+    assert found("2015-01-01", "2016-01-01") == ["c", "d"]
+
+    # Deleting a record removes its dates
+    metastore.delete({"uuid": "c"})
+    assert "c" not in metastore.daterange_index()
+    assert len(metastore.daterange_index()) == 2
+
+    # The dates aren't part of the records
+    assert "start" not in metastore.search({"uuid": "a"})[0]
+
+
+def test_update_and_delete_many(metastore):
+    for i in range(4):
+        metastore.insert({"uuid": str(i), "site": "tac", "comment": "old"} if i % 2 else {"uuid": str(i)})
+
+    metastore.update_many(["0", "1", "2"], to_update={"site": "mhd"}, to_delete="comment")
+
+    results = {r["uuid"]: r for r in metastore.search()}
+    assert results["0"] == {"uuid": "0", "site": "mhd"}
+    assert results["1"] == {"uuid": "1", "site": "mhd"}
+    assert results["3"] == {"uuid": "3", "site": "tac", "comment": "old"}
+
+    with pytest.raises(MetastoreError):
+        metastore.update_many(["0", "10"], to_update={"site": "tac"})
+
+    metastore.delete_many(["0", "3"])
+    assert sorted(r["uuid"] for r in metastore.search()) == ["1", "2"]
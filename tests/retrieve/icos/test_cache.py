@@ -0,0 +1,280 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from icoscp_core.sparql import BoundLiteral, BoundUri
+
+from openghg.retrieve.icos import ICOSResponseCache, set_icos_cache
+from openghg.retrieve.icos._cache import fetch_as_completed, fetch_concurrently
+from openghg.retrieve.icos._queries import make_query_df
+from openghg.retrieve.icos._retrieve import _fetch_dobj, _get_station_data
+
+sparql_results = {
+    "head": {"vars": ["site", "inlet", "dobj_uri"]},
+    "results": {
+        "bindings": [
+            {
+                "site": {"type": "literal", "value": "TAC"},
+                "inlet": {
+                    "type": "literal",
+                    "value": "185.0",
+                    "datatype": "http://www.w3.org/2001/XMLSchema#float",
+                },
+                "dobj_uri": {"type": "uri", "value": "https://meta.icos-cp.eu/objects/abc123"},
+            }
+        ]
+    },
+}
+
+
+class _ICOSStandIn(BaseHTTPRequestHandler):
+    """Minimal stand-in for the ICOS SPARQL endpoint and data service supporting ETags."""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(("GET", self.path, self.headers.get("If-None-Match")))
+
+        payload = server.objects.get(self.path)
+        if payload is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        etag = f'"{hash(payload)}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        query = self.rfile.read(length).decode("utf-8")
+        server.requests.append(("POST", self.path, query))
+
+        payload = json.dumps(sparql_results).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture()
+def icos_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ICOSStandIn)
+    server.requests = []
+    server.objects = {"/objects/abc123": b"some data"}
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture()
+def cache(icos_server, tmp_path):
+    host, port = icos_server.server_address
+    url = f"http://{host}:{port}"
+    return ICOSResponseCache(
+        tmp_path / "icos_cache",
+        ttl=3600,
+        sparql_endpoint=f"{url}/sparql",
+        data_service_url=url,
+    )
+
+
+def test_cache_reuses_fresh_response(cache, icos_server):
+    dobj_uri = "https://meta.icos-cp.eu/objects/abc123"
+
+    assert cache.get_dobj_bytes(dobj_uri) == b"some data"
+    assert cache.get_dobj_bytes(dobj_uri) == b"some data"
+
+    assert len(icos_server.requests) == 1
+
+
+def test_cache_revalidates_with_etag(cache, icos_server):
+    dobj_uri = "https://meta.icos-cp.eu/objects/abc123"
+
+    cache.get_dobj_bytes(dobj_uri)
+
+    # Expired entry is revalidated and server responds with 304 Not Modified
+    assert cache.get_dobj_bytes(dobj_uri, ttl=0) == b"some data"
+    assert len(icos_server.requests) == 2
+    assert icos_server.requests[1][2] is not None
+
+    # Changed data on the server is downloaded again
+    icos_server.objects["/objects/abc123"] = b"updated data"
+    assert cache.get_dobj_bytes(dobj_uri, ttl=0) == b"updated data"
+    assert cache.get_dobj_bytes(dobj_uri) == b"updated data"
+    assert len(icos_server.requests) == 3
+
+
+def test_cache_content_addressed(cache, icos_server, tmp_path):
+    icos_server.objects["/objects/def456"] = b"some data"
+
+    cache.get_dobj_bytes("https://meta.icos-cp.eu/objects/abc123")
+    cache.get_dobj_bytes("https://meta.icos-cp.eu/objects/def456")
+
+    # Two requests, one stored payload
+    assert len(list((tmp_path / "icos_cache" / "entries").glob("*.json"))) == 2
+    assert len([f for f in (tmp_path / "icos_cache" / "objects").rglob("*") if f.is_file()]) == 1
+
+
+def test_cache_uses_stale_response_if_unreachable(cache, icos_server):
+    dobj_uri = "https://meta.icos-cp.eu/objects/abc123"
+    cache.get_dobj_bytes(dobj_uri)
+
+    icos_server.shutdown()
+    icos_server.server_close()
+
+    assert cache.get_dobj_bytes(dobj_uri, ttl=0) == b"some data"
+
+
+def test_make_query_df_uses_cache(cache, icos_server):
+    set_icos_cache(cache.cache_dir, sparql_endpoint=cache.sparql_endpoint)
+
+    try:
+        df = make_query_df("SELECT * WHERE { ?s ?p ?o }")
+        df_cached = make_query_df("SELECT * WHERE { ?s ?p ?o }")
+    finally:
+        set_icos_cache(None)
+
+    assert df.equals(df_cached)
+    assert df.loc[0, "site"] == "TAC"
+    assert df.loc[0, "inlet"] == 185.0
+    assert df.loc[0, "dobj_uri"] == "https://meta.icos-cp.eu/objects/abc123"
+
+    assert [request[0] for request in icos_server.requests] == ["POST"]
+
+
+def test_sparql_select_results(cache):
+    results = cache.sparql_select("SELECT * WHERE { ?s ?p ?o }")
+
+    assert results.variable_names == ["site", "inlet", "dobj_uri"]
+    binding = results.bindings[0]
+    assert binding["site"] == BoundLiteral(value="TAC", datatype=None)
+    assert binding["dobj_uri"] == BoundUri(uri="https://meta.icos-cp.eu/objects/abc123")
+
+
+def test_fetch_concurrently_bounded():
+    lock = threading.Lock()
+    active = 0
+    max_active = 0
+
+    def fetch(item):
+        nonlocal active, max_active
+        with lock:
+            active += 1
+            max_active = max(max_active, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return item * 2
+
+    results = fetch_concurrently(fetch, range(10), max_workers=3)
+
+    assert results == [i * 2 for i in range(10)]
+    assert 1 < max_active <= 3
+
+
+def test_fetch_as_completed_yields_early_results():
+    release = threading.Event()
+
+    def fetch(item):
+        if item == 0:
+            # The first item only completes once a later result has been processed
+            assert release.wait(timeout=5)
+        return item * 2
+
+    results = {}
+    for index, result in fetch_as_completed(fetch, range(5), max_workers=2):
+        results[index] = result
+        release.set()
+
+    assert results == {i: i * 2 for i in range(5)}
+    assert next(iter(results)) != 0
+
+
+def test_fetch_dobj_uses_cache(cache, icos_server, mocker):
+    host, port = icos_server.server_address
+    dobj_uri = f"http://{host}:{port}/objects/abc123"
+    dobj_meta = {
+        "fileName": "ICOS_ATC_L2_TAC_185.0_CTS.CO2",
+        "specification": {"project": {"self": {"label": "ICOS"}}},
+    }
+    icos_server.objects["/objects/abc123"] = json.dumps(dobj_meta).encode("utf-8")
+
+    set_icos_cache(cache.cache_dir, data_service_url=cache.data_service_url)
+    mocker.patch.object(
+        ICOSResponseCache, "get_dobj_columns", return_value={"TIMESTAMP": [1, 2], "Flag": ["O", "O"]}
+    )
+    dobj = mocker.patch("icoscp.cpb.dobj.Dobj", side_effect=AssertionError("icoscp should not be used"))
+
+    try:
+        first = _fetch_dobj(dobj_uri, dataset_source="ICOS", species_upper=["CO2"])
+        second = _fetch_dobj(dobj_uri, dataset_source="ICOS", species_upper=["CO2"])
+        skipped = _fetch_dobj(dobj_uri, dataset_source="InGOS", species_upper=["CO2"])
+    finally:
+        set_icos_cache(None)
+
+    assert first[0] == second[0] == dobj_meta
+    assert first[1] == "ICOS"
+    assert list(first[2].columns) == ["Flag", "TIMESTAMP"]
+    assert skipped is None
+
+    dobj.assert_not_called()
+    assert len(icos_server.requests) == 1
+
+
+def test_get_station_data_uses_cache(cache, mocker):
+    stations = [
+        {
+            "uri": "http://meta.icos-cp.eu/resources/stations/AS_TAC",
+            "id": "TAC",
+            "firstName": "Jane",
+            "lastName": "Doe",
+            "email": "jane@example.com",
+        },
+        {
+            "uri": "http://meta.icos-cp.eu/resources/stations/AS_BIR",
+            "id": "BIR",
+            "firstName": "John",
+            "lastName": "Doe",
+            "email": "john@example.com",
+        },
+    ]
+    data = [
+        {"dobj": "https://meta.icos-cp.eu/objects/abc", "datalevel": "1", "samplingheight": None},
+        {"dobj": "https://meta.icos-cp.eu/objects/def", "datalevel": "2", "samplingheight": "185.0"},
+    ]
+
+    set_icos_cache(cache.cache_dir, sparql_endpoint=cache.sparql_endpoint)
+    sparql_records = mocker.patch.object(ICOSResponseCache, "sparql_records", side_effect=[stations, data])
+    station = mocker.patch(
+        "icoscp.station.station.get", side_effect=AssertionError("icoscp should not be used")
+    )
+
+    try:
+        data_pids, pi_details = _get_station_data("tac", data_level=2)
+    finally:
+        set_icos_cache(None)
+
+    assert data_pids["dobj"].tolist() == ["https://meta.icos-cp.eu/objects/def"]
+    assert pi_details == {"firstName": "Jane", "lastName": "Doe", "email": "jane@example.com"}
+    assert "AS_TAC" in sparql_records.call_args_list[1].args[0]
+    station.assert_not_called()
@@ -9,6 +9,7 @@ from openghg.retrieve import (
     get_bc,
     get_flux,
     get_footprint,
+    get_footprint_coords,
     get_obs_column,
     get_obs_surface,
     search,
@@ -474,6 +475,52 @@ def test_get_footprint(inlet_keyword, inlet_value):
     assert metadata["time_resolved"] == "false"
 
 
+def test_get_footprint_coords():
+    """Test the footprint grid can be retrieved without opening the footprint data"""
+    footprint = get_footprint(site="tmb", domain="europe", inlet="10m", model="test_model").data
+
+    coords = get_footprint_coords(site="tmb", domain="europe", inlet="10m", model="test_model")
+
+    assert sorted(coords) == ["height", "lat", "lon"]
+    np.testing.assert_array_equal(coords["lat"], footprint["lat"].values)
+    np.testing.assert_array_equal(coords["lon"], footprint["lon"].values)
+    np.testing.assert_array_equal(coords["height"], footprint["height"].values)
+
+    with pytest.raises(SearchError):
+        get_footprint_coords(site="seville", domain="spain", height="10m", model="test_model")
+
+
+def test_get_footprint_and_flux_region():
+    """Test a region can be selected when retrieving footprints and fluxes"""
+    footprint = get_footprint(site="tmb", domain="europe", inlet="10m", model="test_model").data
+
+    lat, lon = footprint["lat"].values, footprint["lon"].values
+    lat_bounds = (float(lat[2]), float(lat[5]))
+    lon_bounds = (float(lon[-4]), float(lon[-1]))
+
+    region = get_footprint(
+        site="tmb",
+        domain="europe",
+        inlet="10m",
+        model="test_model",
+        lat_bounds=lat_bounds,
+        lon_bounds=lon_bounds,
+    ).data
+
+    expected = footprint.sel(lat=slice(*lat_bounds), lon=slice(*lon_bounds))
+    assert dict(region.sizes)["lat"] == 4
+    assert dict(region.sizes)["lon"] == 4
+    assert region.fp.equals(expected.fp)
+
+    flux = get_flux(species="co2", source="gpp-cardamom", domain="europe", lat_bounds=(50.0, 60.0)).data
+    assert float(flux.lat.min()) >= 50.0
+    assert float(flux.lat.max()) <= 60.0
+    assert flux.lon.size == get_flux(species="co2", source="gpp-cardamom", domain="europe").data.lon.size
+
+    with pytest.raises(ValueError):
+        get_flux(species="co2", source="gpp-cardamom", domain="europe", lat_bounds=(-90.0, -80.0))
+
+
 def test_get_footprint_no_result():
     """Test sensible error message is being returned when no results are found
     with input keywords for get_footprint function"""
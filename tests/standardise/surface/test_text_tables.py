@@ -0,0 +1,193 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from openghg.standardise.surface._crds import _get_raw_dataframe
+from openghg.standardise.surface._text_tables import (
+    datetime_from_components,
+    flag_characters_set,
+    read_whitespace_table,
+    split_yymmdd,
+    two_digit_year,
+)
+
+
+def test_datetime_from_components():
+    times = datetime_from_components(
+        year=[2012, 2020, 1999], month=[7, 2, 12], day=[24, 29, 31], hour=[21, 0, 23], minute=[2, 0, 59]
+    )
+
+    expected = pd.to_datetime(["2012-07-24 21:02", "2020-02-29 00:00", "1999-12-31 23:59"])
+    pd.testing.assert_index_equal(times, pd.DatetimeIndex(expected))
+
+
+@pytest.mark.parametrize(
+    "components",
+    [
+        {"year": [2019], "month": [2], "day": [29]},
+        {"year": [2019], "month": [13], "day": [1]},
+        {"year": [2019], "month": [1], "day": [1], "hour": [24]},
+        {"year": [2019.0], "month": [1], "day": [1]},
+    ],
+)
+def test_datetime_from_components_invalid_raises(components):
+    with pytest.raises(ValueError):
+        datetime_from_components(**components)
+
+
+def test_split_yymmdd_two_digit_year():
+    year, month, day = split_yymmdd(np.array([120724, 991231, 680101, 690101]))
+
+    assert two_digit_year(year).tolist() == [2012, 1999, 2068, 1969]
+    assert month.tolist() == [7, 12, 1, 1]
+    assert day.tolist() == [24, 31, 1, 1]
+
+    # Times with leading zeros dropped, e.g. 00:23:30
+    assert [c.tolist() for c in split_yymmdd(np.array([2330]))] == [[0], [23], [30]]
+
+
+def test_flag_characters_set():
+    flags = pd.DataFrame({"a": ["--B-", "X---", np.nan], "b": ["-", "-M--", "----"]})
+
+    status, integration = flag_characters_set(flags, positions=(0, 1))
+
+    assert status.tolist() == [[False, False], [True, False], [True, False]]
+    # Missing characters count as set
+    assert integration.tolist() == [[False, True], [False, True], [True, False]]
+
+
+def test_read_whitespace_table_positional_types(tmp_path):
+    filepath = tmp_path / "table.txt"
+    filepath.write_text("skip\nname yyyy mm value\na 2019 01 1.5\nb 2020 12 nan\n")
+
+    data = read_whitespace_table(filepath, column_types={1: "int64", "mm": "int64"}, skiprows=1)
+
+    assert data["yyyy"].dtype == np.int64
+    assert data["mm"].tolist() == [1, 12]
+    assert data["value"].dtype == np.float64
+
+
+# Reference implementations of the parsers before the fast readers were added.
+# These are kept to check the output is unchanged and to measure throughput.
+def _legacy_crds_raw_dataframe(filepath):
+    combined_df = pd.read_csv(filepath, header=[0, 1], skiprows=1, sep=r"\s+")
+    datetime_series = (
+        combined_df.pop(("-", "date")).astype(str)
+        + " "
+        + combined_df.pop(("-", "time")).astype(str).str.zfill(6)
+    )
+    combined_df["time"] = pd.to_datetime(datetime_series, format="%y%m%d %H%M%S")
+    combined_df = combined_df.set_index("time")
+    combined_df = combined_df.loc[~combined_df.index.duplicated(keep="first")]
+    return combined_df
+
+
+def _legacy_gcwerks_times_and_flags(filepath):
+    data = pd.read_csv(filepath, skiprows=4, sep=r"\s+", index_col=False)
+    datetime_cols = data.iloc[:, 1:6].astype(str)
+    times = pd.to_datetime(
+        datetime_cols.iloc[:, 0]
+        + "-"
+        + datetime_cols.iloc[:, 1]
+        + "-"
+        + datetime_cols.iloc[:, 2]
+        + " "
+        + datetime_cols.iloc[:, 3]
+        + ":"
+        + datetime_cols.iloc[:, 4],
+        format="%Y-%m-%d %H:%M",
+    )
+    flags = {}
+    for column in [c for c in data.columns if "Flag" in c]:
+        flags[f"{column} status"] = (data[column].str[0] != "-").astype(int).to_numpy()
+        flags[f"{column} integration"] = (data[column].str[1] != "-").astype(int).to_numpy()
+    return pd.DatetimeIndex(times), flags
+
+
+def _gcwerks_times_and_flags(filepath):
+    data = read_whitespace_table(
+        filepath, column_types={col: "int64" for col in range(1, 6)}, skiprows=4, index_col=False
+    )
+    times = datetime_from_components(*(data.iloc[:, col].to_numpy() for col in range(1, 6)))
+    flag_columns = [c for c in data.columns if "Flag" in c]
+    status, integration = flag_characters_set(data[flag_columns], positions=(0, 1))
+    flags = {}
+    for i, column in enumerate(flag_columns):
+        flags[f"{column} status"] = status[:, i].astype(int)
+        flags[f"{column} integration"] = integration[:, i].astype(int)
+    return times, flags
+
+
+N_ROWS = 50_000
+
+
+@pytest.fixture(scope="module")
+def synthetic_files(tmp_path_factory):
+    rng = np.random.default_rng(seed=42)
+    tmpdir = tmp_path_factory.mktemp("text_tables")
+    times = pd.date_range("2015-01-01", periods=N_ROWS, freq="1min")
+    values = rng.normal(loc=1900, scale=10, size=(N_ROWS, 2)).round(3)
+
+    crds_filepath = tmpdir / "bench.picarro.1minute.100m.min.dat"
+    crds_rows = [
+        f"{t:%y%m%d} {int(t.strftime('%H%M%S'))} air 9 {v[0]} 0.5 19 {v[1]} 0.1 19"
+        for t, v in zip(times, values)
+    ]
+    crds_header = [
+        "Created:  8 Jul 19 07:38 GMT",
+        "- - - - ch4 ch4 ch4 co2 co2 co2",
+        "date time type port C stdev N C stdev N",
+    ]
+    crds_filepath.write_text("\n".join(crds_header + crds_rows) + "\n")
+
+    flag_choices = np.array(["----", "--B-", "X---", "-M--", "XM--"])
+    flags = rng.choice(flag_choices, size=(N_ROWS, 2))
+    gc_filepath = tmpdir / "bench-medusa.15.C"
+    gc_rows = [
+        f"{t.year + t.dayofyear / 366:.6f} {t:%Y %m %d %H %M} {t:%Y %m %d %H %M} 75m_4 G-260 "
+        f"{v[0]} {f[0]} {v[1]} {f[1]}"
+        for t, v, f in zip(times, values, flags)
+    ]
+    gc_header = [
+        "Created: 20 Feb 19 09:18 GMT",
+        "bench-medusa",
+        "Scale: -- -- -- -- -- -- -- -- -- -- -- -- SIO-12 -- SIO-05 --",
+        "Unit: -- -- -- -- -- -- -- -- -- -- -- -- ppt -- ppt --",
+        "Year yyyy mm dd hh mi ryyy rm rd rh ri Inlet Standard NF3 Flag CF4 Flag",
+    ]
+    gc_filepath.write_text("\n".join(gc_header + gc_rows) + "\n")
+
+    return crds_filepath, gc_filepath
+
+
+def _throughput(func, filepath):
+    start = time.perf_counter()
+    result = func(filepath)
+    return result, N_ROWS / (time.perf_counter() - start)
+
+
+@pytest.mark.benchmark
+def test_crds_reader_throughput(synthetic_files):
+    crds_filepath, _ = synthetic_files
+
+    expected, legacy_rate = _throughput(_legacy_crds_raw_dataframe, crds_filepath)
+    result, rate = _throughput(_get_raw_dataframe, crds_filepath)
+
+    pd.testing.assert_frame_equal(result, expected)
+    print(f"\nCRDS: {legacy_rate:,.0f} rows/s (legacy), {rate:,.0f} rows/s")
+
+
+@pytest.mark.benchmark
+def test_gcwerks_reader_throughput(synthetic_files):
+    _, gc_filepath = synthetic_files
+
+    (expected_times, expected_flags), legacy_rate = _throughput(_legacy_gcwerks_times_and_flags, gc_filepath)
+    (times, flags), rate = _throughput(_gcwerks_times_and_flags, gc_filepath)
+
+    pd.testing.assert_index_equal(times, expected_times)
+    assert flags.keys() == expected_flags.keys()
+    for name, values in expected_flags.items():
+        np.testing.assert_array_equal(flags[name], values)
+
+    print(f"\nGCWERKS: {legacy_rate:,.0f} rows/s (legacy), {rate:,.0f} rows/s")
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+import zarr
+from numcodecs import AsType, BitRound, Blosc, Delta
+from openghg.storage import CodecPolicy, get_policy_encoding, get_zarr_memory_store
+
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(seed=1)
+    return xr.Dataset(
+        {
+            "fp": (("time", "lat"), rng.random((50, 4)).astype("float32")),
+            "flag": ("time", rng.integers(0, 3, size=50)),
+            "mf": ("time", rng.normal(size=50)),
+        },
+        coords={"time": pd.date_range("2020-01-01", periods=50, freq="h"), "lat": [10, 20, 30, 40]},
+    )
+
+
+def test_policy_encoding(dataset):
+    compressor = Blosc(cname="zstd", clevel=5, shuffle=Blosc.SHUFFLE)
+    policies = [
+        CodecPolicy("fp*", keepbits=7),
+        CodecPolicy("*", downcast="int8", delta=True, shuffle="bitshuffle"),
+    ]
+    encoding = get_policy_encoding(dataset, policies, compressor)
+
+    assert encoding["fp"]["filters"] == [BitRound(keepbits=7)]
+    assert encoding["flag"]["filters"] == [AsType(encode_dtype="|i1", decode_dtype="<i8"), Delta(dtype="|i1")]
+    assert encoding["lat"]["compressor"].shuffle == Blosc.BITSHUFFLE
+    # delta is applied to floats and datetimes as integers
+    assert encoding["mf"]["filters"] == [Delta(dtype="<i8", astype="<i8")]
+    assert encoding["time"]["filters"] == [Delta(dtype="<i8")]
+
+    assert get_policy_encoding(dataset, [], compressor) == {}
+
+    with pytest.raises(ValueError):
+        get_policy_encoding(dataset.assign(flag=dataset.flag * 100), policies, compressor)
+
+    with pytest.raises(ValueError):
+        CodecPolicy("fp", keepbits=7, digits=2)
+
+
+def test_zarr_store_with_codec_policies(dataset):
+    policies = [CodecPolicy("fp", keepbits=10), CodecPolicy("flag", downcast="uint8")]
+    zs = get_zarr_memory_store(compressor=Blosc(), codec_policies=policies)
+
+    zs.insert(dataset.isel(time=slice(25)))
+    zs.insert(dataset.isel(time=slice(25, None)))
+    stored = zs.get().compute()
+
+    # values are stored to within the precision of the kept bits
+    np.testing.assert_allclose(stored.fp, dataset.fp, rtol=2.0**-11)
+    assert not (stored.fp == dataset.fp).all()
+
+    xr.testing.assert_identical(stored.drop_vars("fp"), dataset.drop_vars("fp"))
+    assert zarr.open_group(zs.store)["flag"].filters == [AsType(encode_dtype="|u1", decode_dtype="<i8")]
+
+
+def test_delta_float_and_datetime_lossless(dataset):
+    policies = [CodecPolicy("fp", keepbits=10, delta=True), CodecPolicy("*", delta=True)]
+    data = dataset.assign_coords(lon=("lat", np.linspace(-10.5, 3.3, 4)))
+    zs = get_zarr_memory_store(compressor=Blosc(), codec_policies=policies)
+
+    zs.insert(data.isel(time=slice(25)))
+    zs.insert(data.isel(time=slice(25, None)))
+    stored = zs.get().compute()
+
+    np.testing.assert_allclose(stored.fp, data.fp, rtol=2.0**-11)
+    xr.testing.assert_identical(stored.drop_vars("fp"), data.drop_vars("fp"))
+
+    group = zarr.open_group(zs.store)
+    assert group["mf"].filters == [Delta(dtype="<i8", astype="<i8")]
+    assert group["fp"].filters == [BitRound(keepbits=10), Delta(dtype="<i4", astype="<i4")]
+    assert group["time"].filters == [Delta(dtype="<i8")]
+
+
+def test_delta_unsupported_dtype(dataset):
+    data = dataset.assign(site=("time", np.array(["mhd"] * 50)))
+
+    with pytest.raises(ValueError, match="Cannot apply delta to site"):
+        get_policy_encoding(data, [CodecPolicy("site", delta=True)])
+
+    # other options are only applied to the dtypes they are for
+    assert get_policy_encoding(data, [CodecPolicy("site", keepbits=7)]) == {"site": {"filters": None}}
+
+
+def test_downcast_range_checked_on_append_and_update(dataset):
+    zs = get_zarr_memory_store(codec_policies=[CodecPolicy("flag", downcast="int8")])
+    zs.insert(dataset.isel(time=slice(25)))
+
+    # values which would wrap around in the stored int8 are rejected, whatever the policies now are
+    zs.codec_policies = []
+    later = dataset.isel(time=slice(25, 28)).assign(flag=("time", [100, 200, 300]))
+    with pytest.raises(ValueError, match="don't fit in int8"):
+        zs.insert(later)
+    with pytest.raises(ValueError, match="don't fit in int8"):
+        zs.append(later)
+
+    overlapping = dataset.isel(time=slice(0, 3)).assign(flag=("time", [100, 200, 300]))
+    with pytest.raises(ValueError, match="don't fit in int8"):
+        zs.update(overlapping)
+    with pytest.raises(ValueError, match="don't fit in int8"):
+        zs.upsert(overlapping)
+
+    xr.testing.assert_identical(zs.get().compute(), dataset.isel(time=slice(25)))
+
+    zs.upsert(dataset.isel(time=slice(20, None)))
+    xr.testing.assert_identical(zs.get().compute(), dataset)
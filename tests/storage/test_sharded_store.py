@@ -0,0 +1,179 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+import zarr
+from openghg.storage import get_versioned_zarr_directory_store, is_sharded_store, ShardedDirectoryStore
+
+
+@pytest.fixture
+def dataset():
+    times = pd.date_range("2020-01-01", periods=100, freq="h")
+    rng = np.random.default_rng(seed=1)
+    return xr.Dataset(
+        {
+            "ch4": (("time", "height"), rng.normal(size=(100, 3))),
+            "ch4_variability": ("time", rng.normal(size=100)),
+        },
+        coords={"time": times, "height": [10, 50, 100]},
+    ).chunk({"time": 10})
+
+
+def _n_files(path):
+    return sum(1 for p in path.rglob("*") if p.is_file())
+
+
+def test_sharded_store_round_trip(tmp_path, dataset):
+    store = ShardedDirectoryStore(tmp_path / "sharded", chunks_per_shard=4)
+    dataset.to_zarr(store, consolidated=True)
+
+    assert is_sharded_store(tmp_path / "sharded")
+    xr.testing.assert_identical(xr.open_zarr(store, consolidated=True).compute(), dataset.compute())
+
+    # 10 time chunks per variable are packed into 3 shards
+    assert sorted(p.name for p in (tmp_path / "sharded" / "ch4").iterdir()) == [
+        ".zarray",
+        ".zattrs",
+        ".zshardindex",
+        ".zshardlock",
+        "shard.0",
+        "shard.1",
+        "shard.2",
+    ]
+
+    directory_store = zarr.DirectoryStore(tmp_path / "directory")
+    dataset.to_zarr(directory_store, consolidated=True)
+
+    assert _n_files(tmp_path / "sharded") < _n_files(tmp_path / "directory")
+    assert sorted(store.keys()) == sorted(directory_store.keys())
+    assert store.listdir("ch4") == directory_store.listdir("ch4")
+
+    # Reopening the store reads the index from disk
+    reopened = ShardedDirectoryStore(tmp_path / "sharded")
+    assert reopened.chunks_per_shard == 4
+    assert reopened["ch4/3.0"] == directory_store["ch4/3.0"]
+
+
+def test_sharded_store_overwrite_delete_compact(tmp_path):
+    store = ShardedDirectoryStore(tmp_path / "sharded")
+    store["x/0.0"] = b"a" * 10
+    store["x/1.0"] = b"b" * 10
+    store["x/0.0"] = b"c" * 5
+
+    assert store["x/0.0"] == b"c" * 5
+    assert store.getsize("x/0.0") == 5
+
+    del store["x/1.0"]
+    assert "x/1.0" not in store
+    with pytest.raises(KeyError):
+        store["x/1.0"]
+
+    assert store.compact() == 20
+    assert sorted(p.name for p in (tmp_path / "sharded" / "x").glob("shard.*")) == ["shard.0.1"]
+    assert (tmp_path / "sharded" / "x" / "shard.0.1").stat().st_size == 5
+    assert ShardedDirectoryStore(tmp_path / "sharded")["x/0.0"] == b"c" * 5
+
+
+def test_sharded_store_read_during_compact(tmp_path, mocker):
+    path = tmp_path / "sharded"
+    writer = ShardedDirectoryStore(path, chunks_per_shard=4)
+    keys = [f"x/{n}.0" for n in range(8)]
+    writer.setitems({key: bytes([n]) * 100 for n, key in enumerate(keys)})
+
+    reader = ShardedDirectoryStore(path)
+    stale_index = dict(reader._index("x"))
+
+    writer.setitems({key: bytes([n + 1]) * 50 for n, key in enumerate(keys)})
+    assert writer.compact() == 800
+    assert sorted(p.name for p in (path / "x").glob("shard.*")) == ["shard.0.1", "shard.1.1"]
+
+    # The reader finds the chunks listed in the index it holds have been removed,
+    # so reads the new index and shards
+    read_index = reader._index
+    indexes = iter([stale_index])
+    mocker.patch.object(
+        reader, "_index", side_effect=lambda prefix: next(indexes, None) or read_index(prefix)
+    )
+
+    assert reader.getitems(keys) == {key: bytes([n + 1]) * 50 for n, key in enumerate(keys)}
+    assert reader["x/3.0"] == bytes([4]) * 50
+
+
+def test_sharded_store_concurrent_read_and_compact(tmp_path):
+    import threading
+
+    path = tmp_path / "sharded"
+    writer = ShardedDirectoryStore(path, chunks_per_shard=2)
+    keys = [f"x/{n}.0" for n in range(6)]
+    writer.setitems({key: bytes([0]) * 64 for key in keys})
+
+    errors = []
+    done = threading.Event()
+
+    def read():
+        reader = ShardedDirectoryStore(path)
+        while not done.is_set():
+            try:
+                values = reader.getitems(keys)
+                assert len(values) == len(keys)
+                assert all(len(set(value)) == 1 and len(value) == 64 for value in values.values())
+            except Exception as e:
+                errors.append(e)
+                return
+
+    thread = threading.Thread(target=read)
+    thread.start()
+    try:
+        for n in range(1, 30):
+            writer.setitems({key: bytes([n]) * 64 for key in keys})
+            writer.compact()
+    finally:
+        done.set()
+        thread.join()
+
+    assert not errors
+    assert writer["x/5.0"] == bytes([29]) * 64
+
+
+def _write_chunks_in_process(path, first_chunk):
+    store = ShardedDirectoryStore(path)
+    for n in range(first_chunk, first_chunk + 20):
+        store[f"x/{n}.0"] = bytes([n]) * (n + 1)
+
+
+def test_sharded_store_concurrent_processes(tmp_path):
+    from concurrent.futures import ProcessPoolExecutor
+
+    path = str(tmp_path / "sharded")
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        list(executor.map(_write_chunks_in_process, [path] * 4, range(0, 80, 20)))
+
+    store = ShardedDirectoryStore(path)
+    assert len(list(store.keys())) == 80
+    for n in range(80):
+        assert store[f"x/{n}.0"] == bytes([n]) * (n + 1)
+
+
+def test_versioned_store_reads_existing_layouts(tmp_path, dataset):
+    path = tmp_path / "zarr"
+    vzds = get_versioned_zarr_directory_store(path=path)
+    vzds.create_version("v1", checkout=True)
+    vzds.insert(dataset.isel(time=slice(50)))
+
+    # New versions are sharded, the existing version keeps its layout
+    vzds = get_versioned_zarr_directory_store(path=path, sharded=True)
+    vzds.create_version("v2", checkout=True)
+    vzds.insert(dataset.isel(time=slice(50)))
+    vzds.insert(dataset.isel(time=slice(50, None)))
+
+    assert not is_sharded_store(path / "v1")
+    assert is_sharded_store(path / "v2")
+
+    vzds = get_versioned_zarr_directory_store(path=path)
+    vzds.checkout_version("v2")
+    assert isinstance(vzds.store, ShardedDirectoryStore)
+    xr.testing.assert_identical(vzds.get().compute(), dataset.compute())
+
+    vzds.checkout_version("v1")
+    assert not isinstance(vzds.store, ShardedDirectoryStore)
+    assert vzds.get().time.size == 50
@@ -456,3 +456,34 @@ def test_delete_data_from_old_version(store_name, request, ds1):
     # check out v2 and test that it is not empty
     store.checkout_version("v2")
     assert store
+
+
+def test_append_matches_stored_chunks(tmp_path):
+    """Check data chunked differently to a stored array is appended with the stored chunk sizes.
+
+    Data is written with `safe_chunks=False`, so writing several dask chunks into one stored chunk
+    using the processes scheduler could lose data.
+    """
+    from openghg.util import execution_options
+
+    zs = get_zarr_directory_store(path=tmp_path)
+
+    def spatial_dataset(times):
+        values = np.arange(len(times) * 36, dtype="float64").reshape(len(times), 6, 6)
+        return xr.Dataset(
+            {"fp": (("time", "lat", "lon"), values)},
+            coords={"time": times, "lat": np.arange(6.0), "lon": np.arange(6.0)},
+        )
+
+    # store written with a single spatial chunk
+    ds1 = spatial_dataset(pd.date_range("2020-01-01", periods=4, freq="h"))
+    zs.insert(ds1.chunk({"time": 2, "lat": 6, "lon": 6}))
+
+    # new data chunked spatially
+    ds2 = spatial_dataset(pd.date_range("2020-01-01 04:00", periods=4, freq="h"))
+    with execution_options(scheduler="processes", num_workers=2):
+        zs.insert(ds2.chunk({"time": 2, "lat": 2, "lon": 2}))
+
+    result = zs.get()
+    assert result.fp.encoding["chunks"] == (2, 6, 6)
+    xr.testing.assert_equal(result.compute(), xr.concat([ds1, ds2], dim="time"))
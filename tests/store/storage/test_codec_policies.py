@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+import zarr
+from helpers import clear_test_stores, get_surface_datapath
+from numcodecs import BitRound
+from openghg.objectstore import get_writable_bucket
+from openghg.retrieve import search_surface
+from openghg.standardise import standardise_surface
+from openghg.storage import CodecPolicy
+from openghg.store.storage import evaluate_codec_policies, get_codec_policies, set_codec_policies
+
+
+@pytest.fixture
+def bucket():
+    clear_test_stores()
+    bucket = get_writable_bucket(name="user")
+    yield bucket
+    set_codec_policies(bucket=bucket, data_type="surface", policies=[])
+    clear_test_stores()
+
+
+def test_codec_policies_used_for_data_type(bucket):
+    assert get_codec_policies(bucket=bucket, data_type="surface") == []
+
+    policies = [CodecPolicy("ch4", keepbits=12), CodecPolicy("*_number_of_observations", downcast="int16")]
+    set_codec_policies(bucket=bucket, data_type="surface", policies=policies)
+    assert get_codec_policies(bucket=bucket, data_type="surface") == policies
+    assert get_codec_policies(bucket=bucket, data_type="footprints") == []
+
+    with pytest.raises(ValueError):
+        set_codec_policies(bucket=bucket, data_type="not_a_data_type", policies=policies)
+
+    standardise_surface(
+        filepath=get_surface_datapath("tac.picarro.1minute.100m.min.dat", source_format="CRDS"),
+        source_format="CRDS",
+        site="tac",
+        network="decc",
+        store="user",
+    )
+
+    result = search_surface(site="tac", species="ch4", inlet="100m", store="user")
+    uuid = next(iter(result.metadata))
+    group = zarr.open_consolidated(f"{bucket}/data/{uuid}/zarr/v1", mode="r")
+    assert group["ch4"].filters == [BitRound(keepbits=12)]
+    assert group["ch4_variability"].filters is None
+
+    evaluation = evaluate_codec_policies(
+        bucket=bucket, data_type="surface", policies={"low": [CodecPolicy("*", keepbits=4)]}, n_datasources=2
+    )
+
+    assert len(evaluation) == 4
+    assert set(evaluation["policy"]) == {"none", "low"}
+    none, low = evaluation[evaluation["policy"] == "none"], evaluation[evaluation["policy"] == "low"]
+    assert (none["relative_size"] == 1).all()
+    assert (low["relative_size"].values < 1).all()
+    assert (none["max_relative_error"] == 0).all()
+    assert (low["max_relative_error"].values > 0).all()
+    assert (low["max_relative_error"] <= 2.0**-5).all()
+
+
+def test_sample_chunks():
+    from openghg.store.storage._compression import _sample_chunks
+
+    data = xr.Dataset(
+        {"mf": ("time", np.arange(100.0))},
+        coords={"time": pd.date_range("2020-01-01", periods=100, freq="h")},
+    ).chunk({"time": 10})
+
+    sample = _sample_chunks(data, max_chunks=3)
+    assert sample.mf.values.tolist() == [*range(0, 10), *range(40, 50), *range(90, 100)]
+    assert _sample_chunks(data, max_chunks=20) is data
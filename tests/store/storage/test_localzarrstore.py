@@ -4,7 +4,13 @@ import pytest
 import xarray as xr
 import numcodecs
 from openghg.objectstore import get_writable_bucket
-from openghg.store.storage import LocalZarrStore
+from openghg.storage import is_sharded_store, ShardedDirectoryStore
+from openghg.store.storage import (
+    convert_store_layout,
+    get_storage_layout,
+    LocalZarrStore,
+    set_storage_layout,
+)
 from openghg.types import ZarrStoreError
 from helpers import get_footprint_datapath
 
@@ -54,6 +60,23 @@ def test_dataset_retrieved_single_dataset_identical(store):
         assert ds.identical(retrieved)
 
 
+def test_get_coords(store):
+    datapath = get_footprint_datapath("TAC-100magl_UKV_co2_TEST_201407.nc")
+    with xr.open_dataset(datapath) as ds:
+        store.add(version="v1", dataset=ds)
+
+        coords = store.get_coords(version="v1", names=["lat", "lon"])
+
+        np.testing.assert_array_equal(coords["lat"], ds["lat"].values)
+        np.testing.assert_array_equal(coords["lon"], ds["lon"].values)
+
+    with pytest.raises(ZarrStoreError):
+        store.get_coords(version="v1", names=["not_a_coord"])
+
+    with pytest.raises(ZarrStoreError):
+        store.get_coords(version="v2", names=["lat"])
+
+
 def test_localzarrstore_add_successive_dates_append():
     bucket = get_writable_bucket(name="user")
     store = LocalZarrStore(bucket=bucket, datasource_uuid="888-888", mode="rw")
@@ -285,3 +308,53 @@ def test_for_missing_data_from_appending_in_loop():
         assert total_missing == 0.0
 
         local_store.delete_all()
+
+
+def test_sharded_layout_update_and_convert(mocker):
+    bucket = get_writable_bucket(name="user")
+    set_storage_layout(bucket=bucket, layout="sharded", chunks_per_shard=8)
+
+    times = pd.date_range("2020-01-01", periods=200, freq="h")
+    ds = xr.Dataset({"x": ("time", np.arange(200.0))}, coords={"time": times}).chunk({"time": 10})
+
+    try:
+        local_store = LocalZarrStore(bucket=bucket, datasource_uuid="test-sharded-123", mode="rw")
+        local_store.add(version="v1", dataset=ds)
+        assert is_sharded_store(local_store.store_path("v1"))
+
+        compact_spy = mocker.spy(ShardedDirectoryStore, "compact")
+        updated = ds.isel(time=slice(0, 150)) + 1
+        local_store.update(version="v2", dataset=updated)
+
+        # Only the arrays written are checked, and only compacted once half of their shards are unused
+        assert compact_spy.call_count == 1
+        assert compact_spy.call_args.kwargs == {"min_unused_fraction": 0.5, "arrays": ["time", "x"]}
+        assert (local_store.get(version="v2")["x"].values[:150] == np.arange(150.0) + 1).all()
+
+        # Appending rewrites the last chunk so the shards are also compacted
+        later = xr.Dataset(
+            {"x": ("time", np.arange(5.0))},
+            coords={"time": pd.date_range("2020-01-10", periods=5, freq="h")},
+        )
+        local_store.add(version="v2", dataset=later)
+        assert compact_spy.call_count == 2
+        assert local_store.get(version="v2").sizes["time"] == 205
+        xr.testing.assert_identical(local_store.get(version="v1").compute(), ds.compute())
+
+        # Convert back to one file per chunk, reading the data is unchanged
+        assert convert_store_layout(store="user", layout="directory") >= 2
+        assert get_storage_layout(bucket=bucket)["layout"] == "directory"
+
+        local_store = LocalZarrStore(bucket=bucket, datasource_uuid="test-sharded-123", mode="rw")
+        assert not is_sharded_store(local_store.store_path("v1"))
+        assert (local_store.store_path("v1") / "x" / "19").exists()
+        xr.testing.assert_identical(local_store.get(version="v1").compute(), ds.compute())
+
+        assert convert_store_layout(store="user", layout="sharded") >= 2
+
+        local_store = LocalZarrStore(bucket=bucket, datasource_uuid="test-sharded-123", mode="rw")
+        assert is_sharded_store(local_store.store_path("v2"))
+        assert (local_store.get(version="v2")["x"].values[:150] == np.arange(150.0) + 1).all()
+    finally:
+        set_storage_layout(bucket=bucket, layout="directory")
+        LocalZarrStore(bucket=bucket, datasource_uuid="test-sharded-123", mode="rw").delete_all()
@@ -0,0 +1,190 @@
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+import toml
+import xarray as xr
+from helpers import clear_test_stores, get_surface_datapath
+from openghg.objectstore import get_datasource, get_writable_bucket
+from openghg.retrieve import search_surface
+from openghg.standardise import standardise_surface
+from openghg.storage import CodecPolicy
+from openghg.store.storage import LocalZarrStore, ReadCache, configure_read_cache, get_read_cache
+from openghg.store.storage import _read_cache
+from openghg.store.storage._read_cache import CachedZarrStore
+from openghg.util import _user
+
+
+@pytest.fixture()
+def read_cache(tmp_path):
+    cache = configure_read_cache(max_size="10MB", spill_dir=tmp_path / "spill")
+    yield cache
+    configure_read_cache(max_size=None)
+
+
+@pytest.fixture()
+def store():
+    bucket = get_writable_bucket(name="user")
+    local_store = LocalZarrStore(bucket=bucket, datasource_uuid="test-read-cache-123", mode="rw")
+    yield local_store
+    local_store.delete_all()
+
+
+def _dataset(start="2020-01-01"):
+    time = pd.date_range(start, periods=500, freq="h")
+    return xr.Dataset(
+        {
+            "mf": ("time", np.random.default_rng(0).random(time.size)),
+            "flag": ("time", np.arange(time.size) % 7),
+            "network": ("time", np.array(["decc", "icos"] * (time.size // 2), dtype=object)),
+        },
+        coords={"time": time},
+    ).chunk({"time": 100})
+
+
+def test_read_cache_lru():
+    cache = ReadCache(max_size=100)
+
+    cache.put(("a", "v1", 1), b"x" * 60)
+    cache.put(("b", "v1", 1), b"y" * 30)
+    assert cache.get(("a", "v1", 1)) == b"x" * 60
+
+    # least recently used entry is evicted
+    cache.put(("c", "v1", 1), b"z" * 30)
+    assert cache.get(("b", "v1", 1)) is None
+    assert cache.size == 90
+
+    cache.invalidate("a")
+    assert cache.get(("a", "v1", 1)) is None
+    assert len(cache) == 1
+
+    # values larger than the cache aren't kept
+    cache.put(("d", "v1", 1), b"w" * 101)
+    assert cache.get(("d", "v1", 1)) is None
+
+
+def test_read_cache_from_config(reset_mock_user_config, monkeypatch):
+    # Forget any cache set by `configure_read_cache`
+    monkeypatch.setattr(_read_cache, "_read_cache", {})
+    monkeypatch.setattr(_read_cache, "_read_cache_options", {})
+    assert get_read_cache() is None
+
+    config_path = _user.get_user_config_path()
+    config = toml.loads(config_path.read_text())
+    config["read_cache"] = {"max_size": "10MB"}
+    config_path.write_text(toml.dumps(config))
+
+    try:
+        # Changes to the config file are picked up
+        cache = get_read_cache()
+        assert cache is not None and cache.max_size == 10**7
+        assert get_read_cache() is cache
+
+        config["read_cache"] = {"max_size": "20MB"}
+        config_path.write_text(toml.dumps(config))
+        cache = get_read_cache()
+        assert cache is not None and cache.max_size == 2 * 10**7
+
+        # The cache set by `configure_read_cache` takes precedence
+        assert configure_read_cache(max_size=None) is None
+        assert get_read_cache() is None
+    finally:
+        config_path.write_text(toml.dumps({k: v for k, v in config.items() if k != "read_cache"}))
+
+
+def test_read_cache_decoded_chunks(store, read_cache, tmp_path):
+    store.add(
+        version="v1",
+        dataset=_dataset(),
+        codec_policies=[CodecPolicy(pattern="flag", delta=True, downcast="int8")],
+    )
+
+    configure_read_cache(max_size=None)
+    expected = store.get(version="v1").compute()
+
+    cache = configure_read_cache(max_size="10MB", spill_dir=tmp_path / "spill")
+    xr.testing.assert_identical(store.get(version="v1").compute(), expected)
+    misses = cache.misses
+
+    xr.testing.assert_identical(store.get(version="v1").compute(), expected)
+    assert cache.misses == misses
+    assert cache.hits > 0
+
+    # mf and flag chunks are held decompressed, strings as stored
+    decoded = [key for key in cache._entries if key[3].startswith(("mf/", "flag/")) and not key[4]]
+    assert decoded
+    assert all(cache._entries[key].nbytes == 800 for key in decoded)
+
+    # another process sharing the spill directory
+    other = ReadCache(max_size=10**7, spill_dir=tmp_path / "spill")
+    assert np.array_equal(other.get(decoded[0]), cache.get(decoded[0]))
+
+    # writing data changes the modification stamp, so new data is read
+    store.add(version="v1", dataset=_dataset(start="2021-01-01"))
+    assert store.get(version="v1").time.size == 1000
+
+
+def test_datasource_read_cache_invalidated_on_save(read_cache):
+    clear_test_stores()
+    standardise_surface(
+        filepath=get_surface_datapath("tac.picarro.1minute.100m.min.dat", source_format="CRDS"),
+        source_format="CRDS",
+        site="tac",
+        network="decc",
+        store="user",
+    )
+
+    bucket = get_writable_bucket(name="user")
+    uuid = next(iter(search_surface(site="tac", species="ch4", store="user").metadata))
+
+    datasource = get_datasource(bucket=bucket, uuid=uuid)
+    datasource.get_data().compute()
+    assert any(key[0] == uuid for key in read_cache._entries)
+
+    datasource._metadata["comment"] = "read cache test"
+    datasource.save()
+    assert not any(key[0] == uuid for key in read_cache._entries)
+    assert not (read_cache.spill_dir / uuid).exists()
+
+    assert get_datasource(bucket=bucket, uuid=uuid).metadata["comment"] == "read cache test"
+    assert get_datasource(bucket=bucket, uuid=uuid).metadata["comment"] == "read cache test"
+
+    clear_test_stores()
+
+
+def test_read_cache_stamp_changes_within_timestamp_resolution(store, read_cache):
+    store.add(version="v1", dataset=_dataset())
+    xr.testing.assert_identical(store.get(version="v1").compute(), _dataset().compute())
+
+    zmetadata = store.store_path("v1") / ".zmetadata"
+    before = zmetadata.stat()
+
+    # Same size of metadata and, as if written within the same timestamp tick, the same modification time
+    updated = _dataset()
+    updated["mf"] = updated["mf"] + 1
+    store.overwrite(version="v1", dataset=updated)
+    os.utime(zmetadata, ns=(before.st_atime_ns, before.st_mtime_ns))
+    assert zmetadata.stat().st_size == before.st_size
+
+    xr.testing.assert_identical(store.get(version="v1").compute(), updated.compute())
+
+
+def test_read_cache_processes_scheduler(store, read_cache):
+    store.add(version="v1", dataset=_dataset())
+    ds = store.get(version="v1")
+
+    # Unpickled in a process with the same cache options, the cache of that process is used
+    cached_store = CachedZarrStore(
+        store._vzds.store, cache=read_cache, uuid="test-read-cache-123", version="v1", stamp=(0, 0, 1)
+    )
+    assert pickle.loads(pickle.dumps(cached_store))._cache is read_cache
+
+    copy = pickle.loads(pickle.dumps(read_cache))
+    assert copy is not read_cache
+    assert copy.spill_dir == read_cache.spill_dir
+    assert len(copy) == 0
+
+    computed = ds.compute(scheduler="processes", num_workers=2)
+    xr.testing.assert_identical(computed, _dataset().compute())
@@ -0,0 +1,165 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+import toml
+import xarray as xr
+import zarr
+from openghg.objectstore import get_writable_bucket
+from openghg.store.storage import (
+    AccessStats,
+    LocalZarrStore,
+    configure_access_stats,
+    rechunk_zarr,
+    suggest_chunks,
+)
+from openghg.store.storage._rechunk import access_stats_enabled
+from openghg.types import ZarrStoreError
+from openghg.util import _user
+from helpers import get_footprint_datapath
+
+
+@pytest.fixture()
+def store():
+    bucket = get_writable_bucket(name="user")
+    local_store = LocalZarrStore(bucket=bucket, datasource_uuid="test-rechunk-store-123", mode="rw")
+    yield local_store
+    local_store.delete_all()
+
+
+def test_access_stats_mean_extent(tmp_path):
+    dim_sizes = {"time": 100, "lat": 10, "lon": 20}
+
+    stats = AccessStats()
+    stats.record(read_sizes={"time": 100, "lat": 1, "lon": 1}, dim_sizes=dim_sizes)
+    stats.record(read_sizes={"time": 50, "lat": 1, "lon": 1}, dim_sizes=dim_sizes)
+
+    mean_extent = stats.mean_extent()
+    assert mean_extent["time"] == pytest.approx(0.75)
+    assert mean_extent["lat"] == pytest.approx(0.1)
+    assert mean_extent["lon"] == pytest.approx(0.05)
+
+    filepath = tmp_path / "stats.json"
+    stats.save(filepath)
+    assert AccessStats.load(filepath) == stats
+    assert AccessStats.load(tmp_path / "missing.json") == AccessStats()
+
+
+def test_suggest_chunks_follows_access_pattern():
+    dim_sizes = {"time": 8760, "lat": 300, "lon": 400}
+
+    point_reads = AccessStats()
+    point_reads.record(read_sizes={"lat": 1, "lon": 1}, dim_sizes=dim_sizes)
+    point_chunks = suggest_chunks(dim_sizes=dim_sizes, dtype_bytes=4, access_stats=point_reads)
+    assert point_chunks["time"] == 8760
+    assert point_chunks["lat"] < 300 and point_chunks["lon"] < 400
+
+    map_reads = AccessStats()
+    map_reads.record(read_sizes={"time": 1}, dim_sizes=dim_sizes)
+    map_chunks = suggest_chunks(dim_sizes=dim_sizes, dtype_bytes=4, access_stats=map_reads)
+    assert map_chunks == {"time": 4, "lat": 300, "lon": 400}
+
+    large_chunks = suggest_chunks(
+        dim_sizes=dim_sizes, dtype_bytes=4, access_stats=AccessStats(reads=1), max_chunk_size=1
+    )
+    assert 4 * np.prod(list(large_chunks.values())) <= 1024 * 1024
+
+    with pytest.raises(ValueError):
+        suggest_chunks(dim_sizes=dim_sizes, dtype_bytes=4, access_stats=AccessStats())
+
+
+def test_rechunk_zarr_bounded_memory():
+    ds = xr.Dataset(
+        {"fp": (("time", "lat", "lon"), np.random.default_rng(1).random((50, 20, 30)))},
+        coords={"time": np.arange(50), "lat": np.arange(20), "lon": np.arange(30)},
+        attrs={"site": "tac"},
+    )
+    source = zarr.MemoryStore()
+    ds.chunk({"time": 1}).to_zarr(source, consolidated=True)
+
+    target = zarr.MemoryStore()
+    # 0.01 MB only holds a few target chunks of 50 x 2 x 2 at a time
+    rechunk_zarr(source, target, chunks={"time": 50, "lat": 2, "lon": 2}, max_mem=0.01)
+
+    assert zarr.open_consolidated(target)["fp"].chunks == (50, 2, 2)
+
+    rechunked = xr.open_zarr(target, consolidated=True)
+    assert rechunked.identical(ds)
+
+    with pytest.raises(ValueError):
+        rechunk_zarr(source, zarr.MemoryStore(), chunks={"time": 50, "lat": 20, "lon": 30}, max_mem=0.01)
+
+
+def test_localzarrstore_rechunk(store):
+    datapath = get_footprint_datapath("TAC-100magl_UKV_co2_TEST_201407.nc")
+    with xr.open_dataset(datapath) as ds:
+        store.add(version="v1", dataset=ds)
+
+        store.rechunk(version="v1", new_version="v2", chunks={"time": 1})
+
+        chunks = store.get_chunks(version="v2")
+        assert chunks["time"] == (1,)
+        assert chunks["fp"] == (12, 12, 1)
+        assert store.get(version="v2").identical(store.get(version="v1"))
+
+        with pytest.raises(ZarrStoreError):
+            store.rechunk(version="v1", new_version="v2", chunks={"time": 1})
+
+        # A failed rechunk doesn't leave the new version behind
+        with pytest.raises(ValueError):
+            store.rechunk(version="v1", new_version="v3", chunks={"time": 1}, max_mem=0)
+
+        assert not store.version_exists("v3")
+
+
+@pytest.fixture()
+def record_access_stats():
+    configure_access_stats(True)
+    yield
+    configure_access_stats(None)
+
+
+def test_localzarrstore_record_access(store, record_access_stats):
+    dim_sizes = {"time": 10, "lat": 5}
+    store.record_access(read_sizes={"time": 1}, dim_sizes=dim_sizes)
+    store.record_access(read_sizes={"time": 1}, dim_sizes=dim_sizes)
+
+    stats = store.access_stats()
+    assert stats.reads == 2
+    assert stats.mean_extent() == {"time": 0.1, "lat": 1.0}
+
+    # Concurrent reads don't lose updates
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for _ in range(40):
+            executor.submit(store.record_access, read_sizes={"time": 1}, dim_sizes=dim_sizes)
+
+    assert store.access_stats().reads == 42
+
+
+def test_localzarrstore_record_access_disabled(store):
+    configure_access_stats(False)
+    store.record_access(read_sizes={"time": 1}, dim_sizes={"time": 10})
+    configure_access_stats(None)
+
+    assert store.access_stats().reads == 0
+
+
+def test_access_stats_enabled_from_config(reset_mock_user_config):
+    assert not access_stats_enabled()
+
+    config_path = _user.get_user_config_path()
+    config = toml.loads(config_path.read_text())
+    config["access_stats"] = {"record": True}
+    config_path.write_text(toml.dumps(config))
+
+    try:
+        # Changes to the config file are picked up
+        assert access_stats_enabled()
+
+        configure_access_stats(False)
+        assert not access_stats_enabled()
+    finally:
+        configure_access_stats(None)
+        config_path.write_text(toml.dumps({k: v for k, v in config.items() if k != "access_stats"}))
+
+    assert not access_stats_enabled()
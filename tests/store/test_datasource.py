@@ -546,3 +546,158 @@ def test_bytes_stored(data, bucket, datasource):
     d = Datasource(uuid="xyz456", bucket=bucket)
 
     assert d.nbytes == 0
+
+
+def _expected_summary(ds):
+    from openghg.objectstore._summary import compute_summary
+
+    return compute_summary(ds.compute())
+
+
+def test_summary_updated_on_add(datasource, datasets_with_gaps):
+    from openghg.objectstore._summary import summary_totals
+
+    data_a, data_b, data_c = (ds.astype(float) for ds in datasets_with_gaps)
+    data_b["mf"] = data_b["mf"].where(data_b.time.dt.day != 3)
+
+    attributes = create_attributes()
+    d = datasource
+
+    d.add_data(metadata=attributes, data=data_a, data_type="surface", new_version=False)
+    d.add_data(metadata=attributes, data=data_b, data_type="surface", new_version=False)
+    d.add_data(metadata=attributes, data=data_c, data_type="surface", new_version=False)
+
+    summary = d.summary()
+    # Only the totals are added to the metadata, the full summary is stored with the data
+    assert d.metadata["summary"] == summary_totals(summary)
+    assert d._store.get_summary(version="v1") == summary
+
+    mf = summary["mf"]
+    assert mf["count"] == 90
+    assert mf["nan_count"] == 1
+    assert mf["min"] == 0
+    assert mf["max"] == 30
+    assert {month: entry[:3] for month, entry in mf["months"].items()} == {
+        "2012-01": [31, 0.0, 30.0],
+        "2012-04": [29, 0.0, 29.0],
+        "2012-09": [30, 0.0, 29.0],
+    }
+    assert mf["months"]["2012-04"][4] == 1
+
+    # New versions only hold the data added
+    d.add_data(metadata=attributes, data=data_a, data_type="surface", new_version=True, if_exists="new")
+    assert list(d.summary()["mf"]["months"]) == ["2012-01"]
+
+    with d.get_data(version="v1") as ds:
+        expected = _expected_summary(ds)
+
+    assert mf["mean"] == pytest.approx(expected["mf"]["mean"])
+    assert {k: v for k, v in mf.items() if k not in ("mean", "months")} == {
+        k: v for k, v in expected["mf"].items() if k not in ("mean", "months")
+    }
+    for month, entry in mf["months"].items():
+        assert entry == pytest.approx(expected["mf"]["months"][month])
+
+
+def test_summary_combine_and_load(bucket, datasource, datasets_with_overlap, mocker):
+    from openghg.objectstore import _legacy_datasource
+
+    data_a, data_b, _ = datasets_with_overlap
+
+    attributes = create_attributes()
+    d = datasource
+
+    d.add_data(metadata=attributes, data=data_a, data_type="surface")
+
+    compute_summary = mocker.spy(_legacy_datasource, "compute_summary")
+    d.add_data(metadata=attributes, data=data_b, data_type="surface", if_exists="combine")
+
+    # Only the months covered by the new data are summarised from the stored data
+    stored_times = compute_summary.call_args_list[-1].args[0].time.values
+    assert stored_times.min() >= np.datetime64("2012-01-01")
+
+    # Overlapping values are replaced, so 29th - 31st January are only counted once
+    assert d.summary()["mf"]["months"]["2012-01"][:3] == [31, 0.0, 1.0]
+    assert d.summary(version="v1")["mf"]["months"]["2012-01"][:3] == [31, 0.0, 0.0]
+
+    expected = _expected_summary(d.get_data(version="v2"))
+    assert d.summary()["mf"]["count"] == expected["mf"]["count"]
+    assert d.summary()["mf"]["mean"] == pytest.approx(expected["mf"]["mean"])
+
+    d.save()
+
+    loaded = Datasource.load(bucket=bucket, uuid=d.uuid)
+    assert loaded.summary() == d.summary()
+
+    # Versions stored without a summary have it computed from the stored data
+    (d._store._summaries_path / "v1.json").unlink()
+    loaded = Datasource.load(bucket=bucket, uuid=d.uuid)
+    assert loaded.summary(version="v1") == d.summary(version="v1")
+
+
+def test_summary_combine_new_version(datasource, datasets_with_overlap):
+    data_a, data_b, data_c = datasets_with_overlap
+    data_c = data_c.sel(time=slice("2012-05-01", None))
+
+    attributes = create_attributes()
+    d = datasource
+
+    d.add_data(metadata=attributes, data=data_a, data_type="surface")
+    d.add_data(metadata=attributes, data=data_c, data_type="surface", new_version=False)
+    d.add_data(metadata=attributes, data=data_b, data_type="surface", new_version=True, if_exists="combine")
+
+    # The new version starts from a copy of the previous version, so the months
+    # not covered by the new data are kept
+    summary = d.summary()
+    assert list(summary["mf"]["months"]) == [f"2012-{month:02}" for month in range(1, 10)]
+    assert summary["mf"]["count"] == _expected_summary(d.get_data(version="v2"))["mf"]["count"]
+    assert d.summary(version="v1")["mf"]["count"] == 31 + data_c.time.size
+
+
+def test_summary_computed_when_requested(bucket, datasource, datasets_with_gaps, mocker):
+    from openghg.objectstore import _legacy_datasource
+    from openghg.objectstore._summary import summary_totals
+
+    data_a, data_b, _ = datasets_with_gaps
+
+    attributes = create_attributes()
+    d = datasource
+
+    d.add_data(metadata=attributes, data=data_a, data_type="surface", new_version=False)
+    d.save()
+
+    # Data stored before summaries were recorded
+    (d._store._summaries_path / "v1.json").unlink()
+    loaded = Datasource.load(bucket=bucket, uuid=d.uuid)
+
+    compute_summary = mocker.spy(_legacy_datasource, "compute_summary")
+    loaded.add_data(metadata=attributes, data=data_b, data_type="surface", new_version=False)
+
+    # Only the new data is summarised, the stored data isn't read
+    assert compute_summary.call_count == 1
+    assert compute_summary.call_args.args[0].time.size == data_b.time.size
+    assert loaded.metadata["summary"] == {}
+    assert loaded._store.get_summary(version="v1") is None
+
+    summary = loaded.summary()
+    assert compute_summary.call_count == 2
+    assert list(summary["mf"]["months"]) == ["2012-01", "2012-04"]
+    assert loaded.metadata["summary"] == summary_totals(summary)
+    assert loaded._store.get_summary(version="v1") == summary
+
+
+def test_summary_not_recorded_for_gridded_data(datasource, mocker):
+    from openghg.objectstore import _legacy_datasource
+
+    time = pd.date_range("2012-01-01", periods=3, freq="1d")
+    data = xr.Dataset(
+        {"fp": (("time", "lat", "lon"), np.ones((3, 2, 2)))},
+        coords={"time": time, "lat": [1.0, 2.0], "lon": [3.0, 4.0]},
+    )
+
+    compute_summary = mocker.spy(_legacy_datasource, "compute_summary")
+    datasource.add_data(metadata=create_attributes(), data=data, data_type="footprints")
+
+    compute_summary.assert_not_called()
+    assert "summary" not in datasource.metadata
+    assert datasource._store.get_summary(version="v1") is None
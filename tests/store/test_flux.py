@@ -1,5 +1,6 @@
 import pytest
 import os
+from pathlib import Path
 from helpers import clear_test_stores, get_flux_datapath, filt
 from openghg.retrieve import search, search_flux
 from openghg.store import Flux
@@ -319,6 +320,26 @@ def test_add_edgar_database(clear_stores):
     assert metadata.items() >= expected_metadata.items()
 
 
+def test_add_edgar_batch_database(clear_stores):
+    """Test all years in an EDGAR folder can be added as one time-stacked Datasource"""
+    test_datapath = get_flux_datapath("EDGAR/yearly/v6.0_CH4")
+
+    proc_results = transform_flux_data(store="user", datapath=test_datapath, database="EDGAR_BATCH")
+
+    expected_info = {"species": "ch4", "source": "anthro", "domain": "globaledgar"}
+    assert len(proc_results) == 1
+    assert expected_info.items() <= proc_results[0].items()
+
+    search_results = search_flux(species="ch4", database="EDGAR", database_version="v6.0")
+    assert len(search_results) == 1
+
+    edgar_obs = search_results.retrieve_all()
+
+    assert edgar_obs.data.sizes["time"] == 2
+    assert edgar_obs.metadata["start_date"] == "2015-01-01 00:00:00+00:00"
+    assert edgar_obs.metadata["end_date"] == "2016-12-31 23:59:59+00:00"
+
+
 @pytest.mark.parametrize("source", [None, "edgar-annual-total"])
 def test_add_edgar_v8_database(clear_stores, source):
     """Test edgar v8.0 can be added to object store (default domain)"""
@@ -517,3 +538,93 @@ def test_info_metadata():
 
     assert "project" in metadata
     assert "tag" in metadata
+
+
+def test_read_file_in_time_slabs(mocker, clear_stores):
+    from openghg.objectstore._legacy_datasource import Datasource
+
+    test_datapath = get_flux_datapath("co2-rtot-cardamom-2hr_TEST_2014.nc")
+    kwargs: Any = dict(
+        store="user",
+        filepath=test_datapath,
+        species="co2",
+        source="natural-rtot",
+        domain="TEST",
+        time_resolved=True,
+        time_slab=10,
+    )
+
+    save_spy = mocker.spy(Datasource, "save")
+    add_spy = mocker.spy(Datasource, "add_data")
+
+    results = standardise_flux(**kwargs)
+
+    assert len(results) == 1
+    assert results[0]["new"] is True
+    # 52 time points are stored in 6 slabs, the Datasource is saved once
+    assert add_spy.call_count == 6
+    assert save_spy.call_count == 1
+
+    flux = search_flux(species="co2", source="natural-rtot", domain="TEST", store="user").retrieve()
+
+    assert flux.metadata["latest_version"] == "v1"
+    assert flux.metadata["start_date"] == "2014-06-29 18:00:00+00:00"
+
+    orig_data = open_dataset(test_datapath)
+    assert orig_data.time.equals(flux.data.time)
+    assert orig_data.flux.equals(flux.data.flux)
+
+    # Replacing the data creates one new version containing every slab
+    standardise_flux(**kwargs, if_exists="new", force=True)
+
+    flux = search_flux(species="co2", source="natural-rtot", domain="TEST", store="user").retrieve()
+    assert flux.metadata["latest_version"] == "v2"
+    assert orig_data.flux.equals(flux.data.flux)
+
+
+def test_time_slabs_rolled_back_on_error(mocker, clear_stores):
+    from openghg.objectstore import get_writable_bucket
+    from openghg.objectstore._legacy_datasource import Datasource
+    from openghg.store.storage import LocalZarrStore
+
+    test_datapath = get_flux_datapath("co2-rtot-cardamom-2hr_TEST_2014.nc")
+    kwargs: Any = dict(
+        store="user",
+        filepath=test_datapath,
+        species="co2",
+        source="natural-rtot",
+        domain="TEST",
+        time_resolved=True,
+        time_slab=10,
+    )
+
+    add_data = Datasource.add_data
+
+    def fail_on_third_slab(self, *args, **kw):
+        if add_spy.call_count == 3:
+            raise RuntimeError("Failed storing slab")
+        return add_data(self, *args, **kw)
+
+    # A new Datasource is deleted
+    add_spy = mocker.patch.object(Datasource, "add_data", autospec=True, side_effect=fail_on_third_slab)
+    with pytest.raises(RuntimeError):
+        standardise_flux(**kwargs)
+
+    assert not search_flux(species="co2", source="natural-rtot", domain="TEST", store="user")
+    bucket = get_writable_bucket(name="user")
+    assert not list((Path(bucket) / "data").glob("*/zarr/v1"))
+
+    mocker.stopall()
+    standardise_flux(**kwargs)
+
+    # The version created by the first slab is deleted, the data stored before is kept
+    add_spy = mocker.patch.object(Datasource, "add_data", autospec=True, side_effect=fail_on_third_slab)
+    with pytest.raises(RuntimeError):
+        standardise_flux(**kwargs, if_exists="new", force=True)
+
+    flux = search_flux(species="co2", source="natural-rtot", domain="TEST", store="user").retrieve()
+    assert flux.metadata["latest_version"] == "v1"
+    assert not LocalZarrStore(bucket=bucket, datasource_uuid=flux.metadata["uuid"], mode="r").version_exists(
+        "v2"
+    )
+    assert open_dataset(test_datapath).flux.equals(flux.data.flux)
@@ -0,0 +1,122 @@
+import pytest
+from helpers import clear_test_stores, get_surface_datapath
+from openghg.objectstore import get_writable_bucket
+from openghg.objectstore.metastore import open_metastore
+from openghg.retrieve import search_surface
+from openghg.standardise import standardise_surface
+from openghg.store import add_noaa_obspack, get_ingest_session, ingest_session
+
+
+@pytest.fixture(autouse=True)
+def clear_stores():
+    clear_test_stores()
+    yield
+    clear_test_stores()
+
+
+def _n_records(data_type="surface"):
+    bucket = get_writable_bucket(name="user")
+    with open_metastore(bucket=bucket, data_type=data_type, mode="r") as metastore:
+        return len(metastore.search())
+
+
+def test_ingest_session_commits_once():
+    bsd = get_surface_datapath("bsd.picarro.1minute.248m.min.dat", source_format="CRDS")
+    tac = get_surface_datapath("tac.picarro.1minute.100m.min.dat", source_format="CRDS")
+
+    with ingest_session(store="user") as session:
+        assert get_ingest_session() is session
+
+        processed = standardise_surface(
+            filepath=bsd, source_format="CRDS", site="bsd", network="decc", store="user"
+        )
+        processed += standardise_surface(
+            filepath=tac, source_format="CRDS", site="tac", network="decc", store="user"
+        )
+
+        # Nothing is written until the session is committed
+        assert _n_records() == 0
+
+    assert get_ingest_session() is None
+    assert session.n_commits == 1
+    assert _n_records() == len({p["uuid"] for p in processed}) == 5
+
+    results = search_surface(site="bsd", species="ch4", store="user")
+    assert results.retrieve().data.time.size > 0
+
+    # The file hashes were saved so the file is not standardised again
+    assert standardise_surface(
+        filepath=bsd, source_format="CRDS", site="bsd", network="decc", store="user"
+    ) == [{}]
+
+
+def test_ingest_session_commit_every():
+    filepaths = [
+        get_surface_datapath("bsd.picarro.1minute.248m.min.dat", source_format="CRDS"),
+        get_surface_datapath("bsd.picarro.1minute.108m.min.dat", source_format="CRDS"),
+        get_surface_datapath("bsd.picarro.1minute.42m.min.dat", source_format="CRDS"),
+    ]
+
+    with ingest_session(store="user", commit_every=2) as session:
+        for filepath in filepaths:
+            standardise_surface(
+                filepath=filepath, source_format="CRDS", site="bsd", network="decc", store="user"
+            )
+
+        assert session.n_commits == 1
+        assert _n_records() == 6
+
+    assert session.n_commits == 2
+    assert _n_records() == 9
+
+
+def test_ingest_session_commits_on_error():
+    bsd = get_surface_datapath("bsd.picarro.1minute.248m.min.dat", source_format="CRDS")
+
+    with pytest.raises(ValueError):
+        with ingest_session(store="user"):
+            standardise_surface(filepath=bsd, source_format="CRDS", site="bsd", network="decc", store="user")
+            raise ValueError("Something went wrong")
+
+    assert _n_records() == 3
+
+    with pytest.raises(ValueError):
+        with ingest_session(store="user"):
+            with ingest_session(store="user"):
+                pass
+
+
+def test_ingest_session_close_twice(mocker):
+    from openghg.objectstore._objectstore import LockingObjectStore
+
+    close_spy = mocker.spy(LockingObjectStore, "close")
+    bsd = get_surface_datapath("bsd.picarro.1minute.248m.min.dat", source_format="CRDS")
+
+    with ingest_session(store="user") as session:
+        standardise_surface(filepath=bsd, source_format="CRDS", site="bsd", network="decc", store="user")
+        session.close()
+        session.close()
+
+        assert close_spy.call_count == 1
+        assert _n_records() == 3
+
+        with pytest.raises(ValueError):
+            session.data_class("surface")
+
+    # Leaving the context manager after an explicit close doesn't close again
+    assert close_spy.call_count == 1
+    assert session.n_commits == 1
+    assert get_ingest_session() is None
+
+    # The lock was released, so data can be added outside the session
+    tac = get_surface_datapath("tac.picarro.1minute.100m.min.dat", source_format="CRDS")
+    standardise_surface(filepath=tac, source_format="CRDS", site="tac", network="decc", store="user")
+    assert _n_records() == 5
+
+
+def test_add_noaa_obspack_in_session():
+    data_directory = get_surface_datapath("ObsPack_ch4", source_format="NOAA")
+    processed = add_noaa_obspack(data_directory=data_directory, store="user", commit_every=1)
+
+    uuids = {p["uuid"] for p in processed}
+    assert len(uuids) == _n_records()
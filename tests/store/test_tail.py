@@ -0,0 +1,184 @@
+import shutil
+
+import pytest
+from helpers import clear_test_stores, get_surface_datapath
+from openghg.retrieve import search_surface
+from openghg.standardise import standardise_surface
+from openghg.standardise.surface import parse_crds
+from openghg.storage._indexing import OverlapDeterminer
+from openghg.store.base._tail import TAIL_FORMATS, scan_file
+
+
+@pytest.fixture(autouse=True)
+def clear_stores():
+    clear_test_stores()
+    yield
+    clear_test_stores()
+
+
+def _read_lines(filepath, sort=False):
+    lines = filepath.read_bytes().splitlines(keepends=True)
+    if sort:
+        lines = lines[:3] + sorted(lines[3:], key=lambda line: line.split()[:2])
+    return lines
+
+
+@pytest.fixture()
+def crds_lines():
+    # Files grow by appending rows in time order
+    filepath = get_surface_datapath("tac.picarro.1minute.100m.min.dat", source_format="CRDS")
+    return _read_lines(filepath, sort=True)
+
+
+def _standardise_tac(filepath, **kwargs):
+    return standardise_surface(
+        filepath=filepath, source_format="CRDS", site="tac", network="decc", store="user", tail=True, **kwargs
+    )
+
+
+def _get_ch4():
+    return search_surface(site="tac", species="ch4", inlet="100m", store="user").retrieve()
+
+
+def _parse_ch4(filepath):
+    return parse_crds(filepath=filepath, site="tac", network="decc")["ch4"]["data"]
+
+
+def test_scan_file_partial_line(tmp_path, crds_lines):
+    filepath = tmp_path / "tac.picarro.1minute.100m.min.dat"
+    complete = b"".join(crds_lines[:10])
+    filepath.write_bytes(complete + crds_lines[10][:12])
+
+    scan = scan_file(filepath, tail_format=TAIL_FORMATS["crds"], checkpoint_offset=len(complete) - 5)
+
+    assert scan.complete_offset == len(complete)
+    assert str(scan.last_timestamp) == "2012-07-26 00:45:30"
+    assert scan.checkpoint_prefix_hash is not None
+
+    checkpoint = scan.checkpoint()
+    filepath.write_bytes(b"".join(crds_lines[:12]))
+    assert checkpoint.matches(scan_file(filepath, TAIL_FORMATS["crds"], checkpoint_offset=checkpoint.offset))
+
+    # Changing an earlier row invalidates the checkpoint
+    filepath.write_bytes(b"".join(crds_lines[:5] + [crds_lines[6]] + crds_lines[6:12]))
+    assert not checkpoint.matches(
+        scan_file(filepath, TAIL_FORMATS["crds"], checkpoint_offset=checkpoint.offset)
+    )
+
+
+def test_tail_ingest_appends_rows(tmp_path, crds_lines, mocker):
+    filepath = tmp_path / "tac.picarro.1minute.100m.min.dat"
+    filepath.write_bytes(b"".join(crds_lines[:100]))
+
+    _standardise_tac(filepath)
+    assert _get_ch4().data.time.size == _parse_ch4(filepath).time.size
+
+    # Append the remaining rows, leaving the last line incomplete
+    with open(filepath, "ab") as f:
+        f.write(b"".join(crds_lines[100:-1]) + crds_lines[-1][:10])
+
+    overlap_spy = mocker.spy(OverlapDeterminer, "has_overlaps")
+    processed = _standardise_tac(filepath)
+
+    assert overlap_spy.call_count == 0
+    assert [p["new"] for p in processed] == [False, False]
+
+    complete_filepath = tmp_path / "complete" / filepath.name
+    complete_filepath.parent.mkdir()
+    complete_filepath.write_bytes(b"".join(crds_lines[:-1]))
+
+    obs = _get_ch4()
+    assert obs.data.time.size == _parse_ch4(complete_filepath).time.size
+    assert obs.metadata["latest_version"] == "v1"
+
+    # Complete the last line
+    with open(filepath, "ab") as f:
+        f.write(crds_lines[-1][10:])
+
+    _standardise_tac(filepath)
+
+    complete_filepath.write_bytes(b"".join(crds_lines))
+
+    obs = _get_ch4()
+    expected_ch4 = _parse_ch4(complete_filepath)
+
+    assert obs.data.time.size == expected_ch4.time.size
+    assert (obs.data.time.values == expected_ch4.time.values).all()
+    assert (obs.data["ch4"].values == expected_ch4["ch4"].values).all()
+
+    # Unchanged file is skipped
+    assert _standardise_tac(filepath) == []
+
+
+def test_tail_ingest_out_of_order_rows(tmp_path, mocker):
+    lines = _read_lines(get_surface_datapath("tac.picarro.1minute.100m.min.dat", source_format="CRDS"))
+
+    filepath = tmp_path / "tac.picarro.1minute.100m.min.dat"
+    filepath.write_bytes(b"".join(lines[:29]))
+    _standardise_tac(filepath)
+
+    # Rows before the last row standardised are checked for overlaps
+    filepath.write_bytes(b"".join(lines))
+    overlap_spy = mocker.spy(OverlapDeterminer, "has_overlaps")
+    _standardise_tac(filepath)
+
+    assert overlap_spy.call_count > 0
+    assert _get_ch4().data.time.size == _parse_ch4(filepath).time.size
+
+
+def test_tail_ingest_reparses_changed_file(tmp_path, crds_lines, mocker):
+    filepath = tmp_path / "tac.picarro.1minute.100m.min.dat"
+    filepath.write_bytes(b"".join(crds_lines[:100]))
+
+    _standardise_tac(filepath)
+
+    # Edit a row which has already been standardised
+    edited = crds_lines[50].replace(b"air", b"std", 1)
+    assert edited != crds_lines[50]
+    filepath.write_bytes(b"".join(crds_lines[:50] + [edited] + crds_lines[51:]))
+
+    overlap_spy = mocker.spy(OverlapDeterminer, "has_overlaps")
+    _standardise_tac(filepath, if_exists="combine")
+
+    assert overlap_spy.call_count > 0
+    assert _get_ch4().data.time.size == _parse_ch4(filepath).time.size
+
+
+def test_tail_ingest_gcwerks(tmp_path):
+    data_filepath = get_surface_datapath("capegrim-medusa.18.C", source_format="GC")
+    precision_filepath = get_surface_datapath("capegrim-medusa.18.precisions.C", source_format="GC")
+
+    lines = data_filepath.read_bytes().splitlines(keepends=True)
+    filepath = tmp_path / data_filepath.name
+    filepath.write_bytes(b"".join(lines[:12]))
+    shutil.copy(precision_filepath, tmp_path / precision_filepath.name)
+
+    def standardise():
+        return standardise_surface(
+            filepath=(filepath, tmp_path / precision_filepath.name),
+            source_format="GCWERKS",
+            site="cgo",
+            network="agage",
+            instrument="medusa",
+            store="user",
+            tail=True,
+        )
+
+    standardise()
+    n_times = search_surface(site="cgo", species="cf4", store="user").retrieve().data.time.size
+
+    filepath.write_bytes(b"".join(lines))
+    standardise()
+
+    obs = search_surface(site="cgo", species="cf4", store="user").retrieve()
+    assert obs.data.time.size > n_times
+    assert obs.metadata["latest_version"] == "v1"
+
+
+def test_tail_ingest_unsupported_format(tmp_path):
+    filepath = get_surface_datapath("DECC-picarro_TAC_20130131_co2-185m-20220929.nc", source_format="OPENGHG")
+
+    with pytest.raises(ValueError, match="Tail ingestion is not available"):
+        standardise_surface(
+            filepath=filepath, source_format="OPENGHG", site="tac", network="decc", store="user", tail=True
+        )
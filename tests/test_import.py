@@ -0,0 +1,102 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Run in a separate interpreter as openghg will already have been imported by the tests
+_import_script = """
+import json, sys, time
+start = time.perf_counter()
+import openghg
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def _import_openghg(tmp_path, script=_import_script):
+    env = os.environ.copy()
+    env["HOME"] = str(tmp_path)
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, env=env, check=True, cwd=tmp_path
+    )
+    return result.stdout.strip().splitlines()[-1]
+
+
+def test_import_is_lazy(tmp_path):
+    output = json.loads(_import_openghg(tmp_path))
+    modules = set(output["modules"])
+
+    heavy = {"xarray", "dask", "zarr", "pint", "pint_xarray", "plotly", "tinydb", "rich", "pandas", "numpy"}
+    assert not heavy & modules
+    assert not {m for m in modules if m.startswith("openghg.")}
+
+    # Opening the log file is also deferred until something is logged
+    assert not (tmp_path / "openghg.log").exists()
+
+    # Generous bound, an eager import takes several seconds
+    assert output["elapsed"] < 1.0
+
+
+def test_lazy_submodule_access(tmp_path):
+    script = """
+import openghg
+from openghg import util
+import openghg.retrieve
+print(openghg.util is util, openghg.retrieve.search is not None, "standardise" in dir(openghg))
+"""
+    assert _import_openghg(tmp_path, script) == "True True True"
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "openghg.analyse",
+        "openghg.dataobjects",
+        "openghg.datapack",
+        "openghg.plotting",
+        "openghg.retrieve",
+        "openghg.standardise",
+    ],
+)
+def test_import_subpackage_is_lazy(tmp_path, module):
+    script = f"""
+import json, sys
+import {module}
+print(json.dumps(sorted(sys.modules)))
+"""
+    modules = set(json.loads(_import_openghg(tmp_path, script)))
+
+    heavy = {"xarray", "dask", "zarr", "pint", "pint_xarray", "plotly", "pandas", "numpy"}
+    assert not heavy & modules
+
+
+def test_lazy_subpackage_attributes(tmp_path):
+    script = """
+import sys
+from openghg.retrieve import search_surface
+from openghg.dataobjects import ObsData
+import openghg.retrieve
+print(openghg.retrieve.search_surface is search_surface, "ObsData" in dir(openghg.dataobjects), "plotly" in sys.modules)
+"""
+    # Plotting libraries are only imported when plotting
+    assert _import_openghg(tmp_path, script) == "True True False"
+
+    with pytest.raises(subprocess.CalledProcessError):
+        _import_openghg(tmp_path, "from openghg.retrieve import not_a_function")
+
+
+@pytest.mark.parametrize(
+    "module", ["openghg.standardise.surface", "openghg.standardise.meta", "openghg.store"]
+)
+def test_import_subpackage_first(tmp_path, module):
+    # Subpackages must be importable without openghg having imported its other subpackages first
+    assert _import_openghg(tmp_path, f"import {module}; print('ok')") == "ok"
+
+
+def test_invalid_attribute_raises():
+    import openghg
+
+    with pytest.raises(AttributeError):
+        openghg.not_a_submodule
@@ -1,8 +1,11 @@
 from helpers import get_bc_datapath
 import logging
 import numpy as np
+import pandas as pd
+import xarray as xr
 
 from openghg.transform.boundary_conditions import parse_cams
+from openghg.transform.boundary_conditions._cams import cams_to_domain, xr_interp
 
 mpl_logger = logging.getLogger("matplotlib")
 mpl_logger.setLevel(logging.WARNING)
@@ -64,3 +67,43 @@ def test_parse_cams():
     assert bc_data["vmr_s"].attrs["units"] == "1e-09"
     assert bc_data["vmr_e"].attrs["units"] == "1e-09"
     assert bc_data["vmr_w"].attrs["units"] == "1e-09"
+
+
+def _synthetic_cams_dataset() -> xr.Dataset:
+    """Create a small CAMS-like dataset covering the EUROPE domain, with altitude varying in space and time."""
+    rng = np.random.default_rng(seed=42)
+
+    time = pd.date_range("2022-01-01", periods=3, freq="D")
+    lat = np.arange(0.0, 90.0, 3.0)
+    lon = np.arange(-120.0, 60.0, 3.0)
+    n_level = 10
+
+    species = rng.uniform(300.0, 340.0, size=(time.size, n_level, lat.size, lon.size))
+
+    base = np.linspace(0.0, 25000.0, n_level + 1)
+    offset = rng.uniform(0.0, 500.0, size=(time.size, 1, lat.size, lon.size))
+    altitude = base[np.newaxis, :, np.newaxis, np.newaxis] + offset
+
+    return xr.Dataset(
+        {
+            "species": (("time", "level", "lat", "lon"), species),
+            "altitude": (("time", "hlevel", "lat", "lon"), altitude),
+        },
+        coords={"time": time, "lat": lat, "lon": lon},
+    )
+
+
+def test_cams_to_domain_matches_per_curtain_interpolation():
+    """
+    Check the batched curtain interpolation gives the same result as interpolating each curtain in turn.
+    """
+    ds = _synthetic_cams_dataset()
+
+    expected = cams_to_domain(ds, domain="EUROPE", xr_interp_fn=xr_interp)
+    result = cams_to_domain(ds.chunk({"time": 1}), domain="EUROPE").compute()
+
+    for var in ("vmr_n", "vmr_e", "vmr_s", "vmr_w"):
+        assert result[var].dims == expected[var].dims
+        assert result[var].dtype == np.float32
+
+    xr.testing.assert_allclose(result, expected)
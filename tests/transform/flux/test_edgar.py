@@ -2,7 +2,7 @@ import numpy as np
 import pytest
 from helpers import get_flux_datapath
 
-from openghg.transform.flux import parse_edgar
+from openghg.transform.flux import parse_edgar, parse_edgar_batch
 from openghg.transform.flux._edgar import _extract_file_info
 
 # TODO: Add tests
@@ -327,3 +327,59 @@ def test_extract_file_info(edgar_file, expected_file_info):
     """Test that the expected file information can be extracted from the EDGAR filename."""
     file_info = _extract_file_info(edgar_file)
     assert file_info == expected_file_info
+
+
+def test_parse_edgar_batch_stacks_years():
+    """
+    Test all years within a folder are stacked into one dataset per sector.
+    """
+    filepath = get_flux_datapath("EDGAR/yearly/v6.0_CH4")
+
+    entry = parse_edgar_batch(filepath, species="ch4")
+
+    assert list(entry.keys()) == ["ch4_anthro_globaledgar"]
+
+    data = entry["ch4_anthro_globaledgar"]["data"]
+    metadata = entry["ch4_anthro_globaledgar"]["metadata"]
+
+    np.testing.assert_array_equal(
+        data["time"].values, np.array(["2015-01-01", "2016-01-01"], dtype="datetime64[ns]")
+    )
+    assert data["flux"].attrs["units"] == "mol/m2/s"
+
+    # Each year should match the output from the single year parser
+    for year in ("2015", "2016"):
+        single_year = list(parse_edgar(filepath, date=year, species="ch4").values())[0]["data"]
+        np.testing.assert_allclose(
+            data["flux"].sel(time=f"{year}-01-01").values, single_year["flux"].isel(time=0).values
+        )
+
+    expected_metadata = {
+        "species": "ch4",
+        "domain": "globaledgar",
+        "source": "anthro",
+        "database": "EDGAR",
+        "database_version": "v6.0",
+        "start_date": "2015-01-01 00:00:00+00:00",
+        "end_date": "2016-12-31 23:59:59+00:00",
+        "time_period": "1 year",
+    }
+
+    assert metadata.items() >= expected_metadata.items()
+
+
+def test_parse_edgar_batch_year_range():
+    """
+    Test years outside of the start_year and end_year range are not included
+    and that an error is raised if nothing matches.
+    """
+    filepath = get_flux_datapath("EDGAR/yearly/v6.0_CH4")
+
+    entry = parse_edgar_batch(filepath, species="ch4", start_year=2016)
+    data = entry["ch4_anthro_globaledgar"]["data"]
+
+    assert data.sizes["time"] == 1
+    assert entry["ch4_anthro_globaledgar"]["metadata"]["start_date"] == "2016-01-01 00:00:00+00:00"
+
+    with pytest.raises(ValueError):
+        parse_edgar_batch(filepath, species="ch4", sectors=["ene"])
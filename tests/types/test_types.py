@@ -1,9 +1,24 @@
+import pandas as pd
 import xarray as xr
 
-from openghg.types import HasMetadataAndData
+from openghg.types import HasMetadataAndData, MetadataAndData, split_time_slabs
 from openghg.dataobjects._basedata import _BaseData
 
 
 def test_base_data_has_metadata_and_data():
     bd = _BaseData(metadata={}, data=xr.Dataset())
     assert isinstance(bd, HasMetadataAndData)
+
+
+def test_split_time_slabs():
+    times = pd.date_range("2020-01-01", periods=5, freq="h")
+    timed = MetadataAndData(
+        metadata={"species": "ch4"}, data=xr.Dataset({"x": ("time", range(5))}, {"time": times})
+    )
+    untimed = MetadataAndData(metadata={"species": "co2"}, data=xr.Dataset({"y": ("lat", [1.0, 2.0])}))
+
+    slabs = list(split_time_slabs([timed, untimed], time_slab=2))
+
+    assert [[x.metadata["species"] for x in slab] for slab in slabs] == [["ch4", "co2"], ["ch4"], ["ch4"]]
+    assert [slab[0].data.time.size for slab in slabs] == [2, 2, 1]
+    xr.testing.assert_identical(xr.concat([slab[0].data for slab in slabs], dim="time"), timed.data)
@@ -169,3 +169,65 @@ def test_combine_and_elevate_inlet_on_real_data_overlap_override_on_conflict(sur
     np.testing.assert_array_equal(
         result.data.inlet.values, np.array([10.0] * step + [10.0] * step + [11.0] * step)
     )
+
+
+def _concat_and_drop_duplicates(datasets):
+    combined = xr.concat(datasets, dim="time", combine_attrs="drop_conflicts", fill_value=np.nan)
+    return combined.drop_duplicates("time").sortby("time")
+
+
+@pytest.mark.parametrize("chunks", [None, 7])
+def test_merge_sorted_matches_concat(chunks):
+    from openghg.util._combine import merge_sorted
+
+    rng = np.random.default_rng(seed=1)
+
+    def make(start, periods, freq, inlet, flag=True):
+        times = pd.date_range(start, periods=periods, freq=freq)
+        ds = xr.Dataset(
+            {"mf": ("time", rng.normal(size=periods)), "n": ("time", rng.integers(0, 10, periods))},
+            coords={"time": times},
+            attrs={"site": "tac", "inlet": inlet},
+        )
+        ds["mf"].attrs = {"units": "ppb", "inlet": inlet}
+        if flag:
+            ds["flag"] = ("time", rng.integers(0, 2, periods))
+        return ds if chunks is None else ds.chunk({"time": chunks})
+
+    datasets = [
+        make("2020-01-01", 100, "1h", "10m"),
+        make("2020-01-02", 150, "30min", "50m", flag=False),
+        make("2019-12-31", 60, "2h", "100m").isel(time=slice(None, None, -1)),
+    ]
+
+    result = merge_sorted(datasets)
+    expected = _concat_and_drop_duplicates(datasets)
+
+    if chunks is not None:
+        assert result["mf"].chunks is not None
+
+    xr.testing.assert_identical(result.compute(), expected.compute())
+    assert result.attrs == {"site": "tac"}
+    assert result["mf"].attrs == {"units": "ppb"}
+    assert result["flag"].dtype == np.float64
+
+
+def test_combine_and_elevate_inlet_dask_matches_concat(make_obs_data):
+    data_objects = [
+        ObsData(metadata=do.metadata, data=do.data.chunk({"time": 5}).isel(time=slice(0, 20)))
+        for do in make_obs_data
+    ]
+    # Overlap the first two objects
+    data_objects[1] = ObsData(
+        metadata=data_objects[1].metadata,
+        data=make_obs_dataset("2024-01-10", "2024-02-10").chunk({"time": 5}),
+    )
+
+    result = combine_and_elevate_inlet(data_objects)
+
+    inlets = [10.0, 11.0, 12.0, 10.0]
+    expected = _concat_and_drop_duplicates(
+        [do.data.assign(inlet=("time", np.full(do.data.time.size, x))) for do, x in zip(data_objects, inlets)]
+    )
+
+    xr.testing.assert_equal(result.data.compute(), expected.compute())
@@ -8,6 +8,8 @@ from openghg.util import (
     cut_data_extent,
     find_domain,
     align_lat_lon,
+    get_spatial_bounds,
+    spatial_index_slices,
 )
 from openghg.util._domain import _get_coord_data
 from helpers import get_footprint_datapath
@@ -26,6 +28,7 @@ def test_find_domain():
     assert lat_increment == 0.234
     assert lon_increment == 0.352
 
+
 def test_find_domain_missing():
     """Test find_domain function returns an error if domain is not present"""
     domain = "FAKE"
@@ -206,3 +209,32 @@ def test_align_lat_lon():
     shifted_data = input_data_to_align.assign_coords(lat=(input_data_to_align.lat + 10))
     with pytest.raises(ValueError):
         align_lat_lon(data=shifted_data, domain=domain)
+
+
+def test_spatial_index_slices():
+    """Test bounds are converted to inclusive index slices for ascending and descending coordinates"""
+    lat = np.arange(10.0, 20.0)
+    lon = np.arange(-5.0, 5.0)[::-1]
+
+    slices = spatial_index_slices(
+        coords={"lat": lat, "lon": lon}, bounds={"lat": (12.0, 14.5), "lon": (-2, 0)}
+    )
+
+    assert slices == {"lat": slice(2, 5), "lon": slice(4, 7)}
+    np.testing.assert_array_equal(lat[slices["lat"]], [12.0, 13.0, 14.0])
+    np.testing.assert_array_equal(lon[slices["lon"]], [0.0, -1.0, -2.0])
+
+    with pytest.raises(ValueError):
+        spatial_index_slices(coords={"lat": lat}, bounds={"lat": (30.0, 40.0)})
+
+
+def test_get_spatial_bounds():
+    """Test explicit bounds take precedence over those of a pre-defined domain"""
+    assert get_spatial_bounds() == {}
+    assert get_spatial_bounds(lat_bounds=(60, 50)) == {"lat": (50.0, 60.0)}
+
+    latitude, longitude, _, _ = find_domain("EUROPE")
+    bounds = get_spatial_bounds(lon_bounds=(0, 10), sub_domain="EUROPE")
+
+    assert bounds["lat"] == (latitude.min(), latitude.max())
+    assert bounds["lon"] == (0.0, 10.0)
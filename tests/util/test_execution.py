@@ -0,0 +1,123 @@
+import dask
+import pytest
+import toml
+import xarray as xr
+from openghg.util import _user, execution_options, get_execution_options, uses_execution_options
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    path = tmp_path / "openghg.conf"
+    monkeypatch.setattr(_user, "get_user_config_path", lambda: path)
+    return path
+
+
+@uses_execution_options
+def _current_scheduler():
+    return dask.config.get("scheduler", None), dask.config.get("num_workers", None)
+
+
+def test_execution_options_context(config_path):
+    assert get_execution_options() == {}
+    before = _current_scheduler()
+
+    with execution_options(scheduler="threads", num_workers=3):
+        assert get_execution_options() == {"scheduler": "threads", "num_workers": 3}
+        assert dask.config.get("scheduler") == "threads"
+        assert _current_scheduler() == ("threads", 3)
+
+        with execution_options(scheduler="synchronous"):
+            assert _current_scheduler()[0] == "synchronous"
+
+        assert _current_scheduler() == ("threads", 3)
+
+    assert get_execution_options() == {}
+    assert _current_scheduler() == before
+
+
+def test_execution_options_from_config(config_path):
+    config_path.write_text('user_id = "test"\n\n[execution]\nscheduler = "processes"\nnum_workers = 2\n')
+
+    assert get_execution_options() == {"scheduler": "processes", "num_workers": 2}
+    assert _current_scheduler() == ("processes", 2)
+
+    # The context manager takes precedence
+    with execution_options(scheduler="synchronous"):
+        assert _current_scheduler()[0] == "synchronous"
+
+
+def test_execution_options_from_user_config(reset_mock_user_config):
+    assert get_execution_options() == {}
+
+    config_path = _user.get_user_config_path()
+    config = toml.loads(config_path.read_text())
+    config["execution"] = {"scheduler": "synchronous"}
+    config_path.write_text(toml.dumps(config))
+
+    try:
+        # Changes to the config file are picked up
+        assert get_execution_options() == {"scheduler": "synchronous"}
+        assert _current_scheduler()[0] == "synchronous"
+    finally:
+        config_path.write_text(toml.dumps({k: v for k, v in config.items() if k != "execution"}))
+
+    assert get_execution_options() == {}
+
+
+def test_execution_options_invalid(config_path):
+    with pytest.raises(ValueError):
+        with execution_options(scheduler="gpu"):
+            pass
+
+    with pytest.raises(ValueError):
+        with execution_options(scheduler="threads", num_workers=0):
+            pass
+
+    config_path.write_text("[execution]\nworkers = 2\n")
+    with pytest.raises(ValueError):
+        get_execution_options()
+
+
+def test_processes_scheduler_with_sharded_store_and_read_cache(tmp_path):
+    from helpers import clear_test_stores, get_surface_datapath
+    from openghg.objectstore import get_writable_bucket
+    from openghg.retrieve import get_obs_surface
+    from openghg.standardise import standardise_surface
+    from openghg.storage import is_sharded_store
+    from openghg.store.storage import configure_read_cache, LocalZarrStore, set_storage_layout
+
+    clear_test_stores()
+    bucket = get_writable_bucket(name="user")
+    set_storage_layout(bucket=bucket, layout="sharded", chunks_per_shard=4)
+
+    try:
+        with execution_options(scheduler="processes", num_workers=2):
+            standardise_surface(
+                filepath=get_surface_datapath("tac.picarro.1minute.100m.min.dat", source_format="CRDS"),
+                source_format="CRDS",
+                site="tac",
+                network="decc",
+                store="user",
+            )
+
+        expected = get_obs_surface(site="tac", species="ch4", inlet="100m").data.compute(scheduler="sync")
+
+        read_cache = configure_read_cache(max_size="10MB", spill_dir=tmp_path / "spill")
+        obs = get_obs_surface(site="tac", species="ch4", inlet="100m")
+        assert obs.data["mf"].chunks is not None
+
+        # Lazy results use the scheduler in effect when they are computed
+        with execution_options(scheduler="processes", num_workers=2):
+            computed = obs.data.compute()
+
+        xr.testing.assert_identical(computed, expected)
+        assert any(read_cache.spill_dir.iterdir())
+
+        uuid = obs.metadata["uuid"]
+        assert is_sharded_store(
+            LocalZarrStore(bucket=bucket, datasource_uuid=uuid, mode="r").store_path("v1")
+        )
+    finally:
+        configure_read_cache(max_size=None)
+        set_storage_layout(bucket=bucket, layout="directory")
+        clear_test_stores()
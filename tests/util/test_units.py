@@ -1,7 +1,10 @@
+import dask.array
+import numpy as np
 import pytest
 import xarray as xr
 
 import openghg
+from openghg.util import add_with_units, conversion_factor, multiply_with_units
 
 
 def test_pint_anywhere():
@@ -83,3 +86,25 @@ def test_parts_per(number, abbrev, long):
 
     # "cf" formatting will use long name
     assert long == f"{converted:cf}"
+
+
+def test_unit_arithmetic_matches_pint():
+    """Check multiplying and adding with scalar unit factors gives the same results as pint."""
+    fp = xr.DataArray(
+        dask.array.from_array(np.linspace(0, 1, 12).reshape(3, 4), chunks=2), dims=["lat", "lon"]
+    )
+    fp.attrs["units"] = "m2 s mol-1"
+    flux = xr.DataArray(np.full((3, 4), 2.0), dims=["lat", "lon"], attrs={"units": "mol m-2 s-1"})
+    mf = xr.DataArray(np.full((3, 4), 5.0), dims=["lat", "lon"], attrs={"units": "1e-9"})
+
+    product = multiply_with_units(fp, flux)
+    expected = (fp.pint.quantify() * flux.pint.quantify()).pint.dequantify()
+    assert isinstance(product.data, dask.array.Array)
+    xr.testing.assert_identical(product.compute(), expected.compute())
+
+    total = add_with_units(product, mf)
+    expected = (product.pint.quantify() + mf.pint.quantify()).pint.dequantify()
+    xr.testing.assert_identical(total.compute(), expected.compute())
+    assert total.attrs["units"] == "1"
+
+    assert conversion_factor("1e-9", "1e-6") == pytest.approx(1e-3)
@@ -5,7 +5,13 @@ import pytest
 import toml
 from unittest.mock import patch
 from openghg.types import ConfigFileError, ObjectStoreError
-from openghg.util import check_config, create_config, read_local_config, handle_direct_store_path
+from openghg.util import (
+    check_config,
+    create_config,
+    read_config_section,
+    read_local_config,
+    handle_direct_store_path,
+)
 
 
 @pytest.fixture
@@ -192,3 +198,29 @@ def test_handle_direct_store_path(caplog, reset_mock_user_config):
 
     with pytest.raises(ObjectStoreError):
         handle_direct_store_path(path=path, add_new_store=True)
+
+
+def test_create_config_keeps_options(monkeypatch, mocker, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    mock_config_path = tmp_path.joinpath("mock_config.conf")
+    mocker.patch("openghg.util._user.get_user_config_path", return_value=mock_config_path)
+
+    create_config(silent=True)
+
+    config = toml.loads(mock_config_path.read_text())
+    config["execution"] = {"scheduler": "threads"}
+    config["access_stats"] = {"record": True}
+    config["read_cache"] = {"max_size": "1GB"}
+    mock_config_path.write_text(toml.dumps(config))
+
+    assert read_config_section("access_stats") == {"record": True}
+    assert read_config_section("object_stores") == {}
+
+    with patch.object(builtins, "input", side_effect=iter(["n", "n"])):
+        create_config(silent=False)
+
+    updated = toml.loads(mock_config_path.read_text())
+
+    assert updated["execution"] == {"scheduler": "threads"}
+    assert updated["access_stats"] == {"record": True}
+    assert updated["read_cache"] == {"max_size": "1GB"}